@@ -15,13 +15,16 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.orm import Session
 
+from app.core.cancellation import CancellationToken, RunCancelled
 from app.core.config import settings
-from app.core.database import Conversation, Message, get_db
+from app.core.database import Conversation, Message, get_db, get_db_session
 from app.core.security import generate_uuid, get_current_user_optional
 from app.models import ChatRequest, ChatResponse
 from app.models.workflow import WorkflowResponse
 from app.services.react_engine.workflow_engine import workflow_engine
 from app.services.websocket.event_emitter import event_emitter
+from app.services.websocket.exceptions import RunRejected
+from app.services.websocket.run_manager import run_manager
 
 router = APIRouter(prefix="/chat")
 
@@ -166,6 +169,12 @@ async def websocket_chat(
     - {action: "rerun_verify", conversation_id: "..."} - Relancer vérification
     - {action: "force_repair", conversation_id: "...", model: "..."} - Forcer réparation
     - {action: "get_models"} - Liste des modèles
+    - {action: "ping"} - Keepalive (répond pong + stats RunManager)
+    - {action: "cancel", run_id: "..."} - Annule un run (tous les runs de l'utilisateur sans run_id)
+
+    Les runs (chat, rerun_verify, force_repair) s'exécutent en tâches de fond
+    via le RunManager: la boucle de réception reste réactive, et un run survit
+    à une reconnexion du même utilisateur.
 
     Messages envoyés:
     - thinking: Phase en cours
@@ -175,7 +184,8 @@ async def websocket_chat(
     - verification_item: Item de vérification QA
     - verification_complete: Vérification terminée (pour rerun_verify)
     - complete: Réponse finale
-    - error: Erreur
+    - error: Erreur (code RUN_LIMIT_EXCEEDED si le run est refusé à l'admission,
+      RUN_CANCELLED / RUN_DEADLINE_EXCEEDED si le run est annulé)
     """
     from app.core.security import verify_token
 
@@ -202,10 +212,18 @@ async def websocket_chat(
         await websocket.close(code=1008, reason="Invalid token payload")
         return
 
+    # Reconnexion: les runs détachés de l'utilisateur streament sur ce socket
+    await run_manager.resume(user_id, websocket)
+
     try:
         while True:
             data = await websocket.receive_json()
 
+            # L'annulation n'est jamais soumise au rate limit
+            if data.get("action") == "cancel":
+                await handle_cancel(data, websocket, user_id)
+                continue
+
             # === Rate Limiting WebSocket ===
             if not ws_rate_limiter.is_allowed(user_id):
                 await websocket.send_json(
@@ -224,130 +242,198 @@ async def websocket_chat(
             action = data.get("action")
 
             if action == "rerun_verify":
-                await handle_rerun_verify(data, websocket, db, user_id)
+                await submit_run(websocket, user_id, "rerun_verify", handle_rerun_verify, data)
                 continue
             elif action == "force_repair":
-                await handle_force_repair(data, websocket, db, user_id)
+                await submit_run(websocket, user_id, "force_repair", handle_force_repair, data)
                 continue
             elif action == "get_models":
                 await handle_get_models(websocket)
                 continue
+            elif action == "ping":
+                await websocket.send_json({"type": "pong", "data": run_manager.get_stats()})
+                continue
 
             # === Flux standard: message chat ===
-            message = data.get("message", "")
-            conversation_id = data.get("conversation_id")
-            model = data.get("model")
-            skip_spec = data.get("skip_spec", False)
+            await submit_run(websocket, user_id, "chat", handle_chat_message, data)
 
-            # Generate run_id for this run (WebSocket v8)
-            import uuid
+    except WebSocketDisconnect:
+        import logging as _logging
 
-            run_id = str(uuid.uuid4())[:8]
-            await event_emitter.lifecycle_tracker.start_run(run_id)
+        _logging.getLogger("app.api.v1.chat").info("[DEBUG Chat] WebSocket disconnected")
+    except Exception as e:
+        import logging as _logging
+        import traceback
 
-            if not message:
-                await event_emitter.emit_terminal(
-                    websocket, "error", run_id, {"message": "Message vide"}
-                )
-                continue
+        _chat_logger = _logging.getLogger("app.api.v1.chat")
+        _chat_logger.error(f"[CRITICAL Chat] Unhandled exception in websocket_chat: {e}")
+        _chat_logger.error(f"[CRITICAL Chat] Traceback: {traceback.format_exc()}")
+        try:
+            await websocket.send_json({"type": "error", "data": {"message": str(e)}})
+        except Exception as send_err:
+            _chat_logger.error(f"[CRITICAL Chat] Failed to send error: {send_err}")
+    finally:
+        # Les runs continuent en arrière-plan; leurs events sont bufferisés
+        # (ENABLE_EVENT_QUEUE) jusqu'à la reconnexion
+        run_manager.detach(websocket)
 
-            # Gestion conversation
-            if not conversation_id:
-                conversation = Conversation(
-                    id=generate_uuid(),
-                    user_id=user_id,
-                    title=message[:50],
-                    model=normalize_model(model),
-                )
-                db.add(conversation)
-                db.commit()
-                conversation_id = conversation.id
-
-                await event_emitter.emit(
-                    websocket,
-                    "conversation_created",
-                    run_id,
-                    {"conversation_id": str(conversation_id)},
-                )
 
-            # Sauvegarder message user
-            user_msg = Message(
-                conversation_id=conversation_id,
-                role="user",
-                content=message,
-            )
-            db.add(user_msg)
-            db.commit()
+async def submit_run(ws: WebSocket, user_id: str, kind: str, handler, data: dict) -> None:
+    """
+    Enregistre un run et le confie au RunManager (tâche de fond).
 
-            # Historique
-            history = (
-                db.query(Message)
-                .filter(Message.conversation_id == conversation_id)
-                .order_by(Message.created_at)
-                .all()
-            )
+    La boucle de réception WebSocket n'attend pas la fin du run: elle reste
+    disponible pour ping/get_models et les runs suivants.
+    """
+    import uuid
+
+    # Generate run_id for this run (WebSocket v8)
+    run_id = str(uuid.uuid4())[:8]
+    await event_emitter.lifecycle_tracker.start_run(run_id)
+    cancel_token = CancellationToken(settings.RUN_DEADLINE_SECONDS)
 
-            history_list = [{"role": m.role, "content": m.content} for m in history]
+    async def _factory(channel):
+        db = get_db_session()
+        try:
+            await handler(data, channel, db, user_id, run_id=run_id, cancel_token=cancel_token)
+        finally:
+            db.close()
+
+    try:
+        run_manager.submit(run_id, user_id, ws, _factory, kind=kind, cancel_token=cancel_token)
+    except RunRejected as e:
+        await event_emitter.emit_terminal(
+            ws,
+            "error",
+            run_id,
+            {"message": str(e), "code": "RUN_LIMIT_EXCEEDED", "reason": e.reason},
+        )
+
+
+async def handle_chat_message(
+    data: dict,
+    ws: WebSocket,
+    db: Session,
+    user_id: str,
+    run_id: str = None,
+    cancel_token: CancellationToken = None,
+):
+    """
+    Exécute un message chat via le WorkflowEngine (run complet).
+    """
+    import logging as _logging
+    import uuid
+
+    _chat_logger = _logging.getLogger("app.api.v1.chat")
+
+    message = data.get("message", "")
+    conversation_id = data.get("conversation_id")
+    model = data.get("model")
+    skip_spec = data.get("skip_spec", False)
+
+    if run_id is None:
+        run_id = str(uuid.uuid4())[:8]
+        await event_emitter.lifecycle_tracker.start_run(run_id)
 
-            # Exécuter via WorkflowEngine avec WebSocket
-            # NOTE: workflow_engine.run() handles terminal events internally
-            import logging as _logging
+    try:
+        if not message:
+            await event_emitter.emit_terminal(ws, "error", run_id, {"message": "Message vide"})
+            return
 
-            _chat_logger = _logging.getLogger("app.api.v1.chat")
-            _chat_logger.debug(f"Starting workflow for run {run_id}, message: {message[:80]}...")
-            _chat_logger.debug(f"Model: {normalize_model(model)}, conv_id: {conversation_id}")
-            result = await workflow_engine.run(
-                user_message=message,
-                conversation_id=conversation_id,
+        # Gestion conversation
+        if not conversation_id:
+            conversation = Conversation(
+                id=generate_uuid(),
+                user_id=user_id,
+                title=message[:50],
                 model=normalize_model(model),
-                history=history_list,
-                websocket=websocket,
-                skip_spec=skip_spec,
-                run_id=run_id,
             )
+            db.add(conversation)
+            db.commit()
+            conversation_id = conversation.id
 
-            _chat_logger.debug(
-                f"Workflow completed for run {run_id}, response length: {len(result.response) if result.response else 0}"
+            await event_emitter.emit(
+                ws,
+                "conversation_created",
+                run_id,
+                {"conversation_id": str(conversation_id)},
             )
 
-            # Sauvegarder réponse
-            tools_names = [t["tool"] for t in result.tools_used] if result.tools_used else []
+        # Sauvegarder message user
+        user_msg = Message(
+            conversation_id=conversation_id,
+            role="user",
+            content=message,
+        )
+        db.add(user_msg)
+        db.commit()
 
-            assistant_msg = Message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=result.response,
-                model=result.model_used,
-                tools_used=tools_names,
-                thinking={"trace": result.thinking} if result.thinking else None,
-            )
-            db.add(assistant_msg)
-            db.commit()
+        # Historique
+        history = (
+            db.query(Message)
+            .filter(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at)
+            .all()
+        )
 
-    except WebSocketDisconnect:
-        import logging as _logging
+        history_list = [{"role": m.role, "content": m.content} for m in history]
+
+        # Exécuter via WorkflowEngine avec WebSocket
+        # NOTE: workflow_engine.run() handles terminal events internally
+        _chat_logger.debug(f"Starting workflow for run {run_id}, message: {message[:80]}...")
+        _chat_logger.debug(f"Model: {normalize_model(model)}, conv_id: {conversation_id}")
+        result = await workflow_engine.run(
+            user_message=message,
+            conversation_id=conversation_id,
+            model=normalize_model(model),
+            history=history_list,
+            websocket=ws,
+            skip_spec=skip_spec,
+            run_id=run_id,
+            cancel_token=cancel_token,
+        )
+
+        # Run annulé: terminal déjà envoyé, ne pas persister de réponse partielle
+        if cancel_token is not None and cancel_token.cancelled:
+            return
+
+        _chat_logger.debug(
+            f"Workflow completed for run {run_id}, response length: {len(result.response) if result.response else 0}"
+        )
+
+        # Sauvegarder réponse
+        tools_names = [t["tool"] for t in result.tools_used] if result.tools_used else []
+
+        assistant_msg = Message(
+            conversation_id=conversation_id,
+            role="assistant",
+            content=result.response,
+            model=result.model_used,
+            tools_used=tools_names,
+            thinking={"trace": result.thinking} if result.thinking else None,
+        )
+        db.add(assistant_msg)
+        db.commit()
 
-        _logging.getLogger("app.api.v1.chat").info("[DEBUG Chat] WebSocket disconnected")
     except Exception as e:
-        import logging as _logging
         import traceback
 
-        _chat_logger = _logging.getLogger("app.api.v1.chat")
-        _chat_logger.error(f"[CRITICAL Chat] Unhandled exception in websocket_chat: {e}")
+        _chat_logger.error(f"[CRITICAL Chat] Unhandled exception in run {run_id}: {e}")
         _chat_logger.error(f"[CRITICAL Chat] Traceback: {traceback.format_exc()}")
-        try:
-            # Try to send proper v8 error terminal event
-            if "run_id" in dir():
-                await event_emitter.emit_terminal(
-                    websocket, "error", run_id, {"message": f"Erreur interne: {str(e)}"}
-                )
-            else:
-                await websocket.send_json({"type": "error", "data": {"message": str(e)}})
-        except Exception as send_err:
-            _chat_logger.error(f"[CRITICAL Chat] Failed to send error: {send_err}")
+        # If workflow_engine.run() threw exception before sending terminal, send error terminal
+        await event_emitter.emit_terminal(
+            ws, "error", run_id, {"message": f"Erreur interne: {str(e)}"}
+        )
 
 
-async def handle_rerun_verify(data: dict, ws: WebSocket, db: Session, user_id: str):
+async def handle_rerun_verify(
+    data: dict,
+    ws: WebSocket,
+    db: Session,
+    user_id: str,
+    run_id: str = None,
+    cancel_token: CancellationToken = None,
+):
     """
     Relance uniquement la phase VERIFY sur le dernier run.
     Exécute les checks QA basiques (git_status, lint).
@@ -359,9 +445,10 @@ async def handle_rerun_verify(data: dict, ws: WebSocket, db: Session, user_id: s
     conversation_id = data.get("conversation_id")
     checks = data.get("checks")  # Optionnel: ["tests", "lint", "format", "git"]
 
-    # Generate run_id for this rerun_verify action
-    run_id = str(uuid.uuid4())[:8]
-    await event_emitter.lifecycle_tracker.start_run(run_id)
+    # Generate run_id for this rerun_verify action (sauf si fourni par submit_run)
+    if run_id is None:
+        run_id = str(uuid.uuid4())[:8]
+        await event_emitter.lifecycle_tracker.start_run(run_id)
 
     try:
         if not conversation_id:
@@ -412,7 +499,7 @@ async def handle_rerun_verify(data: dict, ws: WebSocket, db: Session, user_id: s
 
         # Utiliser la nouvelle méthode run_qa_checks
         verification = await workflow_engine.run_qa_checks(
-            websocket=ws, run_id=run_id, checks=checks
+            websocket=ws, run_id=run_id, checks=checks, cancel_token=cancel_token
         )
 
         # Déterminer le verdict
@@ -435,13 +522,25 @@ async def handle_rerun_verify(data: dict, ws: WebSocket, db: Session, user_id: s
             },
         )
 
+    except RunCancelled as e:
+        await event_emitter.emit_terminal(
+            ws, "error", run_id, {"message": str(e), "code": e.code, "reason": e.reason}
+        )
+
     except Exception as e:
         await event_emitter.emit_terminal(
             ws, "error", run_id, {"message": f"Erreur lors de la re-vérification: {str(e)}"}
         )
 
 
-async def handle_force_repair(data: dict, ws: WebSocket, db: Session, user_id: str):
+async def handle_force_repair(
+    data: dict,
+    ws: WebSocket,
+    db: Session,
+    user_id: str,
+    run_id: str = None,
+    cancel_token: CancellationToken = None,
+):
     """
     Force un cycle de réparation même si le verdict était PASS.
     Demande au LLM d'améliorer la réponse précédente.
@@ -453,9 +552,10 @@ async def handle_force_repair(data: dict, ws: WebSocket, db: Session, user_id: s
     conversation_id = data.get("conversation_id")
     model = data.get("model", settings.DEFAULT_MODEL)
 
-    # Generate run_id for this force_repair action
-    run_id = str(uuid.uuid4())[:8]
-    await event_emitter.lifecycle_tracker.start_run(run_id)
+    # Generate run_id for this force_repair action (sauf si fourni par submit_run)
+    if run_id is None:
+        run_id = str(uuid.uuid4())[:8]
+        await event_emitter.lifecycle_tracker.start_run(run_id)
 
     try:
         if not conversation_id:
@@ -546,8 +646,13 @@ Réponds directement avec la version améliorée."""
             websocket=ws,
             skip_spec=True,
             run_id=run_id,
+            cancel_token=cancel_token,
         )
 
+        # Run annulé: terminal déjà envoyé, ne pas persister de réponse partielle
+        if cancel_token is not None and cancel_token.cancelled:
+            return
+
         # Sauvegarder la nouvelle réponse
         tools_names = [t["tool"] for t in result.tools_used] if result.tools_used else []
 
@@ -571,6 +676,31 @@ Réponds directement avec la version améliorée."""
         )
 
 
+async def handle_cancel(data: dict, ws: WebSocket, user_id: str):
+    """
+    Annule un run de l'utilisateur (ou tous ses runs si run_id absent).
+    Le run émet lui-même son event terminal (code RUN_CANCELLED).
+    """
+    run_id = data.get("run_id")
+
+    if run_id:
+        run = run_manager.get(run_id)
+        # SECURITY: un utilisateur ne peut annuler que ses propres runs
+        if run is None or run.user_id != user_id:
+            await ws.send_json(
+                {
+                    "type": "error",
+                    "data": {"message": f"Run introuvable: {run_id}", "code": "RUN_NOT_FOUND"},
+                }
+            )
+            return
+        cancelled = [run_id] if run_manager.cancel(run_id, "client") else []
+    else:
+        cancelled = run_manager.cancel_user_runs(user_id, "client")
+
+    await ws.send_json({"type": "cancel_ack", "data": {"run_ids": cancelled}})
+
+
 async def handle_get_models(ws: WebSocket):
     """
     Retourne la liste des modèles disponibles depuis Ollama.
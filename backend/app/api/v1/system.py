@@ -298,6 +298,17 @@ async def get_metrics(db: Session = Depends(get_db)):
     return await get_stats(db=db)
 
 
+@router.get("/verifier/stats")
+async def get_verifier_stats():
+    """
+    Statistiques du Verifier: taux d'appels LLM évités par le pré-jugement
+    déterministe et taux de désaccord mesuré par échantillonnage.
+    """
+    from app.services.react_engine.verifier import verifier_service
+
+    return verifier_service.get_stats()
+
+
 @router.get("/models")
 async def get_models():
     """Liste des modèles disponibles avec catégorisation"""
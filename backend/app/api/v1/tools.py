@@ -3,13 +3,19 @@ Tools routes - Liste et gestion des outils
 """
 
 import logging
+import time
+from typing import Callable
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import User, get_db
 from app.core.security import get_current_user, get_current_user_optional
-from app.models import ToolInfo, ToolListResponse
+from app.models import (ToolBatchRequest, ToolBatchResponse, ToolCallResult,
+                        ToolInfo, ToolListResponse)
+from app.services.react_engine.tool_batch import (BatchCall, BatchError,
+                                                  run_batch, validate_batch)
 from app.services.react_engine.tools import BUILTIN_TOOLS
 
 router = APIRouter(prefix="/tools")
@@ -69,19 +75,30 @@ async def get_tool(tool_id: str, current_user: dict = Depends(get_current_user_o
     )
 
 
-@router.post("/{tool_id}/execute")
-async def execute_tool(
-    tool_id: str,
-    params: dict = {},
-    current_user: dict = Depends(get_current_user),  # SECURITY: Authentication REQUIRED
-    db: Session = Depends(get_db),  # SECURITY: For DB admin check
-):
+def _db_admin(current_user: dict, db: Session) -> bool:
+    """Statut admin en base (SECURITY SCEN-10: pas seulement le JWT)"""
+    user = db.query(User).filter(User.id == current_user["sub"]).first()
+
+    # Detect JWT/DB mismatch (privilege escalation attempt)
+    jwt_admin = current_user.get("is_admin", False)
+    db_admin = user.is_admin if user else False
+
+    if jwt_admin != db_admin:
+        logger.critical(
+            f"⚠️ PRIVILEGE ESCALATION ATTEMPT: User {current_user['sub']} "
+            f"JWT says admin={jwt_admin} but DB says admin={db_admin}"
+        )
+    return db_admin
+
+
+async def _run_tool(
+    tool_id: str, params: dict, current_user: dict, is_db_admin: Callable[[], bool]
+) -> dict:
     """
-    Exécute un outil manuellement (avec gestion d'erreur robuste).
+    Vérifie les permissions puis exécute l'outil (erreurs rendues dans la réponse).
 
     SECURITY:
-    - Authentication requise (get_current_user)
-    - Outils sensibles nécessitent admin
+    - Outils sensibles nécessitent admin (``is_db_admin``, vérifié en base)
     - Role downgrade automatique pour execute_command si non-admin
     """
 
@@ -102,36 +119,22 @@ async def execute_tool(
             }
 
         # SECURITY: Vérifier les permissions pour les outils sensibles
-        if tool_id in ADMIN_REQUIRED_TOOLS:
-            # SECURITY SCEN-10: Double-check admin status in database (not just JWT)
-            user = db.query(User).filter(User.id == current_user["sub"]).first()
-
-            # Detect JWT/DB mismatch (privilege escalation attempt)
-            jwt_admin = current_user.get("is_admin", False)
-            db_admin = user.is_admin if user else False
-
-            if jwt_admin != db_admin:
-                logger.critical(
-                    f"⚠️ PRIVILEGE ESCALATION ATTEMPT: User {current_user['sub']} "
-                    f"JWT says admin={jwt_admin} but DB says admin={db_admin}"
-                )
-
-            if not db_admin:
-                logger.warning(
-                    f"🔒 Non-admin user {current_user.get('username')} "
-                    f"attempted to execute admin tool: {tool_id}"
-                )
-                return {
-                    "success": False,
-                    "tool": tool_id,
-                    "params": params,
-                    "result": None,
-                    "error": {
-                        "code": "E_FORBIDDEN",
-                        "message": f"Tool '{tool_id}' requires admin privileges",
-                        "recoverable": False,
-                    },
-                }
+        if tool_id in ADMIN_REQUIRED_TOOLS and not is_db_admin():
+            logger.warning(
+                f"🔒 Non-admin user {current_user.get('username')} "
+                f"attempted to execute admin tool: {tool_id}"
+            )
+            return {
+                "success": False,
+                "tool": tool_id,
+                "params": params,
+                "result": None,
+                "error": {
+                    "code": "E_FORBIDDEN",
+                    "message": f"Tool '{tool_id}' requires admin privileges",
+                    "recoverable": False,
+                },
+            }
 
         # SECURITY: Forcer role="operator" pour execute_command si pas admin
         if tool_id == "execute_command" and not current_user.get("is_admin", False):
@@ -143,23 +146,23 @@ async def execute_tool(
                 params["role"] = "operator"
 
         # Exécuter l'outil
-        result = await BUILTIN_TOOLS.execute(tool_id, **params)
+        result = await BUILTIN_TOOLS.execute(tool_id, user_id=current_user.get("sub"), **params)
 
-        # Vérifier si le résultat indique une erreur
-        if hasattr(result, "success") and not result.success:
+        # ToolResult (dict): échec signalé par success=False + error
+        if not result.get("success"):
             return {
                 "success": False,
                 "tool": tool_id,
                 "params": params,
-                "result": result.dict() if hasattr(result, "dict") else result,
-                "error": result.error if hasattr(result, "error") else None,
+                "result": result,
+                "error": result.get("error"),
             }
 
         return {
             "success": True,
             "tool": tool_id,
             "params": params,
-            "result": result.dict() if hasattr(result, "dict") else result,
+            "result": result,
             "error": None,
         }
 
@@ -172,3 +175,77 @@ async def execute_tool(
             "result": None,
             "error": {"code": "E_TOOL_EXECUTION", "message": str(e), "recoverable": False},
         }
+
+
+@router.post("/batch", response_model=ToolBatchResponse)
+async def execute_batch(
+    batch: ToolBatchRequest,
+    current_user: dict = Depends(get_current_user),  # SECURITY: Authentication REQUIRED
+    db: Session = Depends(get_db),  # SECURITY: For DB admin check
+):
+    """
+    Exécute un lot d'appels d'outils en une requête.
+
+    Authentification et statut admin vérifiés une fois pour le lot; chaque
+    appel passe ensuite par les mêmes contrôles que ``/{tool_id}/execute``.
+    Les appels indépendants s'exécutent en parallèle, ``depends_on`` impose
+    l'ordre (appel non exécuté si une dépendance échoue).
+    """
+    if len(batch.calls) > settings.TOOL_BATCH_MAX_CALLS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Lot trop grand: {len(batch.calls)} appels > {settings.TOOL_BATCH_MAX_CALLS}",
+        )
+
+    calls = [
+        BatchCall(
+            id=call.id or str(index),
+            tool=call.tool,
+            params=dict(call.params),
+            depends_on=list(call.depends_on),
+        )
+        for index, call in enumerate(batch.calls)
+    ]
+    try:
+        validate_batch(calls)
+    except BatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Statut admin lu en base une seule fois, et seulement si un outil l'exige
+    needs_admin = any(call.tool in ADMIN_REQUIRED_TOOLS for call in calls)
+    db_admin = _db_admin(current_user, db) if needs_admin else False
+
+    max_concurrency = min(
+        batch.max_concurrency or settings.TOOL_BATCH_MAX_CONCURRENCY,
+        settings.TOOL_BATCH_MAX_CONCURRENCY,
+    )
+    start = time.perf_counter()
+    results = await run_batch(
+        calls,
+        lambda call: _run_tool(call.tool, call.params, current_user, lambda: db_admin),
+        max_concurrency,
+    )
+
+    return ToolBatchResponse(
+        success=all(r["success"] for r in results),
+        results=[ToolCallResult(**r) for r in results],
+        duration_ms=int((time.perf_counter() - start) * 1000),
+    )
+
+
+@router.post("/{tool_id}/execute")
+async def execute_tool(
+    tool_id: str,
+    params: dict = {},
+    current_user: dict = Depends(get_current_user),  # SECURITY: Authentication REQUIRED
+    db: Session = Depends(get_db),  # SECURITY: For DB admin check
+):
+    """
+    Exécute un outil manuellement (avec gestion d'erreur robuste).
+
+    SECURITY:
+    - Authentication requise (get_current_user)
+    - Outils sensibles nécessitent admin
+    - Role downgrade automatique pour execute_command si non-admin
+    """
+    return await _run_tool(tool_id, params, current_user, lambda: _db_admin(current_user, db))
@@ -0,0 +1,132 @@
+"""
+Cancellation - Jeton d'annulation + deadline absolue par run
+
+Le jeton est créé par la couche API (un par run) et passé explicitement à
+WorkflowEngine → ReactEngine → OllamaClient / ToolRegistry.execute.
+
+Sources d'annulation:
+- message client {action: "cancel"}
+- déconnexion WebSocket (après délai de grâce)
+- deadline absolue dépassée
+- arrêt de l'application
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def _loop_running() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class RunCancelled(Exception):
+    """Levée quand un run est annulé ou que sa deadline est dépassée."""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Run annulé ({reason})")
+
+    @property
+    def code(self) -> str:
+        """Code d'erreur terminal WebSocket"""
+        return "RUN_DEADLINE_EXCEEDED" if self.reason == "deadline" else "RUN_CANCELLED"
+
+
+class CancellationToken:
+    """
+    Jeton d'annulation coopératif avec deadline absolue.
+
+    - ``check()`` aux frontières (itération ReAct, chunk LLM, appel outil)
+    - ``scope()`` autour des awaits longs: annule la tâche courante dès que le
+      jeton est déclenché (ou la deadline atteinte) et lève RunCancelled
+    """
+
+    def __init__(self, deadline_s: Optional[float] = None):
+        self.deadline: Optional[float] = (
+            time.monotonic() + deadline_s if deadline_s and deadline_s > 0 else None
+        )
+        self.reason: Optional[str] = None
+        self._scoped_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self.reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            # Deadline constatée avant le rappel de scope(): annuler aussi les tâches en cours
+            self.cancel("deadline")
+        return self.reason is not None
+
+    def remaining(self) -> Optional[float]:
+        """Secondes restantes avant la deadline (None si pas de deadline)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout(self, default: float) -> float:
+        """Borne un timeout par le temps restant avant la deadline"""
+        remaining = self.remaining()
+        return default if remaining is None else min(default, remaining)
+
+    def cancel(self, reason: str = "client") -> bool:
+        """Déclenche l'annulation. Retourne False si déjà annulé."""
+        if self.reason is not None:
+            return False
+        self.reason = reason
+        logger.info(f"[Cancellation] Token cancelled ({reason})")
+        current = asyncio.current_task() if _loop_running() else None
+        for task in list(self._scoped_tasks):
+            # La tâche appelante verra l'annulation au prochain check()
+            if task is not current:
+                task.cancel()
+        return True
+
+    def check(self) -> None:
+        """Lève RunCancelled si le jeton est déclenché"""
+        if self.cancelled:
+            raise RunCancelled(self.reason)
+
+    @asynccontextmanager
+    async def scope(self) -> AsyncIterator[None]:
+        """
+        Rend interruptibles les awaits du bloc.
+
+        Réentrant: un scope imbriqué dans la même tâche ne fait que vérifier.
+        """
+        self.check()
+        task = asyncio.current_task()
+        if task is None or task in self._scoped_tasks:
+            yield
+            return
+
+        deadline_handle = None
+        remaining = self.remaining()
+        if remaining is not None:
+            deadline_handle = asyncio.get_running_loop().call_later(
+                remaining, self.cancel, "deadline"
+            )
+
+        self._scoped_tasks.add(task)
+        try:
+            yield
+        except asyncio.CancelledError:
+            if self.reason is None:
+                raise  # Annulation externe (shutdown, etc.)
+            task.uncancel()
+            raise RunCancelled(self.reason) from None
+        finally:
+            self._scoped_tasks.discard(task)
+            if deadline_handle is not None:
+                deadline_handle.cancel()
+
+
+def cancel_scope(token: Optional[CancellationToken]):
+    """``token.scope()``, ou un contexte neutre si aucun jeton n'est fourni"""
+    return token.scope() if token is not None else nullcontext()
@@ -5,7 +5,7 @@ AUDIT: Corrections sécurité appliquées le 2026-01-09
 
 import os
 import secrets
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import ConfigDict, Field, field_validator
 from pydantic_settings import BaseSettings
@@ -118,9 +118,15 @@ class Settings(BaseSettings):
     # ReAct Engine
     MAX_ITERATIONS: int = 10
 
+    # Profils de génération par phase (app/services/ollama/profiles.py)
+    # Surcharges JSON, ex: {"spec": {"num_predict": 512}, "execute": {"num_ctx": 16384}}
+    LLM_PROFILE_OVERRIDES: Dict[str, Dict[str, Any]] = {}
+
     # Workflow Settings
     VERIFY_REQUIRED: bool = False
     MAX_REPAIR_CYCLES: int = 3
+    VERIFIER_PREJUDGE_ENABLED: bool = True  # Verdict déterministe si preuves non ambiguës
+    VERIFIER_PREJUDGE_SAMPLE_RATE: float = 0.05  # Fraction re-jugée par LLM (mesure désaccord)
 
     # WebSocket Event System (v8)
     # WS_MODE: "v7" (legacy), "v8" (strict), "compat" (default, emit v8 with optional validation)
@@ -128,6 +134,41 @@ class Settings(BaseSettings):
     WS_STRICT_VALIDATION: bool = True  # Validate events against Pydantic schemas
     WS_TERMINAL_ENFORCEMENT: bool = True  # Enforce exactly one terminal event per run
 
+    # Run Manager - runs exécutés en tâches de fond, découplés de la boucle WebSocket
+    RUN_MAX_CONCURRENT: int = 4  # Runs exécutés simultanément (tous utilisateurs)
+    RUN_MAX_PER_USER: int = 2  # Runs actifs ou en attente par utilisateur
+    RUN_QUEUE_MAX_SIZE: int = 16  # Runs en attente d'un slot avant refus
+    RUN_DEADLINE_SECONDS: int = 900  # Deadline absolue d'un run (0 = aucune)
+    RUN_DISCONNECT_GRACE_SECONDS: int = 30  # Délai avant annulation d'un run sans socket
+
+    # Outils synchrones bloquants (fichiers, psutil, mémoire) hors de la boucle asyncio
+    TOOL_EXECUTOR_WORKERS: int = 8  # Threads du pool des outils bloquants
+    # Limites appliquées par le registre à chaque outil (0 = pas de limite), surchargées
+    # par outil à l'enregistrement (ToolLimits)
+    TOOL_TIMEOUT_SECONDS: float = 120.0  # Deadline d'une exécution d'outil
+    TOOL_MAX_RESULT_BYTES: int = 1048576  # Taille max du résultat (JSON), au-delà erreur
+    TOOL_MAX_CONCURRENT: int = 0  # Exécutions simultanées d'un même outil
+    TOOL_MAX_CONCURRENT_PER_USER: int = 0  # Idem, par utilisateur
+    TOOL_QUEUE_TIMEOUT_SECONDS: float = 10.0  # Attente max d'une place avant E_TOOL_BUSY
+    TOOL_BATCH_MAX_CALLS: int = 50  # Appels max par requête POST /tools/batch
+    TOOL_BATCH_MAX_CONCURRENCY: int = 8  # Appels d'un lot exécutés simultanément
+    LOOP_LAG_MONITOR_ENABLED: bool = True  # Mesure du blocage de la boucle
+    LOOP_LAG_INTERVAL_MS: int = 100  # Période d'échantillonnage
+    LOOP_LAG_WARN_MS: int = 250  # Log warning au-delà
+
+    # Échantillonneur système (get_system_info, get_system_metrics, gauges system_*)
+    SYSTEM_SAMPLER_ENABLED: bool = True
+    SYSTEM_SAMPLER_INTERVAL_SECONDS: float = 5.0  # Période des relevés psutil
+    SYSTEM_SAMPLER_WINDOW: int = 120  # Relevés conservés (10 min à 5s)
+    SYSTEM_SAMPLER_TOP_PROCESSES: int = 5  # Processus les plus gourmands par relevé (0 = aucun)
+
+    # Audit des commandes (SecureExecutor): entrées récentes en mémoire, écriture par lots
+    AUDIT_LOG_BUFFER_SIZE: int = 1000  # Entrées récentes gardées en mémoire (get_audit_log)
+    AUDIT_PERSIST_ENABLED: bool = True  # Écriture des entrées dans audit_logs
+    AUDIT_BATCH_SIZE: int = 100  # Entrées par lot (écriture dès qu'un lot est plein)
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 5.0  # Écriture au plus tard après ce délai
+    AUDIT_MAX_PENDING: int = 10000  # File d'écriture bornée (les plus anciennes abandonnées)
+
     # Agent Isolation (CRQ-P0-1)
     ENFORCE_AGENT_ISOLATION: bool = False  # Default OFF for backward compat
 
@@ -167,6 +208,62 @@ class Settings(BaseSettings):
     # Workspace Safety
     WORKSPACE_DIR: str = "/home/lalpha/projets"
     WORKSPACE_ALLOW_WRITE: bool = True
+    READ_FILE_MAX_BYTES: int = 262144  # Plafond d'octets renvoyés par appel read_file
+    READ_FILE_LINE_COUNT_MAX_BYTES: int = 67108864  # Au-delà, total_lines est estimé
+
+    # Index des chemins (search_files, search_directory) tenu à jour par watchfiles
+    PATH_INDEX_ENABLED: bool = True
+    PATH_INDEX_ROOTS: List[str] = []  # Vide = WORKSPACE_DIR
+    PATH_INDEX_MAX_ENTRIES: int = 500000  # Au-delà, retour au parcours disque
+    PATH_INDEX_DEBOUNCE_MS: int = 200  # Regroupement des événements fichiers
+    PATH_INDEX_EXCLUDE_DIRS: List[str] = [
+        ".git",
+        "__pycache__",
+        "node_modules",
+        ".venv",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".tox",
+    ]
+    PATH_MATCH_MAX_RESULTS: int = 5  # Chemins proches proposés par AUTO_RECOVERY
+    PATH_MATCH_SCAN_TTL_SECONDS: int = 60  # Index construit à la demande (racine non surveillée)
+
+    # État git mis en cache (git_status, git_diff, git_log)
+    GIT_STATE_TTL_SECONDS: float = 2.0  # Validité du cache si le dépôt n'est pas surveillé
+    GIT_DIFF_PAGE_SIZE: int = 20  # Fichiers par page de git_diff par défaut
+    GIT_DIFF_MAX_PAGE_SIZE: int = 200
+    GIT_DIFF_MAX_BYTES: int = 65536  # Octets de patch max par page
+    GIT_DIFF_MAX_FILE_BYTES: int = 16384  # Octets de patch max par fichier
+    GIT_LOG_PAGE_SIZE: int = 20  # Commits par page de git_log par défaut
+    GIT_LOG_MAX_PAGE_SIZE: int = 200
+
+    # Listage de répertoires (list_directory)
+    LIST_DIRECTORY_PAGE_SIZE: int = 200  # Entrées par page par défaut
+    LIST_DIRECTORY_MAX_PAGE_SIZE: int = 1000
+    LIST_DIRECTORY_TREE_MAX_DEPTH: int = 5
+    LIST_DIRECTORY_TREE_PER_DIR: int = 50  # Entrées max par répertoire en mode arbre
+    LIST_DIRECTORY_TREE_MAX_ENTRIES: int = 2000  # Entrées max au total en mode arbre
+
+    # Recherche dans le contenu (search_content)
+    SEARCH_CONTENT_WORKERS: int = 8  # Threads de lecture/recherche
+    SEARCH_CONTENT_MAX_MATCHES: int = 50  # Lignes renvoyées max par appel
+    SEARCH_CONTENT_MAX_FILES: int = 20000  # Fichiers examinés max par appel
+    SEARCH_CONTENT_MAX_FILE_BYTES: int = 2097152  # Fichiers plus gros ignorés
+
+    # Client HTTP partagé des outils web (http_request, web_search, web_read)
+    WEB_POOL_MAX_CONNECTIONS: int = 50  # Connexions simultanées max (tous hôtes)
+    WEB_POOL_MAX_KEEPALIVE: int = 20  # Connexions gardées ouvertes
+    WEB_PER_HOST_LIMIT: int = 4  # Requêtes simultanées max par hôte
+    WEB_CACHE_MAX_ENTRIES: int = 256  # Réponses GET en cache
+    WEB_CACHE_MAX_BYTES: int = 33554432  # 32MB
+    WEB_CACHE_DEFAULT_TTL_SECONDS: int = 300  # web_search/web_read sans Cache-Control
+    WEB_READ_MAX_BYTES: int = 100000  # Plafond de téléchargement de web_read
+    WEB_READ_MAX_CHARS: int = 50000  # Texte renvoyé max par web_read (extraction arrêtée)
+    WEB_DNS_CACHE_TTL_SECONDS: int = 60  # Résolutions validées (anti-SSRF) en cache
+    WEB_DNS_NEGATIVE_TTL_SECONDS: int = 10  # Échecs de résolution en cache
+    WEB_DNS_CACHE_MAX_ENTRIES: int = 1024
+    WEB_DNS_TIMEOUT_SECONDS: float = 5.0
+    WEB_USER_AGENT: str = "Mozilla/5.0 (compatible; AIOrchestrator/8.0; +https://ai.4lb.ca)"
 
     # EXECUTION SECURITY - CORRIGÉ: Mode sandbox par défaut
     EXECUTE_MODE: str = "direct"
@@ -188,11 +285,38 @@ class Settings(BaseSettings):
     TIMEOUT_GIT: int = 10  # Git status (opération rapide)
     TIMEOUT_GIT_DIFF: int = 30  # Git diff (peut être long sur gros repos)
     TIMEOUT_TESTS: int = 300  # Exécution tests (5 min)
+    RUN_TESTS_MAX_SHARDS: int = 4  # Sous-processus pytest parallèles max (run_tests shards)
+    TEST_IMPACT_CACHE_FILE: str = ""  # Cache du graphe d'imports ("" = .pytest_cache du workspace)
     TIMEOUT_LINT: int = 60  # Linting (ruff, black, mypy)
     TIMEOUT_TYPECHECK: int = 60  # Type checking (mypy)
     TIMEOUT_BUILD: int = 180  # Builds frontend (3 min)
     TIMEOUT_DOCKER: int = 300  # Docker compose up/down (5 min, pull images)
 
+    # Sortie des commandes lue au fil de l'eau (SecureExecutor)
+    COMMAND_OUTPUT_HEAD_BYTES: int = 32768  # Début conservé par flux (stdout, stderr)
+    COMMAND_OUTPUT_TAIL_BYTES: int = 131072  # Fin conservée par flux (résumés, erreurs)
+    TOOL_OUTPUT_STREAMING: bool = True  # Événements WebSocket tool_output pendant l'exécution
+    TOOL_OUTPUT_INTERVAL_MS: int = 250  # Au plus un événement par flux par intervalle
+    TOOL_OUTPUT_EVENT_MAX_CHARS: int = 8192  # Au-delà, le plus ancien est abandonné
+
+    # Arrêt et limites des commandes (groupe de processus propre à chaque commande)
+    COMMAND_KILL_GRACE_SECONDS: float = 2.0  # Délai entre SIGTERM et SIGKILL au groupe
+    COMMAND_RLIMIT_CPU_SECONDS: int = 0  # Temps CPU max par processus (0 = pas de limite)
+    COMMAND_RLIMIT_AS_BYTES: int = 0  # Mémoire virtuelle max par processus (0 = pas de limite)
+    COMMAND_RLIMIT_FSIZE_BYTES: int = 0  # Taille max d'un fichier écrit (0 = pas de limite)
+    COMMAND_RLIMIT_NOFILE: int = 0  # Descripteurs ouverts max par processus (0 = pas de limite)
+
+    # Places d'exécution des commandes: file équitable entre utilisateurs (0 = pas de limite)
+    COMMAND_POOL_MAX_CONCURRENT: int = 8  # Commandes simultanées, tous rôles
+    COMMAND_POOL_ROLE_LIMITS: Dict[str, int] = {"operator": 4, "admin": 2}  # Par rôle
+    COMMAND_POOL_QUEUE_TIMEOUT_SECONDS: float = 30.0  # Attente max d'une place avant E_TOOL_BUSY
+    # Priorité et CPUs des commandes par rôle, ex: {"operator": 10}, {"operator": [2, 3]}
+    COMMAND_NICE: Dict[str, int] = {}
+    COMMAND_CPU_AFFINITY: Dict[str, List[int]] = {}
+    # Commandes en lecture seule (df, uptime, docker ps...): résultat partagé
+    COMMAND_CACHE_TTL_SECONDS: float = 5.0  # Durée de réutilisation (0 = coalescence seule)
+    COMMAND_CACHE_MAX_ENTRIES: int = 256  # Résultats gardés par exécuteur
+
     # Database Timeouts
     TIMEOUT_DB_QUERY: int = 10  # Requete DB individuelle
 
@@ -0,0 +1,65 @@
+"""
+Loop Monitor - Mesure du blocage de la boucle asyncio
+
+Une tâche dort ``interval`` secondes en boucle; l'écart entre le réveil
+attendu et le réveil réel est le temps pendant lequel la boucle était
+occupée (code synchrone, outil bloquant exécuté sur la boucle...).
+Exposé dans ai_orchestrator_event_loop_lag_seconds.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_LAG_MAX
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Échantillonne le retard de la boucle asyncio courante"""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or settings.LOOP_LAG_INTERVAL_MS / 1000
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def reset(self) -> None:
+        self.max_lag = 0.0
+        self.samples = 0
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.samples += 1
+            EVENT_LOOP_LAG.observe(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+                EVENT_LOOP_LAG_MAX.set(lag)
+            if lag > settings.LOOP_LAG_WARN_MS / 1000:
+                logger.warning(f"[LoopMonitor] Event loop blocked for {lag * 1000:.0f}ms")
+
+
+# Singleton instance
+loop_monitor = LoopLagMonitor()
@@ -3,6 +3,8 @@ Métriques Prometheus pour l'AI Orchestrator
 Expose les statistiques d'apprentissage et de performance
 """
 
+from typing import Optional
+
 from fastapi import APIRouter
 from fastapi.responses import Response
 from prometheus_client import (CONTENT_TYPE_LATEST, Counter, Gauge, Histogram,
@@ -90,6 +92,20 @@ LLM_TOKENS = Counter(
     "llm_tokens_total", "Tokens LLM utilisés", ["model", "type"]  # type: prompt ou completion
 )
 
+# Tokens LLM par phase (profil de génération)
+LLM_PHASE_TOKENS = Counter(
+    "llm_phase_tokens_total",
+    "Tokens LLM par phase du workflow",
+    ["phase", "type"],  # phase: default, spec, plan, execute, repair, judge / type: prompt, completion
+)
+
+# Générations interrompues par un plafond ou une séquence d'arrêt
+LLM_PHASE_STOPS = Counter(
+    "llm_phase_stops_total",
+    "Fin de génération LLM par phase et par raison",
+    ["phase", "reason"],  # reason: stop (naturel/séquence), length (num_predict), stop_block (client)
+)
+
 # Durée des phases workflow (PHASE 6)
 WORKFLOW_PHASE_DURATION = Histogram(
     "workflow_phase_duration_seconds",
@@ -98,6 +114,204 @@ WORKFLOW_PHASE_DURATION = Histogram(
     buckets=[0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0],
 )
 
+# Temps jusqu'au verdict final (repair inclus)
+WORKFLOW_TIME_TO_VERDICT = Histogram(
+    "workflow_time_to_verdict_seconds",
+    "Durée entre le début du workflow et le verdict final",
+    ["verdict", "repaired"],  # verdict: PASS, FAIL / repaired: true, false
+    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+)
+
+# Appels d'outils lecture seule servis par le memo (EXECUTE → REPAIR)
+TOOL_MEMO_HITS = Counter(
+    "ai_orchestrator_tool_memo_hits_total",
+    "Appels d'outils servis par le memo du run",
+    ["tool"],
+)
+
+# Outils synchrones non bloquants exécutés sur la boucle (temps de blocage)
+TOOL_INLINE_DURATION = Histogram(
+    "ai_orchestrator_tool_inline_seconds",
+    "Durée des outils exécutés directement sur la boucle asyncio",
+    ["tool"],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+# Outils bloquants en attente ou en cours dans le pool de threads
+TOOL_EXECUTOR_INFLIGHT = Gauge(
+    "ai_orchestrator_tool_executor_inflight", "Outils bloquants soumis au pool de threads"
+)
+
+# Limites d'outils atteintes (registre)
+TOOL_LIMIT_HITS = Counter(
+    "ai_orchestrator_tool_limit_hits_total",
+    "Exécutions d'outils refusées ou interrompues par une limite du registre",
+    ["tool", "limit"],  # limit: timeout, result_size, concurrency, user_concurrency
+)
+
+# Décisions du Verifier par source
+VERIFIER_DECISIONS = Counter(
+    "ai_orchestrator_verifier_decisions_total",
+    "Verdicts du Verifier par source",
+    ["source", "status"],  # source: prejudge, llm, fallback
+)
+
+# Échantillons LLM sur verdicts pré-jugés (mesure de désaccord)
+VERIFIER_PREJUDGE_SAMPLES = Counter(
+    "ai_orchestrator_verifier_prejudge_samples_total",
+    "Verdicts pré-jugés re-jugés par le LLM",
+    ["outcome"],  # agree, disagree
+)
+
+# ==================== MÉTRIQUES PATH INDEX ====================
+
+# Entrées indexées par racine (search_files, search_directory)
+PATH_INDEX_ENTRIES = Gauge(
+    "ai_orchestrator_path_index_entries", "Chemins dans l'index du workspace", ["root"]
+)
+
+# Durée de la dernière construction complète
+PATH_INDEX_BUILD_SECONDS = Gauge(
+    "ai_orchestrator_path_index_build_seconds",
+    "Durée de construction de l'index des chemins",
+    ["root"],
+)
+
+# Recherche de chemins proches d'un chemin introuvable (AUTO_RECOVERY)
+PATH_MATCH_SECONDS = Histogram(
+    "ai_orchestrator_path_match_seconds",
+    "Durée d'une recherche de chemins proches (index trigrammes)",
+    ["source"],  # index, scan
+    buckets=[0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01, 0.1, 1.0],
+)
+
+# ==================== MÉTRIQUES EVENT LOOP ====================
+
+# Retard de la boucle asyncio (réveil d'un sleep périodique)
+EVENT_LOOP_LAG = Histogram(
+    "ai_orchestrator_event_loop_lag_seconds",
+    "Retard de la boucle asyncio (blocage)",
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+# Pire retard depuis le démarrage
+EVENT_LOOP_LAG_MAX = Gauge(
+    "ai_orchestrator_event_loop_lag_max_seconds", "Pire retard de la boucle asyncio observé"
+)
+
+# ==================== MÉTRIQUES WEB ====================
+
+# Requêtes des outils web par résultat de cache
+WEB_FETCHES = Counter(
+    "ai_orchestrator_web_fetches_total",
+    "Requêtes HTTP des outils web",
+    ["cache"],  # miss, hit, revalidated, bypass
+)
+
+# Octets renvoyés aux outils (téléchargés ou servis par le cache)
+WEB_FETCH_BYTES = Counter(
+    "ai_orchestrator_web_fetch_bytes_total", "Octets de réponse HTTP des outils web", ["cache"]
+)
+
+# Téléchargements interrompus au plafond d'octets
+WEB_FETCH_TRUNCATED = Counter(
+    "ai_orchestrator_web_fetch_truncated_total", "Téléchargements coupés au plafond d'octets"
+)
+
+# Résolutions DNS des URLs sortantes (url_guard)
+WEB_DNS_LOOKUPS = Counter(
+    "ai_orchestrator_web_dns_lookups_total",
+    "Résolutions DNS des outils web",
+    ["result"],  # hit, miss, error
+)
+
+# ==================== MÉTRIQUES GIT ====================
+
+# Lectures de l'état git servies par le cache (git_state)
+GIT_STATE_LOOKUPS = Counter(
+    "ai_orchestrator_git_state_lookups_total",
+    "Lectures de l'état git par résultat de cache",
+    ["kind", "result"],  # kind: status, diffstat, log — result: hit, miss
+)
+
+# ==================== MÉTRIQUES COMMANDES ====================
+
+# Octets de sortie non conservés (milieu des sorties plus longues que début + fin)
+COMMAND_OUTPUT_OMITTED_BYTES = Counter(
+    "ai_orchestrator_command_output_omitted_bytes_total",
+    "Octets de sortie de commande non conservés (début et fin gardés)",
+)
+
+# Groupes de processus de commandes arrêtés (timeout, annulation)
+COMMAND_KILLS = Counter(
+    "ai_orchestrator_command_kills_total",
+    "Groupes de processus de commandes arrêtés par signal",
+    ["reason", "signal"],
+)
+
+# Attente d'une place d'exécution de commande (CommandPool)
+COMMAND_QUEUE_WAIT_SECONDS = Histogram(
+    "ai_orchestrator_command_queue_wait_seconds",
+    "Attente d'une place d'exécution de commande",
+    ["role"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+)
+
+# Commandes refusées faute de place dans le délai d'attente
+COMMAND_POOL_REJECTED = Counter(
+    "ai_orchestrator_command_pool_rejected_total",
+    "Commandes refusées faute de place d'exécution",
+    ["role"],
+)
+
+# Commandes en lecture seule servies sans exécution (CommandCache)
+COMMAND_CACHE_REQUESTS = Counter(
+    "ai_orchestrator_command_cache_requests_total",
+    "Commandes en lecture seule par source du résultat",
+    ["result"],  # hit (cache), coalesced (appel simultané partagé), miss (exécutée)
+)
+
+# Entrées d'audit des commandes écrites par lots (AuditWriter)
+AUDIT_ENTRIES_WRITTEN = Counter(
+    "ai_orchestrator_audit_entries_written_total", "Entrées d'audit écrites en base par lots"
+)
+
+# Entrées d'audit abandonnées avant écriture
+AUDIT_ENTRIES_DROPPED = Counter(
+    "ai_orchestrator_audit_entries_dropped_total",
+    "Entrées d'audit abandonnées avant écriture",
+    ["reason"],  # overflow (file pleine), error (écriture en échec)
+)
+
+# Durée d'écriture d'un lot d'entrées d'audit
+AUDIT_FLUSH_SECONDS = Histogram(
+    "ai_orchestrator_audit_flush_seconds",
+    "Durée d'écriture d'un lot d'entrées d'audit",
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5],
+)
+
+# ==================== MÉTRIQUES RUNS ====================
+
+# Runs en cours d'exécution (RunManager)
+RUNS_ACTIVE = Gauge("ai_orchestrator_runs_active", "Runs workflow en cours d'exécution")
+
+# Runs en attente d'un slot global
+RUNS_QUEUED = Gauge("ai_orchestrator_runs_queued", "Runs workflow en attente d'admission")
+
+# Runs refusés à l'admission
+RUNS_REJECTED = Counter(
+    "ai_orchestrator_runs_rejected_total",
+    "Runs workflow refusés à l'admission",
+    ["reason"],  # user_limit, queue_full
+)
+
+# Runs annulés (CancellationToken)
+RUNS_CANCELLED = Counter(
+    "ai_orchestrator_runs_cancelled_total",
+    "Runs workflow annulés",
+    ["reason"],  # client, disconnect, deadline, shutdown
+)
+
 # ==================== MÉTRIQUES APPRENTISSAGE ====================
 
 # Expériences stockées
@@ -148,6 +362,26 @@ OLLAMA_CONNECTED = Gauge(
 # Info système
 SYSTEM_INFO = Info("ai_orchestrator", "Informations sur l'AI Orchestrator")
 
+# Ressources de l'hôte (relevés de l'échantillonneur système)
+SYSTEM_CPU_PERCENT = Gauge(
+    "ai_orchestrator_system_cpu_percent", "Host CPU usage over the last sampling interval"
+)
+SYSTEM_MEMORY_PERCENT = Gauge("ai_orchestrator_system_memory_percent", "Host memory usage")
+SYSTEM_DISK_PERCENT = Gauge("ai_orchestrator_system_disk_percent", "Root filesystem usage")
+SYSTEM_LOAD_AVERAGE = Gauge(
+    "ai_orchestrator_system_load_average", "Host load average", ["period"]  # 1m, 5m, 15m
+)
+SYSTEM_DISK_IO_RATE = Gauge(
+    "ai_orchestrator_system_disk_io_bytes_per_second",
+    "Host disk throughput over the last sampling interval",
+    ["direction"],  # read, write
+)
+SYSTEM_NETWORK_RATE = Gauge(
+    "ai_orchestrator_system_network_bytes_per_second",
+    "Host network throughput over the last sampling interval",
+    ["direction"],  # sent, recv
+)
+
 
 # ==================== ENDPOINT METRICS ====================
 
@@ -223,6 +457,30 @@ def record_tool_execution(tool_name: str, duration_s: float, success: bool, erro
         TOOL_ERRORS.labels(tool_name=tool_name, error_code=error_code).inc()
 
 
+class ToolMetrics:
+    """
+    Séries d'un outil résolues à l'enregistrement (``labels()`` coûte
+    quelques µs par appel). Mêmes séries que record_tool_execution et
+    record_tool_inline.
+    """
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self._latency = {
+            success: TOOL_LATENCY.labels(tool_name=tool_name, success=str(success).lower())
+            for success in (True, False)
+        }
+        self._inline = TOOL_INLINE_DURATION.labels(tool=tool_name)
+
+    def record(self, duration_s: float, success: bool, error_code: str = None):
+        self._latency[success].observe(duration_s)
+        if not success and error_code:
+            TOOL_ERRORS.labels(tool_name=self.tool_name, error_code=error_code).inc()
+
+    def record_inline(self, duration_s: float):
+        self._inline.observe(duration_s)
+
+
 def record_llm_call(model: str, success: bool, prompt_tokens: int = 0, completion_tokens: int = 0):
     """
     Enregistre un appel LLM avec tokens utilisés.
@@ -242,6 +500,29 @@ def record_llm_call(model: str, success: bool, prompt_tokens: int = 0, completio
         LLM_TOKENS.labels(model=model, type="completion").inc(completion_tokens)
 
 
+def record_llm_phase(
+    phase: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    reason: Optional[str] = None,
+):
+    """
+    Enregistre les tokens d'une génération pour son profil de phase.
+
+    Args:
+        phase: Nom du profil de génération
+        prompt_tokens: Tokens du prompt
+        completion_tokens: Tokens générés
+        reason: Raison de fin (done_reason Ollama, ou stop_block)
+    """
+    if prompt_tokens > 0:
+        LLM_PHASE_TOKENS.labels(phase=phase, type="prompt").inc(prompt_tokens)
+    if completion_tokens > 0:
+        LLM_PHASE_TOKENS.labels(phase=phase, type="completion").inc(completion_tokens)
+    if reason:
+        LLM_PHASE_STOPS.labels(phase=phase, reason=reason).inc()
+
+
 def record_workflow_phase(phase: str, duration_s: float):
     """
     Enregistre la durée d'une phase du workflow.
@@ -251,3 +532,113 @@ def record_workflow_phase(phase: str, duration_s: float):
         duration_s: Durée en secondes
     """
     WORKFLOW_PHASE_DURATION.labels(phase=phase).observe(duration_s)
+
+
+def record_time_to_verdict(verdict: str, repair_cycles: int, duration_s: float):
+    """
+    Enregistre le temps jusqu'au verdict final d'un workflow.
+
+    Args:
+        verdict: PASS ou FAIL
+        repair_cycles: Nombre de cycles REPAIR exécutés
+        duration_s: Durée en secondes
+    """
+    WORKFLOW_TIME_TO_VERDICT.labels(
+        verdict=verdict, repaired="true" if repair_cycles else "false"
+    ).observe(duration_s)
+
+
+def record_tool_inline(tool: str, duration_s: float):
+    """Enregistre la durée d'un outil exécuté directement sur la boucle"""
+    TOOL_INLINE_DURATION.labels(tool=tool).observe(duration_s)
+
+
+def record_tool_limit_hit(tool: str, limit: str):
+    """Enregistre une limite d'outil atteinte (timeout, result_size, concurrency...)"""
+    TOOL_LIMIT_HITS.labels(tool=tool, limit=limit).inc()
+
+
+def record_web_fetch(cache: str, size: int, truncated: bool):
+    """Enregistre une requête HTTP d'outil (cache: miss, hit, revalidated, bypass)"""
+    WEB_FETCHES.labels(cache=cache).inc()
+    WEB_FETCH_BYTES.labels(cache=cache).inc(size)
+    if truncated:
+        WEB_FETCH_TRUNCATED.inc()
+
+
+def record_dns_lookup(result: str):
+    """Enregistre une résolution DNS d'outil web (hit, miss, error)"""
+    WEB_DNS_LOOKUPS.labels(result=result).inc()
+
+
+def record_git_state_lookup(kind: str, hit: bool):
+    """Enregistre une lecture de l'état git (status, diffstat, log), servie ou non par le cache"""
+    GIT_STATE_LOOKUPS.labels(kind=kind, result="hit" if hit else "miss").inc()
+
+
+def record_path_match(source: str, seconds: float):
+    """Enregistre une recherche de chemins proches (index du workspace ou parcours à la demande)"""
+    PATH_MATCH_SECONDS.labels(source=source).observe(seconds)
+
+
+def record_command_output_truncated(omitted_bytes: int):
+    """Enregistre une sortie de commande tronquée (octets omis entre le début et la fin)"""
+    COMMAND_OUTPUT_OMITTED_BYTES.inc(omitted_bytes)
+
+
+def record_command_kill(reason: str, signal: str):
+    """
+    Enregistre l'arrêt du groupe de processus d'une commande.
+
+    Args:
+        reason: timeout ou cancelled
+        signal: dernier signal envoyé (SIGTERM ou SIGKILL)
+    """
+    COMMAND_KILLS.labels(reason=reason, signal=signal).inc()
+
+
+def record_command_queue_wait(role: str, duration_seconds: float):
+    """Enregistre l'attente d'une place d'exécution de commande"""
+    COMMAND_QUEUE_WAIT_SECONDS.labels(role=role).observe(duration_seconds)
+
+
+def record_command_pool_rejected(role: str):
+    """Enregistre une commande refusée faute de place (E_TOOL_BUSY)"""
+    COMMAND_POOL_REJECTED.labels(role=role).inc()
+
+
+def record_command_cache(result: str):
+    """Enregistre la source du résultat d'une commande en lecture seule (hit, coalesced, miss)"""
+    COMMAND_CACHE_REQUESTS.labels(result=result).inc()
+
+
+def record_audit_flush(count: int, duration_seconds: float):
+    """Enregistre l'écriture d'un lot d'entrées d'audit"""
+    AUDIT_ENTRIES_WRITTEN.inc(count)
+    AUDIT_FLUSH_SECONDS.observe(duration_seconds)
+
+
+def record_audit_dropped(reason: str, count: int = 1):
+    """Enregistre des entrées d'audit abandonnées (overflow ou error)"""
+    AUDIT_ENTRIES_DROPPED.labels(reason=reason).inc(count)
+
+
+def record_tool_memo_hit(tool: str):
+    """Enregistre un appel d'outil servi par le memo du run"""
+    TOOL_MEMO_HITS.labels(tool=tool).inc()
+
+
+def record_verifier_decision(source: str, status: str):
+    """
+    Enregistre la source d'un verdict du Verifier.
+
+    Args:
+        source: prejudge (déterministe), llm, fallback (LLM indisponible)
+        status: PASS ou FAIL
+    """
+    VERIFIER_DECISIONS.labels(source=source, status=status).inc()
+
+
+def record_verifier_sample(outcome: str):
+    """Enregistre l'accord/désaccord LLM sur un verdict pré-jugé (agree, disagree)"""
+    VERIFIER_PREJUDGE_SAMPLES.labels(outcome=outcome).inc()
@@ -0,0 +1,241 @@
+"""
+System Sampler - Échantillonnage périodique des ressources système
+
+Une tâche de fond relève toutes les SYSTEM_SAMPLER_INTERVAL_SECONDS (dans
+un thread, psutil lit /proc) le CPU, la mémoire, le disque, les débits
+disque/réseau et les processus les plus gourmands. Les
+SYSTEM_SAMPLER_WINDOW derniers relevés sont gardés en mémoire:
+get_system_info et get_system_metrics les lisent sans appeler psutil.
+
+Les pourcentages CPU et les débits sont des moyennes sur l'intervalle
+entre deux relevés. Les mêmes valeurs alimentent les gauges
+ai_orchestrator_system_*.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import (SYSTEM_CPU_PERCENT, SYSTEM_DISK_IO_RATE,
+                              SYSTEM_DISK_PERCENT, SYSTEM_LOAD_AVERAGE,
+                              SYSTEM_MEMORY_PERCENT, SYSTEM_NETWORK_RATE)
+
+logger = logging.getLogger(__name__)
+
+# Fenêtre de mesure du CPU quand aucun relevé précédent n'existe
+PRIME_SECONDS = 0.2
+
+
+@dataclass
+class SystemSample:
+    timestamp: float  # Epoch (s)
+    cpu_percent: float
+    load_average: Optional[Tuple[float, float, float]]
+    memory_total_gb: float
+    memory_used_percent: float
+    swap_used_percent: float
+    disk_usage_percent: float
+    disk_read_bytes_per_s: Optional[float]
+    disk_write_bytes_per_s: Optional[float]
+    net_sent_bytes_per_s: Optional[float]
+    net_recv_bytes_per_s: Optional[float]
+    # Processus triés par CPU puis mémoire: pid, name, cpu_percent, memory_mb
+    processes: List[Dict] = field(default_factory=list)
+
+    def to_dict(self, processes: bool = True) -> Dict:
+        data = asdict(self)
+        if not processes:
+            data.pop("processes")
+        return data
+
+
+class SystemSampler:
+    """Relevés psutil périodiques dans une fenêtre glissante"""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        window: Optional[int] = None,
+        top_processes: Optional[int] = None,
+    ):
+        self.interval = interval or settings.SYSTEM_SAMPLER_INTERVAL_SECONDS
+        self.top_processes = (
+            settings.SYSTEM_SAMPLER_TOP_PROCESSES if top_processes is None else top_processes
+        )
+        self._samples: deque = deque(maxlen=window or settings.SYSTEM_SAMPLER_WINDOW)
+        self._lock = threading.Lock()
+        # Compteurs du relevé précédent: (monotonic, disk_io, net_io)
+        self._counters: Optional[Tuple[float, object, object]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="system-sampler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    # --- Lecture (sans psutil) ---
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[SystemSample]:
+        """Dernier relevé, None s'il n'y en a pas ou s'il date de plus de ``max_age`` s"""
+        if not self._samples:
+            return None
+        sample = self._samples[-1]
+        if max_age is not None and time.time() - sample.timestamp > max_age:
+            return None
+        return sample
+
+    def history(self, count: Optional[int] = None) -> List[SystemSample]:
+        """Les ``count`` derniers relevés (tous par défaut), du plus ancien au plus récent"""
+        samples = list(self._samples)
+        return samples if count is None else samples[-count:] if count > 0 else []
+
+    # --- Relevé ---
+
+    async def _run(self) -> None:
+        await asyncio.to_thread(self._prime)
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.warning(f"[SystemSampler] Relevé impossible: {e}")
+
+    def _prime(self) -> None:
+        """Point de départ des moyennes CPU et des débits"""
+        import psutil
+
+        psutil.cpu_percent(interval=None)
+        if self.top_processes:
+            for proc in psutil.process_iter():
+                try:
+                    proc.cpu_percent(interval=None)
+                except psutil.Error:
+                    pass
+        self._counters = (time.monotonic(), _disk_io(psutil), _net_io(psutil))
+
+    def sample(self) -> SystemSample:
+        """
+        Relève l'état du système, l'ajoute à la fenêtre et met à jour les gauges.
+
+        Bloquant (lecture de /proc): à appeler hors de la boucle asyncio. Sans
+        relevé précédent, le CPU est mesuré sur PRIME_SECONDS.
+        """
+        import psutil
+
+        with self._lock:
+            if self._counters is None:
+                self._prime()
+                time.sleep(PRIME_SECONDS)
+
+            now = time.monotonic()
+            disk_io, net_io = _disk_io(psutil), _net_io(psutil)
+            previous, prev_disk, prev_net = self._counters
+            elapsed = max(now - previous, 1e-6)
+            self._counters = (now, disk_io, net_io)
+
+            memory = psutil.virtual_memory()
+            try:
+                load = tuple(round(value, 2) for value in os.getloadavg())
+            except (AttributeError, OSError):
+                load = None
+
+            sample = SystemSample(
+                timestamp=time.time(),
+                cpu_percent=psutil.cpu_percent(interval=None),
+                load_average=load,
+                memory_total_gb=round(memory.total / (1024**3), 2),
+                memory_used_percent=memory.percent,
+                swap_used_percent=psutil.swap_memory().percent,
+                disk_usage_percent=psutil.disk_usage("/").percent,
+                disk_read_bytes_per_s=_rate(disk_io, prev_disk, "read_bytes", elapsed),
+                disk_write_bytes_per_s=_rate(disk_io, prev_disk, "write_bytes", elapsed),
+                net_sent_bytes_per_s=_rate(net_io, prev_net, "bytes_sent", elapsed),
+                net_recv_bytes_per_s=_rate(net_io, prev_net, "bytes_recv", elapsed),
+                processes=self._top(psutil) if self.top_processes else [],
+            )
+            self._samples.append(sample)
+
+        _export(sample)
+        return sample
+
+    def _top(self, psutil) -> List[Dict]:
+        """Processus les plus gourmands (CPU depuis le relevé précédent, puis RSS)"""
+        rows = []
+        # process_iter réutilise les mêmes objets Process d'un appel à l'autre:
+        # cpu_percent(None) mesure depuis le relevé précédent
+        for proc in psutil.process_iter(["name", "memory_info"]):
+            try:
+                cpu = proc.cpu_percent(interval=None)
+            except psutil.Error:
+                continue
+            memory = proc.info.get("memory_info")
+            rows.append(
+                {
+                    "pid": proc.pid,
+                    "name": proc.info.get("name") or "?",
+                    "cpu_percent": round(cpu, 1),
+                    "memory_mb": round(memory.rss / (1024 * 1024), 1) if memory else 0.0,
+                }
+            )
+        rows.sort(key=lambda row: (row["cpu_percent"], row["memory_mb"]), reverse=True)
+        return rows[: self.top_processes]
+
+
+def _disk_io(psutil):
+    try:
+        return psutil.disk_io_counters()
+    except (OSError, RuntimeError):
+        return None
+
+
+def _net_io(psutil):
+    try:
+        return psutil.net_io_counters()
+    except (OSError, RuntimeError):
+        return None
+
+
+def _rate(current, previous, attr: str, elapsed: float) -> Optional[float]:
+    """Débit en octets/s entre deux relevés de compteurs (None si indisponible)"""
+    if current is None or previous is None:
+        return None
+    # Compteurs remis à zéro (interface recréée...): pas de débit négatif
+    return round(max(0, getattr(current, attr) - getattr(previous, attr)) / elapsed, 1)
+
+
+def _export(sample: SystemSample) -> None:
+    SYSTEM_CPU_PERCENT.set(sample.cpu_percent)
+    SYSTEM_MEMORY_PERCENT.set(sample.memory_used_percent)
+    SYSTEM_DISK_PERCENT.set(sample.disk_usage_percent)
+    if sample.load_average:
+        for period, value in zip(("1m", "5m", "15m"), sample.load_average, strict=True):
+            SYSTEM_LOAD_AVERAGE.labels(period=period).set(value)
+    for gauge, direction, value in (
+        (SYSTEM_DISK_IO_RATE, "read", sample.disk_read_bytes_per_s),
+        (SYSTEM_DISK_IO_RATE, "write", sample.disk_write_bytes_per_s),
+        (SYSTEM_NETWORK_RATE, "sent", sample.net_sent_bytes_per_s),
+        (SYSTEM_NETWORK_RATE, "recv", sample.net_recv_bytes_per_s),
+    ):
+        if value is not None:
+            gauge.labels(direction=direction).set(value)
+
+
+# Singleton instance
+system_sampler = SystemSampler()
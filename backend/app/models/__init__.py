@@ -3,14 +3,15 @@
 from .schemas import (ChatRequest,  # Auth; Conversations; Chat; Tools; System
                       ChatResponse, ConversationCreate, ConversationResponse,
                       MessageCreate, MessageResponse, ModelInfo,
-                      ModelsResponse, SystemStats, Token, ToolExecution,
-                      ToolInfo, ToolListResponse, UserCreate, UserLogin,
-                      UserResponse, WSMessage)
+                      ModelsResponse, SystemStats, Token, ToolBatchRequest,
+                      ToolBatchResponse, ToolCall, ToolCallResult,
+                      ToolExecution, ToolInfo, ToolListResponse, UserCreate,
+                      UserLogin, UserResponse, WSMessage)
 from .ws_events import (WSCompleteEvent,  # WebSocket v8 Events
                         WSConversationCreatedEvent, WSErrorEvent, WSEvent,
                         WSEventBase, WSPhaseEvent, WSThinkingEvent,
-                        WSToolEvent, WSVerificationItemEvent,
-                        is_terminal_event)
+                        WSToolEvent, WSToolOutputEvent,
+                        WSVerificationItemEvent, is_terminal_event)
 
 __all__ = [
     "UserCreate",
@@ -26,6 +27,10 @@ __all__ = [
     "ToolExecution",
     "ToolInfo",
     "ToolListResponse",
+    "ToolCall",
+    "ToolBatchRequest",
+    "ToolCallResult",
+    "ToolBatchResponse",
     "SystemStats",
     "ModelInfo",
     "ModelsResponse",
@@ -35,6 +40,7 @@ __all__ = [
     "WSThinkingEvent",
     "WSPhaseEvent",
     "WSToolEvent",
+    "WSToolOutputEvent",
     "WSVerificationItemEvent",
     "WSCompleteEvent",
     "WSErrorEvent",
@@ -248,6 +248,44 @@ class ToolListResponse(BaseModel):
     categories: List[str]
 
 
+class ToolCall(BaseModel):
+    """Appel d'outil d'un lot"""
+
+    id: Optional[str] = Field(None, min_length=1, max_length=64)  # Défaut: position dans le lot
+    tool: str
+    params: Dict[str, Any] = {}
+    depends_on: List[str] = []  # Appels à terminer (avec succès) avant celui-ci
+
+
+class ToolBatchRequest(BaseModel):
+    """Lot d'appels d'outils"""
+
+    calls: List[ToolCall] = Field(..., min_length=1)
+    max_concurrency: Optional[int] = Field(None, ge=1)  # Défaut: TOOL_BATCH_MAX_CONCURRENCY
+
+
+class ToolCallResult(BaseModel):
+    """Résultat d'un appel d'un lot"""
+
+    id: str
+    tool: str
+    success: bool
+    params: Dict[str, Any] = {}
+    result: Any = None
+    error: Optional[Dict[str, Any]] = None
+    skipped: bool = False  # Non exécuté (dépendance en échec)
+    started_ms: int  # Début, relatif au début du lot
+    duration_ms: int
+
+
+class ToolBatchResponse(BaseModel):
+    """Résultats d'un lot, dans l'ordre des appels"""
+
+    success: bool  # Tous les appels ont réussi
+    results: List[ToolCallResult]
+    duration_ms: int
+
+
 # ===== SYSTEM SCHEMAS =====
 
 
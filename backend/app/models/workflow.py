@@ -96,6 +96,9 @@ class ExecutionResult(BaseModel):
     iterations: int = Field(default=0, description="Nombre d'itérations ReAct")
     thinking: str = Field(default="", description="Trace de réflexion")
     duration_ms: int = Field(default=0, description="Durée totale")
+    tool_memo: Dict[str, Any] = Field(
+        default={}, exclude=True, description="Résultats d'outils lecture seule (réutilisés par REPAIR)"
+    )
 
 
 # ===== VERIFICATION =====
@@ -144,6 +147,8 @@ class RepairAttempt(BaseModel):
     issues_addressed: List[str] = Field(default=[], description="Problèmes ciblés")
     changes_made: List[str] = Field(default=[], description="Modifications effectuées")
     tools_used: List[ToolExecution] = Field(default=[])
+    iterations: int = Field(default=0, description="Itérations ReAct de la réparation")
+    verification_before: Optional[VerificationReport] = None  # Checks en échec ciblés
     verification_after: Optional[VerificationReport] = None
 
 
@@ -149,6 +149,33 @@ class WSToolEvent(WSEventBase):
         return v
 
 
+class WSToolOutputEvent(WSEventBase):
+    """
+    Tool output event: Live chunk of a running command's stdout/stderr (rate-limited).
+    Example: {"type": "tool_output", "timestamp": "...", "run_id": "...", "data": {"tool": "run_tests", "stream": "stdout", "chunk": "..."}}
+    """
+
+    type: Literal["tool_output"] = "tool_output"
+    data: Dict[str, Any] = Field(
+        ...,
+        description="Output data with 'tool', 'stream' and 'chunk' keys",
+        examples=[
+            {"tool": "run_tests", "stream": "stdout", "chunk": "....F..\n", "seq": 3, "dropped": 0},
+        ],
+    )
+
+    @field_validator("data")
+    @classmethod
+    def validate_tool_output_data(cls, v: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure 'tool', 'stream' and 'chunk' keys exist."""
+        for key in ("tool", "stream", "chunk"):
+            if key not in v:
+                raise ValueError(f"Tool output event data must contain '{key}' key")
+        if v["stream"] not in ("stdout", "stderr"):
+            raise ValueError("Tool output 'stream' must be 'stdout' or 'stderr'")
+        return v
+
+
 class WSVerificationItemEvent(WSEventBase):
     """
     Verification item event: Individual QA check result.
@@ -250,6 +277,7 @@ WSEvent = Union[
     WSThinkingEvent,
     WSPhaseEvent,
     WSToolEvent,
+    WSToolOutputEvent,
     WSVerificationItemEvent,
     WSCompleteEvent,
     WSErrorEvent,
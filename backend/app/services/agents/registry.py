@@ -93,6 +93,7 @@ class AgentRegistry:
                 allowed_tools={
                     "read_file",
                     "list_directory",
+                    "get_system_metrics",
                     "bash",  # Restricted to safe commands
                 },
                 system_prompt="""You are a system health monitoring agent.
@@ -164,6 +165,7 @@ Summarize findings clearly and cite sources.""",
                     "patch_file",
                     "list_directory",
                     "search_directory",
+                    "search_content",
                     "run_tests",
                     "run_lint",
                     "git_status",
@@ -1,13 +1,26 @@
 """
 Service d'audit - Persistance des logs d'actions
+
+- log_action: écriture immédiate d'une action (une transaction par action)
+- AuditWriter: écriture par lots des entrées fréquentes (commandes de
+  SecureExecutor). Les entrées sont mises en file sans bloquer la boucle et
+  insérées en une transaction dès AUDIT_BATCH_SIZE entrées ou toutes les
+  AUDIT_FLUSH_INTERVAL_SECONDS. La file est bornée (AUDIT_MAX_PENDING): si la
+  base ne suit pas, les plus anciennes entrées non écrites sont abandonnées
+  et comptées.
 """
 
+import asyncio
 import json
 import logging
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
+from app.core.config import settings
 from app.core.database import AuditLog, get_db_session
+from app.core.metrics import record_audit_dropped, record_audit_flush
 
 logger = logging.getLogger(__name__)
 
@@ -118,3 +131,104 @@ def get_audit_logs(
     except Exception as e:
         logger.error(f"Failed to get audit logs: {e}")
         return []
+
+
+def write_audit_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insère des entrées d'audit (colonnes de AuditLog) en une transaction (bloquant)"""
+    db = get_db_session()
+    try:
+        db.bulk_insert_mappings(AuditLog, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+class AuditWriter:
+    """File bornée d'entrées d'audit écrites par lots en tâche de fond"""
+
+    def __init__(
+        self,
+        write: Callable[[List[Dict[str, Any]]], None] = write_audit_rows,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.write = write
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.interval = interval or settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        self._pending: Deque[Dict[str, Any]] = deque(
+            maxlen=max_pending or settings.AUDIT_MAX_PENDING
+        )
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, row: Dict[str, Any]) -> None:
+        """Met une entrée en file (ne bloque pas); réveille l'écrivain si un lot est prêt"""
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+            record_audit_dropped("overflow")
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self) -> None:
+        """Arrête la tâche puis écrit ce qui reste en file"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        while self._pending:
+            await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self._pending:
+                await self.flush()
+                if len(self._pending) < self.batch_size:
+                    break
+
+    async def flush(self) -> int:
+        """Écrit un lot (au plus batch_size entrées) dans un thread; renvoie sa taille"""
+        batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+        if not batch:
+            return 0
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.write, batch)
+        except Exception as e:
+            # Base indisponible: lot abandonné (la file reste bornée)
+            self.dropped += len(batch)
+            record_audit_dropped("error", len(batch))
+            logger.error(f"Failed to write {len(batch)} audit entries: {e}")
+            return 0
+        self.written += len(batch)
+        record_audit_flush(len(batch), time.perf_counter() - start)
+        return len(batch)
+
+
+audit_writer = AuditWriter()
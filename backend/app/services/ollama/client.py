@@ -1,14 +1,20 @@
 """
 Ollama Client - Interface avec l'API Ollama
 Support: génération, streaming, embeddings
+
+Les options de génération viennent du profil de phase (``profile=``, voir
+profiles.py); des ``options`` explicites complètent ou écrasent le profil.
 """
 
+import json
 import logging
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 import httpx
+from app.core.cancellation import CancellationToken, RunCancelled, cancel_scope
 from app.core.config import settings
-from app.core.metrics import record_llm_call
+from app.core.metrics import record_llm_call, record_llm_phase
+from app.services.ollama.profiles import get_profile, resolve_options
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +29,15 @@ class OllamaClient:
             settings.TIMEOUT_OLLAMA_CHAT, connect=settings.TIMEOUT_OLLAMA_CONNECT
         )
 
+    def _timeout_for(self, cancel_token: Optional[CancellationToken]) -> httpx.Timeout:
+        """Timeout HTTP borné par la deadline du run"""
+        if cancel_token is None or cancel_token.remaining() is None:
+            return self.timeout
+        return httpx.Timeout(
+            max(0.1, cancel_token.timeout(settings.TIMEOUT_OLLAMA_CHAT)),
+            connect=settings.TIMEOUT_OLLAMA_CONNECT,
+        )
+
     async def health_check(self) -> bool:
         """Vérifie si Ollama est disponible"""
         try:
@@ -53,6 +68,8 @@ class OllamaClient:
         system: Optional[str] = None,
         context: Optional[List[int]] = None,
         options: Optional[Dict[str, Any]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        profile: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Génère une réponse (non-streaming)"""
         model = model or settings.DEFAULT_MODEL
@@ -61,7 +78,7 @@ class OllamaClient:
             "model": model,
             "prompt": prompt,
             "stream": False,
-            "options": options or {"temperature": 0.7, "num_ctx": 8192},
+            "options": resolve_options(profile, options),
         }
 
         if system:
@@ -70,7 +87,9 @@ class OllamaClient:
             payload["context"] = context
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with cancel_scope(cancel_token), httpx.AsyncClient(
+                timeout=self._timeout_for(cancel_token)
+            ) as client:
                 response = await client.post(f"{self.base_url}/api/generate", json=payload)
 
                 if response.status_code == 200:
@@ -85,6 +104,12 @@ class OllamaClient:
                         prompt_tokens=prompt_tokens,
                         completion_tokens=completion_tokens,
                     )
+                    record_llm_phase(
+                        profile or "default",
+                        prompt_tokens,
+                        completion_tokens,
+                        result.get("done_reason"),
+                    )
 
                     return result
                 else:
@@ -95,6 +120,10 @@ class OllamaClient:
 
                     return {"error": f"HTTP {response.status_code}", "response": ""}
 
+        except RunCancelled:
+            record_llm_call(model=model, success=False)
+            raise
+
         except Exception as e:
             logger.error(f"Ollama generate failed: {e}")
 
@@ -109,37 +138,64 @@ class OllamaClient:
         model: Optional[str] = None,
         system: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        profile: Optional[str] = None,
     ) -> AsyncGenerator[str, None]:
-        """Génère une réponse en streaming"""
+        """
+        Génère une réponse en streaming.
+
+        Le jeton est vérifié à chaque chunk; pour interrompre aussi l'attente
+        du premier token, le consommateur itère dans ``cancel_token.scope()``.
+        Sortir du stream ferme la connexion, ce qui arrête la génération Ollama:
+        c'est ainsi que ``stop_blocks`` du profil coupe après un bloc ```tool.
+        """
         model = model or settings.DEFAULT_MODEL
+        generation = get_profile(profile)
 
         payload = {
             "model": model,
             "prompt": prompt,
             "stream": True,
-            "options": options or {"temperature": 0.7, "num_ctx": 8192},
+            "options": resolve_options(profile, options),
         }
 
         if system:
             payload["system"] = system
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(timeout=self._timeout_for(cancel_token)) as client:
                 async with client.stream(
                     "POST", f"{self.base_url}/api/generate", json=payload
                 ) as response:
+                    text, chunks = "", 0
                     async for line in response.aiter_lines():
+                        if cancel_token is not None:
+                            cancel_token.check()
                         if line:
-                            import json
-
                             try:
                                 data = json.loads(line)
-                                if "response" in data:
-                                    yield data["response"]
-                                if data.get("done"):
-                                    break
                             except json.JSONDecodeError:
                                 continue
+                            chunk = data.get("response", "")
+                            if chunk:
+                                chunks += 1
+                                yield chunk
+                            if data.get("done"):
+                                record_llm_phase(
+                                    generation.name,
+                                    data.get("prompt_eval_count", 0),
+                                    data.get("eval_count", 0),
+                                    data.get("done_reason"),
+                                )
+                                break
+                            if generation.stop_blocks:
+                                text += chunk
+                                if "`" in chunk and generation.block_closed(text):
+                                    # Coupé avant "done": ~1 token par chunk
+                                    record_llm_phase(generation.name, 0, chunks, "stop_block")
+                                    break
+        except RunCancelled:
+            raise
         except Exception as e:
             logger.error(f"Ollama stream failed: {e}")
             yield f"[Erreur: {str(e)}]"
@@ -149,6 +205,8 @@ class OllamaClient:
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        profile: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Chat avec historique (format OpenAI-like)"""
         model = model or settings.DEFAULT_MODEL
@@ -157,11 +215,13 @@ class OllamaClient:
             "model": model,
             "messages": messages,
             "stream": False,
-            "options": options or {"temperature": 0.7, "num_ctx": 8192},
+            "options": resolve_options(profile, options),
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with cancel_scope(cancel_token), httpx.AsyncClient(
+                timeout=self._timeout_for(cancel_token)
+            ) as client:
                 response = await client.post(f"{self.base_url}/api/chat", json=payload)
 
                 if response.status_code == 200:
@@ -176,6 +236,12 @@ class OllamaClient:
                         prompt_tokens=prompt_tokens,
                         completion_tokens=completion_tokens,
                     )
+                    record_llm_phase(
+                        profile or "default",
+                        prompt_tokens,
+                        completion_tokens,
+                        result.get("done_reason"),
+                    )
 
                     return result
                 else:
@@ -184,6 +250,10 @@ class OllamaClient:
 
                     return {"error": f"HTTP {response.status_code}"}
 
+        except RunCancelled:
+            record_llm_call(model=model, success=False)
+            raise
+
         except Exception as e:
             logger.error(f"Ollama chat failed: {e}")
 
@@ -197,34 +267,45 @@ class OllamaClient:
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
         options: Optional[Dict[str, Any]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        profile: Optional[str] = None,
     ) -> AsyncGenerator[str, None]:
-        """Chat avec historique en streaming"""
+        """Chat avec historique en streaming (même contrat d'annulation que generate_stream)"""
         model = model or settings.DEFAULT_MODEL
+        generation = get_profile(profile)
 
         payload = {
             "model": model,
             "messages": messages,
             "stream": True,
-            "options": options or {"temperature": 0.7, "num_ctx": 8192},
+            "options": resolve_options(profile, options),
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(timeout=self._timeout_for(cancel_token)) as client:
                 async with client.stream(
                     "POST", f"{self.base_url}/api/chat", json=payload
                 ) as response:
                     async for line in response.aiter_lines():
+                        if cancel_token is not None:
+                            cancel_token.check()
                         if line:
-                            import json
-
                             try:
                                 data = json.loads(line)
-                                if "message" in data and "content" in data["message"]:
-                                    yield data["message"]["content"]
-                                if data.get("done"):
-                                    break
                             except json.JSONDecodeError:
                                 continue
+                            if "message" in data and "content" in data["message"]:
+                                yield data["message"]["content"]
+                            if data.get("done"):
+                                record_llm_phase(
+                                    generation.name,
+                                    data.get("prompt_eval_count", 0),
+                                    data.get("eval_count", 0),
+                                    data.get("done_reason"),
+                                )
+                                break
+        except RunCancelled:
+            raise
         except Exception as e:
             logger.error(f"Ollama chat stream failed: {e}")
             yield f"[Erreur: {str(e)}]"
@@ -0,0 +1,110 @@
+"""
+Generation Profiles - Paramètres de génération par phase du workflow
+
+Chaque phase (SPEC, PLAN, EXECUTE, REPAIR, JUDGE) a son propre budget:
+- num_predict: plafond de tokens générés (une spec verbeuse ne sert à rien)
+- stop: séquences d'arrêt côté Ollama
+- stop_blocks: blocs ``` dont la fermeture termine le stream côté client
+  (ex: un bloc ```tool complet → on coupe, la suite serait hallucinée)
+- num_ctx, temperature
+
+Les plafonds se règlent sans redéploiement via LLM_PROFILE_OVERRIDES
+(ex: {"spec": {"num_predict": 512}}) à partir de llm_phase_tokens_total.
+"""
+
+import dataclasses
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fermeture d'un bloc ``` suivie d'un saut de ligne: la sortie JSON est finie.
+# N'intercepte pas l'ouverture (```json) qui est suivie du langage.
+CLOSING_FENCE = "\n```\n"
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Paramètres de génération d'une phase"""
+
+    name: str
+    temperature: float = 0.7
+    num_ctx: int = 8192
+    num_predict: int = -1  # -1 = illimité (défaut Ollama)
+    stop: Tuple[str, ...] = ()
+    stop_blocks: Tuple[str, ...] = ()
+
+    def to_options(self) -> Dict[str, Any]:
+        """Options Ollama (/api/generate, /api/chat)"""
+        options: Dict[str, Any] = {"temperature": self.temperature, "num_ctx": self.num_ctx}
+        if self.num_predict > 0:
+            options["num_predict"] = self.num_predict
+        if self.stop:
+            options["stop"] = list(self.stop)
+        return options
+
+    def block_closed(self, text: str) -> bool:
+        """True si ``text`` contient un bloc stop_blocks complet"""
+        return any(_block_pattern(tag).search(text) for tag in self.stop_blocks)
+
+
+@lru_cache(maxsize=None)
+def _block_pattern(tag: str) -> "re.Pattern[str]":
+    # Même forme que ReactEngine._parse_response
+    return re.compile(rf"```{re.escape(tag)}\s*\n?.*?\n?```", re.DOTALL)
+
+
+PROFILES: Dict[str, GenerationProfile] = {
+    # Défaut historique (chat direct, appels sans phase)
+    "default": GenerationProfile(name="default"),
+    # Sorties JSON courtes: arrêt à la fermeture du bloc ```json
+    "spec": GenerationProfile(
+        name="spec", temperature=0.3, num_predict=768, stop=(CLOSING_FENCE,)
+    ),
+    "plan": GenerationProfile(
+        name="plan", temperature=0.3, num_predict=1024, stop=(CLOSING_FENCE,)
+    ),
+    "judge": GenerationProfile(
+        name="judge", temperature=0.1, num_predict=512, stop=(CLOSING_FENCE,)
+    ),
+    # ReAct: la réponse finale peut contenir du code → pas de stop serveur,
+    # mais le stream s'arrête dès qu'un appel ```tool est complet
+    "execute": GenerationProfile(name="execute", num_predict=2048, stop_blocks=("tool",)),
+    "repair": GenerationProfile(
+        name="repair", temperature=0.4, num_predict=2048, stop_blocks=("tool",)
+    ),
+}
+
+
+def get_profile(name: Optional[str]) -> GenerationProfile:
+    """
+    Profil de génération d'une phase, surcharges LLM_PROFILE_OVERRIDES appliquées.
+
+    Un nom inconnu retourne le profil "default".
+    """
+    profile = PROFILES.get(name or "default")
+    if profile is None:
+        logger.warning(f"Unknown generation profile '{name}', using default")
+        profile = PROFILES["default"]
+
+    overrides = settings.LLM_PROFILE_OVERRIDES.get(profile.name)
+    if overrides:
+        fields = {f.name for f in dataclasses.fields(GenerationProfile)} - {"name"}
+        values = {k: tuple(v) if k in ("stop", "stop_blocks") else v for k, v in overrides.items()}
+        profile = dataclasses.replace(profile, **{k: v for k, v in values.items() if k in fields})
+    return profile
+
+
+def resolve_options(
+    profile: Optional[str], options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Options du profil, complétées/écrasées par ``options`` explicites"""
+    resolved = get_profile(profile).to_options()
+    if options:
+        resolved.update(options)
+    return resolved
@@ -0,0 +1,110 @@
+"""
+Command Cache - Résultats partagés des commandes en lecture seule (SecureExecutor)
+
+Les diagnostics relancent les mêmes commandes à quelques secondes
+d'intervalle (``df -h``, ``uptime``, ``docker ps``...), dans un run et entre
+utilisateurs. Pour les commandes déclarées sans effet de bord
+(CACHEABLE_COMMANDS de secure_executor):
+- les appels identiques simultanés n'exécutent la commande qu'une fois
+  (les suivants attendent le résultat du premier)
+- le résultat est resservi pendant COMMAND_CACHE_TTL_SECONDS
+
+Clé: argv, répertoire de travail, rôle (et sortie brute ou bornée).
+Si le premier appel est annulé, un appel en attente exécute la commande
+lui-même: l'annulation d'un run n'atteint pas les autres.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import record_command_cache
+
+
+class CommandCache:
+    """Cache TTL borné avec coalescence des appels simultanés"""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def ttl(self) -> float:
+        return settings.COMMAND_CACHE_TTL_SECONDS if self._ttl is None else self._ttl
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is None:
+            return settings.COMMAND_CACHE_MAX_ENTRIES
+        return self._max_entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cached(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if time.monotonic() >= entry[0]:
+            del self._entries[key]
+            return False, None
+        return True, entry[1]
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_run(
+        self,
+        key: Hashable,
+        run: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = lambda value: True,
+    ) -> Tuple[Any, str]:
+        """
+        Résultat de ``run()`` pour ``key``, exécuté au plus une fois à la fois.
+
+        Returns:
+            (résultat, source): source "hit" (cache), "coalesced" (appel
+            simultané partagé) ou "miss" (exécuté par cet appel)
+        """
+        while True:
+            found, value = self._cached(key)
+            if found:
+                record_command_cache("hit")
+                return value, "hit"
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # Cet appel est annulé
+                continue  # Premier appel annulé ou en échec: reprendre
+            record_command_cache("coalesced")
+            return value, "coalesced"
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await run()
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        if self.ttl > 0 and cacheable(value):
+            self._store(key, value)
+        future.set_result(value)
+        record_command_cache("miss")
+        return value, "miss"
+
+    def clear(self) -> None:
+        self._entries.clear()
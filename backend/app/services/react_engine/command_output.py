@@ -0,0 +1,181 @@
+"""
+Command Output - Sortie des commandes lue au fil de l'eau (SecureExecutor)
+
+- BoundedOutput: début et fin d'un flux (stdout ou stderr), mémoire bornée
+  (COMMAND_OUTPUT_HEAD_BYTES + COMMAND_OUTPUT_TAIL_BYTES); le milieu d'une
+  sortie trop longue est remplacé par un marqueur
+- LiveOutput: relais des morceaux lus vers le client en événements WebSocket
+  ``tool_output``, au plus un par flux toutes les TOOL_OUTPUT_INTERVAL_MS et
+  TOOL_OUTPUT_EVENT_MAX_CHARS caractères par événement (au-delà, le plus ancien est
+  abandonné et compté dans ``dropped``)
+
+Le relais est porté par une contextvar (``output_sink``) posée par le moteur
+autour de l'exécution d'un outil: SecureExecutor n'a pas à connaître le run
+ni la connexion.
+"""
+
+import asyncio
+import codecs
+import contextlib
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.websocket.event_emitter import event_emitter
+
+logger = logging.getLogger(__name__)
+
+# Reçoit (flux, octets lus) pendant l'exécution d'une commande
+output_sink: ContextVar[Optional[Callable[[str, bytes], None]]] = ContextVar(
+    "command_output_sink", default=None
+)
+
+
+class BoundedOutput:
+    """Début et fin d'un flux de sortie, taille bornée"""
+
+    def __init__(self, head_bytes: Optional[int] = None, tail_bytes: Optional[int] = None):
+        self.head_bytes = settings.COMMAND_OUTPUT_HEAD_BYTES if head_bytes is None else head_bytes
+        self.tail_bytes = settings.COMMAND_OUTPUT_TAIL_BYTES if tail_bytes is None else tail_bytes
+        self.head = bytearray()
+        self.tail: Deque[bytes] = deque()
+        self._tail_size = 0
+        self.total = 0
+
+    def feed(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+        self.tail.append(data)
+        self._tail_size += len(data)
+        # Morceaux entiers devenus inutiles (le dernier morceau gardé est coupé à la lecture)
+        while self._tail_size - len(self.tail[0]) >= self.tail_bytes:
+            self._tail_size -= len(self.tail.popleft())
+
+    @property
+    def omitted(self) -> int:
+        return max(0, self.total - len(self.head) - self.tail_bytes)
+
+    def text(self) -> str:
+        tail = b"".join(self.tail)
+        if len(tail) > self.tail_bytes:
+            tail = tail[len(tail) - self.tail_bytes :]
+        if not self.omitted:
+            return (bytes(self.head) + tail).decode("utf-8", errors="replace")
+        return (
+            bytes(self.head).decode("utf-8", errors="replace")
+            + f"\n[... {self.omitted} octets omis ...]\n"
+            + tail.decode("utf-8", errors="replace")
+        )
+
+
+class LiveOutput:
+    """Relais limité en débit des sorties d'une commande vers ``emit``"""
+
+    def __init__(
+        self,
+        emit: Callable[[Dict[str, Any]], Awaitable[Any]],
+        interval_ms: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ):
+        self.emit = emit
+        self.interval = (
+            settings.TOOL_OUTPUT_INTERVAL_MS if interval_ms is None else interval_ms
+        ) / 1000
+        self.max_chars = settings.TOOL_OUTPUT_EVENT_MAX_CHARS if max_chars is None else max_chars
+        self.seq = 0
+        self.dropped = 0
+        self._decoders: Dict[str, codecs.IncrementalDecoder] = {}
+        self._pending: Dict[str, List[str]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._last_flush = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._waiting = False  # Tâche de relais en attente (annulable sans perte)
+
+    def feed(self, stream: str, data: bytes) -> None:
+        """Appelé par le lecteur de la commande (boucle asyncio), ne bloque pas"""
+        decoder = self._decoders.get(stream)
+        if decoder is None:
+            decoder = self._decoders[stream] = codecs.getincrementaldecoder("utf-8")("replace")
+        self._add(stream, decoder.decode(data))
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_later())
+
+    def _add(self, stream: str, text: str) -> None:
+        if not text:
+            return
+        parts = self._pending.setdefault(stream, [])
+        parts.append(text)
+        size = self._sizes.get(stream, 0) + len(text)
+        if size > self.max_chars:
+            # Garder la fin (la plus récente), compter le reste comme abandonné
+            kept = "".join(parts)[size - self.max_chars :]
+            self.dropped += size - self.max_chars
+            parts[:] = [kept]
+            size = len(kept)
+        self._sizes[stream] = size
+
+    async def _flush_later(self) -> None:
+        delay = self._last_flush + self.interval - time.monotonic()
+        if delay > 0:
+            self._waiting = True
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._waiting = False
+        self._task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        pending, self._pending, self._sizes = self._pending, {}, {}
+        for stream, parts in pending.items():
+            self.seq += 1
+            try:
+                await self.emit(
+                    {
+                        "stream": stream,
+                        "chunk": "".join(parts),
+                        "seq": self.seq,
+                        "dropped": self.dropped,
+                    }
+                )
+            except Exception as e:
+                logger.debug(f"[ToolOutput] Emit failed: {e}")
+
+    async def aclose(self) -> None:
+        """Fin de la commande: relaie ce qui reste (fins de séquences UTF-8 comprises)"""
+        task, self._task = self._task, None
+        if task is not None:
+            if self._waiting:
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        for stream, decoder in self._decoders.items():
+            self._add(stream, decoder.decode(b"", final=True))
+        await self._flush()
+
+
+@contextlib.asynccontextmanager
+async def stream_tool_output(websocket: Any, run_id: str, tool: str):
+    """Relaie la sortie des commandes lancées par ``tool`` en événements tool_output"""
+    if websocket is None or not settings.TOOL_OUTPUT_STREAMING:
+        yield None
+        return
+
+    async def emit(data: Dict[str, Any]) -> None:
+        await event_emitter.emit(websocket, "tool_output", run_id, {"tool": tool, **data})
+
+    live = LiveOutput(emit)
+    token = output_sink.set(live.feed)
+    try:
+        yield live
+    finally:
+        output_sink.reset(token)
+        await live.aclose()
@@ -0,0 +1,153 @@
+"""
+Command Pool - Places d'exécution des commandes (SecureExecutor)
+
+- limite globale (COMMAND_POOL_MAX_CONCURRENT) et par rôle
+  (COMMAND_POOL_ROLE_LIMITS): quelques builds OPERATOR ne prennent pas toutes
+  les places, ni le CPU de l'hôte qui sert aussi l'API
+- file équitable entre utilisateurs: les places libérées sont attribuées à
+  tour de rôle à chaque utilisateur en attente (premier arrivé d'abord pour
+  un même utilisateur), un utilisateur qui lance vingt commandes ne bloque
+  pas celle d'un autre
+- attente max COMMAND_POOL_QUEUE_TIMEOUT_SECONDS, au-delà PoolBusy
+
+L'utilisateur est celui du run courant (``current_user``, RunManager).
+"""
+
+import asyncio
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import (record_command_pool_rejected,
+                              record_command_queue_wait)
+
+
+class PoolBusy(Exception):
+    """Aucune place libérée dans le délai d'attente"""
+
+
+@dataclass
+class _Waiter:
+    role: str
+    future: asyncio.Future
+
+
+class CommandPool:
+    """Places globales et par rôle, attribuées à tour de rôle par utilisateur"""
+
+    def __init__(
+        self, max_concurrent: Optional[int] = None, role_limits: Optional[Dict[str, int]] = None
+    ):
+        self._max_concurrent = max_concurrent
+        self._role_limits = role_limits
+        self.active = 0
+        self.active_by_role: Counter = Counter()
+        # Files par utilisateur, dans l'ordre du tour (servi → fin du tour)
+        self._queues: "OrderedDict[Optional[str], Deque[_Waiter]]" = OrderedDict()
+
+    @property
+    def max_concurrent(self) -> int:
+        if self._max_concurrent is None:
+            return settings.COMMAND_POOL_MAX_CONCURRENT
+        return self._max_concurrent
+
+    def role_limit(self, role: str) -> int:
+        limits = self._role_limits
+        if limits is None:
+            limits = settings.COMMAND_POOL_ROLE_LIMITS
+        return limits.get(role, 0)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _has_room(self, role: str) -> bool:
+        if self.max_concurrent and self.active >= self.max_concurrent:
+            return False
+        limit = self.role_limit(role)
+        return not limit or self.active_by_role[role] < limit
+
+    def _take(self, role: str) -> None:
+        self.active += 1
+        self.active_by_role[role] += 1
+
+    def _release(self, role: str) -> None:
+        self.active -= 1
+        self.active_by_role[role] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Attribue les places libres aux utilisateurs en attente, à tour de rôle"""
+        progress = True
+        while progress and self._queues:
+            progress = False
+            for user in list(self._queues):
+                queue = self._queues[user]
+                # Rôle saturé pour le premier de sa file: l'utilisateur suivant peut passer
+                if not self._has_room(queue[0].role):
+                    continue
+                waiter = queue.popleft()
+                self._take(waiter.role)
+                waiter.future.set_result(None)
+                progress = True
+                if queue:
+                    self._queues.move_to_end(user)
+                else:
+                    del self._queues[user]
+
+    def _forget(self, user: Optional[str], waiter: _Waiter) -> None:
+        queue = self._queues.get(user)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del self._queues[user]
+
+    @asynccontextmanager
+    async def slot(self, role: str, user: Optional[str] = None) -> AsyncIterator[float]:
+        """
+        Tient une place pendant le bloc; renvoie l'attente en secondes.
+        Lève PoolBusy après COMMAND_POOL_QUEUE_TIMEOUT_SECONDS d'attente.
+        """
+        start = time.perf_counter()
+        if not self._queues and self._has_room(role):
+            self._take(role)
+        else:
+            waiter = _Waiter(role, asyncio.get_running_loop().create_future())
+            self._queues.setdefault(user, deque()).append(waiter)
+            # Place libre pour ce rôle alors que d'autres attendent un rôle saturé
+            self._dispatch()
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(waiter.future), settings.COMMAND_POOL_QUEUE_TIMEOUT_SECONDS
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if waiter.future.done():
+                    # Place attribuée au moment de l'abandon: la rendre
+                    self._release(role)
+                else:
+                    waiter.future.cancel()
+                    self._forget(user, waiter)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                record_command_pool_rejected(role)
+                raise PoolBusy(
+                    f"Aucune place d'exécution libérée en "
+                    f"{settings.COMMAND_POOL_QUEUE_TIMEOUT_SECONDS}s "
+                    f"({self.active} commande(s) en cours, {self.queued} en attente)"
+                ) from None
+        waited = time.perf_counter() - start
+        record_command_queue_wait(role, waited)
+        try:
+            yield waited
+        finally:
+            self._release(role)
+
+
+command_pool = CommandPool()
@@ -0,0 +1,250 @@
+"""
+Content Search - Recherche parallèle dans le contenu des fichiers
+
+Moteur de l'outil search_content (équivalent borné de ripgrep):
+- parcours scandir qui respecte les .gitignore (pathspec, un spec par niveau)
+- lecture et recherche des fichiers dans un pool de threads; le module
+  ``regex`` relâche le GIL (concurrent=True), les threads tournent vraiment
+  en parallèle
+- fichiers binaires et trop gros ignorés
+- résultats dans l'ordre des chemins, arrêt dès que max_matches est atteint
+- lignes de contexte avant/après, tronquées
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pathspec
+import regex
+
+from app.services.react_engine import file_reader
+
+# Toujours ignorés, même sans .gitignore
+ALWAYS_SKIP_DIRS = frozenset({".git"})
+
+# Longueur max d'une ligne renvoyée (lignes minifiées, lockfiles...)
+MAX_LINE_CHARS = 240
+
+# Temps max de recherche regex par fichier (backtracking catastrophique)
+REGEX_TIMEOUT_S = 2.0
+
+
+class PatternError(ValueError):
+    """Motif de recherche invalide"""
+
+
+@dataclass
+class SearchStats:
+    files_scanned: int = 0
+    files_matched: int = 0
+    skipped: Dict[str, int] = field(
+        default_factory=lambda: {"binary": 0, "large": 0, "timeout": 0}
+    )
+    truncated: bool = False
+
+
+@dataclass
+class FileMatches:
+    path: str  # Relatif à la base de recherche
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: Optional[str] = None  # "binary" | "large" | "timeout"
+
+
+def compile_pattern(pattern: str, literal: bool = False, ignore_case: bool = False):
+    """Compile le motif (regex ou littéral) avec le module ``regex``"""
+    if not pattern:
+        raise PatternError("Motif vide")
+    flags = regex.MULTILINE | (regex.IGNORECASE if ignore_case else 0)
+    source = regex.escape(pattern) if literal else pattern
+    try:
+        return regex.compile(source, flags)
+    except regex.error as e:
+        raise PatternError(f"Regex invalide: {e}") from e
+
+
+def _clip(line: str) -> str:
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + "…"
+
+
+def iter_files(
+    base: str, glob: Optional[str] = None, use_gitignore: bool = True
+) -> Iterator[Tuple[str, str]]:
+    """
+    (chemin absolu, chemin relatif) des fichiers sous ``base``, triés.
+
+    Chaque .gitignore rencontré s'applique à son sous-arbre; le plus profond
+    qui se prononce sur un chemin l'emporte (comme git). Symlinks non suivis.
+    """
+    name_filter = pathspec.GitIgnoreSpec.from_lines([glob]) if glob else None
+    # Pile: (répertoire absolu, relatif, specs hérités [(préfixe, spec)])
+    stack = [(base, "", [])]
+    while stack:
+        current, rel_dir, specs = stack.pop()
+        if use_gitignore:
+            ignore_file = os.path.join(current, ".gitignore")
+            if os.path.isfile(ignore_file):
+                try:
+                    with open(ignore_file, encoding="utf-8", errors="replace") as f:
+                        specs = specs + [(rel_dir, pathspec.GitIgnoreSpec.from_lines(f))]
+                except OSError:
+                    pass
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and entry.name in ALWAYS_SKIP_DIRS:
+                continue
+            if _ignored(specs, rel, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, rel, specs))
+            elif is_file and (name_filter is None or name_filter.match_file(rel)):
+                yield entry.path, rel
+        # Pile LIFO: empiler à l'envers pour garder l'ordre alphabétique
+        stack.extend(reversed(subdirs))
+
+
+def _ignored(specs: List[Tuple[str, Any]], rel: str, is_dir: bool) -> bool:
+    for prefix, spec in reversed(specs):
+        local = rel[len(prefix) + 1 :] if prefix else rel
+        result = spec.check_file(local + "/" if is_dir else local)
+        if result.include is not None:
+            return result.include
+    return False
+
+
+def search_file(
+    path: str, rel: str, compiled, context: int, limit: int, max_file_bytes: int
+) -> FileMatches:
+    """Recherche dans un fichier (exécuté dans le pool)"""
+    result = FileMatches(path=rel)
+    try:
+        if os.path.getsize(path) > max_file_bytes:
+            result.skipped = "large"
+            return result
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return result
+    if file_reader.is_binary(data[: file_reader.BINARY_SAMPLE_BYTES]):
+        result.skipped = "binary"
+        return result
+
+    text = data.decode("utf-8", errors="replace")
+    try:
+        hits = []
+        last_line = -1
+        for match in compiled.finditer(text, concurrent=True, timeout=REGEX_TIMEOUT_S):
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            if line_start == last_line:
+                continue  # Une seule entrée par ligne
+            last_line = line_start
+            hits.append(line_start)
+            if len(hits) >= limit:
+                break
+    except TimeoutError:
+        result.skipped = "timeout"
+        return result
+    if not hits:
+        return result
+
+    lines = text.split("\n")
+    # Offsets de début de ligne → numéros de ligne (un seul passage)
+    numbers = []
+    offset, index = 0, 0
+    for start in hits:
+        while offset + len(lines[index]) + 1 <= start:
+            offset += len(lines[index]) + 1
+            index += 1
+        numbers.append(index)
+    for index in numbers:
+        result.matches.append(
+            {
+                "line": index + 1,
+                "text": _clip(lines[index]),
+                "before": [_clip(x) for x in lines[max(0, index - context) : index]],
+                "after": [_clip(x) for x in lines[index + 1 : index + 1 + context]],
+            }
+        )
+    return result
+
+
+def search(
+    base: str,
+    compiled,
+    *,
+    glob: Optional[str] = None,
+    context: int = 2,
+    max_matches: int = 100,
+    max_files: int = 20000,
+    max_file_bytes: int = 2 * 1024 * 1024,
+    workers: int = 8,
+    use_gitignore: bool = True,
+    stop: Optional[threading.Event] = None,
+) -> Tuple[List[FileMatches], SearchStats]:
+    """
+    Recherche ``compiled`` dans les fichiers sous ``base`` (bloquant).
+
+    Les fichiers sont soumis au pool par fenêtre glissante et consommés dans
+    l'ordre: les résultats sont déterministes et la recherche s'arrête dès
+    que ``max_matches`` lignes sont trouvées (ou que ``stop`` est levé).
+    """
+    stats = SearchStats()
+    results: List[FileMatches] = []
+    remaining = max_matches
+    files = iter_files(base, glob=glob, use_gitignore=use_gitignore)
+    window = workers * 4
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-content") as pool:
+        pending: deque = deque()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                nxt = next(files, None)
+                if nxt is None:
+                    exhausted = True
+                elif stats.files_scanned >= max_files:
+                    stats.truncated = True
+                    exhausted = True
+                else:
+                    stats.files_scanned += 1
+                    pending.append(
+                        pool.submit(
+                            search_file, *nxt, compiled, context, max_matches, max_file_bytes
+                        )
+                    )
+            if not pending or (stop is not None and stop.is_set()):
+                break
+
+            found = pending.popleft().result()
+            if found.skipped:
+                stats.skipped[found.skipped] += 1
+            if found.matches:
+                stats.files_matched += 1
+                if len(found.matches) > remaining:
+                    found.matches = found.matches[:remaining]
+                    stats.truncated = True
+                results.append(found)
+                remaining -= len(found.matches)
+                if remaining <= 0:
+                    # D'autres fichiers restaient à examiner
+                    stats.truncated = stats.truncated or bool(pending) or not exhausted
+                    break
+
+        for future in pending:
+            future.cancel()
+    return results, stats
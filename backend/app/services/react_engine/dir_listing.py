@@ -0,0 +1,181 @@
+"""
+Dir Listing - Listages bornés pour list_directory
+
+- pagination par curseur (keyset: le curseur encode la clé de tri de la
+  dernière entrée renvoyée, stable si le répertoire change entre deux pages)
+- tri par nom, type (répertoires d'abord), taille ou date (décroissantes)
+- stat paresseux: seulement si size/mtime sont demandés ou servent au tri
+- mode arbre: profondeur limitée, plafond d'entrées par répertoire et global
+"""
+
+import base64
+import heapq
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SORT_KEYS = ("name", "type", "size", "mtime")
+STAT_FIELDS = ("size", "mtime")
+
+
+def parse_fields(fields: Any) -> Tuple[str, ...]:
+    """"size,mtime" ou ["size"] → champs stat demandés (ValueError si inconnu)"""
+    if not fields:
+        return ()
+    items = fields.split(",") if isinstance(fields, str) else list(fields)
+    parsed = tuple(dict.fromkeys(f.strip() for f in items if f.strip()))
+    unknown = [f for f in parsed if f not in STAT_FIELDS]
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(unknown)} (valides: size, mtime)")
+    return parsed
+
+
+def encode_cursor(sort: str, key: Tuple) -> str:
+    raw = json.dumps({"sort": sort, "after": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple:
+    """Clé de la dernière entrée vue (ValueError si curseur invalide ou autre tri)"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        after = tuple(payload["after"])
+        cursor_sort = payload["sort"]
+    except Exception as e:
+        raise ValueError("Curseur invalide") from e
+    if cursor_sort != sort:
+        raise ValueError(f"Curseur obtenu avec sort={cursor_sort}, pas sort={sort}")
+    return after
+
+
+def _stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    try:
+        return entry.stat()
+    except OSError:
+        try:
+            return entry.stat(follow_symlinks=False)  # Symlink cassé
+        except OSError:
+            return None
+
+
+def _is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _sort_key(entry: os.DirEntry, sort: str, st: Optional[os.stat_result]) -> Tuple:
+    if sort == "type":
+        return (0 if _is_dir(entry) else 1, entry.name)
+    if sort == "size":
+        # Même convention que la sortie: taille 0 pour les répertoires
+        return (-(st.st_size if st and not _is_dir(entry) else 0), entry.name)
+    if sort == "mtime":
+        return (-(st.st_mtime if st else 0.0), entry.name)
+    return (entry.name,)
+
+
+def _describe(
+    entry: os.DirEntry, fields: Iterable[str], st: Optional[os.stat_result]
+) -> Dict[str, Any]:
+    item: Dict[str, Any] = {"name": entry.name, "is_dir": _is_dir(entry)}
+    if fields and st is None:
+        st = _stat(entry)
+    if "size" in fields:
+        item["size"] = st.st_size if st and not item["is_dir"] else 0
+    if "mtime" in fields:
+        item["mtime"] = (
+            datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat() if st else None
+        )
+    return item
+
+
+def _select(
+    path: str, sort: str, after: Optional[Tuple], limit: int
+) -> Tuple[List[Tuple[Tuple, os.DirEntry, Optional[os.stat_result]]], int, bool]:
+    """
+    Les ``limit`` premières entrées (dans l'ordre de tri) après ``after``.
+
+    Un seul scandir; stat de toutes les entrées uniquement pour un tri par
+    taille/date. heapq.nsmallest évite de trier tout le répertoire.
+
+    Returns:
+        ([(clé, entrée, stat)], nombre total d'entrées, reste-t-il des entrées)
+    """
+    needs_stat = sort in STAT_FIELDS
+    with os.scandir(path) as it:
+        entries = list(it)
+    candidates = []
+    for entry in entries:
+        st = _stat(entry) if needs_stat else None
+        key = _sort_key(entry, sort, st)
+        if after is None or key > after:
+            candidates.append((key, entry, st))
+    selected = heapq.nsmallest(limit + 1, candidates, key=lambda c: c[0])
+    return selected[:limit], len(entries), len(selected) > limit
+
+
+def list_page(
+    path: str, sort: str, after: Optional[Tuple], limit: int, fields: Tuple[str, ...]
+) -> Tuple[List[Dict[str, Any]], int, Optional[Tuple]]:
+    """
+    Une page du listage.
+
+    Returns:
+        (entrées, nombre total d'entrées, clé de reprise ou None si dernière page)
+    """
+    selected, total, more = _select(path, sort, after, limit)
+    items = [_describe(entry, fields, st) for _, entry, st in selected]
+    next_key = selected[-1][0] if more and selected else None
+    return items, total, next_key
+
+
+def list_tree(
+    path: str,
+    depth: int,
+    per_dir: int,
+    max_entries: int,
+    sort: str,
+    fields: Tuple[str, ...],
+) -> Tuple[List[Dict[str, Any]], int, int, bool]:
+    """
+    Arbre jusqu'à ``depth`` niveaux sous ``path``.
+
+    Chaque répertoire liste au plus ``per_dir`` entrées (``omitted`` compte le
+    reste); le parcours s'arrête à ``max_entries`` entrées au total. Les
+    symlinks vers des répertoires ne sont pas développés (boucles).
+
+    Returns:
+        (entrées imbriquées via ``children``, nombre d'entrées,
+         entrées omises à la racine, tronqué?)
+    """
+    count = 0
+    truncated = False
+
+    def walk(current: str, level: int) -> Tuple[List[Dict[str, Any]], int]:
+        nonlocal count, truncated
+        budget = min(per_dir, max_entries - count)
+        if budget <= 0:
+            truncated = True
+            return [], 0
+        try:
+            selected, total, _ = _select(current, sort, None, budget)
+        except OSError:
+            return [], 0
+        count += len(selected)
+        if len(selected) < total:
+            truncated = True
+        items = []
+        for _, entry, st in selected:
+            item = _describe(entry, fields, st)
+            if item["is_dir"] and level < depth and not entry.is_symlink():
+                item["children"], omitted = walk(entry.path, level + 1)
+                if omitted:
+                    item["omitted"] = omitted
+            items.append(item)
+        return items, total - len(selected)
+
+    entries, omitted = walk(path, 1)
+    return entries, count, omitted, truncated
@@ -11,18 +11,59 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from app.core.cancellation import CancellationToken, cancel_scope
 from app.core.config import settings
+from app.core.metrics import record_tool_memo_hit
 from app.services.ollama.client import ollama_client
 from app.services.websocket.event_emitter import event_emitter
 from fastapi import WebSocket
 
-from .tools import BUILTIN_TOOLS, RECOVERABLE_ERRORS, search_directory
+from .command_output import stream_tool_output
+from .path_matcher import suggest_paths
+from .tools import BUILTIN_TOOLS, RECOVERABLE_ERRORS, run_blocking
 
 logger = logging.getLogger(__name__)
 
 # Erreurs qui déclenchent une recherche automatique
 AUTO_RECOVERY_ERRORS = {"E_DIR_NOT_FOUND", "E_FILE_NOT_FOUND", "E_PATH_NOT_FOUND"}
 
+# Type de chemin cherché selon l'erreur (None: fichiers et répertoires)
+RECOVERY_PATH_KINDS = {"E_DIR_NOT_FOUND": "dir", "E_FILE_NOT_FOUND": "file"}
+
+# Outils lecture seule dont le résultat peut être réutilisé (memo) tant
+# qu'aucun outil à effet de bord n'a été exécuté
+MEMOIZABLE_TOOLS = {
+    "read_file",
+    "list_directory",
+    "search_files",
+    "search_content",
+    "search_directory",
+    "list_runbooks",
+    "get_runbook",
+    "search_runbooks",
+}
+
+
+def tool_memo_key(tool_name: str, params: Dict[str, Any]) -> str:
+    """Clé de memo stable pour un appel d'outil"""
+    return f"{tool_name}:{json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)}"
+
+
+def format_observations(observations: List[Dict[str, Any]], limit: int = 10) -> str:
+    """Résumé compact des appels d'outils déjà effectués (réutilisé par REPAIR)"""
+    lines = []
+    for obs in observations[-limit:]:
+        output = obs.get("output") or {}
+        params = json.dumps(obs.get("input", {}), ensure_ascii=False, default=str)[:150]
+        if output.get("success", True):
+            summary = json.dumps(output.get("data"), ensure_ascii=False, default=str)[:300]
+            lines.append(f"- {obs.get('tool')}({params}) → OK: {summary}")
+        else:
+            error = output.get("error") or {}
+            message = (error.get("message") or "")[:200]
+            lines.append(f"- {obs.get('tool')}({params}) → ÉCHEC {error.get('code', '')}: {message}")
+    return "\n".join(lines)
+
 
 class ReactEngine:
     """
@@ -56,6 +97,7 @@ Tu assistes l'administrateur d'un serveur Ubuntu avec:
 - Lister des fichiers/répertoires → list_directory
 - Lire un fichier → read_file
 - État système → get_system_info
+- Tendance CPU/mémoire, processus gourmands → get_system_metrics
 - Exécuter une commande → execute_command
 - Analyser du code → read_file sur les fichiers concernés
 - Diagnostiquer → combiner get_system_info, execute_command, read_file
@@ -137,6 +179,10 @@ Date actuelle: {datetime}
         history: Optional[List[Dict]] = None,
         websocket: Optional[WebSocket] = None,
         run_id: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        observations: Optional[List[Dict[str, Any]]] = None,
+        tool_memo: Optional[Dict[str, Any]] = None,
+        profile: str = "execute",
     ) -> Dict[str, Any]:
         """
         Exécute la boucle ReAct avec streaming
@@ -148,11 +194,16 @@ Date actuelle: {datetime}
             history: Conversation history (optional)
             websocket: WebSocket for streaming (optional)
             run_id: Run identifier for WebSocket v8 (auto-generated if not provided)
+            cancel_token: Run cancellation token (raises RunCancelled when triggered)
+            observations: Tool calls already made earlier in the run (injected in context)
+            tool_memo: Read-only tool results cache shared across phases (mutated in place)
+            profile: Generation profile (num_predict, stop, num_ctx) - "execute" or "repair"
         """
         start_time = time.time()
         model = model or settings.DEFAULT_MODEL
         history = history or []
         run_id = run_id or str(uuid.uuid4())[:8]
+        tool_memo = tool_memo if tool_memo is not None else {}
 
         system_prompt = self.SYSTEM_PROMPT.format(
             tools=self._build_tools_description(),
@@ -176,6 +227,14 @@ Date actuelle: {datetime}
             )
             logger.debug(f"Context loaded: {len(recent_history)} messages")
 
+        # Observations des phases précédentes: évite de redécouvrir l'état
+        if observations:
+            conversation_context += (
+                "=== Observations déjà collectées (outils exécutés) ===\n"
+                + format_observations(observations)
+                + "\n=== Fin observations ===\n\n"
+            )
+
         tools_used = []
         thinking_log = []
         current_prompt = conversation_context + user_message
@@ -191,6 +250,8 @@ Date actuelle: {datetime}
             )
 
         while iteration < self.max_iterations:
+            if cancel_token is not None:
+                cancel_token.check()
             iteration += 1
 
             # Mode streaming si WebSocket disponible
@@ -200,23 +261,27 @@ Date actuelle: {datetime}
                 logger.info(
                     f"[DEBUG ReactEngine] Run {run_id}: starting LLM stream (iteration {iteration})"
                 )
-                async for token in ollama_client.generate_stream(
-                    prompt=current_prompt,
-                    model=model,
-                    system=system_prompt,
-                ):
-                    full_response += token
-                    # Token streaming via event_emitter (v8 compliance: includes run_id)
-                    try:
-                        await event_emitter.emit(
-                            websocket,
-                            "tokens",
-                            run_id,
-                            {"content": token},
-                            validate=False,  # Skip validation for high-frequency tokens
-                        )
-                    except Exception as e:
-                        logger.warning(f"Token emit failed: {e}")
+                # Le scope interrompt aussi l'attente du premier token
+                async with cancel_scope(cancel_token):
+                    async for token in ollama_client.generate_stream(
+                        prompt=current_prompt,
+                        model=model,
+                        system=system_prompt,
+                        cancel_token=cancel_token,
+                        profile=profile,
+                    ):
+                        full_response += token
+                        # Token streaming via event_emitter (v8 compliance: includes run_id)
+                        try:
+                            await event_emitter.emit(
+                                websocket,
+                                "tokens",
+                                run_id,
+                                {"content": token},
+                                validate=False,  # Skip validation for high-frequency tokens
+                            )
+                        except Exception as e:
+                            logger.warning(f"Token emit failed: {e}")
 
                 response_text = full_response
                 logger.info(
@@ -230,6 +295,8 @@ Date actuelle: {datetime}
                     prompt=current_prompt,
                     model=model,
                     system=system_prompt,
+                    cancel_token=cancel_token,
+                    profile=profile,
                 )
 
                 if "error" in result:
@@ -240,6 +307,7 @@ Date actuelle: {datetime}
                         "iterations": iteration,
                         "thinking": "\n".join(thinking_log),
                         "duration_ms": 0,
+                        "tool_memo": tool_memo,
                     }
 
                 response_text = result.get("response", "")
@@ -274,6 +342,7 @@ Date actuelle: {datetime}
                     "iterations": iteration,
                     "thinking": "\n".join(thinking_log),
                     "duration_ms": duration,
+                    "tool_memo": tool_memo,
                 }
 
             elif parsed["type"] == "tool":
@@ -294,9 +363,28 @@ Date actuelle: {datetime}
                         },
                     )
 
+                memo_key = tool_memo_key(tool_name, tool_params)
+                memoized = tool_name in MEMOIZABLE_TOOLS and memo_key in tool_memo
+
                 tool_start = time.time()
-                tool_result = await self.tools.execute(tool_name, **tool_params)
+                if memoized:
+                    tool_result = tool_memo[memo_key]
+                    record_tool_memo_hit(tool_name)
+                else:
+                    async with stream_tool_output(websocket, run_id, tool_name):
+                        tool_result = await self.tools.execute(
+                            tool_name, cancel_token=cancel_token, **tool_params
+                        )
                 tool_duration = int((time.time() - tool_start) * 1000)
+                if cancel_token is not None:
+                    cancel_token.check()
+
+                if tool_name in MEMOIZABLE_TOOLS:
+                    if tool_result.get("success"):
+                        tool_memo[memo_key] = tool_result
+                elif tool_memo:
+                    # Effet de bord possible: les lectures mémorisées sont périmées
+                    tool_memo.clear()
 
                 tools_used.append(
                     {
@@ -304,6 +392,7 @@ Date actuelle: {datetime}
                         "input": tool_params,
                         "output": tool_result,
                         "duration_ms": tool_duration,
+                        **({"memoized": True} if memoized else {}),
                     }
                 )
 
@@ -317,45 +406,40 @@ Date actuelle: {datetime}
                         # Tenter une recherche automatique
                         logger.info(f"Auto-recovery pour erreur {error_code}")
 
-                        # Extraire le nom du chemin recherché
-                        error_msg = tool_result.get("error", {}).get("message", "")
-                        # Pattern: "Répertoire non trouvé: /path/to/dir"
-                        path_match = re.search(r"[:/]\s*([^\s]+)$", error_msg)
-                        search_name = None
-
-                        if path_match:
-                            full_path = path_match.group(1)
-                            # Extraire le dernier segment du chemin
-                            search_name = full_path.rstrip("/").split("/")[-1]
+                        # Chemin demandé: paramètre de l'outil, sinon fin du message
+                        # (Pattern: "Répertoire non trouvé: /path/to/dir")
+                        missing_path = tool_params.get("path")
+                        if not isinstance(missing_path, str) or not missing_path.strip():
+                            error_msg = tool_result.get("error", {}).get("message", "")
+                            path_match = re.search(r"[:/]\s*([^\s]+)$", error_msg)
+                            missing_path = path_match.group(1) if path_match else None
 
-                        if search_name:
+                        if missing_path:
                             if websocket:
                                 await event_emitter.emit(
                                     websocket,
                                     "thinking",
                                     run_id,
                                     {
-                                        "message": f"Recherche automatique: {search_name}...",
+                                        "message": f"Recherche automatique: {missing_path}...",
                                         "iteration": iteration,
                                         "phase": "recovery",
                                     },
                                 )
 
-                            search_result = search_directory(name=search_name)
+                            kind = RECOVERY_PATH_KINDS.get(error_code)
+                            search_result = await run_blocking(suggest_paths, missing_path, kind)
 
-                            if (
-                                search_result.get("success")
-                                and search_result.get("data", {}).get("count", 0) > 0
-                            ):
-                                matches = search_result["data"]["matches"]
-                                suggestion = search_result["data"].get("suggestion")
+                            if search_result["count"] > 0:
+                                matches = search_result["matches"]
+                                suggestion = search_result["suggestion"]
 
                                 tools_used.append(
                                     {
-                                        "tool": "search_directory",
-                                        "input": {"name": search_name},
-                                        "output": search_result,
-                                        "duration_ms": 0,
+                                        "tool": "suggest_paths",
+                                        "input": {"path": missing_path, "kind": kind},
+                                        "output": {"success": True, "data": search_result},
+                                        "duration_ms": search_result["duration_ms"],
                                         "auto_recovery": True,
                                     }
                                 )
@@ -401,6 +485,7 @@ Analyse ce résultat. Si tu as besoin de plus d'informations pour répondre de m
                     "iterations": iteration,
                     "thinking": "\n".join(thinking_log),
                     "duration_ms": duration,
+                    "tool_memo": tool_memo,
                 }
 
         # Max iterations - forcer une réponse
@@ -414,6 +499,7 @@ Analyse ce résultat. Si tu as besoin de plus d'informations pour répondre de m
             "iterations": iteration,
             "thinking": "\n".join(thinking_log),
             "duration_ms": duration,
+            "tool_memo": tool_memo,
         }
 
 
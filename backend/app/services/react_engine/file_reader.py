@@ -0,0 +1,195 @@
+"""
+File Reader - Lectures bornées pour read_file
+
+Ne charge jamais un fichier entier en mémoire:
+- plage d'octets (offset/length) via seek
+- plage de lignes et mode tail via mmap (recherche des \\n en C)
+- plafond dur d'octets renvoyés par appel
+- détection binaire sur un échantillon de tête
+- indices de taille / nombre de lignes pour paginer (comptage mis en cache
+  par fichier inchangé: la pagination ne relit pas tout le fichier à chaque page)
+"""
+
+import codecs
+import mmap
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Échantillon de tête pour la détection binaire
+BINARY_SAMPLE_BYTES = 8192
+
+# Proportion max d'octets de contrôle dans un échantillon texte
+BINARY_CONTROL_RATIO = 0.30
+
+# Octets de contrôle tolérés dans du texte (\\t \\n \\r \\f \\b ESC)
+_TEXT_CONTROLS = {7, 8, 9, 10, 12, 13, 27}
+
+# Lecture par blocs pour le comptage de lignes
+_COUNT_CHUNK = 1 << 20
+
+# Comptages de lignes gardés, clé (chemin, taille, mtime_ns, plafond)
+_LINE_COUNT_CACHE_ENTRIES = 256
+_line_counts: "OrderedDict[Tuple[str, int, int, int], Tuple[int, bool]]" = OrderedDict()
+_line_counts_lock = threading.Lock()
+
+
+@dataclass
+class ReadChunk:
+    """Portion décodée d'un fichier"""
+
+    content: str
+    start: int  # Offset octet du début (inclus)
+    end: int  # Offset octet de fin (exclu)
+    truncated: bool  # Plafond atteint avant la fin de la plage demandée
+    first_line: Optional[int] = None  # Numéro (1-based) de la première ligne renvoyée
+
+
+def is_binary(sample: bytes) -> bool:
+    """Heuristique: octet NUL ou trop d'octets de contrôle → binaire"""
+    if not sample:
+        return False
+    if b"\x00" in sample:
+        return True
+    controls = sum(1 for b in sample if b < 32 and b not in _TEXT_CONTROLS)
+    return controls / len(sample) > BINARY_CONTROL_RATIO
+
+
+def decode(data: bytes, at_file_start: bool, at_file_end: bool) -> Tuple[str, int, int]:
+    """
+    Décode un bloc UTF-8 coupé à des offsets arbitraires.
+
+    Les octets de continuation en tête (caractère commencé avant le bloc) et
+    une séquence incomplète en fin sont écartés.
+
+    Returns:
+        (texte, octets ignorés en tête, octets consommés en tout)
+    """
+    skip = 0
+    if not at_file_start:
+        while skip < min(3, len(data)) and (data[skip] & 0xC0) == 0x80:
+            skip += 1
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    text = decoder.decode(data[skip:], final=at_file_end)
+    pending = len(decoder.getstate()[0])
+    return text, skip, len(data) - pending
+
+
+def count_lines(
+    path: str, size: int, max_bytes: int, mtime_ns: Optional[int] = None
+) -> Tuple[int, bool]:
+    """
+    Nombre de lignes du fichier.
+
+    Exact jusqu'à ``max_bytes``; au-delà, estimé depuis la densité de \\n
+    du premier Mo. Avec ``mtime_ns``, le résultat est réutilisé tant que le
+    fichier garde la même taille et la même date de modification.
+
+    Returns:
+        (nombre de lignes, estimé?)
+    """
+    if mtime_ns is None:
+        return _scan_lines(path, size, max_bytes)
+    key = (path, size, mtime_ns, max_bytes)
+    with _line_counts_lock:
+        cached = _line_counts.get(key)
+        if cached is not None:
+            _line_counts.move_to_end(key)
+            return cached
+    result = _scan_lines(path, size, max_bytes)
+    with _line_counts_lock:
+        _line_counts[key] = result
+        while len(_line_counts) > _LINE_COUNT_CACHE_ENTRIES:
+            _line_counts.popitem(last=False)
+    return result
+
+
+def _scan_lines(path: str, size: int, max_bytes: int) -> Tuple[int, bool]:
+    if size == 0:
+        return 0, False
+    with open(path, "rb") as f:
+        if size <= max_bytes:
+            newlines, last = 0, b""
+            while chunk := f.read(_COUNT_CHUNK):
+                newlines += chunk.count(b"\n")
+                last = chunk
+            return newlines + (0 if last.endswith(b"\n") else 1), False
+        head = f.read(_COUNT_CHUNK)
+    density = head.count(b"\n") / max(1, len(head))
+    return max(1, int(size * density)), True
+
+
+def read_bytes(path: str, offset: int, length: int, size: int) -> ReadChunk:
+    """Plage d'octets [offset, offset+length) via seek"""
+    offset = max(0, min(offset, size))
+    end = min(size, offset + length)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(end - offset)
+    text, skip, consumed = decode(data, offset == 0, end == size)
+    return ReadChunk(
+        content=text, start=offset + skip, end=offset + consumed, truncated=end < size
+    )
+
+
+def read_lines(
+    path: str, start_line: int, end_line: Optional[int], size: int, max_bytes: int
+) -> ReadChunk:
+    """Lignes [start_line, end_line] (1-based, incluses), bornées par ``max_bytes``"""
+    if size == 0:
+        return ReadChunk(content="", start=0, end=0, truncated=False, first_line=start_line)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        for _ in range(start_line - 1):
+            nl = mm.find(b"\n", start)
+            if nl < 0:
+                start = size
+                break
+            start = nl + 1
+
+        end = size
+        if end_line is not None:
+            pos = start
+            for _ in range(end_line - start_line + 1):
+                nl = mm.find(b"\n", pos, min(size, start + max_bytes + 1))
+                if nl < 0:
+                    pos = size
+                    break
+                pos = nl + 1
+            end = pos
+
+        limit = min(end, start + max_bytes)
+        data = mm[start:limit]
+
+    text, _, consumed = decode(data, True, limit == size)
+    return ReadChunk(
+        content=text,
+        start=start,
+        end=start + consumed,
+        truncated=limit < end,
+        first_line=start_line,
+    )
+
+
+def read_tail(path: str, lines: int, size: int, max_bytes: int) -> ReadChunk:
+    """Dernières ``lines`` lignes, bornées par ``max_bytes``"""
+    if size == 0 or lines <= 0:
+        return ReadChunk(content="", start=size, end=size, truncated=False)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        floor = max(0, size - max_bytes)
+        # Un \n final termine la dernière ligne, il ne l'ouvre pas
+        pos = size - 1 if mm[size - 1 : size] == b"\n" else size
+        start, truncated = floor, floor > 0
+        for _ in range(lines):
+            nl = mm.rfind(b"\n", floor, pos)
+            if nl < 0:
+                start = floor
+                break
+            start, pos = nl + 1, nl
+        else:
+            truncated = False
+        data = mm[start:size]
+
+    text, skip, consumed = decode(data, start == 0, True)
+    return ReadChunk(content=text, start=start + skip, end=start + consumed, truncated=truncated)
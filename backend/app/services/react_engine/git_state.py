@@ -0,0 +1,516 @@
+"""
+Git State - État git du workspace mis en cache, diff et historique paginés
+
+Les commandes git passent toujours par SecureExecutor (allowlist, audit),
+mais leurs résultats sont réutilisés tant que le dépôt n'a pas changé:
+- statut et statistiques de diff: empreinte de .git (mtime/taille de index,
+  HEAD, de la branche courante et de packed-refs) + génération incrémentée
+  par les événements de l'index des chemins (fichiers du workspace
+  modifiés) et par ``invalidate``. Hors surveillance (pas d'index prêt sur
+  le dépôt), le cache expire après GIT_STATE_TTL_SECONDS
+- historique: une page est identifiée par (commit de départ, décalage),
+  immuable, donc mise en cache sans invalidation (LRU)
+
+HEAD et la branche courante sont lus directement dans .git (pas de
+sous-processus). Les commandes de lecture utilisent --no-optional-locks:
+git status ne réécrit pas l'index, l'empreinte reste stable.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import shlex
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import record_git_state_lookup
+from app.services.react_engine.path_index import path_indexes
+from app.services.react_engine.secure_executor import (ExecutionRole,
+                                                       secure_executor)
+
+logger = logging.getLogger(__name__)
+
+# Champs de git log séparés par \x1f, commits séparés par \x1e
+LOG_FIELDS = ("hash", "short", "author", "email", "date", "subject")
+LOG_FORMAT = "%H%x1f%h%x1f%an%x1f%ae%x1f%aI%x1f%s%x1e"
+LOG_CACHE_SIZE = 64
+
+# Curseur de git_log: "<commit de départ>:<commits déjà renvoyés>"
+CURSOR_RE = re.compile(r"^([0-9a-f]{7,64}):(\d+)$")
+
+# En-tête de branche de git status --branch
+BRANCH_RE = re.compile(
+    r"^## (?:No commits yet on |Initial commit on )?(?P<branch>.+?)"
+    r"(?:\.\.\.(?P<upstream>\S+))?(?: \[(?P<track>[^\]]+)\])?$"
+)
+
+
+class GitError(Exception):
+    """Échec d'une opération git (``code``: code d'erreur ToolResult)"""
+
+    def __init__(self, code: str, message: str):
+        self.code = code
+        super().__init__(message)
+
+
+@dataclass(frozen=True)
+class Repo:
+    root: str  # Répertoire de travail
+    git_dir: str  # .git (ou gitdir d'un worktree)
+    common_dir: str  # Références partagées (= git_dir hors worktree)
+
+
+@dataclass
+class _RepoCache:
+    generation: int = 0  # Incrémentée à chaque changement signalé
+    key: Optional[Tuple] = None  # (empreinte, génération) des valeurs en cache
+    fetched_at: float = 0.0
+    status: Optional[Dict[str, Any]] = None
+    numstat: Dict[Tuple[bool, str], List[Dict[str, Any]]] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+def find_repo(path: str) -> Optional[Repo]:
+    """Dépôt contenant ``path`` (remonte jusqu'à un .git), None sinon"""
+    current = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return Repo(current, dot_git, dot_git)
+        if os.path.isfile(dot_git):
+            # Worktree ou sous-module: "gitdir: <chemin>"
+            try:
+                with open(dot_git, encoding="utf-8") as f:
+                    line = f.readline().strip()
+            except OSError:
+                return None
+            if not line.startswith("gitdir:"):
+                return None
+            git_dir = os.path.normpath(os.path.join(current, line[len("gitdir:") :].strip()))
+            common_dir = git_dir
+            try:
+                with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as f:
+                    common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+            except OSError:
+                pass
+            return Repo(current, git_dir, common_dir)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def read_head(repo: Repo) -> Dict[str, Optional[str]]:
+    """Branche courante (None si HEAD détaché) et commit (None si dépôt vide)"""
+    head = (_read(os.path.join(repo.git_dir, "HEAD")) or "").strip()
+    if not head.startswith("ref:"):
+        return {"branch": None, "commit": head or None}
+    ref = head[len("ref:") :].strip()
+    branch = ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else ref
+    commit = (_read(os.path.join(repo.common_dir, ref)) or "").strip()
+    if not commit:
+        for line in (_read(os.path.join(repo.common_dir, "packed-refs")) or "").splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                commit = sha
+                break
+    return {"branch": branch, "commit": commit or None}
+
+
+def _fingerprint(repo: Repo) -> Tuple:
+    """mtime et taille des fichiers dont dépendent statut et diff"""
+    head = (_read(os.path.join(repo.git_dir, "HEAD")) or "").strip()
+    paths = [
+        os.path.join(repo.git_dir, "index"),
+        os.path.join(repo.git_dir, "HEAD"),
+        os.path.join(repo.common_dir, "packed-refs"),
+    ]
+    if head.startswith("ref:"):
+        paths.append(os.path.join(repo.common_dir, head[len("ref:") :].strip()))
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return (head, *stamps)
+
+
+def _cap(text: str, max_bytes: int) -> Tuple[str, bool]:
+    """``text`` coupé à ``max_bytes`` octets UTF-8 (avec marqueur), et s'il a été coupé"""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text, False
+    kept = encoded[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{kept}\n... [tronqué: {len(encoded) - max_bytes} octets]\n", True
+
+
+def parse_status(stdout: str) -> Dict[str, Any]:
+    """Sortie de git status --porcelain --branch → branche, suivi, fichiers"""
+    lines = stdout.splitlines()
+    info: Dict[str, Any] = {"branch": None, "upstream": None, "ahead": 0, "behind": 0}
+    if lines and lines[0].startswith("## "):
+        match = BRANCH_RE.match(lines.pop(0))
+        if match:
+            branch = match.group("branch")
+            info["branch"] = None if branch.startswith("HEAD (no branch)") else branch
+            info["upstream"] = match.group("upstream")
+            for part in (match.group("track") or "").split(", "):
+                kind, _, count = part.partition(" ")
+                if kind in ("ahead", "behind") and count.isdigit():
+                    info[kind] = int(count)
+    files = []
+    for line in lines:
+        if len(line) < 4:
+            continue
+        entry = {"index": line[0], "worktree": line[1], "path": line[3:]}
+        if " -> " in entry["path"]:
+            entry["old_path"], entry["path"] = entry["path"].split(" -> ", 1)
+        files.append(entry)
+    info["files"] = files
+    info["clean"] = not files
+    info["stdout"] = "\n".join(lines) + ("\n" if lines else "")
+    return info
+
+
+def parse_numstat(stdout: str) -> List[Dict[str, Any]]:
+    """Sortie de git diff --numstat -z → fichiers avec lignes ajoutées/supprimées"""
+    tokens = stdout.split("\0")
+    files = []
+    i = 0
+    while i < len(tokens):
+        record = tokens[i]
+        i += 1
+        if not record:
+            continue
+        added, deleted, path = record.split("\t", 2)
+        entry: Dict[str, Any] = {}
+        if not path:
+            # Renommage: "<a>\t<d>\t\0<ancien>\0<nouveau>\0"
+            entry["old_path"], path = tokens[i], tokens[i + 1]
+            i += 2
+        binary = added == "-"
+        entry.update(
+            {
+                "path": path,
+                "added": 0 if binary else int(added),
+                "deleted": 0 if binary else int(deleted),
+                "binary": binary,
+            }
+        )
+        files.append(entry)
+    return files
+
+
+def split_patch(stdout: str) -> List[str]:
+    """Patch complet → un morceau par fichier (dans l'ordre de git)"""
+    return [chunk for chunk in re.split(r"(?m)^(?=diff --git )", stdout) if chunk]
+
+
+# Échappements C de git pour les chemins (quote.c)
+_C_ESCAPES = {7: "a", 8: "b", 9: "t", 10: "n", 11: "v", 12: "f", 13: "r", 34: '"', 92: "\\"}
+
+
+def _quote_path(path: str, non_ascii: bool) -> str:
+    """Chemin tel que git l'écrit dans un en-tête (entre guillemets s'il faut échapper)"""
+    out, quoted = bytearray(), False
+    for byte in path.encode("utf-8", "surrogateescape"):
+        if byte in _C_ESCAPES:
+            out += b"\\" + _C_ESCAPES[byte].encode()
+        elif byte < 0x20 or byte == 0x7F or (non_ascii and byte >= 0x80):
+            out += f"\\{byte:03o}".encode()
+        else:
+            out.append(byte)
+            continue
+        quoted = True
+    text = out.decode("utf-8", "replace")
+    return f'"{text}"' if quoted else text
+
+
+def patch_header(old_path: str, path: str, non_ascii: bool = True) -> str:
+    """Première ligne du patch git d'un fichier (``non_ascii``: core.quotePath)"""
+    old, new = _quote_path("a/" + old_path, non_ascii), _quote_path("b/" + path, non_ascii)
+    return f"diff --git {old} {new}"
+
+
+def match_patch(entry: Dict[str, Any], chunks: Dict[str, str]) -> str:
+    """
+    Morceau de patch d'un fichier de --numstat, retrouvé par son en-tête.
+
+    Un renommage non détecté par le second diff donne deux morceaux
+    (suppression + ajout), réunis. Aucun morceau: chaîne vide.
+    """
+    path = entry["path"]
+    old_path = entry.get("old_path", path)
+    for non_ascii in (True, False):
+        chunk = chunks.get(patch_header(old_path, path, non_ascii))
+        if chunk:
+            return chunk
+        if old_path != path:
+            halves = [chunks.get(patch_header(p, p, non_ascii)) or "" for p in (old_path, path)]
+            if any(halves):
+                return "".join(halves)
+    return ""
+
+
+class GitState:
+    """Statut, diff et historique git, mis en cache par dépôt"""
+
+    def __init__(self):
+        self._repos: Dict[str, _RepoCache] = {}
+        self._log_pages: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+
+    # ----- Invalidation -----
+
+    def _cache(self, repo: Repo) -> _RepoCache:
+        cache = self._repos.get(repo.root)
+        if cache is None:
+            cache = self._repos[repo.root] = _RepoCache()
+        return cache
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Oublie l'état des dépôts contenant ``path`` (tous si None)"""
+        for root, cache in list(self._repos.items()):
+            if path is None or _contains(root, path):
+                cache.generation += 1
+
+    def on_paths_changed(self, paths: Iterable[str]) -> None:
+        """Événements de l'index des chemins (fichiers ajoutés, modifiés, supprimés)"""
+        paths = list(paths)
+        for root, cache in list(self._repos.items()):
+            if any(_contains(root, path) for path in paths):
+                cache.generation += 1
+
+    def _fresh(self, repo: Repo, cache: _RepoCache, key: Tuple) -> bool:
+        if cache.key != key:
+            return False
+        if path_indexes.lookup(repo.root) is not None:
+            return True  # Surveillé: tout changement du workspace incrémente la génération
+        return time.monotonic() - cache.fetched_at < settings.GIT_STATE_TTL_SECONDS
+
+    def _state(self, repo: Repo) -> Tuple[_RepoCache, bool]:
+        """(cache du dépôt, valeurs encore valides) — à appeler sous ``cache.lock``"""
+        cache = self._cache(repo)
+        key = (_fingerprint(repo), cache.generation)
+        if self._fresh(repo, cache, key):
+            return cache, True
+        cache.key = key
+        cache.fetched_at = time.monotonic()
+        cache.status = None
+        cache.numstat.clear()
+        return cache, False
+
+    # ----- Commandes -----
+
+    async def _git(
+        self, repo: Repo, args: List[str], timeout: int, literal_pathspecs: bool = False
+    ) -> str:
+        options = ["--no-optional-locks"] + (["--literal-pathspecs"] if literal_pathspecs else [])
+        command = shlex.join(["git", *options, *args])
+        # Sortie analysée ici (et bornée par page): ni tronquée ni relayée au client
+        result = await secure_executor.execute(
+            command=command,
+            role=ExecutionRole.OPERATOR,
+            timeout=timeout,
+            cwd=repo.root,
+            raw_output=True,
+        )
+        if not result.success:
+            detail = result.stderr.strip() or result.error_message or "Erreur inconnue"
+            raise GitError(result.error_code or "E_CMD_FAILED", f"git {args[0]}: {detail}")
+        return result.stdout
+
+    def _repo(self, path: str) -> Repo:
+        repo = find_repo(path)
+        if repo is None:
+            raise GitError("E_GIT_NO_REPO", f"Pas de dépôt git dans {path}")
+        return repo
+
+    # ----- Statut -----
+
+    async def status(self, path: str) -> Dict[str, Any]:
+        """Statut du dépôt contenant ``path`` (branche, suivi, fichiers modifiés)"""
+        repo = self._repo(path)
+        cache = self._cache(repo)
+        async with cache.lock:
+            cache, fresh = self._state(repo)
+            hit = fresh and cache.status is not None
+            record_git_state_lookup("status", hit)
+            if not hit:
+                stdout = await self._git(
+                    repo, ["status", "--porcelain", "--branch"], settings.TIMEOUT_GIT
+                )
+                cache.status = parse_status(stdout)
+            status = dict(cache.status)
+        head = read_head(repo)
+        status.update(
+            {
+                "repo": repo.root,
+                "head": head["commit"],
+                "branch": status["branch"] or head["branch"],
+                "cached": hit,
+                "stderr": "",
+                "returncode": 0,
+            }
+        )
+        return status
+
+    # ----- Diff -----
+
+    async def _numstat(self, repo: Repo, staged: bool, pathspec: str) -> Tuple[list, bool]:
+        cache = self._cache(repo)
+        async with cache.lock:
+            cache, fresh = self._state(repo)
+            hit = fresh and (staged, pathspec) in cache.numstat
+            record_git_state_lookup("diffstat", hit)
+            if not hit:
+                args = ["diff", "--numstat", "-z"] + (["--staged"] if staged else [])
+                if pathspec:
+                    args += ["--", pathspec]
+                stdout = await self._git(repo, args, settings.TIMEOUT_GIT_DIFF)
+                cache.numstat[(staged, pathspec)] = parse_numstat(stdout)
+            return cache.numstat[(staged, pathspec)], hit
+
+    async def diff(
+        self,
+        path: str,
+        staged: bool = False,
+        pathspec: str = "",
+        stat_only: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Diff paginé par fichier: statistiques de tous les fichiers (en cache),
+        patch des fichiers de la page, chaque fichier coupé à
+        GIT_DIFF_MAX_FILE_BYTES et la page à ``max_bytes``. ``next_offset``
+        reprend au premier fichier non renvoyé.
+        """
+        repo = self._repo(path)
+        limit = max(1, min(limit or settings.GIT_DIFF_PAGE_SIZE, settings.GIT_DIFF_MAX_PAGE_SIZE))
+        max_bytes = max_bytes or settings.GIT_DIFF_MAX_BYTES
+        offset = max(0, offset)
+
+        files, cached = await self._numstat(repo, staged, pathspec)
+        page = [dict(f) for f in files[offset : offset + limit]]
+        stdout, truncated = "", False
+        if page and not stat_only:
+            args = ["diff"] + (["--staged"] if staged else []) + ["--"]
+            for entry in page:
+                if "old_path" in entry:
+                    args.append(entry["old_path"])
+                args.append(entry["path"])
+            # Noms de fichiers du workspace: jamais interprétés comme pathspec (*, [, :)
+            stdout = await self._git(repo, args, settings.TIMEOUT_GIT_DIFF, literal_pathspecs=True)
+            chunks = {chunk.split("\n", 1)[0]: chunk for chunk in split_patch(stdout)}
+            parts, used = [], 0
+            for entry in page:
+                chunk = match_patch(entry, chunks)
+                chunk, entry["truncated"] = _cap(chunk, settings.GIT_DIFF_MAX_FILE_BYTES)
+                size = len(chunk.encode("utf-8"))
+                if parts and used + size > max_bytes:
+                    break
+                if used + size > max_bytes:
+                    chunk, _ = _cap(chunk, max_bytes)
+                    entry["truncated"] = True
+                    size = max_bytes
+                parts.append(chunk)
+                used += size
+            truncated = len(parts) < len(page) or any(e.get("truncated") for e in page)
+            page = page[: len(parts)]
+            stdout = "".join(parts)
+
+        end = offset + len(page)
+        return {
+            "repo": repo.root,
+            "staged": staged,
+            "stdout": stdout,
+            "stderr": "",
+            "returncode": 0,
+            "files": page,
+            "offset": offset,
+            "next_offset": end if end < len(files) else None,
+            "total_files": len(files),
+            "stat": {
+                "files": len(files),
+                "added": sum(f["added"] for f in files),
+                "deleted": sum(f["deleted"] for f in files),
+            },
+            "truncated": truncated,
+            "cached": cached,
+        }
+
+    # ----- Historique -----
+
+    async def log(
+        self,
+        path: str,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        pathspec: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Historique paginé. Le curseur fige le commit de départ: les pages
+        suivantes restent cohérentes même si HEAD avance entre deux appels.
+        """
+        repo = self._repo(path)
+        limit = max(1, min(limit or settings.GIT_LOG_PAGE_SIZE, settings.GIT_LOG_MAX_PAGE_SIZE))
+        if cursor:
+            match = CURSOR_RE.match(cursor)
+            if not match:
+                raise GitError("E_INVALID_CURSOR", f"Curseur invalide: {cursor}")
+            start, skip = match.group(1), int(match.group(2))
+        else:
+            start, skip = read_head(repo)["commit"], 0
+            if start is None:
+                return {"repo": repo.root, "commits": [], "next_cursor": None, "cached": False}
+
+        key = (repo.root, start, skip, limit, pathspec)
+        page = self._log_pages.get(key)
+        record_git_state_lookup("log", page is not None)
+        if page is not None:
+            self._log_pages.move_to_end(key)
+            return {**page, "cached": True}
+
+        args = ["log", f"--format={LOG_FORMAT}", f"--skip={skip}", f"-n{limit + 1}", start]
+        if pathspec:
+            args += ["--", pathspec]
+        stdout = await self._git(repo, args, settings.TIMEOUT_GIT)
+        commits = [
+            dict(zip(LOG_FIELDS, record.strip("\n").split("\x1f"), strict=True))
+            for record in stdout.split("\x1e")
+            if record.strip("\n")
+        ]
+        page = {
+            "repo": repo.root,
+            "commits": commits[:limit],
+            "next_cursor": f"{start}:{skip + limit}" if len(commits) > limit else None,
+        }
+        self._log_pages[key] = page
+        if len(self._log_pages) > LOG_CACHE_SIZE:
+            self._log_pages.popitem(last=False)
+        return {**page, "cached": False}
+
+
+def _contains(root: str, path: str) -> bool:
+    path = os.path.abspath(path)
+    return path == root or path.startswith(root + os.sep)
+
+
+# Singleton instance, tenu à jour par les événements de l'index des chemins
+git_state = GitState()
+path_indexes.add_listener(git_state.on_paths_changed)
@@ -106,12 +106,15 @@ class GovernanceManager:
             "read_file",
             "list_directory",
             "search_files",
+            "search_content",
             "search_directory",
             "get_system_info",
+            "get_system_metrics",
             "get_datetime",
             "get_audit_log",
             "git_status",
             "git_diff",
+            "git_log",
             "list_llm_models",
         }
 
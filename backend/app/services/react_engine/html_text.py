@@ -0,0 +1,315 @@
+"""
+HTML Text - Extraction incrémentale du texte d'une page HTML (web_read)
+
+Un seul passage d'un tokeniseur léger sur des morceaux successifs
+(``feed``), au lieu de plusieurs regex sur tout le document. html.parser coûte ~10µs par
+balise en Python pur: ici seules les balises qui structurent la sortie
+sont traitées une à une, le reste est retiré par substitution regex.
+- contenu de script/style/noscript/template/svg ignoré
+- titres conservés en Markdown (``## Titre``), liens en ``[texte](url)``
+- blocs (p, div, li, tr...) séparés par des retours à la ligne, espaces
+  consécutifs fusionnés, ``<pre>`` conservé tel quel
+- arrêt dès que le budget de caractères est atteint: le reste du document
+  n'est pas analysé
+"""
+
+import codecs
+import html
+import re
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+# Contenu brut (pas de balises à l'intérieur): sauté jusqu'à la balise fermante
+RAW_TAGS = frozenset({"script", "style"})
+# Contenu ignoré, balises comprises
+SKIP_TAGS = frozenset({"noscript", "template", "svg"})
+
+HREF_RE = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+RAW_END_RE = {tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in RAW_TAGS}
+
+BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt fieldset figcaption figure footer "
+    "form header hr li main nav ol p pre section table title tr ul".split()
+)
+
+# Blocs séparés par un seul retour à la ligne (les autres par une ligne vide)
+LINE_TAGS = frozenset({"br", "li", "tr", "dt", "dd"})
+
+HEADING_TAGS = {f"h{level}": level for level in range(1, 7)}
+
+
+def _names_pattern(names: Iterable[str]) -> str:
+    """Alternative regex en arbre préfixe, insensible à la casse sans re.IGNORECASE"""
+    trie: dict = {}
+    for name in names:
+        node = trie
+        for char in name:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        alternatives = [
+            (f"[{c}{c.upper()}]" if c.isalpha() else c) + build(node[c])
+            for c in sorted(node)
+            if c
+        ]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+# Balises qui structurent la sortie: cherchées une à une. Les autres (inline,
+# cellules, doctype...) sont retirées du texte par substitution, sans passer
+# par du code Python balise par balise. Le "<" littéral en tête permet au
+# moteur regex de sauter directement d'un "<" au suivant.
+STRUCT_RE = re.compile(
+    r"<(?:!--|(/?)("
+    + _names_pattern(BLOCK_TAGS | set(HEADING_TAGS) | RAW_TAGS | SKIP_TAGS | {"a"})
+    + r")(?=[\s/>])((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>)"
+)
+CELL_RE = re.compile(r"</?t[dh](?=[\s/>])[^>]*>", re.IGNORECASE)
+INLINE_TAG_RE = re.compile(r"<[A-Za-z/!?][^>]*>")
+
+# Taille des morceaux passés au parseur quand le document est déjà en mémoire
+CHUNK_CHARS = 16384
+
+
+class TextExtractor:
+    """
+    Extracteur incrémental: ``feed(morceau)`` autant que nécessaire, puis
+    ``close()`` et ``result()``. ``done`` passe à True quand ``max_chars``
+    est atteint.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, base_url: Optional[str] = None):
+        self.max_chars = max_chars
+        self.base_url = base_url
+        self.done = False
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip = 0
+        self._pre = 0
+        self._space = False  # Espace en attente avant le prochain texte
+        self._glue = False  # Pas d'espace juste après un "["
+        self._breaks = 2  # Retours à la ligne en fin de sortie (2 = début)
+        # Liens ouverts: (url, index du "[", retours à la ligne avant le "[")
+        self._links: List[Tuple[Optional[str], int, int]] = []
+        self._buffer = ""  # Fin du morceau précédent pas encore analysable
+        self._raw: Optional[str] = None  # Dans un <script>/<style> non fermé
+
+    # --- Tokenisation ---
+
+    def feed(self, chunk: str) -> None:
+        if self.done:
+            return
+        buf = self._buffer + chunk
+        self._buffer = ""
+        pos = 0
+        while not self.done:
+            if self._raw:
+                match = RAW_END_RE[self._raw].search(buf, pos)
+                if match is None:
+                    # Garder de quoi reconnaître une balise fermante à cheval
+                    self._buffer = buf[max(pos, len(buf) - 16) :]
+                    return
+                self._raw = None
+                pos = match.end()
+                continue
+
+            match = STRUCT_RE.search(buf, pos)
+            if match is None:
+                self._hold(buf, pos)
+                return
+            if match.start() > pos:
+                self._inline(buf[pos : match.start()])
+
+            if match.group(2) is None:  # Commentaire
+                close = buf.find("-->", match.end())
+                if close == -1:
+                    self._buffer = buf[match.start() :]
+                    return
+                pos = close + 3
+                continue
+
+            pos = match.end()
+            closing, tag, attrs = match.group(1), match.group(2).lower(), match.group(3)
+            if closing:
+                self.handle_endtag(tag)
+            elif tag in RAW_TAGS:
+                if not attrs.endswith("/"):
+                    self._raw = tag
+            else:
+                self.handle_starttag(tag, attrs)
+                if attrs.endswith("/"):
+                    self.handle_endtag(tag)
+
+    def _hold(self, buf: str, pos: int) -> None:
+        """Analyse la fin du morceau, garde ce qui peut être coupé"""
+        lt = buf.rfind("<", pos)
+        if lt != -1 and buf.find(">", lt) == -1:
+            end = lt  # Balise coupée
+        elif buf.rfind("<!--", pos) > buf.rfind("-->", pos):
+            end = buf.rfind("<!--", pos)  # Commentaire coupé (contient des ">")
+        else:
+            # Garder le dernier mot hors balise (entité coupée)
+            start = max(pos, buf.rfind(">", pos) + 1)
+            end = max(buf.rfind(" ", start), buf.rfind("\n", start), pos)
+        if end > pos:
+            self._inline(buf[pos:end])
+        self._buffer = buf[end:]
+
+    def _inline(self, text: str) -> None:
+        """Texte sans balise structurante: balises inline retirées en bloc"""
+        if "<" in text:
+            text = INLINE_TAG_RE.sub("", CELL_RE.sub(" ", text))
+        if "&" in text:
+            text = html.unescape(text)
+        self.handle_data(text)
+
+    def close(self) -> None:
+        if self._buffer and not self._raw and not self._buffer.startswith("<!--"):
+            self._inline(self._buffer)
+        self._buffer = ""
+
+    # --- Sortie ---
+
+    def _emit(self, text: str) -> None:
+        if self.done or not text:
+            return
+        if self.max_chars is not None and self._length + len(text) > self.max_chars:
+            text = text[: self.max_chars - self._length]
+            self.done = True
+        self._parts.append(text)
+        self._length += len(text)
+
+    def _break(self, count: int) -> None:
+        self._space = False
+        if self._breaks < count:
+            self._emit("\n" * (count - self._breaks))
+            self._breaks = count
+
+    # --- Événements ---
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif self._skip:
+            return
+        elif tag in HEADING_TAGS:
+            self._break(2)
+            self._emit("#" * HEADING_TAGS[tag])
+            self._breaks, self._space = 0, True
+        elif tag == "a":
+            match = HREF_RE.search(attrs)
+            href = html.unescape(next(g for g in match.groups() if g is not None)) if match else ""
+            if self.base_url:
+                href = urljoin(self.base_url, href)
+            if href.startswith(("http://", "https://")):
+                self._flush_space()
+                self._links.append((href, len(self._parts), self._breaks))
+                self._emit("[")
+                self._breaks, self._glue = 0, True
+            else:
+                self._links.append((None, len(self._parts), self._breaks))
+        elif tag in BLOCK_TAGS:
+            self._break(1 if tag in LINE_TAGS else 2)
+            if tag == "li":
+                self._emit("-")
+                self._breaks, self._space = 0, True
+            elif tag == "pre":
+                self._pre += 1
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif self._skip:
+            return
+        elif tag in HEADING_TAGS:
+            self._break(2)
+        elif tag == "a" and self._links:
+            href, start, breaks = self._links.pop()
+            if href is None:
+                return
+            if start == len(self._parts) - 1:
+                self._parts.pop()  # Lien sans texte: retirer le "["
+                self._length -= 1
+                self._breaks, self._glue = breaks, False
+            else:
+                self._emit(f"]({href})")
+        elif tag in BLOCK_TAGS:
+            if tag == "pre":
+                self._pre = max(0, self._pre - 1)
+            self._break(1 if tag in LINE_TAGS else 2)
+
+    def handle_data(self, data):
+        if self.done or self._skip:
+            return
+        if self._pre:
+            self._flush_space()
+            self._emit(data)
+            self._breaks = 0
+            return
+        words = data.split()
+        if not words:
+            self._space = self._space or bool(data)
+            return
+        if data[0].isspace():
+            self._space = True
+        self._flush_space()
+        self._emit(" ".join(words))
+        self._breaks = 0
+        self._space = data[-1].isspace()
+
+    def _flush_space(self) -> None:
+        if self._space and self._breaks == 0 and not self._glue:
+            self._emit(" ")
+        self._space = self._glue = False
+
+    # --- Résultat ---
+
+    def result(self) -> Tuple[str, bool]:
+        """(texte, tronqué au budget?)"""
+        return "".join(self._parts).strip(), self.done
+
+
+def extract_text(
+    chunks: Iterable,
+    max_chars: Optional[int] = None,
+    base_url: Optional[str] = None,
+    encoding: Optional[str] = None,
+) -> Tuple[str, bool]:
+    """
+    Texte d'un document HTML fourni par morceaux (str ou bytes).
+
+    S'arrête de lire ``chunks`` dès que ``max_chars`` est atteint.
+
+    Returns:
+        (texte, tronqué au budget?)
+    """
+    parser = TextExtractor(max_chars=max_chars, base_url=base_url)
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+            chunk = decoder.decode(chunk)
+        parser.feed(chunk)
+        if parser.done:
+            break
+    else:
+        if decoder is not None:
+            parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return parser.result()
+
+
+def split_chunks(data, size: int = CHUNK_CHARS) -> Iterable:
+    """Découpe un document en mémoire pour ``extract_text``"""
+    return (data[i : i + size] for i in range(0, len(data), size))
@@ -0,0 +1,318 @@
+"""
+Impact Analysis - Sélection des tests touchés par un changement (run_tests)
+
+Graphe des imports des fichiers Python du workspace (ast, pas d'exécution):
+un fichier modifié touche les modules qui l'importent, transitivement; les
+fichiers de test atteints sont sélectionnés. Règles complémentaires:
+- conftest.py modifié: tous les tests de son répertoire (et en dessous)
+- fichier de configuration (pytest.ini, pyproject.toml...) modifié: tous les tests
+- autre fichier non Python sous un répertoire de tests (données, fixtures):
+  les tests de ce répertoire
+- tests en échec au run précédent: toujours resélectionnés
+
+Les imports analysés (par mtime/taille) et les tests en échec sont conservés
+d'un run à l'autre dans un fichier JSON (TEST_IMPACT_CACHE_FILE, défaut
+``.pytest_cache/ai_orchestrator_impact.json`` dans le workspace).
+
+Le mode shardé répartit les fichiers de test en N groupes de taille
+équilibrée, exécutés en parallèle par des sous-processus pytest distincts.
+"""
+
+import ast
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEST_FILE_RE = re.compile(r"^(test_.*|.*_test)\.py$")
+
+# Fichiers dont la modification peut changer n'importe quel test
+CONFIG_FILES = frozenset(
+    {"pytest.ini", "pyproject.toml", "setup.cfg", "setup.py", "tox.ini", "requirements.txt"}
+)
+
+# Lignes FAILED/ERROR du résumé pytest (-r fE, par défaut)
+FAILED_RE = re.compile(r"^(?:FAILED|ERROR) ([^\s:]+\.py)", re.MULTILINE)
+
+CACHE_VERSION = 1
+
+
+def is_test_file(rel: str) -> bool:
+    return bool(TEST_FILE_RE.match(os.path.basename(rel)))
+
+
+def module_names(rel: str) -> List[str]:
+    """Noms importables possibles d'un fichier: tous les suffixes de son chemin pointé"""
+    parts = rel[: -len(".py")].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return [".".join(parts[i:]) for i in range(len(parts)) if parts[i:]]
+
+
+def parse_imports(source: str, rel: str) -> List[str]:
+    """Modules importés par un fichier (imports relatifs résolus depuis son chemin)"""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    package = rel.split("/")[:-1]
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[: len(package) - node.level + 1]
+                module = ".".join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module or ""
+            if module:
+                names.add(module)
+            # "from pkg import mod": mod peut être un sous-module
+            for alias in node.names:
+                if alias.name != "*":
+                    names.add(f"{module}.{alias.name}" if module else alias.name)
+    return sorted(names)
+
+
+@dataclass
+class Selection:
+    tests: List[str]  # Fichiers de test à exécuter (relatifs au workspace)
+    total: int  # Fichiers de test du workspace
+    full: bool  # Tous les tests (configuration modifiée, mode complet)
+    reasons: Dict[str, str] = field(default_factory=dict)  # Fichier de test → raison
+
+    @property
+    def skipped(self) -> int:
+        return self.total - len(self.tests)
+
+
+class ImpactAnalyzer:
+    """Graphe des imports d'un workspace, mis à jour de façon incrémentale"""
+
+    def __init__(self, root: str, cache_file: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.cache_file = cache_file or os.path.join(
+            self.root, ".pytest_cache", "ai_orchestrator_impact.json"
+        )
+        self.exclude_dirs = frozenset(settings.PATH_INDEX_EXCLUDE_DIRS)
+        self.imports: Dict[str, List[str]] = {}
+        self.failed: Set[str] = set()
+        self._stamps: Dict[str, List[int]] = {}
+        self._importers: Dict[str, Set[str]] = defaultdict(set)
+        # Les runs concurrents partagent le graphe (appelé depuis le pool d'outils)
+        self._lock = threading.Lock()
+
+    # ----- Cache -----
+
+    def load(self) -> None:
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        for rel, (mtime_ns, size, imports) in data.get("files", {}).items():
+            self._stamps[rel] = [mtime_ns, size]
+            self.imports[rel] = imports
+        self.failed = set(data.get("failed", []))
+
+    def save(self) -> None:
+        data = {
+            "version": CACHE_VERSION,
+            "files": {
+                rel: [*self._stamps[rel], imports]
+                for rel, imports in self.imports.items()
+                if rel in self._stamps
+            },
+            "failed": sorted(self.failed),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = f"{self.cache_file}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            logger.warning(f"[Impact] Cache not saved ({self.cache_file}): {e}")
+
+    # ----- Graphe -----
+
+    def _python_files(self) -> Iterable[str]:
+        for current, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in self.exclude_dirs and not d.startswith(".")]
+            for name in files:
+                if name.endswith(".py"):
+                    yield os.path.relpath(os.path.join(current, name), self.root).replace(
+                        os.sep, "/"
+                    )
+
+    def refresh(self) -> int:
+        """Analyse les fichiers nouveaux ou modifiés (bloquant); renvoie leur nombre"""
+        seen, parsed = set(), 0
+        for rel in self._python_files():
+            seen.add(rel)
+            path = os.path.join(self.root, rel)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            if self._stamps.get(rel) == stamp:
+                continue
+            try:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    self.imports[rel] = parse_imports(f.read(), rel)
+            except OSError:
+                continue
+            self._stamps[rel] = stamp
+            parsed += 1
+        for rel in set(self.imports) - seen:
+            self.imports.pop(rel, None)
+            self._stamps.pop(rel, None)
+        self._importers = defaultdict(set)
+        for rel, names in self.imports.items():
+            for name in names:
+                self._importers[name].add(rel)
+        return parsed
+
+    def tests(self) -> List[str]:
+        return sorted(rel for rel in self.imports if is_test_file(rel))
+
+    def dependents(self, rel: str) -> Set[str]:
+        """Fichiers qui importent ``rel`` (existant ou supprimé)"""
+        found: Set[str] = set()
+        names = module_names(rel)
+        for name in names:
+            found |= self._importers.get(name, set())
+        if rel.endswith("__init__.py"):
+            # Paquet: ses sous-modules importés l'exécutent aussi
+            for name in names:
+                prefix = name + "."
+                for imported, importers in self._importers.items():
+                    if imported.startswith(prefix):
+                        found |= importers
+        found.discard(rel)
+        return found
+
+    def affected(self, changed: Iterable[str]) -> Set[str]:
+        """Fichiers modifiés et tous ceux qui en dépendent, transitivement"""
+        seen: Set[str] = set()
+        stack = [rel for rel in changed if rel.endswith(".py")]
+        while stack:
+            rel = stack.pop()
+            if rel in seen:
+                continue
+            seen.add(rel)
+            stack.extend(self.dependents(rel) - seen)
+        return seen
+
+    # ----- Sélection -----
+
+    def select(self, changed: Iterable[str]) -> Selection:
+        """Tests touchés par ``changed`` (chemins relatifs au workspace)"""
+        tests = self.tests()
+        changed = sorted(set(changed))
+        reasons: Dict[str, str] = {}
+
+        def pick(test: str, reason: str) -> None:
+            reasons.setdefault(test, reason)
+
+        def under(directory: str) -> List[str]:
+            prefix = "" if directory in ("", ".") else directory.rstrip("/") + "/"
+            return [t for t in tests if t.startswith(prefix)]
+
+        for rel in changed:
+            name = os.path.basename(rel)
+            if name in CONFIG_FILES:
+                return Selection(tests, len(tests), True, {t: f"config:{rel}" for t in tests})
+            if name == "conftest.py":
+                for test in under(os.path.dirname(rel)):
+                    pick(test, f"conftest:{rel}")
+            elif not rel.endswith(".py"):
+                directory = os.path.dirname(rel)
+                if not any(part.startswith("test") for part in directory.split("/")):
+                    continue
+                # Répertoire de tests le plus proche contenant le fichier
+                while directory and not under(directory):
+                    directory = os.path.dirname(directory)
+                for test in under(directory):
+                    pick(test, f"data:{rel}")
+
+        for rel in sorted(self.affected(changed)):
+            if is_test_file(rel) and rel in self.imports:
+                pick(rel, "changed" if rel in changed else "imports")
+
+        for test in sorted(self.failed):
+            if test in self.imports:
+                pick(test, "failed_last_run")
+
+        return Selection(sorted(reasons), len(tests), False, reasons)
+
+    def record_failures(self, outputs: Iterable[str], ran: Iterable[str]) -> None:
+        """Met à jour les tests en échec à partir des sorties pytest du run"""
+        ran = set(ran)
+        self.failed -= ran
+        for output in outputs:
+            for reported in FAILED_RE.findall(output):
+                # Chemins pytest relatifs à son rootdir, pas forcément au workspace
+                self.failed.update(t for t in ran if t == reported or t.endswith("/" + reported))
+
+    # ----- Points d'entrée (bloquants, à appeler via run_blocking) -----
+
+    def plan(self, changed: Optional[Iterable[str]]) -> Selection:
+        """Graphe à jour puis sélection; ``changed=None``: tous les tests"""
+        with self._lock:
+            self.refresh()
+            if changed is None:
+                tests = self.tests()
+                return Selection(tests, len(tests), True, {t: "full" for t in tests})
+            return self.select(changed)
+
+    def finish(self, outputs: Iterable[str], ran: Iterable[str]) -> None:
+        """Enregistre les échecs du run et persiste le cache"""
+        with self._lock:
+            self.record_failures(outputs, ran)
+            self.save()
+
+
+def split_shards(files: List[str], shards: int, root: str) -> List[List[str]]:
+    """Répartition équilibrée par taille de fichier (le plus gros vers le groupe le plus léger)"""
+    shards = max(1, min(shards, len(files)))
+    groups: List[List[str]] = [[] for _ in range(shards)]
+    loads = [0] * shards
+
+    def size(rel: str) -> int:
+        try:
+            return os.path.getsize(os.path.join(root, rel))
+        except OSError:
+            return 0
+
+    for rel in sorted(files, key=size, reverse=True):
+        lightest = loads.index(min(loads))
+        groups[lightest].append(rel)
+        loads[lightest] += size(rel) or 1
+    return [sorted(group) for group in groups if group]
+
+
+# Analyseurs par workspace (graphe conservé en mémoire entre les runs)
+_analyzers: Dict[str, ImpactAnalyzer] = {}
+
+
+def get_analyzer(root: str) -> ImpactAnalyzer:
+    root = os.path.abspath(root)
+    analyzer = _analyzers.get(root)
+    if analyzer is None:
+        analyzer = ImpactAnalyzer(root, settings.TEST_IMPACT_CACHE_FILE or None)
+        analyzer.load()
+        _analyzers[root] = analyzer
+    return analyzer
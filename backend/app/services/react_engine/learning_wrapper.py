@@ -245,7 +245,7 @@ class LearningReactWrapper:
         patterns = {
             "docker_debug": {"docker_ps", "docker_logs", "docker_inspect"},
             "file_operations": {"file_read", "file_write", "file_list"},
-            "system_monitoring": {"execute_command", "get_system_info"},
+            "system_monitoring": {"execute_command", "get_system_info", "get_system_metrics"},
             "network_check": {"execute_command"},  # avec commandes réseau
             "service_management": {"systemctl_status", "execute_command"},
         }
@@ -13,6 +13,7 @@ import asyncio
 import json
 import logging
 import os
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
@@ -57,6 +58,8 @@ class DurableMemory:
         self.storage_path = storage_path
         self.memory_file = os.path.join(storage_path, "memory.json")
         self.entries: Dict[str, MemoryEntry] = {}
+        # Les outils mémoire tournent dans le pool de threads du ToolRegistry
+        self._lock = threading.RLock()
         self._ensure_storage()
         self._load()
 
@@ -92,27 +95,30 @@ class DurableMemory:
 
     def _save(self):
         """Sauvegarde la mémoire dans le fichier"""
-        try:
-            data = {}
-            for entry_id, entry in self.entries.items():
-                data[entry_id] = {
-                    "category": entry.category.value,
-                    "key": entry.key,
-                    "value": entry.value,
-                    "description": entry.description,
-                    "created_at": entry.created_at.isoformat(),
-                    "updated_at": entry.updated_at.isoformat(),
-                    "tags": entry.tags,
-                    "confidence": entry.confidence,
-                    "expiry_date": entry.expiry_date.isoformat() if entry.expiry_date else None,
-                }
-
-            with open(self.memory_file, "w") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            logger.debug(f"[MEMORY] Sauvegardé {len(self.entries)} entrées")
-        except Exception as e:
-            logger.error(f"[MEMORY] Erreur sauvegarde: {e}")
+        with self._lock:
+            try:
+                data = {}
+                for entry_id, entry in self.entries.items():
+                    data[entry_id] = {
+                        "category": entry.category.value,
+                        "key": entry.key,
+                        "value": entry.value,
+                        "description": entry.description,
+                        "created_at": entry.created_at.isoformat(),
+                        "updated_at": entry.updated_at.isoformat(),
+                        "tags": entry.tags,
+                        "confidence": entry.confidence,
+                        "expiry_date": (
+                            entry.expiry_date.isoformat() if entry.expiry_date else None
+                        ),
+                    }
+
+                with open(self.memory_file, "w") as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+
+                logger.debug(f"[MEMORY] Sauvegardé {len(self.entries)} entrées")
+            except Exception as e:
+                logger.error(f"[MEMORY] Erreur sauvegarde: {e}")
 
     def _generate_id(self, category: MemoryCategory, key: str) -> str:
         """Génère un ID unique pour une entrée"""
@@ -143,57 +149,58 @@ class DurableMemory:
         Returns:
             Entrée de mémoire créée/mise à jour
         """
-        entry_id = self._generate_id(category, key)
+        with self._lock:
+            entry_id = self._generate_id(category, key)
+
+            # CRQ-P0-5: Quota enforcement AVANT création nouvelle entrée
+            if entry_id not in self.entries:
+                if (
+                    settings.ENABLE_MEMORY_CLEANUP
+                    and len(self.entries) >= settings.MEMORY_MAX_DOCUMENTS
+                ):
+                    purge_count = max(1, int(len(self.entries) * 0.10))
+                    self._purge_oldest(purge_count)
+                    logger.warning(
+                        f"[MEMORY] Quota atteint ({settings.MEMORY_MAX_DOCUMENTS}), "
+                        f"purge de {purge_count} entrées"
+                    )
 
-        # CRQ-P0-5: Quota enforcement AVANT création nouvelle entrée
-        if entry_id not in self.entries:
-            if (
-                settings.ENABLE_MEMORY_CLEANUP
-                and len(self.entries) >= settings.MEMORY_MAX_DOCUMENTS
-            ):
-                purge_count = max(1, int(len(self.entries) * 0.10))
-                self._purge_oldest(purge_count)
-                logger.warning(
-                    f"[MEMORY] Quota atteint ({settings.MEMORY_MAX_DOCUMENTS}), "
-                    f"purge de {purge_count} entrées"
+            # CRQ-P0-5: Calcul expiry_date
+            expiry = None
+            if settings.ENABLE_MEMORY_CLEANUP:
+                days = ttl_days if ttl_days is not None else settings.MEMORY_TTL_DAYS
+                expiry = datetime.now(timezone.utc) + timedelta(days=days)
+
+            if entry_id in self.entries:
+                # Mise à jour
+                entry = self.entries[entry_id]
+                entry.value = value
+                entry.description = description
+                entry.updated_at = datetime.now(timezone.utc)
+                if tags:
+                    entry.tags = list(set(entry.tags + tags))
+                entry.confidence = confidence
+                # Reset TTL on update
+                if expiry:
+                    entry.expiry_date = expiry
+                logger.info(f"[MEMORY] Mis à jour: {entry_id}")
+            else:
+                # Nouvelle entrée
+                entry = MemoryEntry(
+                    id=entry_id,
+                    category=category,
+                    key=key,
+                    value=value,
+                    description=description,
+                    tags=tags or [],
+                    confidence=confidence,
+                    expiry_date=expiry,
                 )
+                self.entries[entry_id] = entry
+                logger.info(f"[MEMORY] Nouveau: {entry_id} (expiry: {expiry})")
 
-        # CRQ-P0-5: Calcul expiry_date
-        expiry = None
-        if settings.ENABLE_MEMORY_CLEANUP:
-            days = ttl_days if ttl_days is not None else settings.MEMORY_TTL_DAYS
-            expiry = datetime.now(timezone.utc) + timedelta(days=days)
-
-        if entry_id in self.entries:
-            # Mise à jour
-            entry = self.entries[entry_id]
-            entry.value = value
-            entry.description = description
-            entry.updated_at = datetime.now(timezone.utc)
-            if tags:
-                entry.tags = list(set(entry.tags + tags))
-            entry.confidence = confidence
-            # Reset TTL on update
-            if expiry:
-                entry.expiry_date = expiry
-            logger.info(f"[MEMORY] Mis à jour: {entry_id}")
-        else:
-            # Nouvelle entrée
-            entry = MemoryEntry(
-                id=entry_id,
-                category=category,
-                key=key,
-                value=value,
-                description=description,
-                tags=tags or [],
-                confidence=confidence,
-                expiry_date=expiry,
-            )
-            self.entries[entry_id] = entry
-            logger.info(f"[MEMORY] Nouveau: {entry_id} (expiry: {expiry})")
-
-        self._save()
-        return entry
+            self._save()
+            return entry
 
     def recall(
         self,
@@ -254,13 +261,13 @@ class DurableMemory:
         """
         entry_id = self._generate_id(category, key)
 
-        if entry_id in self.entries:
+        with self._lock:
+            if entry_id not in self.entries:
+                return False
             del self.entries[entry_id]
             self._save()
-            logger.info(f"[MEMORY] Oublié: {entry_id}")
-            return True
-
-        return False
+        logger.info(f"[MEMORY] Oublié: {entry_id}")
+        return True
 
     def search(self, query: str) -> List[MemoryEntry]:
         """
@@ -364,18 +371,20 @@ class DurableMemory:
             return 0
 
         now = datetime.now(timezone.utc)
-        expired_ids = []
-
-        for entry in self.entries.values():
-            if entry.expiry_date and now > entry.expiry_date:
-                expired_ids.append(entry.id)
 
-        for entry_id in expired_ids:
-            del self.entries[entry_id]
-            logger.debug(f"[MEMORY] Purgé (expiré): {entry_id}")
+        with self._lock:
+            expired_ids = [
+                entry.id
+                for entry in self.entries.values()
+                if entry.expiry_date and now > entry.expiry_date
+            ]
+            for entry_id in expired_ids:
+                del self.entries[entry_id]
+                logger.debug(f"[MEMORY] Purgé (expiré): {entry_id}")
+            if expired_ids:
+                self._save()
 
         if expired_ids:
-            self._save()
             logger.info(f"[MEMORY] Cleanup: {len(expired_ids)} entrées expirées supprimées")
 
         return len(expired_ids)
@@ -0,0 +1,418 @@
+"""
+Path Index - Index en mémoire des chemins du workspace
+
+Un index par racine autorisée, construit une fois en tâche de fond puis tenu
+à jour par watchfiles. search_files, search_directory et path_matcher
+(AUTO_RECOVERY) l'interrogent au lieu de parcourir le disque à chaque appel:
+- nom exact: dict basename → chemins
+- préfixe: bisect sur la liste triée des chemins relatifs
+- glob: regex sur les basenames distincts, filtrés par sous-arbre
+
+Les écouteurs (``add_listener``) reçoivent les chemins de chaque lot
+d'événements, modifications de contenu comprises (cache git_state).
+
+Les requêtes s'exécutent aussi dans les threads du pool des outils: un
+état publié (``_Snapshot``) n'est jamais modifié, chaque lot de changements
+est appliqué à une copie qui remplace l'état courant en une affectation.
+
+Tant qu'un index n'est pas prêt (ou s'il a dépassé PATH_INDEX_MAX_ENTRIES),
+les outils retombent sur le parcours disque.
+"""
+
+import asyncio
+import bisect
+import fnmatch
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional, Set,
+                    Tuple)
+
+from app.core.config import settings
+from app.core.metrics import PATH_INDEX_BUILD_SECONDS, PATH_INDEX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    """
+    Structures de l'index. Une fois publié (``PathIndex._snap``), un état n'est
+    plus modifié: les lecteurs (boucle ou threads du pool) le parcourent sans
+    verrou. add/remove_tree ne s'appliquent qu'à un état en construction
+    (``build``) ou à une copie (``copy``), publiée ensuite d'un bloc.
+    """
+
+    def __init__(self):
+        self.paths: List[str] = []  # Chemins relatifs triés (fichiers + répertoires)
+        self.members: Set[str] = set()
+        self.dirs: Set[str] = set()
+        self.by_name: Dict[str, Set[str]] = defaultdict(set)
+
+    def copy(self) -> "_Snapshot":
+        """Copie modifiable; les ensembles par nom restent partagés (remplacés, jamais modifiés)"""
+        snap = _Snapshot()
+        snap.paths = list(self.paths)
+        snap.members = set(self.members)
+        snap.dirs = set(self.dirs)
+        snap.by_name = defaultdict(set, self.by_name)
+        return snap
+
+    def add(self, rel: str, is_dir: bool) -> bool:
+        if rel in self.members:
+            return False
+        self.members.add(rel)
+        bisect.insort(self.paths, rel)
+        name = rel.rsplit("/", 1)[-1]
+        self.by_name[name] = self.by_name.get(name, set()) | {rel}
+        if is_dir:
+            self.dirs.add(rel)
+        return True
+
+    def remove_tree(self, rel: str) -> int:
+        """Retire ``rel`` et tous ses descendants"""
+        # Les descendants sont contigus dans la liste triée ("0" suit "/" en ASCII)
+        lo = bisect.bisect_left(self.paths, rel + "/")
+        hi = bisect.bisect_left(self.paths, rel + "0")
+        doomed = self.paths[lo:hi]
+        del self.paths[lo:hi]
+        if rel in self.members:
+            doomed.append(rel)
+            del self.paths[bisect.bisect_left(self.paths, rel)]
+        for path in doomed:
+            self.members.discard(path)
+            self.dirs.discard(path)
+            name = path.rsplit("/", 1)[-1]
+            bucket = self.by_name.get(name)
+            if bucket is not None:
+                rest = bucket - {path}
+                if rest:
+                    self.by_name[name] = rest
+                else:
+                    del self.by_name[name]
+        return len(doomed)
+
+
+class PathIndex:
+    """Index des chemins sous une racine, tenu à jour par watchfiles"""
+
+    def __init__(
+        self,
+        root: str,
+        exclude_dirs: Optional[Iterable[str]] = None,
+        max_entries: Optional[int] = None,
+        listeners: Optional[List[Callable[[List[str]], None]]] = None,
+    ):
+        self.root = str(Path(root).resolve())
+        self.exclude_dirs = frozenset(
+            exclude_dirs if exclude_dirs is not None else settings.PATH_INDEX_EXCLUDE_DIRS
+        )
+        self.max_entries = max_entries or settings.PATH_INDEX_MAX_ENTRIES
+        self.ready = False
+        self.complete = True  # False si max_entries atteint: requêtes → parcours disque
+        self.build_seconds: Optional[float] = None
+        self._snap = _Snapshot()
+        self.version = 0  # Incrémenté à chaque changement (caches dérivés: path_matcher)
+        self._pending: List[Tuple[str, str]] = []
+        self._stop_event: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.listeners = listeners if listeners is not None else []
+
+    # ----- Construction -----
+
+    def _walk(self, top: str) -> Iterator[Tuple[str, bool]]:
+        """(chemin relatif, est_répertoire) sous ``top``, sans suivre les symlinks"""
+        stack = [top]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if is_dir and entry.name in self.exclude_dirs:
+                            continue
+                        yield os.path.relpath(entry.path, self.root), is_dir
+                        if is_dir:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def build(self) -> None:
+        """Parcours complet (bloquant, à lancer dans un thread)"""
+        start = time.perf_counter()
+        snap = _Snapshot()
+        entries = []
+        for rel, is_dir in self._walk(self.root):
+            entries.append((rel, is_dir))
+            if len(entries) >= self.max_entries:
+                self.complete = False
+                logger.warning(
+                    f"[PathIndex] {self.root}: more than {self.max_entries} entries, "
+                    "queries fall back to disk scans"
+                )
+                break
+        entries.sort()
+        snap.paths = [rel for rel, _ in entries]
+        snap.members = set(snap.paths)
+        for rel, is_dir in entries:
+            snap.by_name[rel.rsplit("/", 1)[-1]].add(rel)
+            if is_dir:
+                snap.dirs.add(rel)
+        self._snap = snap
+        self.version += 1
+        self.build_seconds = time.perf_counter() - start
+
+    async def start(self) -> None:
+        """Lance la surveillance puis la construction (en tâche de fond)"""
+        self._stop_event = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._watch(), name=f"path-index-watch:{self.root}"),
+            asyncio.create_task(self._build_async(), name=f"path-index-build:{self.root}"),
+        ]
+
+    async def _build_async(self) -> None:
+        try:
+            await asyncio.to_thread(self.build)
+        except Exception as e:
+            logger.error(f"[PathIndex] Build failed for {self.root}: {e}")
+            return
+        # Changements reçus pendant la construction (et pendant leur application)
+        while self._pending:
+            pending, self._pending = self._pending, []
+            await self._apply(pending)
+        self.ready = True
+        PATH_INDEX_BUILD_SECONDS.labels(root=self.root).set(self.build_seconds)
+        PATH_INDEX_ENTRIES.labels(root=self.root).set(len(self))
+        logger.info(
+            f"[PathIndex] {self.root}: {len(self)} entries indexed in {self.build_seconds:.2f}s"
+        )
+
+    async def stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.ready = False
+
+    # ----- Mises à jour -----
+
+    def _is_excluded(self, path: str) -> bool:
+        rel = os.path.relpath(path, self.root)
+        return rel.startswith("..") or any(
+            part in self.exclude_dirs for part in rel.split(os.sep)
+        )
+
+    async def _watch(self) -> None:
+        from watchfiles import Change, awatch
+
+        kinds = {Change.added: "added", Change.deleted: "deleted", Change.modified: "modified"}
+        try:
+            async for changes in awatch(
+                self.root,
+                stop_event=self._stop_event,
+                watch_filter=lambda _, path: not self._is_excluded(path),
+                debounce=settings.PATH_INDEX_DEBOUNCE_MS,
+                ignore_permission_denied=True,
+            ):
+                self._notify([p for _, p in changes])
+                batch = [(kinds[c], p) for c, p in changes if c != Change.modified]
+                if not self.ready:
+                    self._pending.extend(batch)
+                else:
+                    await self._apply(batch)
+                    PATH_INDEX_ENTRIES.labels(root=self.root).set(len(self))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Plus de mises à jour fiables: l'index n'est plus utilisé
+            self.ready = False
+            logger.error(f"[PathIndex] Watcher stopped for {self.root}: {e}")
+
+    def _notify(self, paths: List[str]) -> None:
+        for listener in self.listeners:
+            try:
+                listener(paths)
+            except Exception as e:
+                logger.error(f"[PathIndex] Listener failed for {self.root}: {e}")
+
+    async def _apply(self, changes: List[Tuple[str, str]]) -> None:
+        """
+        Applique des changements (idempotent: l'état disque fait foi) à une
+        copie de l'état courant, publiée à la fin en une affectation.
+        """
+        if not changes:
+            return
+        snap = self._snap.copy()
+        for kind, path in changes:
+            rel = os.path.relpath(path, self.root)
+            if rel.startswith("..") or rel == ".":
+                continue
+            if kind == "deleted" or not os.path.lexists(path):
+                snap.remove_tree(rel)
+                continue
+            is_dir = os.path.isdir(path) and not os.path.islink(path)
+            parent = os.path.dirname(rel)
+            if parent:
+                snap.add(parent, True)
+            if snap.add(rel, is_dir) and is_dir:
+                # Répertoire créé ou déplacé: son contenu n'a pas d'événement propre
+                for child, child_is_dir in await asyncio.to_thread(
+                    lambda p=path: list(self._walk(p))
+                ):
+                    snap.add(child, child_is_dir)
+        self._snap = snap
+        # Après la publication: un cache dérivé de cette version voit ces changements
+        self.version += 1
+        if len(snap.members) > self.max_entries:
+            self.complete = False
+
+    # ----- Requêtes -----
+
+    def __len__(self) -> int:
+        return len(self._snap.members)
+
+    @property
+    def usable(self) -> bool:
+        return self.ready and self.complete
+
+    def relpath(self, path: str) -> Optional[str]:
+        """Chemin relatif à la racine ("" pour la racine), None si hors index"""
+        resolved = str(Path(path).resolve())
+        if resolved == self.root:
+            return ""
+        if resolved.startswith(self.root + os.sep):
+            return resolved[len(self.root) + 1 :]
+        return None
+
+    def is_dir(self, rel: str) -> bool:
+        return rel in self._snap.dirs
+
+    def entries(self) -> Tuple[List[str], Set[str]]:
+        """Copie (chemins triés, répertoires), utilisable hors de la boucle"""
+        snap = self._snap
+        return list(snap.paths), set(snap.dirs)
+
+    def under(self, prefix: str, snap: Optional[_Snapshot] = None) -> List[str]:
+        """Tous les chemins sous le répertoire ``prefix`` ("" = tout)"""
+        paths = (snap or self._snap).paths
+        if not prefix:
+            return list(paths)
+        lo = bisect.bisect_left(paths, prefix + "/")
+        hi = bisect.bisect_left(paths, prefix + "0")
+        return paths[lo:hi]
+
+    def by_name(self, name: str) -> List[str]:
+        return sorted(self._snap.by_name.get(name, ()))
+
+    def glob(self, pattern: str, under: str = "", include_hidden: bool = False) -> List[str]:
+        """
+        Équivalent de ``glob(under/**/pattern, recursive=True)``.
+
+        Comme glob, les composants cachés (".x") sont exclus sauf si le motif
+        commence par un point.
+        """
+        snap = self._snap
+        if "/" in pattern:
+            # Correspondance par composants depuis la droite, comme **/a/*.py
+            offset = len(under) + 1 if under else 0
+            candidates = [
+                p for p in self.under(under, snap) if PurePosixPath(p[offset:]).match(pattern)
+            ]
+        elif not any(c in pattern for c in "*?["):
+            candidates = list(snap.by_name.get(pattern, ()))
+        elif under:
+            # Sous-arbre: plage contiguë de la liste triée, moins large que tous les noms
+            match = re.compile(fnmatch.translate(pattern)).match
+            candidates = [p for p in self.under(under, snap) if match(p.rsplit("/", 1)[-1])]
+        else:
+            match = re.compile(fnmatch.translate(pattern)).match
+            candidates = [p for name, bucket in snap.by_name.items() if match(name) for p in bucket]
+        if under:
+            candidates = [p for p in candidates if p.startswith(under + "/")]
+        if not include_hidden and not pattern.startswith("."):
+            offset = len(under) + 1 if under else 0
+            candidates = [p for p in candidates if "/." not in "/" + p[offset:]]
+        return sorted(candidates)
+
+    def find_dirs(self, fragment: str, under: str = "") -> List[str]:
+        """Répertoires dont le nom contient ``fragment`` (insensible à la casse)"""
+        fragment = fragment.lower()
+        snap = self._snap
+        matches = [
+            p
+            for name, bucket in snap.by_name.items()
+            if fragment in name.lower()
+            for p in bucket
+            if p in snap.dirs
+        ]
+        if under:
+            matches = [p for p in matches if p.startswith(under + "/")]
+        return matches
+
+
+class PathIndexRegistry:
+    """Index par racine autorisée"""
+
+    def __init__(self):
+        self._indexes: Dict[str, PathIndex] = {}
+        self._listeners: List[Callable[[List[str]], None]] = []
+
+    def add_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """Appelé avec les chemins de chaque lot d'événements, sur tous les index"""
+        self._listeners.append(listener)
+
+    async def start(self, roots: Iterable[str]) -> None:
+        for root in roots:
+            if not os.path.isdir(root):
+                logger.warning(f"[PathIndex] Root not found, not indexed: {root}")
+                continue
+            index = PathIndex(root, listeners=self._listeners)
+            if index.root in self._indexes:
+                continue
+            self._indexes[index.root] = index
+            await index.start()
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(i.stop() for i in self._indexes.values()))
+        self._indexes.clear()
+
+    def lookup(self, path: str) -> Optional[Tuple[PathIndex, str]]:
+        """(index utilisable, chemin relatif) couvrant ``path``, sinon None"""
+        for index in self._indexes.values():
+            if not index.usable:
+                continue
+            rel = index.relpath(path)
+            if rel is not None and (rel == "" or index.is_dir(rel)):
+                return index, rel
+        return None
+
+    def covering(self, path: str) -> Optional[PathIndex]:
+        """Index utilisable dont la racine contient ``path`` (existant ou non)"""
+        for index in self._indexes.values():
+            if index.usable and index.relpath(path) is not None:
+                return index
+        return None
+
+    def get_stats(self) -> List[Dict]:
+        return [
+            {
+                "root": i.root,
+                "ready": i.ready,
+                "complete": i.complete,
+                "entries": len(i),
+                "build_seconds": i.build_seconds,
+            }
+            for i in self._indexes.values()
+        ]
+
+
+# Singleton instance
+path_indexes = PathIndexRegistry()
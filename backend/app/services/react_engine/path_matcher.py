@@ -0,0 +1,194 @@
+"""
+Path Matcher - Chemins proches d'un chemin introuvable (AUTO_RECOVERY)
+
+Index trigrammes des noms (basenames) distincts d'une racine, construit à
+partir de l'index des chemins (path_index) et reconstruit quand il change.
+Si aucune racine surveillée ne couvre le workspace, un index est construit à
+la demande et conservé PATH_MATCH_SCAN_TTL_SECONDS.
+
+Classement des candidats:
+- similarité des noms (coefficient de Dice sur les trigrammes)
+- bonus pour les répertoires parents en commun avec le chemin demandé
+- puis les chemins les moins profonds
+
+Les trigrammes présents dans une grande part des noms (".py", "tes"...) ne
+servent pas à générer les candidats, seulement à les noter.
+"""
+
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.metrics import record_path_match
+from app.services.react_engine.path_index import PathIndex, path_indexes
+
+# Noms candidats notés précisément par requête
+MAX_CANDIDATE_NAMES = 64
+
+# Similarité minimale des noms (en dessous: bruit, quels que soient les parents)
+MIN_SIMILARITY = 0.35
+
+# Poids des répertoires parents en commun dans le score
+PARENT_WEIGHT = 0.3
+
+
+def trigrams(name: str) -> Set[str]:
+    padded = f"  {name.lower()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PathMatcher:
+    """Index trigrammes des noms d'une liste de chemins relatifs"""
+
+    def __init__(self, paths: List[str], dirs: Set[str]):
+        self.dirs = dirs
+        by_name: Dict[str, List[str]] = defaultdict(list)
+        for rel in paths:
+            by_name[rel.rsplit("/", 1)[-1].lower()].append(rel)
+        self.names = list(by_name)
+        # Chemins de chaque nom, répertoires et fichiers séparés (filtre kind)
+        self.dir_paths = [[p for p in by_name[name] if p in dirs] for name in self.names]
+        self.file_paths = [[p for p in by_name[name] if p not in dirs] for name in self.names]
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self.postings[gram].append(i)
+        # Trigramme "courant": trop de noms pour générer des candidats utiles
+        self.common_limit = max(1000, len(self.names) // 20)
+
+    def match(
+        self, rel: str, kind: Optional[str] = None, limit: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        Chemins proches de ``rel`` (relatif à la racine), meilleurs d'abord.
+        kind: "dir", "file" ou None (les deux)
+        """
+        parts = [p for p in rel.lower().strip("/").split("/") if p not in ("", ".")]
+        if not parts:
+            return []
+        name, parents = parts[-1], set(parts[:-1])
+        grams = trigrams(name)
+        postings = sorted((self.postings.get(g, []) for g in grams), key=len)
+        selective = [p for p in postings if len(p) <= self.common_limit] or postings[:1]
+
+        hits: Counter = Counter()
+        for posting in selective:
+            hits.update(posting)
+
+        candidates = []
+        for i, _ in hits.most_common(MAX_CANDIDATE_NAMES):
+            candidate = trigrams(self.names[i])
+            similarity = 2 * len(grams & candidate) / (len(grams) + len(candidate))
+            candidates.append((similarity, i))
+        candidates.sort(reverse=True)
+
+        # Noms par similarité décroissante: arrêt dès qu'aucun chemin ne peut
+        # plus entrer dans le classement (un nom peut couvrir des milliers de chemins)
+        bonus = PARENT_WEIGHT if parents else 0.0
+        needles = [f"/{parent}/" for parent in parents]
+        scored: List[Tuple[float, int, str]] = []
+        for similarity, i in candidates:
+            if similarity < MIN_SIMILARITY:
+                break
+            if len(scored) >= limit and similarity + bonus < -scored[-1][0]:
+                break
+            paths = (self.dir_paths[i] if kind != "file" else []) + (
+                self.file_paths[i] if kind != "dir" else []
+            )
+            for path in paths:
+                wrapped = "/" + path.lower()
+                common = len([n for n in needles if n in wrapped])
+                score = similarity + bonus * common / max(1, len(needles))
+                scored.append((-score, path.count("/"), path))
+            scored.sort()
+            del scored[limit:]
+        return [(path, round(-score, 3)) for score, _, path in scored]
+
+
+class PathMatcherCache:
+    """Matchers par racine: dérivés d'un index surveillé, ou construits à la demande"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexed: Dict[str, Tuple[int, PathMatcher]] = {}
+        self._scanned: Dict[str, Tuple[float, PathMatcher]] = {}
+
+    def for_index(self, index: PathIndex) -> PathMatcher:
+        with self._lock:
+            cached = self._indexed.get(index.root)
+            if cached is not None and cached[0] == index.version:
+                return cached[1]
+            version = index.version
+            matcher = PathMatcher(*index.entries())
+            self._indexed[index.root] = (version, matcher)
+            return matcher
+
+    def for_scan(self, root: str) -> PathMatcher:
+        with self._lock:
+            cached = self._scanned.get(root)
+            if cached is not None and time.monotonic() - cached[0] < (
+                settings.PATH_MATCH_SCAN_TTL_SECONDS
+            ):
+                return cached[1]
+            index = PathIndex(root)
+            index.build()
+            matcher = PathMatcher(*index.entries())
+            self._scanned[root] = (time.monotonic(), matcher)
+            return matcher
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexed.clear()
+            self._scanned.clear()
+
+
+matchers = PathMatcherCache()
+
+
+def suggest_paths(
+    path: str, kind: Optional[str] = None, limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Chemins existants proches de ``path`` (bloquant à froid: à appeler via run_blocking).
+
+    La racine est l'index surveillé qui contient ``path``, sinon le workspace.
+    """
+    start = time.perf_counter()
+    limit = limit or settings.PATH_MATCH_MAX_RESULTS
+    workspace = str(Path(settings.WORKSPACE_DIR).resolve())
+    absolute = os.path.normpath(os.path.join(workspace, path))
+
+    index = path_indexes.covering(absolute) or path_indexes.covering(workspace)
+    if index is not None:
+        root, source = index.root, "index"
+        matcher = matchers.for_index(index)
+    elif os.path.isdir(workspace):
+        root, source = workspace, "scan"
+        matcher = matchers.for_scan(workspace)
+    else:
+        return {"query": path, "matches": [], "count": 0, "suggestion": None, "source": None}
+
+    if absolute == root or absolute.startswith(root + os.sep):
+        rel = os.path.relpath(absolute, root)
+    else:
+        # Hors de la racine: seul le nom (et ses parents) guide la recherche
+        rel = absolute.lstrip("/")
+    matches = [
+        {"path": os.path.join(root, p), "score": score, "is_dir": p in matcher.dirs}
+        for p, score in matcher.match(rel, kind, limit)
+    ]
+    elapsed = time.perf_counter() - start
+    record_path_match(source, elapsed)
+    return {
+        "query": path,
+        "root": root,
+        "matches": matches,
+        "count": len(matches),
+        "suggestion": matches[0]["path"] if matches else None,
+        "source": source,
+        "duration_ms": round(elapsed * 1000, 3),
+    }
@@ -6,23 +6,44 @@ Principes de sécurité:
 1. Parsing strict en argv (pas de shell interpretation)
 2. Allowlist de commandes autorisées
 3. Blocage des caractères dangereux
-4. Audit complet de toutes les exécutions
+4. Audit complet de toutes les exécutions: entrées récentes en mémoire
+   (AUDIT_LOG_BUFFER_SIZE), toutes écrites par lots dans audit_logs (AuditWriter)
+5. Chaque commande dans son propre groupe de processus: au timeout ou à
+   l'annulation, SIGTERM puis SIGKILL au groupe entier (descendants compris);
+   rlimits optionnelles (COMMAND_RLIMIT_*) appliquées avant exec
+6. Places d'exécution limitées globalement et par rôle (command_pool), priorité
+   et CPUs optionnels par rôle (COMMAND_NICE, COMMAND_CPU_AFFINITY)
+7. Commandes en lecture seule (CACHEABLE_COMMANDS): appels identiques
+   simultanés exécutés une fois, résultat resservi COMMAND_CACHE_TTL_SECONDS
 """
 
 import asyncio
 import logging
 import os
 import re
+import resource
 import shlex
+import signal
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.metrics import record_command_kill, record_command_output_truncated
+from app.services.audit_service import audit_writer
+from app.services.react_engine.command_cache import CommandCache
+from app.services.react_engine.command_output import BoundedOutput, output_sink
+from app.services.react_engine.command_pool import PoolBusy, command_pool
+from app.services.react_engine.tool_limits import current_user
 
 logger = logging.getLogger(__name__)
 
+# Taille d'une lecture sur les pipes de la commande
+COMMAND_OUTPUT_READ_BYTES = 65536
+
 
 class ExecutionRole(Enum):
     """Rôles d'exécution avec permissions croissantes"""
@@ -44,6 +65,23 @@ class AuditEntry:
     result: Optional[Dict] = None
     duration_ms: int = 0
 
+    def to_row(self) -> Dict[str, Any]:
+        """Colonnes de la table audit_logs"""
+        return {
+            "timestamp": self.timestamp,
+            "action": "command_execute",
+            "resource": os.path.basename(self.command[0])[:200] if self.command else None,
+            "allowed": self.allowed,
+            "role": self.role.value,
+            "details": {
+                "command": " ".join(self.command)[:1000],
+                "reason": self.reason,
+                "result": self.result,
+                "duration_ms": self.duration_ms,
+                "user": current_user.get(),
+            },
+        }
+
 
 @dataclass
 class ExecutionResult:
@@ -56,6 +94,7 @@ class ExecutionResult:
     error_code: Optional[str] = None
     error_message: Optional[str] = None
     audit: Optional[AuditEntry] = None
+    omitted_bytes: int = 0  # Octets de sortie non conservés (milieu des flux trop longs)
 
 
 # ============== CONFIGURATION SÉCURITÉ ==============
@@ -159,13 +198,133 @@ FORBIDDEN_SUBCOMMANDS = {
     "parted": ["*"],
 }
 
+def _no_arguments(args: List[str]) -> bool:
+    """ifconfig, hostname: lecture seulement sans argument (sinon configuration)"""
+    return not args
+
+
+def _ip_show(args: List[str]) -> bool:
+    """ip {addr,route,link} [show|list ...]: les autres actions modifient le réseau"""
+    words = [a for a in args if not a.startswith("-")]
+    if not words or words[0] not in ("addr", "address", "route", "link"):
+        return False
+    return len(words) == 1 or words[1] in ("show", "list")
+
+
+def _ss_read_only(args: List[str]) -> bool:
+    """ss sauf -K/--kill (ferme les sockets)"""
+    return not any(
+        a == "--kill" or (a.startswith("-") and not a.startswith("--") and "K" in a) for a in args
+    )
+
+
+# Commandes idempotentes et sans effet de bord: résultat partagé quelques secondes
+# entre appels identiques. Commande → sous-commandes admises (None = toutes), ou
+# prédicat sur les arguments pour les commandes qui lisent ou modifient selon eux.
+# Exclues: sorties qui suivent le temps (date, top, journalctl) ou le contenu
+# des fichiers (cat, grep...), git (git_state a son propre cache)
+CACHEABLE_COMMANDS: Dict[str, Optional[set | Callable[[List[str]], bool]]] = {
+    "df": None,
+    "du": None,
+    "free": None,
+    "uptime": None,
+    "uname": None,
+    "hostname": _no_arguments,
+    "whoami": None,
+    "ps": None,
+    "ip": _ip_show,
+    "ifconfig": _no_arguments,
+    "netstat": None,
+    "ss": _ss_read_only,
+    "which": None,
+    "whereis": None,
+    "ollama": {"list", "ps"},
+    "docker": {"ps", "images", "inspect", "info", "version"},
+    "systemctl": {"status", "is-active", "is-enabled", "is-failed", "list-units", "show"},
+    "service": {"--status-all"},
+}
+
+
+def _command_rlimits() -> List[Tuple[int, int]]:
+    """Limites (ressource, valeur) configurées pour les commandes; 0 = non limitée"""
+    from app.core.config import settings
+
+    configured = (
+        (resource.RLIMIT_CPU, settings.COMMAND_RLIMIT_CPU_SECONDS),
+        (resource.RLIMIT_AS, settings.COMMAND_RLIMIT_AS_BYTES),
+        (resource.RLIMIT_FSIZE, settings.COMMAND_RLIMIT_FSIZE_BYTES),
+        (resource.RLIMIT_NOFILE, settings.COMMAND_RLIMIT_NOFILE),
+    )
+    limits = []
+    for res, value in configured:
+        if value <= 0:
+            continue
+        # Jamais au-dessus de la limite dure du serveur (setrlimit échouerait)
+        _, hard = resource.getrlimit(res)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        limits.append((res, value))
+    return limits
+
+
+def _command_cpus(role: ExecutionRole) -> Optional[set]:
+    """CPUs configurés pour le rôle (COMMAND_CPU_AFFINITY), limités à ceux du serveur"""
+    from app.core.config import settings
+
+    wanted = settings.COMMAND_CPU_AFFINITY.get(role.value)
+    if not wanted:
+        return None
+    cpus = set(wanted) & os.sched_getaffinity(0)
+    if not cpus:
+        logger.warning(f"[AUDIT] COMMAND_CPU_AFFINITY[{role.value}]: aucun CPU disponible, ignoré")
+    return cpus or None
+
+
+def _prepare_child(
+    limits: List[Tuple[int, int]], nice: int = 0, cpus: Optional[set] = None
+) -> Callable[[], None]:
+    """preexec_fn: exécuté dans l'enfant entre fork et exec (appels système seulement)"""
+
+    def prepare() -> None:
+        for res, value in limits:
+            resource.setrlimit(res, (value, value))
+        if nice:
+            os.nice(nice)
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+
+    return prepare
+
+
+def _signal_group(pgid: int, sig: signal.Signals) -> bool:
+    """Envoie ``sig`` au groupe; False si le groupe n'a plus aucun membre"""
+    try:
+        os.killpg(pgid, sig)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Un membre a changé d'identité (setuid): rien de plus à faire ici
+        logger.error(f"[AUDIT] Cannot signal process group {pgid}")
+        return False
+
 
 class SecureExecutor:
     """Exécuteur de commandes sécurisé"""
 
-    def __init__(self, workspace_dir: str = "/home/lalpha/orchestrator-workspace"):
+    def __init__(
+        self,
+        workspace_dir: str = "/home/lalpha/orchestrator-workspace",
+        audit_buffer_size: Optional[int] = None,
+    ):
+        from app.core.config import settings
+
         self.workspace_dir = workspace_dir
-        self.audit_log: List[AuditEntry] = []
+        # Entrées récentes seulement: l'historique complet est dans audit_logs
+        self.audit_log: Deque[AuditEntry] = deque(
+            maxlen=audit_buffer_size or settings.AUDIT_LOG_BUFFER_SIZE
+        )
+        self._cache = CommandCache()
         self._ensure_workspace()
 
     def _ensure_workspace(self):
@@ -246,6 +405,21 @@ class SecureExecutor:
 
         return True, ""
 
+    def _is_cacheable(self, argv: List[str]) -> bool:
+        """Commande déclarée en lecture seule (CACHEABLE_COMMANDS)"""
+        base_cmd = os.path.basename(argv[0])
+        if base_cmd not in CACHEABLE_COMMANDS:
+            return False
+        subcommands = CACHEABLE_COMMANDS[base_cmd]
+        args = argv[1:]
+        if subcommands is None:
+            return True
+        if callable(subcommands):
+            return subcommands(args)
+        # Premier argument qui n'est pas une option (docker ps -a, systemctl status nginx)
+        subcommand = next((a for a in args if not a.startswith("-")), args[0] if args else None)
+        return subcommand in subcommands
+
     def _create_audit_entry(
         self, role: ExecutionRole, argv: List[str], allowed: bool, reason: str
     ) -> AuditEntry:
@@ -258,12 +432,21 @@ class SecureExecutor:
             reason=reason,
         )
 
+    def _record(self, audit: AuditEntry) -> None:
+        """Garde l'entrée parmi les récentes et la met en file d'écriture (audit_logs)"""
+        from app.core.config import settings
+
+        self.audit_log.append(audit)
+        if settings.AUDIT_PERSIST_ENABLED:
+            audit_writer.submit(audit.to_row())
+
     async def execute(
         self,
         command: str,
         role: ExecutionRole = ExecutionRole.VIEWER,
         timeout: int | None = None,
         cwd: Optional[str] = None,
+        raw_output: bool = False,
     ) -> ExecutionResult:
         """
         Exécute une commande de manière SÉCURISÉE
@@ -273,6 +456,7 @@ class SecureExecutor:
             role: Rôle d'exécution (détermine les permissions)
             timeout: Timeout en secondes (défaut: settings.TIMEOUT_COMMAND_DEFAULT)
             cwd: Répertoire de travail (défaut: workspace)
+            raw_output: Sortie complète, ni bornée ni relayée (analysée par l'appelant)
 
         Returns:
             ExecutionResult avec résultat et audit
@@ -285,7 +469,6 @@ class SecureExecutor:
         else:
             timeout = max(1, min(timeout, settings.TIMEOUT_COMMAND_DEFAULT * 2))
 
-        start_time = time.time()
         work_dir = cwd or self.workspace_dir
 
         # 1. Parser la commande en argv
@@ -293,7 +476,7 @@ class SecureExecutor:
 
         if not parse_ok:
             audit = self._create_audit_entry(role, [command], False, parse_error)
-            self.audit_log.append(audit)
+            self._record(audit)
             logger.warning(f"[AUDIT] BLOCKED: {command} - {parse_error}")
 
             return ExecutionResult(
@@ -305,34 +488,109 @@ class SecureExecutor:
 
         if not allowed:
             audit = self._create_audit_entry(role, argv, False, allow_reason)
-            self.audit_log.append(audit)
+            self._record(audit)
             logger.warning(f"[AUDIT] DENIED: {' '.join(argv)} - {allow_reason}")
 
             return ExecutionResult(
                 success=False, error_code="E_NOT_ALLOWED", error_message=allow_reason, audit=audit
             )
 
-        # 3. Exécuter avec subprocess_exec (JAMAIS shell=True)
+        # 3. Lecture seule: résultat partagé (appels simultanés, cache court)
+        if self._is_cacheable(argv):
+            key = (tuple(argv), os.path.realpath(work_dir), role.value, raw_output)
+            result, source = await self._cache.get_or_run(
+                key,
+                lambda: self._execute_allowed(argv, role, timeout, work_dir, raw_output),
+                cacheable=lambda r: r.error_code in (None, "E_CMD_FAILED"),
+            )
+            if source == "miss":
+                return result
+            audit = self._create_audit_entry(role, argv, True, "Résultat partagé")
+            audit.result = {**(result.audit.result if result.audit else {}), "cached": source}
+            self._record(audit)
+            logger.info(f"[AUDIT] CACHED ({source}): {' '.join(argv)}")
+            return replace(result, audit=audit)
+
+        return await self._execute_allowed(argv, role, timeout, work_dir, raw_output)
+
+    async def _execute_allowed(
+        self,
+        argv: List[str],
+        role: ExecutionRole,
+        timeout: int,
+        work_dir: str,
+        raw_output: bool,
+    ) -> ExecutionResult:
+        """Attend une place (globale et par rôle, file équitable entre utilisateurs) puis exécute"""
         audit = self._create_audit_entry(role, argv, True, "Exécution autorisée")
+        try:
+            async with command_pool.slot(role.value, current_user.get()):
+                return await self._run(argv, role, audit, timeout, work_dir, raw_output)
+        except PoolBusy as e:
+            audit.result = {"error": "busy"}
+            self._record(audit)
+            logger.warning(f"[AUDIT] BUSY: {' '.join(argv)} - {e}")
+
+            return ExecutionResult(
+                success=False, error_code="E_TOOL_BUSY", error_message=str(e), audit=audit
+            )
+
+    async def _run(
+        self,
+        argv: List[str],
+        role: ExecutionRole,
+        audit: AuditEntry,
+        timeout: int,
+        work_dir: str,
+        raw_output: bool,
+    ) -> ExecutionResult:
+        """Exécute une commande autorisée avec subprocess_exec (JAMAIS shell=True)"""
+        from app.core.config import settings
+
+        start_time = time.time()
+        process = None
 
         try:
             logger.info(f"[AUDIT] EXEC: {' '.join(argv)} (role={role.value})")
 
+            # Groupe de processus propre (arrêt de tous les descendants); preexec_fn
+            # seulement si des limites, une priorité ou des CPUs sont configurés
+            # (fork plus coûteux sinon)
+            limits = _command_rlimits()
+            nice = settings.COMMAND_NICE.get(role.value, 0)
+            cpus = _command_cpus(role)
             process = await asyncio.create_subprocess_exec(
-                *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=work_dir
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=work_dir,
+                start_new_session=True,
+                preexec_fn=_prepare_child(limits, nice, cpus) if limits or nice or cpus else None,
             )
 
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            if raw_output:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+                stdout_text = stdout.decode("utf-8", errors="replace")
+                stderr_text = stderr.decode("utf-8", errors="replace")
+                output_bytes, omitted = [len(stdout), len(stderr)], 0
+            else:
+                outputs = await asyncio.wait_for(self._read_output(process), timeout=timeout)
+                stdout_text, stderr_text = (output.text() for output in outputs)
+                output_bytes = [output.total for output in outputs]
+                omitted = sum(output.omitted for output in outputs)
+                if omitted:
+                    record_command_output_truncated(omitted)
 
             duration_ms = int((time.time() - start_time) * 1000)
             audit.duration_ms = duration_ms
 
             result = ExecutionResult(
                 success=(process.returncode == 0),
-                stdout=stdout.decode("utf-8", errors="replace"),
-                stderr=stderr.decode("utf-8", errors="replace"),
+                stdout=stdout_text,
+                stderr=stderr_text,
                 returncode=process.returncode,
                 audit=audit,
+                omitted_bytes=omitted,
             )
 
             if process.returncode != 0:
@@ -342,18 +600,20 @@ class SecureExecutor:
             audit.result = {
                 "success": result.success,
                 "returncode": result.returncode,
-                "stdout_len": len(result.stdout),
-                "stderr_len": len(result.stderr),
+                "stdout_len": output_bytes[0],
+                "stderr_len": output_bytes[1],
+                **({"omitted_bytes": omitted} if omitted else {}),
             }
 
-            self.audit_log.append(audit)
+            self._record(audit)
             logger.info(f"[AUDIT] DONE: {' '.join(argv)} -> {result.returncode} ({duration_ms}ms)")
 
             return result
 
         except asyncio.TimeoutError:
-            audit.result = {"error": "timeout"}
-            self.audit_log.append(audit)
+            killed = await self._kill_process(process, "timeout")
+            audit.result = {"error": "timeout", **({"killed": killed} if killed else {})}
+            self._record(audit)
             logger.error(f"[AUDIT] TIMEOUT: {' '.join(argv)}")
 
             return ExecutionResult(
@@ -363,9 +623,18 @@ class SecureExecutor:
                 audit=audit,
             )
 
+        except asyncio.CancelledError:
+            # Run annulé (cancel client, déconnexion, deadline): tuer l'enfant
+            await self._kill_process(process, "cancelled")
+            audit.result = {"error": "cancelled"}
+            audit.duration_ms = int((time.time() - start_time) * 1000)
+            self._record(audit)
+            logger.warning(f"[AUDIT] CANCELLED: {' '.join(argv)}")
+            raise
+
         except FileNotFoundError:
             audit.result = {"error": "not_found"}
-            self.audit_log.append(audit)
+            self._record(audit)
 
             return ExecutionResult(
                 success=False,
@@ -376,16 +645,74 @@ class SecureExecutor:
 
         except Exception as e:
             audit.result = {"error": str(e)}
-            self.audit_log.append(audit)
+            self._record(audit)
             logger.error(f"[AUDIT] ERROR: {' '.join(argv)} - {e}")
 
             return ExecutionResult(
                 success=False, error_code="E_EXEC_ERROR", error_message=str(e), audit=audit
             )
 
+    async def _read_output(
+        self, process: asyncio.subprocess.Process
+    ) -> Tuple[BoundedOutput, BoundedOutput]:
+        """
+        Lit stdout et stderr au fil de l'eau jusqu'à la fin du processus:
+        début et fin de chaque flux conservés, morceaux relayés à ``output_sink``.
+        """
+        sink = output_sink.get()
+        outputs = (BoundedOutput(), BoundedOutput())
+
+        async def pump(reader: asyncio.StreamReader, output: BoundedOutput, name: str) -> None:
+            while chunk := await reader.read(COMMAND_OUTPUT_READ_BYTES):
+                output.feed(chunk)
+                if sink is not None:
+                    sink(name, chunk)
+
+        await asyncio.gather(
+            pump(process.stdout, outputs[0], "stdout"),
+            pump(process.stderr, outputs[1], "stderr"),
+        )
+        await process.wait()
+        return outputs
+
+    async def _kill_process(
+        self, process: Optional[asyncio.subprocess.Process], reason: str
+    ) -> Optional[str]:
+        """
+        Arrête le groupe de processus de la commande (meneur et descendants):
+        SIGTERM, puis SIGKILL au groupe si le meneur n'est pas sorti après
+        COMMAND_KILL_GRACE_SECONDS ou si des descendants restent. Attend la fin
+        du meneur (pas de zombie).
+
+        Returns:
+            Dernier signal envoyé, None si le groupe était déjà vide
+        """
+        from app.core.config import settings
+
+        if process is None:
+            return None
+        # start_new_session: le pid du meneur est aussi l'identifiant du groupe
+        pgid = process.pid
+        if not _signal_group(pgid, signal.SIGTERM):
+            return None
+        killed = "SIGTERM"
+        try:
+            await asyncio.wait_for(process.wait(), timeout=settings.COMMAND_KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        # Meneur qui ignore SIGTERM ou descendants encore vivants
+        if _signal_group(pgid, signal.SIGKILL):
+            killed = "SIGKILL"
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            logger.error(f"[AUDIT] Process {process.pid} did not exit after SIGKILL")
+        record_command_kill(reason, killed)
+        return killed
+
     def get_audit_log(self, last_n: int = 50) -> List[Dict]:
-        """Récupère les dernières entrées d'audit"""
-        entries = self.audit_log[-last_n:]
+        """Récupère les dernières entrées d'audit (tampon en mémoire)"""
+        entries = list(self.audit_log)[-last_n:]
         return [
             {
                 "timestamp": e.timestamp.isoformat(),
@@ -401,8 +728,8 @@ class SecureExecutor:
 
     def clear_audit_log(self):
         """Vide le log d'audit (garder les 100 derniers)"""
-        if len(self.audit_log) > 100:
-            self.audit_log = self.audit_log[-100:]
+        while len(self.audit_log) > 100:
+            self.audit_log.popleft()
 
 
 # Instance globale
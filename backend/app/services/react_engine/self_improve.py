@@ -79,6 +79,7 @@ class SelfImproveEngine:
         "patch_file",
         "list_directory",
         "search_directory",
+        "search_content",
         "run_tests",
         "run_lint",
         "git_status",
@@ -0,0 +1,113 @@
+"""
+Tool Batch - Exécution d'un lot d'appels d'outils avec dépendances
+
+Les appels sans dépendance entre eux s'exécutent en parallèle (au plus
+``max_concurrency`` à la fois); un appel attend la fin des appels listés
+dans ``depends_on``. Si l'un d'eux échoue, l'appel n'est pas exécuté
+(E_DEPENDENCY_FAILED). Les résultats sont rendus dans l'ordre du lot, avec
+le début (relatif au lot) et la durée de chaque appel.
+
+Le lot est validé avant toute exécution: identifiants uniques, dépendances
+connues, pas de cycle (BatchError sinon).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class BatchError(ValueError):
+    """Lot invalide (identifiant dupliqué, dépendance inconnue, cycle)"""
+
+
+@dataclass
+class BatchCall:
+    id: str
+    tool: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+
+
+def validate_batch(calls: List[BatchCall]) -> None:
+    """Lève BatchError si le lot ne peut pas être ordonnancé"""
+    ids = set()
+    for call in calls:
+        if call.id in ids:
+            raise BatchError(f"Identifiant d'appel dupliqué: '{call.id}'")
+        ids.add(call.id)
+    for call in calls:
+        for dep in call.depends_on:
+            if dep not in ids:
+                raise BatchError(f"Appel '{call.id}': dépendance inconnue '{dep}'")
+            if dep == call.id:
+                raise BatchError(f"Appel '{call.id}': dépend de lui-même")
+
+    # Tri topologique (Kahn): les appels restants forment un cycle
+    pending = {call.id: set(call.depends_on) for call in calls}
+    ready = [call_id for call_id, deps in pending.items() if not deps]
+    while ready:
+        done = ready.pop()
+        del pending[done]
+        for call_id, deps in pending.items():
+            if done in deps:
+                deps.discard(done)
+                if not deps:
+                    ready.append(call_id)
+    if pending:
+        raise BatchError(f"Dépendances cycliques entre: {', '.join(sorted(pending))}")
+
+
+async def run_batch(
+    calls: List[BatchCall],
+    execute: Callable[[BatchCall], Awaitable[Dict[str, Any]]],
+    max_concurrency: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Exécute le lot et renvoie un résultat par appel, dans l'ordre du lot.
+
+    ``execute`` renvoie un dict avec au moins ``success``; ``id``,
+    ``started_ms`` et ``duration_ms`` y sont ajoutés.
+    """
+    validate_batch(calls)
+    loop = asyncio.get_running_loop()
+    done: Dict[str, asyncio.Future] = {call.id: loop.create_future() for call in calls}
+    slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    batch_start = time.perf_counter()
+
+    async def run_one(call: BatchCall) -> Dict[str, Any]:
+        try:
+            failed = [dep for dep in call.depends_on if not await done[dep]]
+            start = time.perf_counter()
+            if failed:
+                result = {
+                    "success": False,
+                    "tool": call.tool,
+                    "params": call.params,
+                    "result": None,
+                    "skipped": True,
+                    "error": {
+                        "code": "E_DEPENDENCY_FAILED",
+                        "message": f"Non exécuté: échec de {', '.join(failed)}",
+                        "recoverable": False,
+                    },
+                }
+            elif slots is None:
+                result = await execute(call)
+            else:
+                async with slots:
+                    start = time.perf_counter()
+                    result = await execute(call)
+            result["id"] = call.id
+            result["started_ms"] = int((start - batch_start) * 1000)
+            result["duration_ms"] = int((time.perf_counter() - start) * 1000)
+            done[call.id].set_result(bool(result["success"]))
+            return result
+        except BaseException:
+            if not done[call.id].done():
+                done[call.id].set_result(False)
+            raise
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(run_one(call)) for call in calls]
+    return [task.result() for task in tasks]
@@ -0,0 +1,164 @@
+"""
+Tool Limits - Limites déclaratives par outil, appliquées par ToolRegistry.execute
+
+- deadline: durée maximale d'une exécution. Un outil async est annulé; un
+  outil bloquant est abandonné (son thread termine en arrière-plan, le
+  résultat est ignoré)
+- taille maximale du résultat (``data`` sérialisé en JSON)
+- exécutions simultanées, globalement et par utilisateur: un appel attend
+  une place au plus TOOL_QUEUE_TIMEOUT_SECONDS
+
+Les champs non déclarés à l'enregistrement prennent les valeurs TOOL_*
+de la configuration (0 = pas de limite). L'utilisateur est celui passé à
+``execute(user_id=...)``, sinon celui du run courant (``current_user``,
+positionné par RunManager).
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# Propriétaire du run en cours (hérité par les tâches et les threads du pool)
+current_user: ContextVar[Optional[str]] = ContextVar("tool_user", default=None)
+
+# Limite atteinte → code d'erreur ToolResult
+LIMIT_ERRORS = {
+    "timeout": "E_TOOL_TIMEOUT",
+    "result_size": "E_RESULT_TOO_LARGE",
+    "concurrency": "E_TOOL_BUSY",
+    "user_concurrency": "E_TOOL_BUSY",
+}
+
+
+@dataclass(frozen=True)
+class ToolLimits:
+    timeout_s: Optional[float] = None  # Deadline d'une exécution
+    max_result_bytes: Optional[int] = None  # Taille max de data (JSON)
+    max_concurrent: Optional[int] = None  # Exécutions simultanées, tous utilisateurs
+    max_concurrent_per_user: Optional[int] = None  # Exécutions simultanées par utilisateur
+
+    def resolve(self) -> "ToolLimits":
+        """Champs non déclarés remplacés par les valeurs par défaut de la configuration"""
+        defaults = {
+            "timeout_s": settings.TOOL_TIMEOUT_SECONDS,
+            "max_result_bytes": settings.TOOL_MAX_RESULT_BYTES,
+            "max_concurrent": settings.TOOL_MAX_CONCURRENT,
+            "max_concurrent_per_user": settings.TOOL_MAX_CONCURRENT_PER_USER,
+        }
+        return ToolLimits(
+            **{
+                f.name: defaults[f.name] if getattr(self, f.name) is None else getattr(self, f.name)
+                for f in fields(self)
+            }
+        )
+
+
+class LimitExceeded(Exception):
+    """Limite d'outil atteinte (``limit``: clé de LIMIT_ERRORS)"""
+
+    def __init__(self, limit: str, message: str):
+        self.limit = limit
+        super().__init__(message)
+
+    @property
+    def code(self) -> str:
+        return LIMIT_ERRORS[self.limit]
+
+
+class _Gate:
+    def __init__(self, size: int):
+        self.semaphore = asyncio.Semaphore(size)
+        self.holders = 0  # Appels qui attendent ou tiennent une place
+
+
+class ConcurrencyGates:
+    """Sémaphores par outil et par (outil, utilisateur), retirés dès qu'ils sont libres"""
+
+    def __init__(self):
+        self._gates: Dict[Tuple[str, Optional[str]], _Gate] = {}
+
+    def in_use(self, tool: str, user: Optional[str] = None) -> int:
+        gate = self._gates.get((tool, user))
+        return gate.holders if gate else 0
+
+    @asynccontextmanager
+    async def hold(
+        self, tool: str, limits: ToolLimits, user: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Place globale puis place de l'utilisateur (LimitExceeded après l'attente max)"""
+        keys = []
+        if limits.max_concurrent:
+            keys.append(((tool, None), limits.max_concurrent, "concurrency"))
+        if limits.max_concurrent_per_user and user:
+            keys.append(((tool, user), limits.max_concurrent_per_user, "user_concurrency"))
+
+        held = []
+        try:
+            for key, size, limit in keys:
+                gate = self._gates.get(key)
+                if gate is None:
+                    gate = self._gates[key] = _Gate(size)
+                gate.holders += 1
+                held.append((key, gate, False))
+                try:
+                    if gate.semaphore.locked():
+                        await asyncio.wait_for(
+                            gate.semaphore.acquire(), settings.TOOL_QUEUE_TIMEOUT_SECONDS
+                        )
+                    else:
+                        await gate.semaphore.acquire()
+                except asyncio.TimeoutError:
+                    scope = "pour cet utilisateur" if limit == "user_concurrency" else "au total"
+                    raise LimitExceeded(
+                        limit,
+                        f"Outil '{tool}' saturé: {size} exécution(s) simultanée(s) max {scope}, "
+                        f"aucune place libérée en {settings.TOOL_QUEUE_TIMEOUT_SECONDS}s",
+                    ) from None
+                held[-1] = (key, gate, True)
+            yield
+        finally:
+            for key, gate, acquired in reversed(held):
+                if acquired:
+                    gate.semaphore.release()
+                gate.holders -= 1
+                if gate.holders == 0:
+                    self._gates.pop(key, None)
+
+
+@asynccontextmanager
+async def deadline(tool: str, seconds: Optional[float]) -> AsyncIterator[None]:
+    """Annule le bloc après ``seconds`` (LimitExceeded "timeout"); 0/None = sans limite"""
+    if not seconds:
+        yield
+        return
+    try:
+        async with asyncio.timeout(seconds) as scope:
+            yield
+    except TimeoutError:
+        if not scope.expired():
+            raise  # TimeoutError levée par l'outil lui-même
+        raise LimitExceeded(
+            "timeout", f"Outil '{tool}' interrompu: deadline de {seconds}s dépassée"
+        ) from None
+
+
+def check_result_size(tool: str, result: dict, max_bytes: Optional[int]) -> None:
+    """Lève LimitExceeded "result_size" si ``data`` sérialisé dépasse ``max_bytes``"""
+    if not max_bytes or result.get("data") is None:
+        return
+    size = len(json.dumps(result["data"], ensure_ascii=False, default=str).encode("utf-8"))
+    if size > max_bytes:
+        raise LimitExceeded(
+            "result_size",
+            f"Résultat de '{tool}' trop volumineux ({size} octets > {max_bytes}): "
+            "réduire la portée de l'appel (plage, page, filtre)",
+        )
+
+
+# Singleton instance
+tool_gates = ConcurrencyGates()
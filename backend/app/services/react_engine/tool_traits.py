@@ -0,0 +1,64 @@
+"""
+Tool Traits - Caractéristiques déclarées d'un outil
+
+ToolRegistry.register en déduit, une fois, les étapes de contrôle exécutées
+à chaque appel de l'outil:
+- isolation agent: tous les outils (si ENFORCE_AGENT_ISOLATION)
+- détection d'injection: outils qui prennent du texte libre (si
+  ENFORCE_PROMPT_INJECTION_DETECTION)
+- gouvernance (prepare_action + audit): outils sensibles, sauf les outils
+  en lecture seule sans accès réseau
+- audit seul (log_action): outils sensibles exemptés de la gouvernance, dont
+  chaque appel reste tracé
+
+Les champs non déclarés sont déduits de la catégorie, du nom et des
+paramètres de l'outil.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+# Outils soumis à la gouvernance par catégorie ou par nom
+SENSITIVE_CATEGORIES = frozenset({"system", "file", "network"})
+SENSITIVE_TOOLS = frozenset(
+    {"execute_command", "write_file", "delete_file", "git_commit", "git_push"}
+)
+
+# Types de paramètres (description) qui portent du texte libre
+FREE_TEXT_TYPES = ("string", "dict", "list")
+
+
+@dataclass(frozen=True)
+class ToolTraits:
+    read_only: Optional[bool] = None  # Aucun effet de bord
+    sensitive: Optional[bool] = None  # Soumis à la gouvernance
+    network: Optional[bool] = None  # Accès réseau sortant
+    free_text: Optional[bool] = None  # Paramètres texte à scanner (injection)
+
+    def resolve(self, name: str, category: str, parameters: Dict[str, Any]) -> "ToolTraits":
+        """Champs non déclarés déduits de l'enregistrement de l'outil"""
+        inferred = {
+            "read_only": False,
+            "sensitive": category in SENSITIVE_CATEGORIES or name in SENSITIVE_TOOLS,
+            "network": category == "network",
+            "free_text": any(
+                str(description).lstrip().startswith(FREE_TEXT_TYPES)
+                for description in parameters.values()
+            ),
+        }
+        return ToolTraits(
+            **{
+                key: inferred[key] if getattr(self, key) is None else getattr(self, key)
+                for key in inferred
+            }
+        )
+
+    @property
+    def governed(self) -> bool:
+        """Appels validés par la gouvernance (lecture locale exemptée)"""
+        return bool(self.sensitive and (self.network or not self.read_only))
+
+    @property
+    def audited(self) -> bool:
+        """Appels tracés dans l'audit (tout outil sensible, gouverné ou non)"""
+        return bool(self.sensitive)
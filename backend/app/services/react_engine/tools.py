@@ -10,31 +10,52 @@ Contrat uniforme ToolResult:
 """
 
 import asyncio
-import ipaddress
+import contextlib
+import contextvars
+import functools
 import logging
 import os
 import re
 import shlex
-import socket
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, TypedDict
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, quote_plus, unquote, urlparse
 
+import httpx
+
+from app.core.cancellation import CancellationToken, RunCancelled, cancel_scope
 from app.core.config import settings
-from app.core.metrics import record_tool_execution
+from app.core.metrics import (TOOL_EXECUTOR_INFLIGHT, ToolMetrics,
+                              record_tool_limit_hit)
+from app.core.system_sampler import SystemSample, system_sampler
+from app.services.agents.registry import AgentRegistry
 from app.services.audit_service import log_action
+from app.services.react_engine import (content_search, dir_listing,
+                                       file_reader, html_text, impact_analysis)
+from app.services.react_engine.git_state import GitError, git_state
 from app.services.react_engine.governance import (ActionCategory,
                                                   GovernanceError,
                                                   governance_manager)
 from app.services.react_engine.memory import MemoryCategory, durable_memory
+from app.services.react_engine.path_index import path_indexes
 from app.services.react_engine.prompt_injection_detector import (
     PromptInjectionError, prompt_injection_detector)
 from app.services.react_engine.runbooks import (RunbookCategory,
                                                 runbook_registry)
 from app.services.react_engine.secure_executor import (ExecutionRole,
                                                        secure_executor)
+from app.services.react_engine.tool_limits import (LimitExceeded, ToolLimits,
+                                                   check_result_size,
+                                                   current_user, deadline,
+                                                   tool_gates)
+from app.services.react_engine.tool_traits import ToolTraits
+from app.services.react_engine.url_guard import check_url
+from app.services.react_engine.web_client import (TooManyRedirects,
+                                                  URLForbidden, web_client)
 from app.services.websocket.event_emitter import event_emitter
 
 # ===== SECURITY: INPUT NORMALIZATION (CRQ-P0-7) =====
@@ -323,9 +344,50 @@ def is_path_in_workspace(path: str) -> tuple[bool, str]:
         return False, f"Erreur validation chemin: {e}"
 
 
+# ===== TOOL EXECUTOR =====
+
+_tool_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Pool borné des outils synchrones bloquants (créé au premier usage)"""
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ThreadPoolExecutor(
+            max_workers=settings.TOOL_EXECUTOR_WORKERS, thread_name_prefix="tool"
+        )
+    return _tool_executor
+
+
+def shutdown_tool_executor() -> None:
+    """Arrête le pool (appels en attente annulés, appels en cours non attendus)"""
+    global _tool_executor
+    if _tool_executor is not None:
+        _tool_executor.shutdown(wait=False, cancel_futures=True)
+        _tool_executor = None
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Exécute ``func`` dans le pool des outils, contextvars propagées"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    TOOL_EXECUTOR_INFLIGHT.inc()
+    try:
+        return await loop.run_in_executor(get_tool_executor(), call)
+    finally:
+        TOOL_EXECUTOR_INFLIGHT.dec()
+
+
 # ===== TOOL REGISTRY =====
 
 
+# Paramètres utilisés par le registry/la gouvernance, pas transmis aux outils
+FRAMEWORK_PARAMS = frozenset({"agent_id", "run_id", "justification"})
+
+# Outil sans limite de concurrence: pas de passage par tool_gates
+_UNGATED = contextlib.nullcontext()
+
+
 class ToolRegistry:
     """Registre des outils disponibles"""
 
@@ -339,17 +401,60 @@ class ToolRegistry:
         description: str,
         category: str = "general",
         parameters: Optional[Dict[str, Any]] = None,
+        blocking: Optional[bool] = None,
+        limits: Optional[ToolLimits] = None,
+        traits: Optional[ToolTraits] = None,
     ):
-        """Enregistre un nouvel outil"""
+        """
+        Enregistre un nouvel outil.
+
+        ``blocking``: un outil synchrone est exécuté dans le pool de threads
+        (défaut), sauf ``blocking=False`` pour les fonctions triviales en
+        mémoire, exécutées directement sur la boucle. Ignoré pour les outils async.
+
+        ``limits``: deadline, taille de résultat et concurrence propres à
+        l'outil (champs non renseignés: valeurs TOOL_* de la configuration).
+
+        ``traits``: lecture seule, sensible, réseau, texte libre (champs non
+        renseignés: déduits de la catégorie, du nom et des paramètres).
+
+        Limites, traits, étapes de contrôle et séries de métriques sont
+        résolus ici une fois pour toutes: ``execute`` ne fait que les appliquer.
+        """
+        is_async = asyncio.iscoroutinefunction(func)
+        parameters = parameters or {}
+        traits = (traits or ToolTraits()).resolve(name, category, parameters)
+        resolved_limits = (limits or ToolLimits()).resolve()
         self.tools[name] = {
             "name": name,
             "func": func,
             "description": description,
             "category": category,
-            "parameters": parameters or {},
+            "parameters": parameters,
+            "is_async": is_async,
+            "blocking": not is_async and (blocking is None or blocking),
+            "limits": limits or ToolLimits(),
+            "resolved_limits": resolved_limits,
+            "gated": bool(
+                resolved_limits.max_concurrent or resolved_limits.max_concurrent_per_user
+            ),
+            "traits": traits,
+            "stages": self._build_stages(traits),
+            "metrics": ToolMetrics(name),
             "usage_count": 0,
         }
 
+    def _build_stages(self, traits: ToolTraits) -> tuple:
+        """Étapes de contrôle exécutées avant l'outil, selon ses traits"""
+        stages = [self._check_agent]
+        if traits.free_text:
+            stages.append(self._scan_injection)
+        if traits.governed:
+            stages.append(self._govern)
+        elif traits.audited:
+            stages.append(self._audit)
+        return tuple(stages)
+
     def get(self, name: str) -> Optional[Dict[str, Any]]:
         """Récupère un outil"""
         return self.tools.get(name)
@@ -371,200 +476,228 @@ class ToolRegistry:
         """Liste les catégories"""
         return list(set(t["category"] for t in self.tools.values()))
 
-    async def execute(self, name: str, agent_id: Optional[str] = None, **kwargs) -> ToolResult:
+    async def execute(
+        self,
+        name: str,
+        agent_id: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        user_id: Optional[str] = None,
+        **kwargs,
+    ) -> ToolResult:
         """
-        Exécute un outil avec contrôle d'isolation agent et gouvernance
+        Exécute un outil avec contrôle d'isolation agent, gouvernance et limites
+
+        Seules les étapes retenues à l'enregistrement de l'outil sont
+        exécutées (voir ``_build_stages``); la première qui refuse l'appel
+        renvoie son erreur.
 
         Args:
             name: Nom de l'outil à exécuter
             agent_id: ID de l'agent (optionnel pour compatibilité)
+            cancel_token: Jeton d'annulation du run (interrompt l'outil async en cours)
+            user_id: Utilisateur pour les limites de concurrence (défaut: propriétaire du run)
             **kwargs: Paramètres de l'outil
 
         Returns:
             ToolResult avec succès/échec
         """
-        from app.core.config import settings
-        from app.services.agents.registry import AgentRegistry
-
-        tool = self.get(name)
+        tool = self.tools.get(name)
         if not tool:
             return fail("E_TOOL_NOT_FOUND", f"Outil '{name}' non trouvé")
 
-        # === CRQ-P0-1: Enforcer isolation agent ===
-        if settings.ENFORCE_AGENT_ISOLATION:
-            if not agent_id:
-                # Fail closed: agent_id requis si enforcement actif
-                logger.warning(f"Agent isolation enforced: tool '{name}' called without agent_id")
-                return fail(
-                    "E_AGENT_REQUIRED",
-                    "Agent ID required for tool execution (ENFORCE_AGENT_ISOLATION=true)",
-                )
+        if cancel_token is not None and cancel_token.cancelled:
+            return fail("E_CANCELLED", f"Run annulé ({cancel_token.reason})")
 
-            # Vérifier que l'agent existe
-            agent_registry = AgentRegistry()
-            agent = agent_registry.get(agent_id)
+        for stage in tool["stages"]:
+            refused = await stage(tool, agent_id, kwargs)
+            if refused is not None:
+                return refused
 
-            if not agent:
-                logger.error(f"Agent not found: {agent_id}")
-                return fail("E_AGENT_NOT_FOUND", f"Agent '{agent_id}' not found in registry")
+        return await self._run(tool, kwargs, cancel_token, user_id)
 
-            # Vérifier permissions agent
-            if not agent.can_use_tool(name):
-                # Log audit du refus
-                log_action(
-                    action="tool_denied",
-                    resource=name,
-                    allowed=False,
-                    role=agent_id,
-                    parameters=kwargs,
-                    result=f"Agent {agent_id} not authorized for tool {name}",
-                )
-                logger.warning(f"Agent '{agent_id}' DENIED access to tool '{name}'")
-                return fail(
-                    "E_AGENT_PERMISSION_DENIED",
-                    f"Agent '{agent_id}' is not authorized to use tool '{name}'",
-                )
+    # --- Étapes de contrôle (None = appel accepté) ---
 
-            logger.info(f"Agent '{agent_id}' authorized for tool '{name}'")
-
-        # === CRQ-P0-3: Détection d'injection de prompts ===
-        if settings.ENFORCE_PROMPT_INJECTION_DETECTION:
-            try:
-                # Scanner tous les paramètres pour injections
-                injection_results = prompt_injection_detector.scan_parameters(kwargs)
-
-                if injection_results:
-                    # Au moins une injection détectée
-                    for param_name, detection in injection_results.items():
-                        if prompt_injection_detector.should_block(detection):
-                            logger.warning(
-                                f"PROMPT INJECTION BLOCKED in tool '{name}' parameter '{param_name}': "
-                                f"severity={detection.severity.value}, confidence={detection.confidence:.2f}"
-                            )
+    async def _check_agent(
+        self, tool: Dict[str, Any], agent_id: Optional[str], kwargs: Dict[str, Any]
+    ) -> Optional[ToolResult]:
+        """CRQ-P0-1: Enforcer isolation agent"""
+        if not settings.ENFORCE_AGENT_ISOLATION:
+            return None
+        name = tool["name"]
 
-                            # Log audit
-                            log_action(
-                                action="prompt_injection_blocked",
-                                resource=name,
-                                allowed=False,
-                                role="security",
-                                parameters={
-                                    "parameter": param_name,
-                                    "severity": detection.severity.value,
-                                    "confidence": detection.confidence,
-                                    "patterns": len(detection.patterns_matched),
-                                },
-                                result=detection.reason,
-                            )
+        if not agent_id:
+            # Fail closed: agent_id requis si enforcement actif
+            logger.warning(f"Agent isolation enforced: tool '{name}' called without agent_id")
+            return fail(
+                "E_AGENT_REQUIRED",
+                "Agent ID required for tool execution (ENFORCE_AGENT_ISOLATION=true)",
+            )
 
-                            # Émettre event prompt_injection_blocked
-                            if hasattr(event_emitter, "emit_event"):
-                                try:
-                                    await event_emitter.emit_event(
-                                        event_type="prompt_injection_blocked",
-                                        run_id=kwargs.get("run_id", "unknown"),
-                                        data={
-                                            "tool_name": name,
-                                            "parameter": param_name,
-                                            "severity": detection.severity.value,
-                                            "confidence": detection.confidence,
-                                            "reason": detection.reason,
-                                        },
-                                    )
-                                except Exception as emit_error:
-                                    logger.error(
-                                        f"Failed to emit prompt_injection_blocked event: {emit_error}"
-                                    )
-
-                            return fail(
-                                "E_PROMPT_INJECTION",
-                                f"Potential prompt injection detected in parameter '{param_name}': {detection.reason}",
-                            )
+        # Vérifier que l'agent existe
+        agent_registry = AgentRegistry()
+        agent = agent_registry.get(agent_id)
+
+        if not agent:
+            logger.error(f"Agent not found: {agent_id}")
+            return fail("E_AGENT_NOT_FOUND", f"Agent '{agent_id}' not found in registry")
+
+        # Vérifier permissions agent
+        if not agent.can_use_tool(name):
+            # Log audit du refus
+            log_action(
+                action="tool_denied",
+                resource=name,
+                allowed=False,
+                role=agent_id,
+                parameters=kwargs,
+                result=f"Agent {agent_id} not authorized for tool {name}",
+            )
+            logger.warning(f"Agent '{agent_id}' DENIED access to tool '{name}'")
+            return fail(
+                "E_AGENT_PERMISSION_DENIED",
+                f"Agent '{agent_id}' is not authorized to use tool '{name}'",
+            )
 
-                        # Log détection non bloquante (LOW severity)
-                        logger.info(
-                            f"Prompt injection detected (not blocking) in '{name}.{param_name}': "
-                            f"severity={detection.severity.value}, confidence={detection.confidence:.2f}"
-                        )
+        logger.info(f"Agent '{agent_id}' authorized for tool '{name}'")
+        return None
 
-            except PromptInjectionError as inj_error:
-                # Exception explicite levée par le détecteur
-                logger.error(f"Prompt injection error: {inj_error}")
+    async def _scan_injection(
+        self, tool: Dict[str, Any], agent_id: Optional[str], kwargs: Dict[str, Any]
+    ) -> Optional[ToolResult]:
+        """CRQ-P0-3: Détection d'injection de prompts (outils à texte libre)"""
+        if not settings.ENFORCE_PROMPT_INJECTION_DETECTION:
+            return None
+        name = tool["name"]
 
-                if settings.ENFORCE_PROMPT_INJECTION_DETECTION:
-                    raise  # Re-raise pour bloquer
+        try:
+            # Scanner tous les paramètres pour injections
+            injection_results = prompt_injection_detector.scan_parameters(kwargs)
+
+            if injection_results:
+                # Au moins une injection détectée
+                for param_name, detection in injection_results.items():
+                    if prompt_injection_detector.should_block(detection):
+                        logger.warning(
+                            f"PROMPT INJECTION BLOCKED in tool '{name}' parameter '{param_name}': "
+                            f"severity={detection.severity.value}, confidence={detection.confidence:.2f}"
+                        )
 
-                # Mode legacy: log mais continue
-                logger.warning(f"Prompt injection (non bloquant, legacy mode): {inj_error}")
+                        # Log audit
+                        log_action(
+                            action="prompt_injection_blocked",
+                            resource=name,
+                            allowed=False,
+                            role="security",
+                            parameters={
+                                "parameter": param_name,
+                                "severity": detection.severity.value,
+                                "confidence": detection.confidence,
+                                "patterns": len(detection.patterns_matched),
+                            },
+                            result=detection.reason,
+                        )
 
-            except Exception as other_error:
-                # Erreurs inattendues dans la détection
-                logger.error(f"Error in prompt injection detection: {other_error}")
-                # Ne pas bloquer sur erreur de détection (fail open pour disponibilité)
+                        # Émettre event prompt_injection_blocked
+                        if hasattr(event_emitter, "emit_event"):
+                            try:
+                                await event_emitter.emit_event(
+                                    event_type="prompt_injection_blocked",
+                                    run_id=kwargs.get("run_id", "unknown"),
+                                    data={
+                                        "tool_name": name,
+                                        "parameter": param_name,
+                                        "severity": detection.severity.value,
+                                        "confidence": detection.confidence,
+                                        "reason": detection.reason,
+                                    },
+                                )
+                            except Exception as emit_error:
+                                logger.error(
+                                    f"Failed to emit prompt_injection_blocked event: {emit_error}"
+                                )
+
+                        return fail(
+                            "E_PROMPT_INJECTION",
+                            f"Potential prompt injection detected in parameter '{param_name}': {detection.reason}",
+                        )
 
-        # === CRQ-P0-2: Gouvernance bloquante (fail closed) ===
-        try:
-            # Déterminer la catégorie d'action
-            tool_category = tool.get("category", "utility")
-
-            # Outils sensibles nécessitant vérification
-            sensitive_categories = {"system", "file", "network"}
-            sensitive_tools = {
-                "execute_command",
-                "write_file",
-                "delete_file",
-                "git_commit",
-                "git_push",
-            }
+                    # Log détection non bloquante (LOW severity)
+                    logger.info(
+                        f"Prompt injection detected (not blocking) in '{name}.{param_name}': "
+                        f"severity={detection.severity.value}, confidence={detection.confidence:.2f}"
+                    )
 
-            if tool_category in sensitive_categories or name in sensitive_tools:
-                # FIX: Appel async correct avec bons paramètres
-                approved, context, message = await governance_manager.prepare_action(
-                    tool_name=name, params=kwargs, justification=kwargs.get("justification", "")
-                )
+        except PromptInjectionError as inj_error:
+            # Exception explicite levée par le détecteur
+            logger.error(f"Prompt injection error: {inj_error}")
 
-                if not approved:
-                    reason = message
-                    logger.warning(f"Gouvernance: action '{name}' bloquée - {reason}")
-
-                    # Persister le refus dans audit logs
-                    log_action(
-                        action="tool_execute",
-                        resource=name,
-                        allowed=False,
-                        role=tool_category,
-                        parameters=kwargs,
-                        result=reason,
-                    )
+            if settings.ENFORCE_PROMPT_INJECTION_DETECTION:
+                raise  # Re-raise pour bloquer
 
-                    # Émettre event governance_denied (CRQ-P0-2)
-                    if hasattr(event_emitter, "emit_event"):
-                        try:
-                            await event_emitter.emit_event(
-                                event_type="governance_denied",
-                                run_id=kwargs.get("run_id", "unknown"),
-                                data={
-                                    "tool_name": name,
-                                    "category": context.category.value,
-                                    "action_id": context.action_id,
-                                    "reason": reason,
-                                },
-                            )
-                        except Exception as emit_error:
-                            logger.error(f"Failed to emit governance_denied event: {emit_error}")
+            # Mode legacy: log mais continue
+            logger.warning(f"Prompt injection (non bloquant, legacy mode): {inj_error}")
 
-                    return fail("E_GOVERNANCE_DENIED", f"Action bloquée: {reason}")
+        except Exception as other_error:
+            # Erreurs inattendues dans la détection
+            logger.error(f"Error in prompt injection detection: {other_error}")
+            # Ne pas bloquer sur erreur de détection (fail open pour disponibilité)
+
+        return None
+
+    async def _govern(
+        self, tool: Dict[str, Any], agent_id: Optional[str], kwargs: Dict[str, Any]
+    ) -> Optional[ToolResult]:
+        """CRQ-P0-2: Gouvernance bloquante (fail closed), outils sensibles"""
+        name = tool["name"]
+        tool_category = tool.get("category", "utility")
+        try:
+            # FIX: Appel async correct avec bons paramètres
+            approved, context, message = await governance_manager.prepare_action(
+                tool_name=name, params=kwargs, justification=kwargs.get("justification", "")
+            )
 
-                logger.info(f"Gouvernance: action '{name}' autorisée")
+            if not approved:
+                reason = message
+                logger.warning(f"Gouvernance: action '{name}' bloquée - {reason}")
 
-                # Persister dans audit logs
+                # Persister le refus dans audit logs
                 log_action(
                     action="tool_execute",
                     resource=name,
-                    allowed=True,
+                    allowed=False,
                     role=tool_category,
                     parameters=kwargs,
+                    result=reason,
                 )
+
+                # Émettre event governance_denied (CRQ-P0-2)
+                if hasattr(event_emitter, "emit_event"):
+                    try:
+                        await event_emitter.emit_event(
+                            event_type="governance_denied",
+                            run_id=kwargs.get("run_id", "unknown"),
+                            data={
+                                "tool_name": name,
+                                "category": context.category.value,
+                                "action_id": context.action_id,
+                                "reason": reason,
+                            },
+                        )
+                    except Exception as emit_error:
+                        logger.error(f"Failed to emit governance_denied event: {emit_error}")
+
+                return fail("E_GOVERNANCE_DENIED", f"Action bloquée: {reason}")
+
+            logger.info(f"Gouvernance: action '{name}' autorisée")
+
+            # Persister dans audit logs
+            log_action(
+                action="tool_execute",
+                resource=name,
+                allowed=True,
+                role=tool_category,
+                parameters=kwargs,
+            )
         except GovernanceError as gov_error:
             # CRQ-P0-2: Fail closed - erreurs gouvernance BLOQUENT l'exécution
             if settings.ENFORCE_GOVERNANCE_BLOCKING:
@@ -596,64 +729,100 @@ class ToolRegistry:
             else:
                 # Mode legacy
                 logger.warning(f"Erreur gouvernance (non bloquant, legacy mode): {other_error}")
+        return None
+
+    async def _audit(
+        self, tool: Dict[str, Any], agent_id: Optional[str], kwargs: Dict[str, Any]
+    ) -> Optional[ToolResult]:
+        """Outil sensible en lecture seule: pas d'approbation, mais l'appel est tracé"""
+        log_action(
+            action="tool_execute",
+            resource=tool["name"],
+            allowed=True,
+            role=tool.get("category", "utility"),
+            parameters=kwargs,
+        )
+        return None
 
+    # --- Exécution ---
+
+    async def _run(
+        self,
+        tool: Dict[str, Any],
+        kwargs: Dict[str, Any],
+        cancel_token: Optional[CancellationToken],
+        user_id: Optional[str],
+    ) -> ToolResult:
+        """Exécute l'outil sous ses limites et enregistre ses métriques"""
+        name = tool["name"]
+        limits = tool["resolved_limits"]
+        metrics = tool["metrics"]
+        start = time.perf_counter()
         try:
             tool["usage_count"] += 1
             func = tool["func"]
 
             # Filtrer les paramètres framework (CRQ-P0-2)
-            # Ces paramètres sont utilisés par le registry/governance, pas par les tools
-            tool_kwargs = {
-                k: v for k, v in kwargs.items() if k not in ("agent_id", "run_id", "justification")
-            }
+            tool_kwargs = {k: v for k, v in kwargs.items() if k not in FRAMEWORK_PARAMS}
 
-            start = time.perf_counter()
-            if asyncio.iscoroutinefunction(func):
-                result = await func(**tool_kwargs)
-            else:
-                result = func(**tool_kwargs)
+            gate = (
+                tool_gates.hold(name, limits, user_id or current_user.get())
+                if tool["gated"]
+                else _UNGATED
+            )
+            async with gate:
+                if tool["is_async"]:
+                    async with cancel_scope(cancel_token), deadline(name, limits.timeout_s):
+                        result = await func(**tool_kwargs)
+                elif tool["blocking"]:
+                    # Hors de la boucle: le streaming des autres runs continue
+                    async with cancel_scope(cancel_token), deadline(name, limits.timeout_s):
+                        result = await run_blocking(func, **tool_kwargs)
+                else:
+                    result = func(**tool_kwargs)
+                    metrics.record_inline(time.perf_counter() - start)
             elapsed_ms = int((time.perf_counter() - start) * 1000)
 
             # Assurer le format ToolResult
             if isinstance(result, dict) and "success" in result:
+                check_result_size(name, result, limits.max_result_bytes)
                 result["meta"]["duration_ms"] = elapsed_ms
 
                 # Enregistrer métriques (PHASE 6)
                 error_code = result.get("error", {}).get("code") if not result["success"] else None
-                record_tool_execution(
-                    tool_name=name,
-                    duration_s=elapsed_ms / 1000,
-                    success=result["success"],
-                    error_code=error_code,
-                )
+                metrics.record(elapsed_ms / 1000, result["success"], error_code)
 
                 return result
             else:
                 # Legacy format - convertir
                 converted = ok(result, duration_ms=elapsed_ms)
+                check_result_size(name, converted, limits.max_result_bytes)
 
-                # Enregistrer métriques (PHASE 6)
-                record_tool_execution(
-                    tool_name=name,
-                    duration_s=elapsed_ms / 1000,
-                    success=True,  # Legacy format assume succès
-                    error_code=None,
-                )
+                # Enregistrer métriques (PHASE 6) - legacy format assume succès
+                metrics.record(elapsed_ms / 1000, True)
 
                 return converted
 
+        except LimitExceeded as e:
+            logger.warning(f"Tool limit hit ({name}): {e}")
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            record_tool_limit_hit(name, e.limit)
+            metrics.record(elapsed_ms / 1000, False, e.code)
+            return fail(e.code, str(e), duration_ms=elapsed_ms, limit=e.limit)
+
+        except RunCancelled as e:
+            logger.info(f"Tool execution cancelled ({name}): {e.reason}")
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            metrics.record(elapsed_ms / 1000, False, "E_CANCELLED")
+            return fail("E_CANCELLED", str(e))
+
         except Exception as e:
             logger.error(f"Tool execution error ({name}): {e}")
             error_result = fail("E_TOOL_EXEC", str(e))
 
             # Enregistrer métriques (PHASE 6) - échec exception
             elapsed_ms = int((time.perf_counter() - start) * 1000)
-            record_tool_execution(
-                tool_name=name,
-                duration_s=elapsed_ms / 1000,
-                success=False,
-                error_code="E_TOOL_EXEC",
-            )
+            metrics.record(elapsed_ms / 1000, False, "E_TOOL_EXEC")
 
             return error_result
 
@@ -694,6 +863,8 @@ async def execute_command(
     result = await secure_executor.execute(
         command=command, role=exec_role, timeout=timeout, cwd=settings.WORKSPACE_DIR
     )
+    # La commande a pu modifier le workspace ou le dépôt
+    git_state.invalidate()
 
     # Convertir en ToolResult pour compatibilité
     if result.success:
@@ -733,8 +904,26 @@ def get_audit_log(last_n: int = 20) -> ToolResult:
         return fail("E_AUDIT_ERROR", str(e))
 
 
-def read_file(path: str) -> ToolResult:
-    """Lit le contenu d'un fichier (sécurisé contre path traversal)"""
+def read_file(
+    path: str,
+    offset: Optional[int] = None,
+    length: Optional[int] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    tail: Optional[int] = None,
+) -> ToolResult:
+    """
+    Lit un fichier par morceaux bornés (sécurisé contre path traversal).
+
+    Modes (exclusifs):
+    - défaut: depuis le début, jusqu'à READ_FILE_MAX_BYTES
+    - offset/length: plage d'octets
+    - start_line/end_line: plage de lignes (1-based, incluses)
+    - tail: N dernières lignes
+
+    Le fichier n'est jamais chargé en entier: size, total_lines et
+    next_offset/next_line permettent au modèle de paginer.
+    """
     try:
         # Valider et résoudre le chemin de manière sécurisée
         is_valid, result = validate_and_resolve_path(path, settings.WORKSPACE_DIR)
@@ -743,17 +932,81 @@ def read_file(path: str) -> ToolResult:
 
         canonical_path = result
 
-        with open(canonical_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        try:
+            offset, length, start_line, end_line, tail = (
+                None if v in (None, "") else int(v)
+                for v in (offset, length, start_line, end_line, tail)
+            )
+        except (TypeError, ValueError):
+            return fail("E_INVALID_PARAMS", "offset, length, start_line, end_line, tail: entiers")
+
+        modes = [
+            m
+            for m, used in (
+                ("bytes", offset is not None or length is not None),
+                ("lines", start_line is not None or end_line is not None),
+                ("tail", tail is not None),
+            )
+            if used
+        ]
+        if len(modes) > 1:
+            return fail("E_INVALID_PARAMS", f"Modes de lecture exclusifs: {', '.join(modes)}")
+        if any(v is not None and v < 0 for v in (offset, length, tail)) or (
+            start_line is not None and start_line < 1
+        ):
+            return fail("E_INVALID_PARAMS", "Valeurs négatives (ou start_line < 1) interdites")
+        if end_line is not None and end_line < (start_line or 1):
+            return fail("E_INVALID_PARAMS", "end_line doit être >= start_line")
+
+        stat = os.stat(canonical_path)
+        size = stat.st_size
+        max_bytes = settings.READ_FILE_MAX_BYTES
+
+        with open(canonical_path, "rb") as f:
+            sample = f.read(file_reader.BINARY_SAMPLE_BYTES)
+        if file_reader.is_binary(sample):
+            return fail(
+                "E_BINARY_FILE",
+                f"Fichier binaire ({size} octets), contenu non affiché: {path}",
+            )
 
-        return ok(
-            {
-                "content": content,
-                "path": canonical_path,
-                "size": len(content),
-                "lines": content.count("\n") + 1,
-            }
+        if modes == ["lines"]:
+            chunk = file_reader.read_lines(
+                canonical_path, start_line or 1, end_line, size, max_bytes
+            )
+        elif modes == ["tail"]:
+            chunk = file_reader.read_tail(canonical_path, tail, size, max_bytes)
+        else:
+            chunk = file_reader.read_bytes(
+                canonical_path, offset or 0, min(length or max_bytes, max_bytes), size
+            )
+
+        total_lines, estimated = file_reader.count_lines(
+            canonical_path, size, settings.READ_FILE_LINE_COUNT_MAX_BYTES, stat.st_mtime_ns
         )
+        content = chunk.content
+        # Indices de pagination avant le contenu: le prompt ReAct tronque le JSON
+        data = {
+            "path": canonical_path,
+            "size": size,
+            "lines": content.count("\n") + (0 if content.endswith("\n") or not content else 1),
+            "total_lines": total_lines,
+            "offset": chunk.start,
+            "bytes_read": chunk.end - chunk.start,
+            "truncated": chunk.truncated,
+        }
+        if estimated:
+            data["total_lines_estimated"] = True
+        if chunk.first_line is not None:
+            data["start_line"] = chunk.first_line
+        if chunk.end < size and modes != ["tail"]:
+            data["next_offset"] = chunk.end
+            if chunk.first_line is not None:
+                data["next_line"] = chunk.first_line + content.count("\n")
+        data["content"] = content
+        return ok(data)
+    except IsADirectoryError:
+        return fail("E_INVALID_PATH", f"Chemin est un répertoire: {path}")
     except FileNotFoundError:
         return fail("E_FILE_NOT_FOUND", f"Fichier non trouvé: {path}")
     except PermissionError:
@@ -784,6 +1037,7 @@ def write_file(path: str, content: str, append: bool = False) -> ToolResult:
         mode = "a" if append else "w"
         with open(canonical_path, mode, encoding="utf-8") as f:
             f.write(content)
+        git_state.invalidate(canonical_path)
 
         return ok(
             {"path": canonical_path, "size": len(content), "mode": "append" if append else "write"}
@@ -794,8 +1048,27 @@ def write_file(path: str, content: str, append: bool = False) -> ToolResult:
         return fail("E_WRITE_ERROR", str(e))
 
 
-def list_directory(path: str = ".") -> ToolResult:
-    """Liste le contenu d'un répertoire (sécurisé contre path traversal)"""
+def list_directory(
+    path: str = ".",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    sort: str = "name",
+    fields: Any = None,
+    depth: Optional[int] = None,
+    per_dir: Optional[int] = None,
+) -> ToolResult:
+    """
+    Liste le contenu d'un répertoire (sécurisé contre path traversal).
+
+    Modes:
+    - défaut: une page de ``limit`` entrées; ``next_cursor`` donne la suivante
+    - depth >= 1: arbre sur ``depth`` niveaux, ``per_dir`` entrées max par
+      répertoire (``omitted`` = entrées non listées)
+
+    Les entrées n'ont que name/is_dir; ``fields`` ("size", "mtime") déclenche
+    un stat par entrée. sort: name, type (répertoires d'abord), size ou
+    mtime (plus gros / plus récents d'abord).
+    """
     try:
         # Valider et résoudre le chemin de manière sécurisée
         is_valid, result = validate_and_resolve_path(path, settings.WORKSPACE_DIR)
@@ -804,40 +1077,175 @@ def list_directory(path: str = ".") -> ToolResult:
 
         canonical_path = result
 
-        entries = []
-        for entry in os.scandir(canonical_path):
-            entries.append(
+        sort = sort or "name"
+        if sort not in dir_listing.SORT_KEYS:
+            return fail(
+                "E_INVALID_PARAMS",
+                f"sort invalide: {sort} (valides: {', '.join(dir_listing.SORT_KEYS)})",
+            )
+        try:
+            requested = dir_listing.parse_fields(fields)
+            limit, depth, per_dir = (
+                None if v in (None, "") else int(v) for v in (limit, depth, per_dir)
+            )
+        except (TypeError, ValueError) as e:
+            return fail("E_INVALID_PARAMS", f"Paramètres invalides: {e}")
+
+        if depth:
+            if cursor:
+                return fail("E_INVALID_PARAMS", "cursor non supporté en mode arbre (depth)")
+            depth = min(max(1, depth), settings.LIST_DIRECTORY_TREE_MAX_DEPTH)
+            per_dir = max(1, per_dir or settings.LIST_DIRECTORY_TREE_PER_DIR)
+            entries, count, omitted, truncated = dir_listing.list_tree(
+                canonical_path,
+                depth,
+                per_dir,
+                settings.LIST_DIRECTORY_TREE_MAX_ENTRIES,
+                sort,
+                requested,
+            )
+            return ok(
                 {
-                    "name": entry.name,
-                    "is_dir": entry.is_dir(),
-                    "size": entry.stat().st_size if entry.is_file() else 0,
+                    "path": canonical_path,
+                    "depth": depth,
+                    "count": count,
+                    "omitted": omitted,
+                    "truncated": truncated,
+                    "entries": entries,
                 }
             )
 
-        return ok({"path": canonical_path, "entries": entries, "count": len(entries)})
+        try:
+            after = dir_listing.decode_cursor(cursor, sort) if cursor else None
+        except ValueError as e:
+            return fail("E_INVALID_PARAMS", str(e))
+        limit = min(
+            max(1, limit or settings.LIST_DIRECTORY_PAGE_SIZE),
+            settings.LIST_DIRECTORY_MAX_PAGE_SIZE,
+        )
+
+        entries, total, next_key = dir_listing.list_page(
+            canonical_path, sort, after, limit, requested
+        )
+        return ok(
+            {
+                "path": canonical_path,
+                "count": len(entries),
+                "total": total,
+                "next_cursor": dir_listing.encode_cursor(sort, next_key) if next_key else None,
+                "entries": entries,
+            }
+        )
     except FileNotFoundError:
         return fail("E_DIR_NOT_FOUND", f"Répertoire non trouvé: {path}")
     except Exception as e:
         return fail("E_LIST_ERROR", str(e))
 
 
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "oui")
+    return bool(value)
+
+
+async def search_content(
+    pattern: str,
+    path: str = ".",
+    literal: bool = False,
+    ignore_case: bool = False,
+    glob: Optional[str] = None,
+    context: int = 2,
+    max_matches: Optional[int] = None,
+) -> ToolResult:
+    """
+    Recherche un motif dans le contenu des fichiers (équivalent borné de grep -rn).
+
+    Respecte les .gitignore, ignore les binaires et les fichiers trop gros.
+    Les fichiers sont examinés en parallèle dans un pool de threads; les
+    résultats sont triés par chemin et plafonnés à SEARCH_CONTENT_MAX_MATCHES
+    lignes (``truncated`` indique qu'il en reste).
+    """
+    is_valid, result = validate_and_resolve_path(path, settings.WORKSPACE_DIR)
+    if not is_valid:
+        return fail("E_PATH_FORBIDDEN", result)
+    base = result
+    if not os.path.isdir(base):
+        return fail("E_DIR_NOT_FOUND", f"Répertoire non trouvé: {path}")
+
+    try:
+        context = min(max(0, int(context)), 5)
+        limit = settings.SEARCH_CONTENT_MAX_MATCHES
+        if max_matches not in (None, ""):
+            limit = min(max(1, int(max_matches)), limit)
+    except (TypeError, ValueError):
+        return fail("E_INVALID_PARAMS", "context et max_matches: entiers")
+
+    try:
+        compiled = content_search.compile_pattern(
+            pattern, literal=_as_bool(literal), ignore_case=_as_bool(ignore_case)
+        )
+    except content_search.PatternError as e:
+        return fail("E_INVALID_PARAMS", str(e))
+
+    stop = threading.Event()
+    try:
+        files, stats = await asyncio.to_thread(
+            content_search.search,
+            base,
+            compiled,
+            glob=glob or None,
+            context=context,
+            max_matches=limit,
+            max_files=settings.SEARCH_CONTENT_MAX_FILES,
+            max_file_bytes=settings.SEARCH_CONTENT_MAX_FILE_BYTES,
+            workers=settings.SEARCH_CONTENT_WORKERS,
+            stop=stop,
+        )
+    except asyncio.CancelledError:
+        stop.set()  # Libère le pool au prochain fichier
+        raise
+
+    matches = [{"path": f.path, **m} for f in files for m in f.matches]
+    return ok(
+        {
+            "pattern": pattern,
+            "path": base,
+            "count": len(matches),
+            "files_matched": stats.files_matched,
+            "files_scanned": stats.files_scanned,
+            "skipped": stats.skipped,
+            "truncated": stats.truncated,
+            "matches": matches,
+        }
+    )
+
+
+def _recent_sample() -> Optional[SystemSample]:
+    """Dernier relevé de l'échantillonneur s'il date de moins de deux périodes"""
+    return system_sampler.latest(max_age=2 * system_sampler.interval)
+
+
 def get_system_info() -> ToolResult:
-    """Informations système"""
+    """Informations système (CPU, mémoire et disque: relevé de l'échantillonneur)"""
     import platform
 
     try:
         import psutil
 
+        # Sans échantillonneur actif, relevé à la demande (ajouté à la fenêtre)
+        sample = _recent_sample() or system_sampler.sample()
         return ok(
             {
                 "os": platform.system(),
                 "release": platform.release(),
                 "hostname": platform.node(),
                 "cpu_count": psutil.cpu_count(),
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-                "memory_used_percent": psutil.virtual_memory().percent,
-                "disk_usage_percent": psutil.disk_usage("/").percent,
+                "cpu_percent": sample.cpu_percent,
+                "load_average": sample.load_average,
+                "memory_total_gb": sample.memory_total_gb,
+                "memory_used_percent": sample.memory_used_percent,
+                "disk_usage_percent": sample.disk_usage_percent,
+                "sampled_at": datetime.fromtimestamp(sample.timestamp, timezone.utc).isoformat(),
                 "workspace": settings.WORKSPACE_DIR,
                 "execute_mode": settings.EXECUTE_MODE,
             }
@@ -854,6 +1262,40 @@ def get_system_info() -> ToolResult:
         )
 
 
+async def get_system_metrics(history: int = 0, processes: bool = True) -> ToolResult:
+    """
+    Ressources système relevées en tâche de fond (SYSTEM_SAMPLER_*).
+
+    Renvoie le dernier relevé (CPU, charge, mémoire, disque, débits disque et
+    réseau, processus les plus gourmands) et, avec ``history``, les N relevés
+    précédents sans les processus. Lecture en mémoire: psutil n'est appelé
+    que si l'échantillonneur n'a pas de relevé récent.
+    """
+    try:
+        count = min(max(0, int(history or 0)), settings.SYSTEM_SAMPLER_WINDOW)
+    except (TypeError, ValueError):
+        return fail("E_INVALID_PARAMS", "history: entier")
+
+    sample = _recent_sample()
+    if sample is None:
+        try:
+            sample = await run_blocking(system_sampler.sample)
+        except ImportError:
+            return fail("E_IMPORT", "psutil non installé")
+
+    previous = []
+    if count:
+        previous = [s for s in system_sampler.history(count + 1) if s is not sample][-count:]
+    return ok(
+        {
+            "sampler_running": system_sampler.running,
+            "interval_seconds": system_sampler.interval,
+            "latest": sample.to_dict(processes=_as_bool(processes)),
+            "history": [s.to_dict(processes=False) for s in previous],
+        }
+    )
+
+
 def get_datetime() -> ToolResult:
     """Date et heure actuelles"""
     now = datetime.now(timezone.utc)
@@ -903,70 +1345,8 @@ def calculate(expression: str) -> ToolResult:
         return fail("E_CALC_ERROR", str(e))
 
 
-def is_url_safe(url: str) -> tuple[bool, str]:
-    """
-    Valide qu'une URL est sûre pour éviter les attaques SSRF.
-
-    SECURITY: Bloque l'accès à:
-    - localhost, 127.0.0.1, ::1, 0.0.0.0
-    - IP privées (10.x, 172.16-31.x, 192.168.x, fd00::/8)
-    - IP link-local (169.254.0.0/16 - métadonnées cloud AWS/GCP/Azure)
-    - Loopback addresses
-
-    Args:
-        url: URL à valider
-
-    Returns:
-        (is_safe, reason) - (True, "") si OK, (False, "raison") si bloqué
-    """
-    try:
-        parsed = urlparse(url)
-        hostname = parsed.hostname
-
-        if not hostname:
-            return False, "URL invalide: pas de hostname"
-
-        # Bloquer localhost explicitement
-        if hostname.lower() in ["localhost", "127.0.0.1", "::1", "0.0.0.0", "[::1]"]:
-            return False, f"Accès à localhost interdit: {hostname}"
-
-        # Tenter de résoudre l'IP
-        try:
-            # Si c'est déjà une IP
-            ip = ipaddress.ip_address(hostname)
-        except ValueError:
-            # C'est un nom de domaine, le résoudre
-            try:
-                resolved_ip = socket.gethostbyname(hostname)
-                ip = ipaddress.ip_address(resolved_ip)
-            except (socket.gaierror, socket.error):
-                # Ne peut pas résoudre - peut-être DNS externe, autoriser
-                # mais logger pour monitoring
-                logger.info(f"DNS resolution échouée pour {hostname}, autorisation par défaut")
-                return True, ""
-
-        # Bloquer IP privées (10.0.0.0/8, 172.16.0.0/12, 192.168.0.0/16)
-        if ip.is_private:
-            return False, f"Accès à IP privée interdit: {ip}"
-
-        # Bloquer link-local (169.254.0.0/16 - métadonnées cloud!)
-        if ip.is_link_local:
-            return False, f"Accès à IP link-local interdit (métadonnées cloud AWS/GCP/Azure): {ip}"
-
-        # Bloquer loopback (127.0.0.0/8, ::1/128)
-        if ip.is_loopback:
-            return False, f"Accès à loopback interdit: {ip}"
-
-        # Bloquer multicast/reserved
-        if ip.is_multicast or ip.is_reserved:
-            return False, f"Accès à IP multicast/reserved interdit: {ip}"
-
-        # URL sûre
-        return True, ""
-
-    except Exception as e:
-        logger.error(f"Erreur validation URL {url}: {e}")
-        return False, f"Erreur validation URL: {str(e)}"
+# Corps de réponse max renvoyé par http_request
+HTTP_REQUEST_MAX_BODY = 10000
 
 
 async def http_request(url: str, method: str = "GET", data: Optional[Dict] = None) -> ToolResult:
@@ -976,51 +1356,73 @@ async def http_request(url: str, method: str = "GET", data: Optional[Dict] = Non
     SECURITY: Validation anti-SSRF activée
     - Bloque localhost, IP privées, métadonnées cloud
     - Timeout 30 secondes
-    - Corps limité à 10KB
+    - Corps limité à 10KB (téléchargement interrompu au-delà)
+
+    Les GET passent par le cache de web_client: une réponse avec ETag ou
+    Last-Modified est revalidée (304) plutôt que retéléchargée.
     """
-    # SECURITY: Valider l'URL AVANT la requête
-    is_safe, reason = is_url_safe(url)
-    if not is_safe:
-        logger.warning(f"🔒 SSRF attempt blocked: {url} - {reason}")
-        return fail("E_URL_FORBIDDEN", f"URL interdite: {reason}")
-    try:
-        import httpx
-    except ImportError:
-        return fail("E_IMPORT", "httpx non installé")
+    method = method.upper()
+    if method not in ("GET", "POST"):
+        return fail("E_HTTP_METHOD", f"Méthode non supportée: {method}")
 
     try:
-        async with httpx.AsyncClient(timeout=settings.TIMEOUT_HTTP_REQUEST) as client:
-            if method.upper() == "GET":
-                response = await client.get(url)
-            elif method.upper() == "POST":
-                response = await client.post(url, json=data)
-            else:
-                return fail("E_HTTP_METHOD", f"Méthode non supportée: {method}")
-
-            return ok(
-                {
-                    "status_code": response.status_code,
-                    "headers": dict(response.headers),
-                    "body": response.text[:10000],
-                }
-            )
+        # SECURITY: URL validée (check_url) avant connexion, adresse épinglée
+        response = await web_client.fetch(
+            url,
+            method,
+            json=data if method == "POST" else None,
+            max_bytes=HTTP_REQUEST_MAX_BODY,
+            timeout=settings.TIMEOUT_HTTP_REQUEST,
+            url_check=check_url,
+        )
+    except URLForbidden as e:
+        logger.warning(f"🔒 SSRF attempt blocked: {url} - {e}")
+        return fail("E_URL_FORBIDDEN", f"URL interdite: {e}")
     except httpx.TimeoutException:
         return fail("E_HTTP_TIMEOUT", "Timeout HTTP")
     except Exception as e:
         return fail("E_HTTP_ERROR", str(e))
 
+    return ok(
+        {
+            "status_code": response.status_code,
+            "headers": response.headers,
+            "truncated": response.truncated,
+            "body": response.text(),
+        }
+    )
+
 
 def search_files(pattern: str, path: str = ".") -> ToolResult:
-    """Recherche des fichiers par pattern"""
+    """
+    Recherche des fichiers par pattern.
+
+    Répond depuis l'index des chemins si ``path`` est sous une racine indexée
+    (les répertoires PATH_INDEX_EXCLUDE_DIRS n'y figurent pas), sinon glob récursif.
+    """
     import glob
 
     try:
         if not os.path.isabs(path):
             path = os.path.join(settings.WORKSPACE_DIR, path)
 
-        matches = glob.glob(os.path.join(path, "**", pattern), recursive=True)
+        indexed = path_indexes.lookup(path)
+        if indexed is not None:
+            index, rel = indexed
+            offset = len(rel) + 1 if rel else 0
+            matches = [os.path.join(path, p[offset:]) for p in index.glob(pattern, under=rel)]
+            source = "index"
+        else:
+            matches = glob.glob(os.path.join(path, "**", pattern), recursive=True)
+            source = "scan"
         return ok(
-            {"pattern": pattern, "path": path, "matches": matches[:100], "count": len(matches)}
+            {
+                "pattern": pattern,
+                "path": path,
+                "matches": matches[:100],
+                "count": len(matches),
+                "source": source,
+            }
         )
     except Exception as e:
         return fail("E_SEARCH_ERROR", str(e))
@@ -1050,10 +1452,13 @@ def search_directory(name: str, base: str = None, max_depth: int = SEARCH_MAX_DE
 
     SÉCURITÉ:
     - Base allowlistée uniquement
-    - Profondeur limitée (défaut: 3)
+    - Profondeur limitée (défaut: 3) pour le parcours disque
     - Nombre de résultats limité (5)
     - Pas de scan global illimité
 
+    Si la base est sous une racine indexée, la recherche se fait dans l'index
+    à toute profondeur (noms exacts d'abord, puis les moins profonds).
+
     Args:
         name: Nom du répertoire à chercher (exact ou partiel)
         base: Répertoire de base (défaut: WORKSPACE_DIR, doit être dans l'allowlist)
@@ -1096,9 +1501,38 @@ def search_directory(name: str, base: str = None, max_depth: int = SEARCH_MAX_DE
     if not os.path.isdir(base_resolved):
         return fail("E_BASE_NOT_FOUND", f"Répertoire de base non trouvé: {base_resolved}")
 
+    name_lower = name.lower()
+
+    indexed = path_indexes.lookup(base_resolved)
+    if indexed is not None:
+        index, rel = indexed
+        base_depth = rel.count("/") + 1 if rel else 0
+        found = sorted(
+            index.find_dirs(name, under=rel),
+            key=lambda p: (p.rsplit("/", 1)[-1].lower() != name_lower, p.count("/"), p),
+        )
+        matches = [
+            {
+                "path": os.path.join(index.root, p),
+                "name": p.rsplit("/", 1)[-1],
+                "depth": p.count("/") - base_depth,
+            }
+            for p in found[:SEARCH_MAX_RESULTS]
+        ]
+        return ok(
+            {
+                "query": name,
+                "base": base_resolved,
+                "max_depth": None,
+                "matches": matches,
+                "count": len(matches),
+                "suggestion": matches[0]["path"] if matches else None,
+                "source": "index",
+            }
+        )
+
     # Rechercher les répertoires
     matches = []
-    name_lower = name.lower()
 
     def search_recursive(current_path: str, current_depth: int):
         if current_depth > max_depth or len(matches) >= SEARCH_MAX_RESULTS:
@@ -1240,20 +1674,90 @@ async def list_llm_models() -> ToolResult:
 
 
 async def git_status() -> ToolResult:
-    """Affiche le statut Git du workspace"""
-    return await execute_command("git status --porcelain", timeout=settings.TIMEOUT_GIT)
+    """
+    Affiche le statut Git du workspace (branche, suivi, fichiers modifiés).
+    Mis en cache tant que le dépôt ne change pas (``cached``).
+    """
+    try:
+        return ok(await git_state.status(settings.WORKSPACE_DIR))
+    except GitError as e:
+        return fail(e.code, str(e))
+
+
+async def git_diff(
+    staged: bool = False,
+    path: str = "",
+    stat_only: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> ToolResult:
+    """
+    Affiche les différences Git, paginées par fichier.
 
+    ``stat`` et ``files`` donnent les lignes ajoutées/supprimées; ``stdout``
+    contient le patch des fichiers de la page (sauf ``stat_only``), coupé
+    par fichier et par page. ``next_offset`` donne la page suivante.
+    """
+    try:
+        offset, limit, max_bytes = (
+            v if v in (None, "") else int(v) for v in (offset, limit, max_bytes)
+        )
+    except (TypeError, ValueError) as e:
+        return fail("E_INVALID_PARAMS", f"Paramètres invalides: {e}")
+    try:
+        return ok(
+            await git_state.diff(
+                settings.WORKSPACE_DIR,
+                staged=bool(staged),
+                pathspec=path or "",
+                stat_only=bool(stat_only),
+                offset=offset or 0,
+                limit=limit,
+                max_bytes=max_bytes,
+            )
+        )
+    except GitError as e:
+        return fail(e.code, str(e))
 
-async def git_diff(staged: bool = False) -> ToolResult:
-    """Affiche les différences Git"""
-    cmd = "git diff --staged" if staged else "git diff"
-    return await execute_command(cmd, timeout=settings.TIMEOUT_GIT_DIFF)
 
+async def git_log(
+    cursor: Optional[str] = None, limit: Optional[int] = None, path: str = ""
+) -> ToolResult:
+    """
+    Historique Git du workspace, du plus récent au plus ancien.
+    ``next_cursor`` donne la page suivante (stable si HEAD avance entre-temps).
+    """
+    try:
+        limit = None if limit in (None, "") else int(limit)
+    except (TypeError, ValueError) as e:
+        return fail("E_INVALID_PARAMS", f"Paramètres invalides: {e}")
+    try:
+        return ok(
+            await git_state.log(
+                settings.WORKSPACE_DIR, cursor=cursor or None, limit=limit, pathspec=path or ""
+            )
+        )
+    except GitError as e:
+        return fail(e.code, str(e))
 
-async def run_tests(target: str = "backend") -> ToolResult:
+
+# Fin de sortie conservée par shard (les échecs et le résumé pytest sont en fin)
+RUN_TESTS_SHARD_OUTPUT_CHARS = 10000
+
+
+async def run_tests(
+    target: str = "backend",
+    mode: str = "full",
+    shards: int = 1,
+    changed: Optional[List[str]] = None,
+) -> ToolResult:
     """
     Exécute les tests.
     target: backend | frontend | all
+    mode: full | impact (backend: seulement les tests touchés par les fichiers
+    modifiés, ``changed`` ou git status du workspace, + échecs du run précédent)
+    shards: nombre de sous-processus pytest parallèles (backend)
     """
     commands = {
         "backend": "python3 -m pytest -q --tb=short",
@@ -1265,8 +1769,137 @@ async def run_tests(target: str = "backend") -> ToolResult:
         return fail(
             "E_INVALID_TARGET", f"Target invalide: {target}. Utiliser: backend, frontend, all"
         )
+    if mode not in ("full", "impact"):
+        return fail("E_INVALID_PARAMS", f"Mode invalide: {mode}. Utiliser: full, impact")
+    try:
+        shards = int(shards or 1)
+    except (TypeError, ValueError) as e:
+        return fail("E_INVALID_PARAMS", f"Paramètres invalides: {e}")
+
+    if mode == "full" and shards <= 1:
+        return await execute_command(commands[target], timeout=settings.TIMEOUT_TESTS)
+    if target != "backend":
+        return fail("E_INVALID_PARAMS", "Les modes impact et shards ne s'appliquent qu'à backend")
+    if isinstance(changed, str):
+        changed = [p.strip() for p in changed.split(",") if p.strip()]
+    return await _run_selected_tests(mode, shards, changed)
+
+
+async def _changed_files(root: str) -> List[str]:
+    """Fichiers modifiés selon git status, relatifs au workspace"""
+    status = await git_state.status(root)
+    changed = []
+    for entry in status["files"]:
+        for path in (entry["path"], entry.get("old_path")):
+            if not path:
+                continue
+            rel = os.path.relpath(os.path.join(status["repo"], path), root).replace(os.sep, "/")
+            if not rel.startswith("../"):
+                changed.append(rel)
+    return changed
+
+
+async def _run_selected_tests(
+    mode: str, shards: int, changed: Optional[List[str]]
+) -> ToolResult:
+    """
+    run_tests en mode impact (tests touchés par les fichiers modifiés) et/ou
+    shardé (N sous-processus pytest en parallèle, via SecureExecutor).
+    """
+    root = settings.WORKSPACE_DIR
+    start = time.perf_counter()
+    if mode == "impact" and changed is None:
+        try:
+            changed = await _changed_files(root)
+        except GitError as e:
+            return fail(e.code, f"Fichiers modifiés indisponibles: {e}")
+
+    analyzer = impact_analysis.get_analyzer(root)
+    selection = await run_blocking(analyzer.plan, changed if mode == "impact" else None)
+    report = {
+        "mode": mode,
+        "changed": sorted(changed or []),
+        "selected": len(selection.tests),
+        "skipped": selection.skipped,
+        "total_test_files": selection.total,
+        "full": selection.full,
+        "tests": selection.tests,
+        "reasons": selection.reasons,
+    }
+    if not selection.tests:
+        report.update(
+            {
+                "shards": [],
+                "wall_ms": int((time.perf_counter() - start) * 1000),
+                "stdout": "Aucun test impacté par les fichiers modifiés\n",
+                "stderr": "",
+                "returncode": 0,
+            }
+        )
+        return ok(report)
+
+    groups = impact_analysis.split_shards(
+        selection.tests, min(shards, settings.RUN_TESTS_MAX_SHARDS), root
+    )
+
+    async def run_shard(files: List[str]) -> Dict[str, Any]:
+        shard_start = time.perf_counter()
+        result = await secure_executor.execute(
+            command=shlex.join(["python3", "-m", "pytest", "-q", "--tb=short", *files]),
+            role=ExecutionRole.OPERATOR,
+            timeout=settings.TIMEOUT_TESTS,
+            cwd=root,
+        )
+        lines = result.stdout.strip().splitlines()
+        return {
+            "files": files,
+            "success": result.success,
+            "returncode": result.returncode,
+            "error_code": result.error_code,
+            "error_message": result.error_message,
+            "duration_ms": int((time.perf_counter() - shard_start) * 1000),
+            "summary": lines[-1] if lines else "",
+            "stdout": result.stdout[-RUN_TESTS_SHARD_OUTPUT_CHARS:],
+            "stderr": result.stderr[-RUN_TESTS_SHARD_OUTPUT_CHARS:],
+        }
 
-    return await execute_command(commands[target], timeout=settings.TIMEOUT_TESTS)
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(run_shard(files)) for files in groups]
+    results = [task.result() for task in tasks]
+    git_state.invalidate()
+
+    # Un shard non exécuté (refusé, timeout) ne dit rien de ses tests
+    ran = [f for r in results if r["error_code"] in (None, "E_CMD_FAILED") for f in r["files"]]
+    await run_blocking(analyzer.finish, [r["stdout"] for r in results], ran)
+
+    report.update(
+        {
+            "shards": [
+                {k: r[k] for k in ("files", "returncode", "duration_ms", "summary")}
+                for r in results
+            ],
+            "wall_ms": int((time.perf_counter() - start) * 1000),
+            "stdout": "".join(r["stdout"] for r in results),
+            "stderr": "".join(r["stderr"] for r in results),
+            "returncode": max((r["returncode"] for r in results), key=abs),
+        }
+    )
+    failed = [r for r in results if not r["success"]]
+    if not failed:
+        return ok(report)
+    # Erreur d'exécution (commande refusée, timeout): son code prime sur l'échec des tests
+    error = next((r for r in failed if r["error_code"] != "E_CMD_FAILED"), failed[0])
+    message = "; ".join(
+        f"shard {results.index(r) + 1}/{len(results)}: {r['summary'] or r['error_message']}"
+        for r in failed
+    )
+    if error["error_code"] == "E_CMD_FAILED":
+        message += "\n" + error["stdout"][-2000:]
+    return fail(
+        error["error_code"] or "E_CMD_ERROR",
+        message,
+        **{k: v for k, v in report.items() if k not in ("stdout", "stderr")},
+    )
 
 
 async def run_lint(target: str = "backend") -> ToolResult:
@@ -1358,16 +1991,49 @@ BUILTIN_TOOLS.register(
 )
 
 BUILTIN_TOOLS.register(
-    "get_system_info", get_system_info, "Obtient les informations système", "system", {}
+    "get_system_info",
+    get_system_info,
+    "Obtient les informations système",
+    "system",
+    {},
+    traits=ToolTraits(read_only=True),
 )
 
 BUILTIN_TOOLS.register(
-    "get_datetime", get_datetime, "Obtient la date et l'heure actuelles", "utility", {}
+    "get_system_metrics",
+    get_system_metrics,
+    "Ressources système relevées en continu: dernier relevé et historique récent",
+    "system",
+    {
+        "history": "int (optional, default=0): Nombre de relevés précédents à inclure",
+        "processes": "bool (optional, default=true): Inclure les processus les plus gourmands",
+    },
+    traits=ToolTraits(read_only=True),
+)
+
+BUILTIN_TOOLS.register(
+    "get_datetime",
+    get_datetime,
+    "Obtient la date et l'heure actuelles",
+    "utility",
+    {},
+    blocking=False,
 )
 
 # Outils filesystem
 BUILTIN_TOOLS.register(
-    "read_file", read_file, "Lit le contenu d'un fichier", "filesystem", {"path": "string"}
+    "read_file",
+    read_file,
+    "Lit un fichier par morceaux bornés (plage d'octets, de lignes ou fin du fichier)",
+    "filesystem",
+    {
+        "path": "string",
+        "offset": "int (optional): Offset en octets (avec length)",
+        "length": "int (optional): Nombre d'octets à lire",
+        "start_line": "int (optional): Première ligne (1-based)",
+        "end_line": "int (optional): Dernière ligne incluse",
+        "tail": "int (optional): N dernières lignes",
+    },
 )
 
 BUILTIN_TOOLS.register(
@@ -1381,9 +2047,17 @@ BUILTIN_TOOLS.register(
 BUILTIN_TOOLS.register(
     "list_directory",
     list_directory,
-    "Liste le contenu d'un répertoire",
+    "Liste un répertoire par pages (curseur) ou en arbre borné (depth)",
     "filesystem",
-    {"path": "string (optional)"},
+    {
+        "path": "string (optional)",
+        "cursor": "string (optional): next_cursor de la page précédente",
+        "limit": "int (optional): Entrées par page",
+        "sort": "string (optional): name | type | size | mtime",
+        "fields": "string (optional): size,mtime (stat par entrée)",
+        "depth": "int (optional): Mode arbre, niveaux à développer",
+        "per_dir": "int (optional): Mode arbre, entrées max par répertoire",
+    },
 )
 
 BUILTIN_TOOLS.register(
@@ -1394,6 +2068,22 @@ BUILTIN_TOOLS.register(
     {"pattern": "string", "path": "string (optional)"},
 )
 
+BUILTIN_TOOLS.register(
+    "search_content",
+    search_content,
+    "Recherche un motif (regex ou texte) dans le contenu des fichiers, .gitignore respecté",
+    "filesystem",
+    {
+        "pattern": "string: Regex (ou texte si literal=true)",
+        "path": "string (optional): Répertoire de départ",
+        "literal": "bool (optional)",
+        "ignore_case": "bool (optional)",
+        "glob": "string (optional): Filtre de fichiers (ex: *.py)",
+        "context": "int (optional, default=2, max=5): Lignes de contexte",
+        "max_matches": "int (optional)",
+    },
+)
+
 BUILTIN_TOOLS.register(
     "search_directory",
     search_directory,
@@ -1417,6 +2107,7 @@ BUILTIN_TOOLS.register(
     "Effectue une requête HTTP",
     "network",
     {"url": "string", "method": "string (optional)", "data": "dict (optional)"},
+    limits=ToolLimits(timeout_s=settings.TIMEOUT_HTTP_REQUEST * 2, max_concurrent_per_user=4),
 )
 
 # Outil LLM Models
@@ -1426,13 +2117,43 @@ BUILTIN_TOOLS.register(
     "Liste les modèles LLM disponibles avec catégorisation (général, code, vision, embedding, cloud)",
     "system",
     {},
+    traits=ToolTraits(read_only=True),
 )
 
 # Outils QA (v6.1)
-BUILTIN_TOOLS.register("git_status", git_status, "Affiche le statut Git du workspace", "qa", {})
+BUILTIN_TOOLS.register(
+    "git_status",
+    git_status,
+    "Affiche le statut Git du workspace (branche, avance/retard, fichiers modifiés)",
+    "qa",
+    {},
+)
 
 BUILTIN_TOOLS.register(
-    "git_diff", git_diff, "Affiche les différences Git", "qa", {"staged": "bool (optional)"}
+    "git_diff",
+    git_diff,
+    "Affiche les différences Git, paginées par fichier, avec statistiques",
+    "qa",
+    {
+        "staged": "bool (optional)",
+        "path": "string (optional): Limiter à un fichier ou répertoire",
+        "stat_only": "bool (optional, default=false): Statistiques seules, sans patch",
+        "offset": "int (optional, default=0): Premier fichier de la page (next_offset)",
+        "limit": f"int (optional, default={settings.GIT_DIFF_PAGE_SIZE}): Fichiers par page",
+        "max_bytes": f"int (optional, default={settings.GIT_DIFF_MAX_BYTES}): Octets de patch max",
+    },
+)
+
+BUILTIN_TOOLS.register(
+    "git_log",
+    git_log,
+    "Historique Git paginé (hash, auteur, date, sujet)",
+    "qa",
+    {
+        "cursor": "string (optional): next_cursor de la page précédente",
+        "limit": f"int (optional, default={settings.GIT_LOG_PAGE_SIZE}): Commits par page",
+        "path": "string (optional): Commits touchant ce fichier ou répertoire",
+    },
 )
 
 BUILTIN_TOOLS.register(
@@ -1440,7 +2161,15 @@ BUILTIN_TOOLS.register(
     run_tests,
     "Exécute les tests (pytest pour backend, npm test pour frontend)",
     "qa",
-    {"target": "string: backend|frontend|all"},
+    {
+        "target": "string: backend|frontend|all",
+        "mode": "string (optional, default=full): full|impact (tests touchés par les modifications)",
+        "shards": f"int (optional, default=1, max={settings.RUN_TESTS_MAX_SHARDS}): "
+        "Sous-processus pytest parallèles",
+        "changed": "list (optional): Fichiers modifiés (défaut: git status du workspace)",
+    },
+    # Une suite de tests à la fois par utilisateur (même workspace)
+    limits=ToolLimits(timeout_s=settings.TIMEOUT_TESTS + 30, max_concurrent_per_user=1),
 )
 
 BUILTIN_TOOLS.register(
@@ -1460,7 +2189,12 @@ BUILTIN_TOOLS.register(
 )
 
 BUILTIN_TOOLS.register(
-    "run_build", run_build, "Build le projet", "qa", {"target": "string: backend|frontend|all"}
+    "run_build",
+    run_build,
+    "Build le projet",
+    "qa",
+    {"target": "string: backend|frontend|all"},
+    limits=ToolLimits(timeout_s=settings.TIMEOUT_BUILD + 30, max_concurrent_per_user=1),
 )
 
 BUILTIN_TOOLS.register(
@@ -1479,6 +2213,8 @@ BUILTIN_TOOLS.register(
     "Récupère les entrées d'audit des commandes exécutées",
     "system",
     {"last_n": "int (optional, default=20): Nombre d'entrées à récupérer"},
+    blocking=False,
+    traits=ToolTraits(read_only=True),
 )
 
 
@@ -1549,6 +2285,7 @@ BUILTIN_TOOLS.register(
     "Récupère l'historique des actions pour audit",
     "governance",
     {"last_n": "int (optional, default=20): Nombre d'entrées"},
+    blocking=False,
 )
 
 BUILTIN_TOOLS.register(
@@ -1557,6 +2294,7 @@ BUILTIN_TOOLS.register(
     "Liste les actions en attente de vérification",
     "governance",
     {},
+    blocking=False,
 )
 
 BUILTIN_TOOLS.register(
@@ -1853,21 +2591,20 @@ __all__ = [
 
 # ===== WEB TOOLS (v8.0) =====
 
-# Configuration pour les outils web
+# Configuration pour les outils web (requêtes via le client partagé web_client)
 WEB_SEARCH_TIMEOUT = 15  # secondes
 WEB_READ_TIMEOUT = 30  # secondes
-WEB_READ_MAX_SIZE = 100000  # 100KB max content
 WEB_SEARCH_MAX_RESULTS = 10
+WEB_SEARCH_MAX_BYTES = 262144  # Les résultats sont en tête de page
+WEB_READ_MAX_REDIRECTS = 5
 
-# Domaines de recherche autorisés pour web_search (API de recherche)
-WEB_SEARCH_ALLOWED_ENGINES = [
-    "duckduckgo.com",
-    "html.duckduckgo.com",
-    "lite.duckduckgo.com",
-]
+# Types de contenu acceptés par web_read
+WEB_READ_TEXT_TYPES = ("text/", "application/json", "application/xml", "application/xhtml+xml")
 
 
-async def web_search(query: str, max_results: int = 5) -> ToolResult:
+async def web_search(
+    query: str, max_results: int = 5, num_results: Optional[int] = None
+) -> ToolResult:
     """
     Effectue une recherche web sécurisée via DuckDuckGo HTML.
 
@@ -1877,9 +2614,13 @@ async def web_search(query: str, max_results: int = 5) -> ToolResult:
     - Résultats limités
     - Pas d'exécution de JavaScript
 
+    Une même requête est servie par le cache de web_client pendant
+    WEB_CACHE_DEFAULT_TTL_SECONDS.
+
     Args:
         query: Termes de recherche
         max_results: Nombre max de résultats (1-10, défaut: 5)
+        num_results: Alias de max_results
 
     Returns:
         ToolResult avec liste de résultats {title, url, snippet}
@@ -1887,163 +2628,149 @@ async def web_search(query: str, max_results: int = 5) -> ToolResult:
     if not query or not query.strip():
         return fail("E_INVALID_QUERY", "Query de recherche vide")
 
-    max_results = min(max(1, max_results), WEB_SEARCH_MAX_RESULTS)
-
+    if num_results is not None:
+        max_results = num_results
     try:
-        import re
-        from urllib.parse import quote_plus
-
-        import httpx
-    except ImportError:
-        return fail("E_IMPORT", "httpx non installé")
+        max_results = min(max(1, int(max_results)), WEB_SEARCH_MAX_RESULTS)
+    except (TypeError, ValueError):
+        return fail("E_INVALID_PARAMS", f"max_results invalide: {max_results}")
 
     # Utiliser DuckDuckGo HTML (lite, pas de JS)
     search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
 
     try:
-        async with httpx.AsyncClient(timeout=WEB_SEARCH_TIMEOUT) as client:
-            response = await client.get(
-                search_url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (compatible; AIOrchestrator/8.0; +https://ai.4lb.ca)",
-                    "Accept": "text/html",
-                },
-            )
-
-            if response.status_code != 200:
-                return fail("E_SEARCH_ERROR", f"DuckDuckGo returned {response.status_code}")
-
-            html = response.text
-
-            # Parser les résultats (format DuckDuckGo HTML)
-            results = []
-
-            # Pattern pour extraire les résultats
-            # DuckDuckGo HTML utilise class="result__a" pour les liens
-            link_pattern = r'class="result__a"[^>]*href="([^"]+)"[^>]*>([^<]+)</a>'
-            snippet_pattern = r'class="result__snippet"[^>]*>([^<]+)</a>'
+        response = await web_client.fetch(
+            search_url,
+            headers={"Accept": "text/html"},
+            max_bytes=WEB_SEARCH_MAX_BYTES,
+            timeout=WEB_SEARCH_TIMEOUT,
+            url_check=check_url,
+            default_ttl=settings.WEB_CACHE_DEFAULT_TTL_SECONDS,
+        )
+    except httpx.TimeoutException:
+        return fail("E_WEB_TIMEOUT", f"Timeout après {WEB_SEARCH_TIMEOUT}s")
+    except Exception as e:
+        logger.error(f"web_search error: {e}")
+        return fail("E_WEB_SEARCH", str(e))
 
-            links = re.findall(link_pattern, html)
-            snippets = re.findall(snippet_pattern, html)
+    if response.status_code != 200:
+        return fail("E_WEB_SEARCH", f"DuckDuckGo returned {response.status_code}")
 
-            for i, (url, title) in enumerate(links[:max_results]):
-                result = {
-                    "title": title.strip(),
-                    "url": url,
-                    "snippet": snippets[i].strip() if i < len(snippets) else "",
-                }
-                # Nettoyer l'URL (DuckDuckGo peut inclure des redirects)
-                if "uddg=" in url:
-                    # Extraire l'URL réelle du redirect
-                    import urllib.parse
+    html = response.text()
 
-                    parsed = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
-                    if "uddg" in parsed:
-                        result["url"] = urllib.parse.unquote(parsed["uddg"][0])
+    # Parser les résultats (format DuckDuckGo HTML)
+    # DuckDuckGo HTML utilise class="result__a" pour les liens
+    link_pattern = r'class="result__a"[^>]*href="([^"]+)"[^>]*>([^<]+)</a>'
+    snippet_pattern = r'class="result__snippet"[^>]*>([^<]+)</a>'
 
-                results.append(result)
+    links = re.findall(link_pattern, html)
+    snippets = re.findall(snippet_pattern, html)
 
-            return ok(
-                {"query": query, "results": results, "count": len(results), "engine": "duckduckgo"}
-            )
+    results = []
+    for i, (url, title) in enumerate(links[:max_results]):
+        result = {
+            "title": title.strip(),
+            "url": url,
+            "snippet": snippets[i].strip() if i < len(snippets) else "",
+        }
+        # Nettoyer l'URL (DuckDuckGo peut inclure des redirects)
+        if "uddg=" in url:
+            parsed = parse_qs(urlparse(url).query)
+            if "uddg" in parsed:
+                result["url"] = unquote(parsed["uddg"][0])
+        results.append(result)
 
-    except httpx.TimeoutException:
-        return fail("E_SEARCH_TIMEOUT", f"Timeout après {WEB_SEARCH_TIMEOUT}s")
-    except Exception as e:
-        logger.error(f"web_search error: {e}")
-        return fail("E_SEARCH_ERROR", str(e))
+    return ok(
+        {
+            "query": query,
+            "count": len(results),
+            "engine": "duckduckgo",
+            "cache": response.cache,
+            "results": results,
+        }
+    )
 
 
-async def web_read(url: str, extract_text: bool = True) -> ToolResult:
+async def web_read(
+    url: str, extract_text: bool = True, max_length: Optional[int] = None
+) -> ToolResult:
     """
     Lit le contenu d'une page web de manière sécurisée.
 
     SECURITY:
-    - Hérite de la protection SSRF de http_request
+    - Validation anti-SSRF (check_url), y compris à chaque redirection
     - Timeout strict (30s)
-    - Taille limitée (100KB)
+    - Téléchargement interrompu à WEB_READ_MAX_BYTES (100KB)
+    - Contenus non textuels refusés
     - Headers User-Agent identifié
 
     Args:
         url: URL de la page à lire
-        extract_text: Si True, extrait uniquement le texte (défaut: True)
+        extract_text: Si True, extrait uniquement le texte du HTML (défaut: True)
+        max_length: Longueur max du contenu renvoyé (caractères, défaut WEB_READ_MAX_CHARS)
 
     Returns:
         ToolResult avec le contenu de la page
     """
-    # SECURITY: Validation anti-SSRF
-    is_safe, reason = is_url_safe(url)
-    if not is_safe:
-        logger.warning(f"🔒 web_read SSRF blocked: {url} - {reason}")
-        return fail("E_URL_FORBIDDEN", f"URL interdite: {reason}")
-
     try:
-        import httpx
-    except ImportError:
-        return fail("E_IMPORT", "httpx non installé")
-
-    try:
-        async with httpx.AsyncClient(
-            timeout=WEB_READ_TIMEOUT, follow_redirects=True, max_redirects=5
-        ) as client:
-            response = await client.get(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (compatible; AIOrchestrator/8.0; +https://ai.4lb.ca)",
-                    "Accept": "text/html,application/xhtml+xml,text/plain",
-                },
-            )
-
-            if response.status_code != 200:
-                return fail("E_HTTP_ERROR", f"Status {response.status_code}")
-
-            content_type = response.headers.get("content-type", "")
-            content = response.text[:WEB_READ_MAX_SIZE]
+        response = await web_client.fetch(
+            url,
+            headers={"Accept": "text/html,application/xhtml+xml,text/plain"},
+            max_bytes=settings.WEB_READ_MAX_BYTES,
+            timeout=WEB_READ_TIMEOUT,
+            max_redirects=WEB_READ_MAX_REDIRECTS,
+            url_check=check_url,
+            default_ttl=settings.WEB_CACHE_DEFAULT_TTL_SECONDS,
+        )
+    except URLForbidden as e:
+        logger.warning(f"🔒 web_read SSRF blocked: {url} - {e}")
+        return fail("E_URL_FORBIDDEN", f"URL interdite: {e}")
+    except TooManyRedirects:
+        return fail("E_TOO_MANY_REDIRECTS", "Trop de redirections")
+    except httpx.TimeoutException:
+        return fail("E_WEB_TIMEOUT", f"Timeout après {WEB_READ_TIMEOUT}s")
+    except Exception as e:
+        logger.error(f"web_read error: {e}")
+        return fail("E_WEB_READ", str(e))
 
-            # Extraction de texte si demandé et si HTML
-            if extract_text and "html" in content_type.lower():
-                try:
-                    # Extraction basique sans BeautifulSoup
-                    import re
+    if response.status_code != 200:
+        return fail("E_WEB_READ", f"Erreur HTTP: {response.status_code}")
 
-                    # Supprimer scripts et styles
-                    content = re.sub(
-                        r"<script[^>]*>.*?</script>", "", content, flags=re.DOTALL | re.IGNORECASE
-                    )
-                    content = re.sub(
-                        r"<style[^>]*>.*?</style>", "", content, flags=re.DOTALL | re.IGNORECASE
-                    )
-                    # Supprimer les tags HTML
-                    content = re.sub(r"<[^>]+>", " ", content)
-                    # Nettoyer les espaces multiples
-                    content = re.sub(r"\s+", " ", content).strip()
-                    # Décoder les entités HTML basiques
-                    content = content.replace("&nbsp;", " ")
-                    content = content.replace("&amp;", "&")
-                    content = content.replace("&lt;", "<")
-                    content = content.replace("&gt;", ">")
-                    content = content.replace("&quot;", '"')
-                except Exception:
-                    pass  # Si l'extraction échoue, garder le contenu brut
+    content_type = response.headers.get("content-type", "")
+    if not any(t in content_type.lower() for t in WEB_READ_TEXT_TYPES):
+        return fail("E_CONTENT_TYPE", f"Type non supporté: {content_type}")
 
-            return ok(
-                {
-                    "url": str(response.url),  # URL finale après redirects
-                    "status_code": response.status_code,
-                    "content_type": content_type,
-                    "content": content,
-                    "length": len(content),
-                    "truncated": len(response.text) > WEB_READ_MAX_SIZE,
-                }
-            )
+    try:
+        budget = int(max_length) if max_length is not None else settings.WEB_READ_MAX_CHARS
+    except (TypeError, ValueError):
+        return fail("E_INVALID_PARAMS", f"max_length invalide: {max_length}")
+
+    if _as_bool(extract_text) and "html" in content_type.lower():
+        # Un seul passage, hors de la boucle, arrêté au budget
+        content, cut = await run_blocking(
+            html_text.extract_text,
+            html_text.split_chunks(response.content),
+            budget,
+            response.url,
+            response.encoding,
+        )
+    else:
+        content = response.text()
+        cut = len(content) > budget
+        content = content[:budget]
+    truncated = response.truncated or cut
 
-    except httpx.TimeoutException:
-        return fail("E_READ_TIMEOUT", f"Timeout après {WEB_READ_TIMEOUT}s")
-    except httpx.TooManyRedirects:
-        return fail("E_TOO_MANY_REDIRECTS", "Trop de redirections")
-    except Exception as e:
-        logger.error(f"web_read error: {e}")
-        return fail("E_READ_ERROR", str(e))
+    return ok(
+        {
+            "url": response.url,  # URL finale après redirects
+            "status_code": response.status_code,
+            "content_type": content_type,
+            "length": len(content),
+            "truncated": truncated,
+            "cache": response.cache,
+            "content": content,
+        }
+    )
 
 
 # Outils Web v8
@@ -2053,6 +2780,7 @@ BUILTIN_TOOLS.register(
     "Recherche web sécurisée via DuckDuckGo (pas de tracking, timeout 15s)",
     "network",
     {"query": "string", "max_results": "int (optional, 1-10, default=5)"},
+    limits=ToolLimits(timeout_s=WEB_SEARCH_TIMEOUT * 2, max_concurrent_per_user=4),
 )
 
 BUILTIN_TOOLS.register(
@@ -2060,192 +2788,19 @@ BUILTIN_TOOLS.register(
     web_read,
     "Lit le contenu d'une page web (SSRF protégé, 100KB max, extraction texte)",
     "network",
-    {"url": "string", "extract_text": "bool (optional, default=True)"},
+    {
+        "url": "string",
+        "extract_text": "bool (optional, default=True)",
+        "max_length": "int (optional, caractères renvoyés)",
+    },
+    # Deadline de toute la lecture, redirections comprises
+    limits=ToolLimits(timeout_s=WEB_READ_TIMEOUT * 2, max_concurrent_per_user=4),
 )
 
 
-# ===== WEB SEARCH & READ TOOLS (v8) =====
-
-# Domaines autorisés pour la recherche web
-WEB_SEARCH_ALLOWED_DOMAINS = [
-    "duckduckgo.com",
-    "api.duckduckgo.com",
-    "html.duckduckgo.com",
-    "lite.duckduckgo.com",
-    "wikipedia.org",
-    "en.wikipedia.org",
-    "fr.wikipedia.org",
-]
-
-# Limites de sécurité
-WEB_READ_MAX_SIZE = 50000  # 50KB max content
-WEB_READ_TIMEOUT = 15  # 15 secondes
-
-
-async def web_search(query: str, num_results: int = 5) -> ToolResult:
+def _extract_text_from_html(html: str, max_chars: Optional[int] = None) -> str:
     """
-    Recherche web sécurisée via DuckDuckGo.
-
-    SECURITY:
-    - Utilise uniquement l'API DuckDuckGo
-    - Pas d'exécution de JavaScript
-    - Résultats limités
-    - Timeout strict
-
-    Args:
-        query: Requête de recherche
-        num_results: Nombre de résultats (max 10)
-
-    Returns:
-        ToolResult avec les résultats de recherche
+    Extraction du texte depuis HTML (voir html_text).
+    Supprime scripts, styles et balises; garde titres et liens.
     """
-    try:
-        import httpx
-    except ImportError:
-        return fail("E_IMPORT", "httpx non installé")
-
-    # Limiter le nombre de résultats
-    num_results = min(num_results, 10)
-
-    # Encoder la requête
-    import urllib.parse
-
-    encoded_query = urllib.parse.quote_plus(query)
-
-    # Utiliser l'API DuckDuckGo Instant Answers
-    url = f"https://api.duckduckgo.com/?q={encoded_query}&format=json&no_html=1&skip_disambig=1"
-
-    try:
-        async with httpx.AsyncClient(timeout=WEB_READ_TIMEOUT) as client:
-            response = await client.get(url)
-
-            if response.status_code != 200:
-                return fail("E_WEB_SEARCH", f"Erreur de recherche: {response.status_code}")
-
-            data = response.json()
-
-            results = []
-
-            # Résultat abstrait
-            if data.get("Abstract"):
-                results.append(
-                    {
-                        "title": data.get("Heading", "Résultat"),
-                        "snippet": data.get("Abstract"),
-                        "url": data.get("AbstractURL", ""),
-                        "source": data.get("AbstractSource", "DuckDuckGo"),
-                    }
-                )
-
-            # Résultats connexes
-            for topic in data.get("RelatedTopics", [])[: num_results - 1]:
-                if isinstance(topic, dict) and "Text" in topic:
-                    results.append(
-                        {
-                            "title": topic.get("Text", "")[:100],
-                            "snippet": topic.get("Text", ""),
-                            "url": topic.get("FirstURL", ""),
-                            "source": "DuckDuckGo",
-                        }
-                    )
-
-            return ok({"query": query, "results": results[:num_results], "count": len(results)})
-
-    except httpx.TimeoutException:
-        return fail("E_WEB_TIMEOUT", "Timeout de recherche web")
-    except Exception as e:
-        return fail("E_WEB_SEARCH", str(e))
-
-
-async def web_read(url: str, max_length: int = WEB_READ_MAX_SIZE) -> ToolResult:
-    """
-    Lit le contenu d'une page web de manière sécurisée.
-
-    SECURITY:
-    - Validation URL anti-SSRF (réutilise is_url_safe)
-    - Domaines restreints pour la lecture
-    - Taille limitée
-    - Timeout strict
-    - Extraction de texte uniquement (pas de JavaScript)
-
-    Args:
-        url: URL de la page à lire
-        max_length: Taille maximale du contenu (défaut 50KB)
-
-    Returns:
-        ToolResult avec le contenu textuel de la page
-    """
-    try:
-        import httpx
-    except ImportError:
-        return fail("E_IMPORT", "httpx non installé")
-
-    # SECURITY: Valider l'URL
-    is_safe, reason = is_url_safe(url)
-    if not is_safe:
-        logger.warning(f"🔒 web_read blocked: {url} - {reason}")
-        return fail("E_URL_FORBIDDEN", f"URL interdite: {reason}")
-
-    # Limiter la taille
-    max_length = min(max_length, WEB_READ_MAX_SIZE)
-
-    try:
-        async with httpx.AsyncClient(timeout=WEB_READ_TIMEOUT, follow_redirects=True) as client:
-            response = await client.get(url)
-
-            if response.status_code != 200:
-                return fail("E_WEB_READ", f"Erreur HTTP: {response.status_code}")
-
-            content_type = response.headers.get("content-type", "")
-
-            # Rejeter les contenus non-texte
-            if not any(t in content_type for t in ["text/", "application/json", "application/xml"]):
-                return fail("E_CONTENT_TYPE", f"Type non supporté: {content_type}")
-
-            content = response.text[:max_length]
-
-            # Extraction simple du texte si HTML
-            if "text/html" in content_type:
-                content = _extract_text_from_html(content)
-
-            return ok(
-                {
-                    "url": str(response.url),
-                    "content": content,
-                    "content_type": content_type,
-                    "length": len(content),
-                    "truncated": len(response.text) > max_length,
-                }
-            )
-
-    except httpx.TimeoutException:
-        return fail("E_WEB_TIMEOUT", "Timeout de lecture web")
-    except Exception as e:
-        return fail("E_WEB_READ", str(e))
-
-
-def _extract_text_from_html(html: str) -> str:
-    """
-    Extraction simple du texte depuis HTML.
-    Supprime les balises et garde uniquement le texte lisible.
-    """
-    import re
-
-    # Supprimer scripts et styles
-    html = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r"<style[^>]*>.*?</style>", "", html, flags=re.DOTALL | re.IGNORECASE)
-
-    # Supprimer les balises HTML
-    html = re.sub(r"<[^>]+>", " ", html)
-
-    # Décoder les entités HTML basiques
-    html = html.replace("&nbsp;", " ")
-    html = html.replace("&amp;", "&")
-    html = html.replace("&lt;", "<")
-    html = html.replace("&gt;", ">")
-    html = html.replace("&quot;", '"')
-
-    # Nettoyer les espaces multiples
-    html = re.sub(r"\s+", " ", html)
-
-    return html.strip()
+    return html_text.extract_text(html_text.split_chunks(html), max_chars)[0]
@@ -0,0 +1,178 @@
+"""
+URL Guard - Validation anti-SSRF des URLs sortantes des outils
+
+- résolution DNS asynchrone (loop.getaddrinfo, exécuté hors de la boucle)
+- cache des résolutions (positives et négatives) avec TTL, borné
+- toutes les adresses renvoyées sont vérifiées: une seule adresse interne
+  suffit à refuser l'URL (DNS à plusieurs enregistrements A/AAAA)
+- les adresses validées sont renvoyées pour être épinglées par web_client:
+  la connexion ne refait pas de résolution (pas de DNS rebinding entre la
+  validation et la connexion)
+
+getaddrinfo n'expose pas le TTL des enregistrements: les entrées vivent
+WEB_DNS_CACHE_TTL_SECONDS.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from app.core.config import settings
+from app.core.metrics import record_dns_lookup
+
+logger = logging.getLogger(__name__)
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+LOCALHOST_NAMES = {"localhost", "127.0.0.1", "::1", "0.0.0.0", "[::1]"}
+
+ALLOWED_SCHEMES = ("http", "https")
+
+
+class ResolutionError(Exception):
+    """Résolution DNS impossible (hôte inconnu, timeout)"""
+
+
+@dataclass
+class UrlVerdict:
+    allowed: bool
+    reason: str = ""
+    host: Optional[str] = None
+    addresses: Tuple[str, ...] = ()  # Adresses validées à épingler (vide pour une IP littérale)
+
+
+def forbidden_reason(ip: IPAddress) -> Optional[str]:
+    """Raison du refus d'une adresse, None si elle est publique"""
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped  # ::ffff:127.0.0.1 → 127.0.0.1
+
+    # Bloquer loopback (127.0.0.0/8, ::1/128)
+    if ip.is_loopback:
+        return f"Accès à loopback interdit: {ip}"
+
+    # Bloquer link-local (169.254.0.0/16 - métadonnées cloud!)
+    if ip.is_link_local:
+        return f"Accès à IP link-local interdit (métadonnées cloud AWS/GCP/Azure): {ip}"
+
+    # Bloquer IP privées (10.0.0.0/8, 172.16.0.0/12, 192.168.0.0/16, fc00::/7)
+    if ip.is_private or ip.is_unspecified:
+        return f"Accès à IP privée interdit: {ip}"
+
+    # Bloquer multicast/reserved
+    if ip.is_multicast or ip.is_reserved:
+        return f"Accès à IP multicast/reserved interdit: {ip}"
+
+    return None
+
+
+class DNSCache:
+    """Résolutions DNS asynchrones avec cache TTL (LRU borné)"""
+
+    def __init__(self):
+        # host → (expiration monotonic, adresses | message d'erreur)
+        self._entries: OrderedDict = OrderedDict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _lookup(self, host: str) -> Tuple[str, ...]:
+        loop = asyncio.get_running_loop()
+        infos = await asyncio.wait_for(
+            loop.getaddrinfo(host, None, type=socket.SOCK_STREAM),
+            timeout=settings.WEB_DNS_TIMEOUT_SECONDS,
+        )
+        # Dédoublonner en gardant l'ordre du résolveur
+        return tuple(dict.fromkeys(info[4][0] for info in infos))
+
+    async def resolve(self, host: str) -> Tuple[str, ...]:
+        """
+        Adresses de ``host`` (cache ou résolution).
+
+        Raises:
+            ResolutionError: hôte inconnu ou délai dépassé (échec mis en
+                cache WEB_DNS_NEGATIVE_TTL_SECONDS)
+        """
+        host = host.lower()
+        cached = self._entries.get(host)
+        if cached is not None and time.monotonic() < cached[0]:
+            self._entries.move_to_end(host)
+            record_dns_lookup("hit")
+            if isinstance(cached[1], str):
+                raise ResolutionError(cached[1])
+            return cached[1]
+
+        try:
+            addresses = await self._lookup(host)
+        except asyncio.TimeoutError:
+            addresses, error = (), f"délai de {settings.WEB_DNS_TIMEOUT_SECONDS}s dépassé"
+        except OSError as e:
+            addresses, error = (), str(e)
+        else:
+            error = "aucune adresse"
+
+        if not addresses:
+            message = f"Résolution DNS impossible pour {host}: {error}"
+            record_dns_lookup("error")
+            self._put(host, message, settings.WEB_DNS_NEGATIVE_TTL_SECONDS)
+            raise ResolutionError(message)
+
+        record_dns_lookup("miss")
+        self._put(host, addresses, settings.WEB_DNS_CACHE_TTL_SECONDS)
+        return addresses
+
+    def _put(self, host: str, value, ttl: float) -> None:
+        self._entries[host] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(host)
+        while len(self._entries) > settings.WEB_DNS_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+
+# Singleton instance
+dns_cache = DNSCache()
+
+
+async def check_url(url: str) -> UrlVerdict:
+    """
+    Valide qu'une URL est sûre pour éviter les attaques SSRF.
+
+    SECURITY: Bloque l'accès à:
+    - localhost, 127.0.0.1, ::1, 0.0.0.0
+    - IP privées (10.x, 172.16-31.x, 192.168.x, fd00::/8)
+    - IP link-local (169.254.0.0/16 - métadonnées cloud AWS/GCP/Azure)
+    - Loopback addresses
+    et ce pour chacune des adresses du nom d'hôte.
+
+    Raises:
+        ResolutionError: le nom d'hôte ne se résout pas
+    """
+    parsed = urlparse(url)
+    hostname = parsed.hostname
+
+    if not hostname:
+        return UrlVerdict(False, "URL invalide: pas de hostname")
+    if parsed.scheme not in ALLOWED_SCHEMES:
+        return UrlVerdict(False, f"Schéma non supporté: {parsed.scheme}")
+
+    # Bloquer localhost explicitement
+    if hostname.lower() in LOCALHOST_NAMES:
+        return UrlVerdict(False, f"Accès à localhost interdit: {hostname}", hostname)
+
+    try:
+        # Si c'est déjà une IP
+        reason = forbidden_reason(ipaddress.ip_address(hostname))
+        return UrlVerdict(reason is None, reason or "", hostname)
+    except ValueError:
+        pass
+
+    addresses = await dns_cache.resolve(hostname)
+    for address in addresses:
+        reason = forbidden_reason(ipaddress.ip_address(address.split("%", 1)[0]))
+        if reason:
+            return UrlVerdict(False, f"{hostname} → {reason}", hostname)
+    return UrlVerdict(True, "", hostname, addresses)
@@ -0,0 +1,431 @@
+"""
+Web Client - Client HTTP partagé pour les outils réseau
+
+Un seul httpx.AsyncClient (pool de connexions keep-alive) pour http_request,
+web_search et web_read, au lieu d'un client neuf par appel:
+- téléchargement en streaming plafonné: on coupe dès ``max_bytes`` atteint
+- cache des réponses GET (LRU borné) avec revalidation conditionnelle
+  (If-None-Match / If-Modified-Since → 304) et TTL (Cache-Control max-age)
+- limite de requêtes simultanées par hôte (sémaphore retiré dès qu'il est libre)
+- redirections suivies à la main, chaque saut validé par ``url_check``
+  (anti-SSRF: une redirection ne doit pas mener vers le réseau interne)
+- connexions épinglées sur les adresses validées par ``url_check``: pas de
+  seconde résolution DNS au moment de se connecter. L'épingle vit le temps
+  de la requête; un nom d'hôte sans épingle est refusé (fail closed)
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import httpcore
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import record_web_fetch
+from app.services.react_engine.url_guard import UrlVerdict
+
+logger = logging.getLogger(__name__)
+
+REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+# Validation d'une URL avant connexion (ex: url_guard.check_url)
+UrlCheck = Callable[[str], Awaitable[UrlVerdict]]
+
+
+class URLForbidden(Exception):
+    """URL (ou cible de redirection) refusée par ``url_check``"""
+
+
+class TooManyRedirects(Exception):
+    """Plus de ``max_redirects`` redirections"""
+
+
+@dataclass
+class FetchResult:
+    url: str  # URL finale (après redirections)
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    truncated: bool  # Téléchargement coupé à max_bytes
+    cache: str = "miss"  # miss | hit | revalidated | bypass
+    encoding: Optional[str] = None
+
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+@dataclass
+class _CacheEntry:
+    result: FetchResult
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        self.size = len(self.result.content)
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+def _freshness(headers: httpx.Headers, default_ttl: float) -> Optional[float]:
+    """TTL en secondes selon Cache-Control (None = ne pas stocker)"""
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    if "no-store" in directives or "private" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            return 0.0
+    return default_ttl
+
+
+class ResponseCache:
+    """Cache LRU des réponses GET, borné en entrées et en octets"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: _CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self.discard(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+
+@dataclass
+class _Pin:
+    """Adresses validées d'un hôte, tenues par les requêtes en cours"""
+
+    addresses: Tuple[str, ...]
+    refs: int = 0
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+class _HostSlot:
+    def __init__(self, size: int):
+        self.semaphore = asyncio.Semaphore(size)
+        self.holders = 0  # Requêtes qui attendent ou tiennent une place
+
+
+class _PinnedBackend(httpcore.AsyncNetworkBackend):
+    """Backend réseau qui se connecte aux adresses épinglées d'un hôte"""
+
+    def __init__(self, pins: Dict[str, _Pin]):
+        self.pins = pins
+        self._inner = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ):
+        pin = self.pins.get(host.lower())
+        if pin is not None:
+            addresses = pin.addresses
+        elif _is_ip_literal(host):
+            addresses = (host,)
+        else:
+            # Pas de résolution système: elle rouvrirait la fenêtre de DNS rebinding
+            raise httpcore.ConnectError(f"Aucune adresse validée pour {host}")
+        for i, address in enumerate(addresses):
+            try:
+                return await self._inner.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                if i == len(addresses) - 1:
+                    raise
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+class WebClient:
+    """Client HTTP partagé des outils (un pool par boucle asyncio)"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport
+        self.cache = ResponseCache(settings.WEB_CACHE_MAX_ENTRIES, settings.WEB_CACHE_MAX_BYTES)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: Dict[str, _HostSlot] = {}
+        # Hôte → adresses validées par url_check, tant qu'une requête les utilise
+        # (lues par _PinnedBackend)
+        self._pins: Dict[str, _Pin] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            # Un AsyncClient est lié à la boucle qui l'a créé
+            transport = self.transport
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=settings.WEB_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.WEB_POOL_MAX_KEEPALIVE,
+                    )
+                )
+                # httpx n'expose pas le backend réseau de son pool httpcore
+                transport._pool._network_backend = _PinnedBackend(self._pins)
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                follow_redirects=False,
+                headers={"User-Agent": settings.WEB_USER_AGENT},
+            )
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    @asynccontextmanager
+    async def _slot(self, url: str) -> AsyncIterator[None]:
+        """Place de l'hôte de ``url`` (WEB_PER_HOST_LIMIT requêtes simultanées)"""
+        host = urlparse(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = _HostSlot(settings.WEB_PER_HOST_LIMIT)
+        slot.holders += 1
+        try:
+            async with slot.semaphore:
+                yield
+        finally:
+            slot.holders -= 1
+            if slot.holders == 0 and self._host_slots.get(host) is slot:
+                del self._host_slots[host]
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        *,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: int,
+        timeout: Optional[float] = None,
+        max_redirects: int = 0,
+        url_check: Optional[UrlCheck] = None,
+        default_ttl: float = 0.0,
+    ) -> FetchResult:
+        """
+        Requête HTTP, corps plafonné à ``max_bytes``.
+
+        Les GET sont servis depuis le cache tant qu'ils sont frais, puis
+        revalidés par requête conditionnelle. ``default_ttl`` s'applique aux
+        réponses sans Cache-Control; avec 0, seules les réponses porteuses
+        d'un ETag/Last-Modified sont gardées (et toujours revalidées).
+
+        ``url_check`` valide chaque URL avant connexion (première requête et
+        redirections); la connexion part vers les adresses qu'il a validées.
+
+        Raises:
+            httpx.HTTPError, URLForbidden, TooManyRedirects,
+            url_guard.ResolutionError
+        """
+        method = method.upper()
+        headers = dict(headers or {})
+        cacheable = method == "GET" and json is None
+        key = f"{url}\n{headers.get('Accept', '')}"
+        entry = self.cache.get(key) if cacheable else None
+
+        if entry is not None and entry.result.truncated and len(entry.result.content) < max_bytes:
+            entry = None  # Copie tronquée plus courte que la demande
+        if entry is not None and entry.fresh:
+            return self._from_cache(entry, "hit", max_bytes)
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        client = self._get_client()
+        current, redirects = url, 0
+        while True:
+            pinned = None
+            if url_check is not None:
+                pinned = await self._check(url_check, current, redirected=redirects > 0)
+            try:
+                async with self._slot(current):
+                    async with client.stream(
+                        method,
+                        current,
+                        json=json,
+                        headers=headers,
+                        timeout=timeout or settings.TIMEOUT_HTTP_REQUEST,
+                    ) as response:
+                        location = response.headers.get("location")
+                        if response.status_code in REDIRECT_CODES and location and max_redirects:
+                            next_url = urljoin(str(response.url), location)
+                        else:
+                            next_url = None
+                            content, truncated = await self._read_capped(response, max_bytes)
+            finally:
+                self._unpin(pinned)
+
+            if next_url is None:
+                break
+            redirects += 1
+            if redirects > max_redirects:
+                raise TooManyRedirects(f"Plus de {max_redirects} redirections")
+            if response.status_code == 303:
+                method, json = "GET", None
+            # Les validateurs concernent l'URL d'origine
+            headers.pop("If-None-Match", None)
+            headers.pop("If-Modified-Since", None)
+            current = next_url
+
+        if response.status_code == 304 and entry is not None:
+            ttl = _freshness(response.headers, default_ttl)
+            entry.expires_at = time.monotonic() + (ttl or 0.0)
+            return self._from_cache(entry, "revalidated", max_bytes)
+
+        result = FetchResult(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content=content,
+            truncated=truncated,
+            cache="miss" if cacheable else "bypass",
+            encoding=response.charset_encoding,
+        )
+        record_web_fetch(result.cache, len(content), truncated)
+
+        if cacheable and response.status_code == 200:
+            self._store(key, result, response.headers, default_ttl)
+        return result
+
+    async def _check(self, url_check: UrlCheck, url: str, redirected: bool) -> Optional[str]:
+        """Valide ``url`` et épingle ses adresses; renvoie l'hôte épinglé (à relâcher)"""
+        verdict = await url_check(url)
+        if not verdict.allowed:
+            if redirected:
+                raise URLForbidden(f"redirection vers {url}: {verdict.reason}")
+            raise URLForbidden(verdict.reason)
+        if not (verdict.host and verdict.addresses):
+            return None  # IP littérale: rien à résoudre
+        host = verdict.host.lower()
+        pin = self._pins.get(host)
+        if pin is None:
+            pin = self._pins[host] = _Pin(verdict.addresses)
+        else:
+            pin.addresses = verdict.addresses
+        pin.refs += 1
+        return host
+
+    def _unpin(self, host: Optional[str]) -> None:
+        """Relâche l'épingle de ``host``, retirée quand plus aucune requête ne la tient"""
+        pin = self._pins.get(host) if host is not None else None
+        if pin is None:
+            return
+        pin.refs -= 1
+        if pin.refs <= 0:
+            del self._pins[host]
+
+    @staticmethod
+    async def _read_capped(response: httpx.Response, max_bytes: int) -> Tuple[bytes, bool]:
+        """Lit le corps en streaming; s'arrête (connexion fermée) au plafond"""
+        chunks, size = [], 0
+        async for chunk in response.aiter_bytes():
+            room = max_bytes - size
+            if len(chunk) > room:
+                chunks.append(chunk[:room])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks), False
+
+    def _store(
+        self, key: str, result: FetchResult, headers: httpx.Headers, default_ttl: float
+    ) -> None:
+        ttl = _freshness(headers, default_ttl)
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        if ttl is None or (ttl == 0 and not (etag or last_modified)):
+            self.cache.discard(key)
+            return
+        self.cache.put(
+            key,
+            _CacheEntry(
+                result=result,
+                expires_at=time.monotonic() + ttl,
+                etag=etag,
+                last_modified=last_modified,
+            ),
+        )
+
+    @staticmethod
+    def _from_cache(entry: _CacheEntry, status: str, max_bytes: int) -> FetchResult:
+        cached = entry.result
+        content = cached.content[:max_bytes]
+        record_web_fetch(status, len(content), False)
+        return FetchResult(
+            url=cached.url,
+            status_code=cached.status_code,
+            headers=cached.headers,
+            content=content,
+            truncated=cached.truncated or len(content) < len(cached.content),
+            cache=status,
+            encoding=cached.encoding,
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+
+# Singleton instance
+web_client = WebClient()
@@ -17,8 +17,9 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from app.core.cancellation import CancellationToken, RunCancelled
 from app.core.config import settings
-from app.core.metrics import record_workflow_phase
+from app.core.metrics import record_time_to_verdict, record_workflow_phase
 from app.models.workflow import (AcceptanceCriteria, CheckResult,
                                  ExecutionResult, JudgeVerdict, PlanStep,
                                  RepairAttempt, TaskPlan, TaskSpec,
@@ -26,6 +27,7 @@ from app.models.workflow import (AcceptanceCriteria, CheckResult,
                                  WorkflowPhase, WorkflowResponse,
                                  WorkflowState)
 from app.services.ollama.client import ollama_client
+from app.services.react_engine.command_output import stream_tool_output
 from app.services.react_engine.engine import react_engine
 from app.services.react_engine.tools import BUILTIN_TOOLS
 from app.services.react_engine.verifier import verifier_service
@@ -83,10 +85,14 @@ Problèmes identifiés:
 Corrections suggérées:
 {fixes}
 
+Checks en échec:
+{failure_digest}
+
 Contexte:
 - Réponse précédente: {previous_response}
 - Dernier outil utilisé: {last_tool}
 
+Les observations de l'exécution sont fournies ci-dessus: ne relis pas ce qui est déjà connu.
 Effectue les corrections minimales nécessaires. Tu as accès aux mêmes outils.
 Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
 
@@ -104,6 +110,7 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
         websocket: Optional[WebSocket] = None,
         skip_spec: bool = False,
         run_id: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> WorkflowResponse:
         """
         Exécute le workflow complet.
@@ -116,6 +123,7 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
             websocket: WebSocket pour streaming
             skip_spec: Sauter la génération de spec (pour questions simples)
             run_id: Run identifier for WebSocket v8 (will use workflow_id if not provided)
+            cancel_token: Jeton d'annulation + deadline du run (cancel client, déconnexion)
 
         Returns:
             WorkflowResponse avec résultats et preuves
@@ -132,6 +140,9 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
         )
 
         try:
+            if cancel_token is not None:
+                cancel_token.check()
+
             # Détecter si c'est une question simple (pas besoin de spec/plan)
             is_simple = self._is_simple_request(user_message)
             logger.debug(
@@ -155,7 +166,9 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
                     )
 
                 logger.debug(f"Run {run_id}: calling _execute (simple path)")
-                execution = await self._execute(user_message, model, history, websocket, run_id)
+                execution = await self._execute(
+                    user_message, model, history, websocket, run_id, cancel_token
+                )
                 logger.debug(
                     f"Run {run_id}: _execute returned, response length={len(execution.response) if execution.response else 0}"
                 )
@@ -189,7 +202,7 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
                     )
 
                 phase_start = time.time()
-                spec = await self._generate_spec(user_message, model)
+                spec = await self._generate_spec(user_message, model, cancel_token)
                 state.spec = spec
                 record_workflow_phase("SPEC", time.time() - phase_start)  # PHASE 6
 
@@ -204,7 +217,7 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
                     )
 
                 phase_start = time.time()
-                plan = await self._generate_plan(spec, model)
+                plan = await self._generate_plan(spec, model, cancel_token)
                 state.plan = plan
                 record_workflow_phase("PLAN", time.time() - phase_start)  # PHASE 6
 
@@ -226,7 +239,9 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
                 enriched_message = self._enrich_with_plan(user_message, spec, plan)
 
                 phase_start = time.time()
-                execution = await self._execute(enriched_message, model, history, websocket, run_id)
+                execution = await self._execute(
+                    enriched_message, model, history, websocket, run_id, cancel_token
+                )
                 state.execution = execution
                 record_workflow_phase("EXECUTE", time.time() - phase_start)  # PHASE 6
 
@@ -246,13 +261,15 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
                         )
 
                     phase_start = time.time()
-                    verification = await self._run_verification(spec, websocket, run_id)
+                    verification = await self._run_verification(
+                        spec, websocket, run_id, cancel_token
+                    )
                     state.verification = verification
                     record_workflow_phase("VERIFY", time.time() - phase_start)  # PHASE 6
 
                     # 5. JUDGE
                     verdict = await verifier_service.judge(
-                        user_message, spec, execution, verification
+                        user_message, spec, execution, verification, cancel_token=cancel_token
                     )
                     state.verdict = verdict
 
@@ -276,17 +293,26 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
 
                         # Réparer
                         phase_start = time.time()
-                        repair_attempt = await self._repair(state, verdict, model, websocket)
+                        repair_attempt = await self._repair(
+                            state, verdict, model, websocket, cancel_token, history, run_id
+                        )
                         state.repair_history.append(repair_attempt)
                         record_workflow_phase("REPAIR", time.time() - phase_start)  # PHASE 6
 
                         # Re-vérifier
-                        verification = await self._run_verification(spec, websocket, run_id)
+                        verification = await self._run_verification(
+                            spec, websocket, run_id, cancel_token
+                        )
+                        repair_attempt.verification_after = verification
                         state.verification = verification
 
                         # Re-juger
                         verdict = await verifier_service.judge(
-                            user_message, spec, state.execution, verification
+                            user_message,
+                            spec,
+                            state.execution,
+                            verification,
+                            cancel_token=cancel_token,
                         )
                         state.verdict = verdict
                 else:
@@ -306,6 +332,9 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
             )
             state.completed_at = datetime.now(timezone.utc)
             state.total_duration_ms = int((time.time() - start_time) * 1000)
+            record_time_to_verdict(
+                state.verdict.status, state.repair_cycles, time.time() - start_time
+            )
 
             # Construire la réponse
             response = self._build_response(state, model, conversation_id)
@@ -337,6 +366,32 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
 
             return response
 
+        except RunCancelled as e:
+            logger.info(f"Run {run_id} cancelled ({e.reason}) during {state.phase.value}")
+            phase = state.phase
+            state.phase = WorkflowPhase.FAILED
+            state.error = str(e)
+
+            if websocket:
+                await event_emitter.emit_terminal(
+                    websocket,
+                    "error",
+                    run_id,
+                    {
+                        "message": str(e),
+                        "code": e.code,
+                        "reason": e.reason,
+                        "phase": phase.value,
+                    },
+                )
+
+            return WorkflowResponse(
+                response=f"Run annulé: {e.reason}",
+                model_used=model,
+                workflow_phase=WorkflowPhase.FAILED,
+                duration_ms=int((time.time() - start_time) * 1000),
+            )
+
         except Exception as e:
             logger.error(f"Workflow error: {e}")
             state.phase = WorkflowPhase.FAILED
@@ -559,12 +614,14 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
 
         return False
 
-    async def _generate_spec(self, request: str, model: str) -> TaskSpec:
+    async def _generate_spec(
+        self, request: str, model: str, cancel_token: Optional[CancellationToken] = None
+    ) -> TaskSpec:
         """Génère la spécification de la tâche"""
         prompt = self.SPEC_PROMPT.format(request=request)
 
         response = await ollama_client.generate(
-            prompt=prompt, model=model, options={"temperature": 0.3}
+            prompt=prompt, model=model, profile="spec", cancel_token=cancel_token
         )
 
         content = response.get("response", "")
@@ -573,7 +630,8 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
         try:
             import re
 
-            json_match = re.search(r"```json\s*(.*?)\s*```", content, re.DOTALL)
+            # Bloc éventuellement non fermé (séquence d'arrêt du profil)
+            json_match = re.search(r"```json\s*(.*?)\s*(?:```|$)", content, re.DOTALL)
             if json_match:
                 data = json.loads(json_match.group(1))
             else:
@@ -594,7 +652,9 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
                 objective=request, acceptance=AcceptanceCriteria(checks=["task completed"])
             )
 
-    async def _generate_plan(self, spec: TaskSpec, model: str) -> TaskPlan:
+    async def _generate_plan(
+        self, spec: TaskSpec, model: str, cancel_token: Optional[CancellationToken] = None
+    ) -> TaskPlan:
         """Génère le plan d'exécution"""
         tools_list = ", ".join([t["name"] for t in BUILTIN_TOOLS.list_tools()])
 
@@ -603,7 +663,7 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
         )
 
         response = await ollama_client.generate(
-            prompt=prompt, model=model, options={"temperature": 0.3}
+            prompt=prompt, model=model, profile="plan", cancel_token=cancel_token
         )
 
         content = response.get("response", "")
@@ -611,7 +671,8 @@ Après correction, vérifie avec les outils QA (run_tests, run_lint, etc.)."""
         try:
             import re
 
-            json_match = re.search(r"```json\s*(.*?)\s*```", content, re.DOTALL)
+            # Bloc éventuellement non fermé (séquence d'arrêt du profil)
+            json_match = re.search(r"```json\s*(.*?)\s*(?:```|$)", content, re.DOTALL)
             if json_match:
                 data = json.loads(json_match.group(1))
             else:
@@ -660,10 +721,16 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
         history: Optional[List[Dict]],
         websocket: Optional[WebSocket],
         run_id: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> ExecutionResult:
         """Exécute via le ReAct Engine"""
         result = await react_engine.run(
-            user_message=message, model=model, history=history, websocket=websocket, run_id=run_id
+            user_message=message,
+            model=model,
+            history=history,
+            websocket=websocket,
+            run_id=run_id,
+            cancel_token=cancel_token,
         )
 
         # Convertir en ExecutionResult
@@ -684,6 +751,7 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
             iterations=result.get("iterations", 0),
             thinking=result.get("thinking", ""),
             duration_ms=result.get("duration_ms", 0),
+            tool_memo=result.get("tool_memo") or {},
         )
 
     async def run_qa_checks(
@@ -691,6 +759,7 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
         websocket: Optional[WebSocket] = None,
         run_id: str = None,
         checks: Optional[List[str]] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> VerificationReport:
         """
         Exécute des checks QA basiques sans nécessiter un TaskSpec.
@@ -700,6 +769,7 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
             websocket: WebSocket pour streaming
             run_id: ID du run pour les événements
             checks: Liste des checks à exécuter (défaut: git_status, run_lint)
+            cancel_token: Jeton d'annulation du run
         """
         start = time.time()
         checks_run = []
@@ -732,6 +802,8 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
             qa_checks = default_checks
 
         for check_name, tool_name, params in qa_checks:
+            if cancel_token is not None:
+                cancel_token.check()
             checks_run.append(check_name)
 
             if websocket:
@@ -742,7 +814,10 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
                     {"name": check_name, "passed": False, "status": "running"},
                 )
 
-            result = await BUILTIN_TOOLS.execute(tool_name, **params)
+            async with stream_tool_output(websocket, run_id, tool_name):
+                result = await BUILTIN_TOOLS.execute(
+                    tool_name, cancel_token=cancel_token, **params
+                )
 
             passed = result.get("success", False)
             output = ""
@@ -781,7 +856,11 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
         )
 
     async def _run_verification(
-        self, spec: TaskSpec, websocket: Optional[WebSocket] = None, run_id: str = None
+        self,
+        spec: TaskSpec,
+        websocket: Optional[WebSocket] = None,
+        run_id: str = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> VerificationReport:
         """Exécute les outils de vérification QA avec événements WS"""
         start = time.time()
@@ -794,6 +873,8 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
         qa_checks = self._map_acceptance_to_qa(spec.acceptance.checks)
 
         for check_name, tool_name, params in qa_checks:
+            if cancel_token is not None:
+                cancel_token.check()
             checks_run.append(check_name)
 
             # Envoyer événement "running"
@@ -806,7 +887,10 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
                 )
 
             # Exécuter l'outil QA
-            result = await BUILTIN_TOOLS.execute(tool_name, **params)
+            async with stream_tool_output(websocket, run_id, tool_name):
+                result = await BUILTIN_TOOLS.execute(
+                    tool_name, cancel_token=cancel_token, **params
+                )
 
             passed = result.get("success", False)
             output = ""
@@ -880,23 +964,56 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
         verdict: JudgeVerdict,
         model: str,
         websocket: Optional[WebSocket],
+        cancel_token: Optional[CancellationToken] = None,
+        history: Optional[List[Dict]] = None,
+        run_id: Optional[str] = None,
     ) -> RepairAttempt:
-        """Tente de réparer les problèmes identifiés"""
+        """
+        Tente de réparer les problèmes identifiés.
+
+        La réparation reprend le contexte de l'exécution au lieu de repartir de
+        zéro: historique de conversation, journal d'observations des outils,
+        memo des lectures, et un résumé des checks en échec (diff avec le cycle
+        précédent).
+        """
 
         last_tool = "unknown"
-        if state.execution and state.execution.tools_used:
-            last_tool = state.execution.tools_used[-1].tool
+        observations: List[Dict[str, Any]] = []
+        tool_memo: Dict[str, Any] = {}
+        if state.execution:
+            if state.execution.tools_used:
+                last_tool = state.execution.tools_used[-1].tool
+            observations = [
+                {"tool": t.tool, "input": t.params, "output": t.result}
+                for t in state.execution.tools_used
+            ]
+            tool_memo = state.execution.tool_memo
+
+        # Rapport auquel a répondu la réparation précédente (state.verification est le suivant)
+        previous = state.repair_history[-1].verification_before if state.repair_history else None
+        failure_digest = (
+            self._failure_digest(state.verification, previous) if state.verification else "- (aucun)"
+        )
 
         repair_prompt = self.REPAIR_PROMPT.format(
             issues="\n".join(f"- {i}" for i in verdict.issues),
             fixes="\n".join(f"- {f}" for f in verdict.suggested_fixes),
+            failure_digest=failure_digest,
             previous_response=state.execution.response[:500] if state.execution else "",
             last_tool=last_tool,
         )
 
-        # Exécuter la réparation via ReAct
+        # Exécuter la réparation via ReAct (même run, même contexte)
         result = await react_engine.run(
-            user_message=repair_prompt, model=model, websocket=websocket
+            user_message=repair_prompt,
+            model=model,
+            history=history,
+            websocket=websocket,
+            run_id=run_id,
+            cancel_token=cancel_token,
+            observations=observations,
+            tool_memo=tool_memo,
+            profile="repair",
         )
 
         # Mettre à jour l'execution avec le résultat de réparation
@@ -921,8 +1038,46 @@ IMPORTANT: Après avoir terminé, tu DOIS vérifier avec les outils QA (run_test
             issues_addressed=verdict.issues,
             changes_made=[f"Outil utilisé: {t.tool}" for t in tools_used],
             tools_used=tools_used,
+            iterations=result.get("iterations", 0),
+            verification_before=state.verification,
         )
 
+    @staticmethod
+    def _failure_digest(
+        current: VerificationReport,
+        previous: Optional[VerificationReport] = None,
+        tail_chars: int = 300,
+    ) -> str:
+        """
+        Résumé compact des checks en échec pour le prompt de réparation.
+
+        Chaque check en échec est listé avec son erreur et la fin de sa sortie;
+        si un cycle précédent existe, les checks sont marqués nouveau/persistant
+        et les checks corrigés depuis sont listés.
+        """
+        failed = [r for r in current.results if not r.passed]
+        previous_failed = (
+            {r.name for r in previous.results if not r.passed} if previous is not None else None
+        )
+
+        lines = []
+        for r in failed:
+            status = ""
+            if previous_failed is not None:
+                status = " [persistant]" if r.name in previous_failed else " [nouveau]"
+            lines.append(f"- {r.name}{status}: {r.error or 'échec'}")
+            output = r.output.strip()
+            if output:
+                tail = output[-tail_chars:].replace("\n", "\n    ")
+                lines.append(f"    {tail}")
+
+        if previous_failed:
+            fixed = sorted(previous_failed - {r.name for r in failed})
+            if fixed:
+                lines.append(f"- Corrigés depuis le cycle précédent: {', '.join(fixed)}")
+
+        return "\n".join(lines) if lines else "- (aucun check en échec)"
+
     def _build_response(
         self, state: WorkflowState, model: str, conversation_id: Optional[str]
     ) -> WorkflowResponse:
@@ -4,9 +4,10 @@ Provides centralized EventEmitter for WebSocket event management.
 """
 
 from .event_emitter import WSEventEmitter, event_emitter
-from .exceptions import (InvalidEventStructure, RunNotFound,
+from .exceptions import (InvalidEventStructure, RunNotFound, RunRejected,
                          TerminalAlreadySent, WebSocketClosed,
                          WSEventEmitterError)
+from .run_manager import RunManager, run_manager
 
 __all__ = [
     "WSEventEmitterError",
@@ -14,6 +15,9 @@ __all__ = [
     "InvalidEventStructure",
     "RunNotFound",
     "WebSocketClosed",
+    "RunRejected",
     "WSEventEmitter",
     "event_emitter",
+    "RunManager",
+    "run_manager",
 ]
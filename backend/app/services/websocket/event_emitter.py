@@ -21,7 +21,8 @@ from app.core.config import settings
 from app.models.ws_events import (WSCompleteEvent, WSConversationCreatedEvent,
                                   WSErrorEvent, WSEvent, WSEventBase,
                                   WSPhaseEvent, WSThinkingEvent, WSToolEvent,
-                                  WSVerificationItemEvent, is_terminal_event)
+                                  WSToolOutputEvent, WSVerificationItemEvent,
+                                  is_terminal_event)
 from app.services.websocket.exceptions import (InvalidEventStructure,
                                                TerminalAlreadySent,
                                                WebSocketClosed)
@@ -336,6 +337,7 @@ class WSEventEmitter:
             "thinking": WSThinkingEvent,
             "phase": WSPhaseEvent,
             "tool": WSToolEvent,
+            "tool_output": WSToolOutputEvent,
             "verification_item": WSVerificationItemEvent,
             "complete": WSCompleteEvent,
             "error": WSErrorEvent,
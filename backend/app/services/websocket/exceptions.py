@@ -42,3 +42,11 @@ class WebSocketClosed(WSEventEmitterError):
     """Raised when attempting to emit to closed WebSocket."""
 
     pass
+
+
+class RunRejected(WSEventEmitterError):
+    """Raised when the run manager refuses to admit a new run (limits reached)."""
+
+    def __init__(self, reason: str, message: str):
+        self.reason = reason
+        super().__init__(message)
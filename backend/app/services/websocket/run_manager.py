@@ -0,0 +1,324 @@
+"""
+Run Manager - Background execution of workflow runs
+Decouples run execution from the WebSocket receive loop.
+
+Responsibilities:
+- Launch each run as a tracked asyncio task
+- Per-user concurrency limit + global admission queue
+- Runs survive socket reconnects (RunChannel re-binds to the new socket)
+- Cancellation: client request, disconnect grace expiry, deadline, shutdown
+- Expose active / queued / rejected / cancelled runs as Prometheus metrics
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.cancellation import CancellationToken
+from app.core.config import settings
+from app.core.metrics import (RUNS_ACTIVE, RUNS_CANCELLED, RUNS_QUEUED,
+                              RUNS_REJECTED)
+from app.services.react_engine.tool_limits import current_user
+from app.services.websocket.event_emitter import event_emitter
+from app.services.websocket.exceptions import RunRejected
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+
+class RunChannel:
+    """
+    Stable send target for a run, independent of the underlying socket.
+
+    Workflow code only calls ``send_json``; the manager swaps the socket on
+    reconnect. While detached, sends raise the same RuntimeError as a closed
+    Starlette socket so the EventEmitter buffers them (CRQ-P1-5 event queue).
+    """
+
+    def __init__(self, websocket: Optional[WebSocket] = None):
+        self._websocket = websocket
+
+    @property
+    def websocket(self) -> Optional[WebSocket]:
+        return self._websocket
+
+    @property
+    def connected(self) -> bool:
+        return self._websocket is not None
+
+    def attach(self, websocket: WebSocket) -> None:
+        self._websocket = websocket
+
+    def detach(self) -> None:
+        self._websocket = None
+
+    async def send_json(self, data: Any, mode: str = "text") -> None:
+        websocket = self._websocket
+        if websocket is None:
+            raise RuntimeError("WebSocket is not connected")
+        await websocket.send_json(data, mode=mode)
+
+
+@dataclass
+class ManagedRun:
+    """A run tracked by the RunManager."""
+
+    run_id: str
+    user_id: str
+    kind: str
+    channel: RunChannel
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    status: str = "queued"  # queued, running
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+    disconnect_handle: Optional[asyncio.TimerHandle] = None
+
+
+RunFactory = Callable[[RunChannel], Awaitable[Any]]
+
+
+class RunManager:
+    """
+    Admits, schedules and tracks workflow runs.
+
+    Admission rules (evaluated synchronously in ``submit``):
+    1. A user may have at most ``max_per_user`` runs queued or running.
+    2. At most ``max_concurrent`` runs execute at once; others wait in a FIFO
+       admission queue of at most ``max_queue`` entries.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.max_concurrent = max_concurrent or settings.RUN_MAX_CONCURRENT
+        self.max_per_user = max_per_user or settings.RUN_MAX_PER_USER
+        self.max_queue = max_queue if max_queue is not None else settings.RUN_QUEUE_MAX_SIZE
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._runs: Dict[str, ManagedRun] = {}
+        self._queued = 0
+
+    # ----- Admission -----
+
+    def submit(
+        self,
+        run_id: str,
+        user_id: str,
+        websocket: Optional[WebSocket],
+        factory: RunFactory,
+        kind: str = "chat",
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> ManagedRun:
+        """
+        Admit a run and schedule it as a background task.
+
+        Args:
+            run_id: Run identifier (already registered with the lifecycle tracker)
+            user_id: Owner of the run
+            websocket: Socket the run streams to initially
+            factory: Coroutine factory receiving the run's RunChannel
+            kind: Run kind for logging (chat, rerun_verify, force_repair)
+            cancel_token: Token passed down the run (default: RUN_DEADLINE_SECONDS deadline)
+
+        Raises:
+            RunRejected: If the per-user limit or the admission queue is full
+        """
+        user_runs = self.get_user_runs(user_id)
+        if len(user_runs) >= self.max_per_user:
+            RUNS_REJECTED.labels(reason="user_limit").inc()
+            raise RunRejected(
+                "user_limit",
+                f"Limite de runs simultanés atteinte ({self.max_per_user} par utilisateur)",
+            )
+
+        # Runs admis mais pas encore démarrés comptent dans les slots, pas dans la file
+        if len(self._runs) >= self.max_concurrent + self.max_queue:
+            RUNS_REJECTED.labels(reason="queue_full").inc()
+            raise RunRejected("queue_full", "Serveur saturé: file d'attente des runs pleine")
+
+        run = ManagedRun(
+            run_id=run_id,
+            user_id=user_id,
+            kind=kind,
+            channel=RunChannel(websocket),
+            cancel_token=cancel_token or CancellationToken(settings.RUN_DEADLINE_SECONDS),
+        )
+        self._runs[run_id] = run
+        self._queued += 1
+        RUNS_QUEUED.inc()
+        run.task = asyncio.create_task(self._execute(run, factory), name=f"run-{run_id}")
+
+        logger.info(
+            f"[RunManager] Run {run_id} admitted ({kind}, user={user_id}, "
+            f"queued={self._queued}, active={self.active_count})"
+        )
+        return run
+
+    async def _execute(self, run: ManagedRun, factory: RunFactory) -> None:
+        """Wait for a global slot, then run the factory to completion."""
+        # Tools called by this run count against its owner's limits
+        current_user.set(run.user_id)
+        dequeued = False
+        try:
+            async with self._slots:
+                self._queued -= 1
+                RUNS_QUEUED.dec()
+                dequeued = True
+
+                run.status = "running"
+                run.started_at = time.time()
+                RUNS_ACTIVE.inc()
+                try:
+                    await factory(run.channel)
+                finally:
+                    RUNS_ACTIVE.dec()
+        except asyncio.CancelledError:
+            logger.info(f"[RunManager] Run {run.run_id} cancelled")
+            if dequeued or run.cancel_token.reason is None:
+                raise
+            # Annulé avant d'obtenir un slot: le handler n'a jamais tourné
+            await self._emit_cancelled(run)
+        except Exception as e:
+            logger.error(f"[RunManager] Run {run.run_id} crashed: {e}")
+        finally:
+            if not dequeued:
+                self._queued -= 1
+                RUNS_QUEUED.dec()
+            if run.disconnect_handle is not None:
+                run.disconnect_handle.cancel()
+            if run.cancel_token.reason is not None:
+                RUNS_CANCELLED.labels(reason=run.cancel_token.reason).inc()
+            self._runs.pop(run.run_id, None)
+            logger.debug(f"[RunManager] Run {run.run_id} released")
+
+    async def _emit_cancelled(self, run: ManagedRun) -> None:
+        """Terminal event for a run cancelled while still queued."""
+        try:
+            await event_emitter.emit_terminal(
+                run.channel,
+                "error",
+                run.run_id,
+                {
+                    "message": f"Run annulé ({run.cancel_token.reason})",
+                    "code": "RUN_CANCELLED",
+                    "reason": run.cancel_token.reason,
+                },
+            )
+        except Exception as e:
+            logger.debug(f"[RunManager] Could not notify cancel of {run.run_id}: {e}")
+
+    # ----- Cancellation -----
+
+    def cancel(self, run_id: str, reason: str = "client") -> bool:
+        """
+        Cancel a run. Running runs stop at their next cancellation point
+        (LLM stream, tool call, subprocess is killed); queued runs are dropped.
+        """
+        run = self._runs.get(run_id)
+        if run is None or not run.cancel_token.cancel(reason):
+            return False
+        if run.status == "queued" and run.task is not None:
+            run.task.cancel()
+        logger.info(f"[RunManager] Run {run_id} cancel requested ({reason})")
+        return True
+
+    def cancel_user_runs(self, user_id: str, reason: str = "client") -> List[str]:
+        """Cancel every live run of ``user_id``."""
+        return [r.run_id for r in self.get_user_runs(user_id) if self.cancel(r.run_id, reason)]
+
+    # ----- Socket binding -----
+
+    async def resume(self, user_id: str, websocket: WebSocket) -> List[str]:
+        """
+        Re-bind the detached live runs of ``user_id`` to a (new) socket.
+
+        Runs still streaming to another open socket (second tab) stay on it.
+        Events buffered while the run was detached (ENABLE_EVENT_QUEUE) are
+        replayed on the new socket.
+        """
+        resumed = []
+        for run in self.get_user_runs(user_id):
+            if run.channel.connected:
+                continue
+            if run.disconnect_handle is not None:
+                run.disconnect_handle.cancel()
+                run.disconnect_handle = None
+            pending = await event_emitter.get_queued_events(run.run_id)
+            run.channel.attach(websocket)
+            for event in pending:
+                try:
+                    await websocket.send_json(event)
+                except Exception as e:
+                    logger.warning(f"[RunManager] Replay failed for run {run.run_id}: {e}")
+                    break
+            resumed.append(run.run_id)
+        if resumed:
+            logger.info(f"[RunManager] Resumed runs {resumed} for user {user_id}")
+        return resumed
+
+    def detach(self, websocket: WebSocket) -> List[str]:
+        """
+        Unbind runs streaming to ``websocket`` (socket closed).
+
+        Runs not resumed within RUN_DISCONNECT_GRACE_SECONDS are cancelled.
+        """
+        grace = settings.RUN_DISCONNECT_GRACE_SECONDS
+        detached = []
+        for run in list(self._runs.values()):
+            if run.channel.websocket is websocket:
+                run.channel.detach()
+                detached.append(run.run_id)
+                if grace <= 0:
+                    self.cancel(run.run_id, "disconnect")
+                else:
+                    run.disconnect_handle = asyncio.get_running_loop().call_later(
+                        grace, self.cancel, run.run_id, "disconnect"
+                    )
+        return detached
+
+    # ----- Introspection -----
+
+    def get(self, run_id: str) -> Optional[ManagedRun]:
+        return self._runs.get(run_id)
+
+    def get_user_runs(self, user_id: str) -> List[ManagedRun]:
+        return [r for r in self._runs.values() if r.user_id == user_id]
+
+    @property
+    def active_count(self) -> int:
+        return sum(1 for r in self._runs.values() if r.status == "running")
+
+    @property
+    def queued_count(self) -> int:
+        return self._queued
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active_count,
+            "queued": self.queued_count,
+            "max_concurrent": self.max_concurrent,
+            "max_per_user": self.max_per_user,
+            "max_queue": self.max_queue,
+        }
+
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        """Cancel all runs (application shutdown), forcing tasks that linger."""
+        tasks = [r.task for r in self._runs.values() if r.task and not r.task.done()]
+        for run_id in list(self._runs):
+            self.cancel(run_id, "shutdown")
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending, timeout=timeout)
+            logger.info(f"[RunManager] {len(tasks)} runs cancelled at shutdown")
+
+
+# Singleton instance
+run_manager = RunManager()
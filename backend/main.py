@@ -87,6 +87,34 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Scheduler non démarré: {e}")
 
+    # Mesure du blocage de la boucle asyncio
+    if settings.LOOP_LAG_MONITOR_ENABLED:
+        from app.core.loop_monitor import loop_monitor
+
+        loop_monitor.start()
+
+    # Relevés système en tâche de fond (get_system_info, get_system_metrics)
+    if settings.SYSTEM_SAMPLER_ENABLED:
+        from app.core.system_sampler import system_sampler
+
+        system_sampler.start()
+
+    # Écriture par lots de l'audit des commandes (audit_logs)
+    if settings.AUDIT_PERSIST_ENABLED and not settings.TESTING:
+        from app.services.audit_service import audit_writer
+
+        audit_writer.start()
+
+    # Index des chemins du workspace (search_files, search_directory)
+    if settings.PATH_INDEX_ENABLED and not settings.TESTING:
+        try:
+            from app.services.react_engine.path_index import path_indexes
+
+            await path_indexes.start(settings.PATH_INDEX_ROOTS or [settings.WORKSPACE_DIR])
+            logger.info("✅ Index des chemins en construction")
+        except Exception as e:
+            logger.warning(f"⚠️ Index des chemins non démarré: {e}")
+
     logger.info(f"🎯 Serveur prêt sur http://{settings.HOST}:{settings.PORT}")
 
     yield
@@ -102,6 +130,47 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Erreur arrêt scheduler: {e}")
 
+    # Annuler les runs encore actifs (RunManager)
+    try:
+        from app.services.websocket.run_manager import run_manager
+
+        await run_manager.shutdown()
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur arrêt RunManager: {e}")
+
+    # Arrêter la surveillance de l'index des chemins
+    try:
+        from app.services.react_engine.path_index import path_indexes
+
+        await path_indexes.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur arrêt index des chemins: {e}")
+
+    # Écrire les entrées d'audit encore en file
+    try:
+        from app.services.audit_service import audit_writer
+
+        await audit_writer.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur écriture audit: {e}")
+
+    # Fermer le pool de connexions des outils web
+    try:
+        from app.services.react_engine.web_client import web_client
+
+        await web_client.aclose()
+    except Exception as e:
+        logger.warning(f"⚠️ Erreur fermeture client web: {e}")
+
+    # Pool des outils bloquants, relevés système et mesure de la boucle
+    from app.core.loop_monitor import loop_monitor
+    from app.core.system_sampler import system_sampler
+    from app.services.react_engine.tools import shutdown_tool_executor
+
+    await system_sampler.stop()
+    await loop_monitor.stop()
+    shutdown_tool_executor()
+
 
 # Application FastAPI
 app = FastAPI(
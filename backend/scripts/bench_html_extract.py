@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction de texte HTML de web_read: regex vs html_text
+
+Compare, page par page, l'ancienne extraction (passes regex successives sur
+tout le document) et l'extracteur incrémental html_text, sans budget puis
+avec le budget par défaut de web_read (WEB_READ_MAX_CHARS).
+
+Corpus: les fichiers .html de --corpus (pages enregistrées), sinon un corpus
+synthétique (article, documentation, application JS, grand tableau, page
+avec balises <script> non fermées).
+
+Usage:
+    python scripts/bench_html_extract.py [--corpus DIR] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "1")
+
+from app.core.config import settings  # noqa: E402
+from app.services.react_engine.html_text import (extract_text,  # noqa: E402
+                                                 split_chunks)
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def legacy_extract(html: str) -> str:
+    """Extraction d'origine de web_read (pour comparaison)"""
+    html = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r"<style[^>]*>.*?</style>", "", html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r"<[^>]+>", " ", html)
+    html = html.replace("&nbsp;", " ")
+    html = html.replace("&amp;", "&")
+    html = html.replace("&lt;", "<")
+    html = html.replace("&gt;", ">")
+    html = html.replace("&quot;", '"')
+    html = re.sub(r"\s+", " ", html)
+    return html.strip()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def synthetic_corpus(seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    nav = "".join(f'<li><a href="/section/{i}">{_text(rng, 2)}</a></li>' for i in range(80))
+    head = (
+        "<head><title>Page</title>"
+        + "".join(f"<style>.c{i} {{ color: #{i:06x}; }}</style>" for i in range(50))
+        + "</head>"
+    )
+
+    article = "".join(
+        f"<h2>{_text(rng, 4)}</h2>"
+        + "".join(f"<p>{_text(rng, 60)} &amp; <b>{_text(rng, 3)}</b></p>" for _ in range(5))
+        for _ in range(60)
+    )
+    docs = "".join(
+        f"<h3>{_text(rng, 3)}</h3><p>{_text(rng, 40)}</p>"
+        f"<pre><code>def f{i}(x):\n    return x &lt; {i}\n</code></pre>"
+        for i in range(400)
+    )
+    app_shell = "".join(
+        f"<script>window.__STATE_{i}__ = {{\"items\": [{', '.join(str(n) for n in range(400))}]}};"
+        "</script>"
+        for i in range(150)
+    ) + "<div id='root'><noscript>Activez JavaScript</noscript></div>"
+    table = "<table>" + "".join(
+        "<tr>" + "".join(f"<td>{rng.randint(0, 10**6)}</td>" for _ in range(12)) + "</tr>"
+        for _ in range(5000)
+    ) + "</table>"
+    unclosed = "".join(f"<p>{_text(rng, 20)}</p><script>var a{i} = 1;" for i in range(300))
+
+    def page(body: str) -> str:
+        return f"<html>{head}<body><nav><ul>{nav}</ul></nav>{body}</body></html>"
+
+    return {
+        "article": page(article),
+        "docs": page(docs),
+        "app_shell": page(app_shell),
+        "table": page(table),
+        "unclosed_script": page(unclosed),
+    }
+
+
+def load_corpus(directory: str) -> dict:
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                pages[name] = f.read()
+    return pages
+
+
+def timed(fn, runs: int):
+    """(médiane en ms, dernier résultat)"""
+    samples, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Répertoire de pages .html enregistrées")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    budget = settings.WEB_READ_MAX_CHARS
+
+    print(
+        f"{'page':<18} {'size':>8} {'regex(ms)':>10} {'stream(ms)':>11} "
+        f"{'budget(ms)':>11} {'chars regex/stream':>20}"
+    )
+    totals = [0.0, 0.0, 0.0]
+    for name, html in pages.items():
+        t_regex, out_regex = timed(lambda html=html: legacy_extract(html), args.runs)
+        t_stream, (out_stream, _) = timed(
+            lambda html=html: extract_text(split_chunks(html)), args.runs
+        )
+        t_budget, _ = timed(
+            lambda html=html: extract_text(split_chunks(html), budget), args.runs
+        )
+        for i, value in enumerate((t_regex, t_stream, t_budget)):
+            totals[i] += value
+        print(
+            f"{name[:18]:<18} {len(html) // 1024:>6}KB {t_regex:>10.1f} {t_stream:>11.1f} "
+            f"{t_budget:>11.1f} {len(out_regex):>10}/{len(out_stream)}"
+        )
+    print(
+        f"{'total':<18} {'':>8} {totals[0]:>10.1f} {totals[1]:>11.1f} {totals[2]:>11.1f}"
+        f"\n(budget = WEB_READ_MAX_CHARS = {budget})"
+    )
+
+
+if __name__ == "__main__":
+    main()
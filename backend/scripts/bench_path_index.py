@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'index des chemins: requêtes indexées vs parcours disque
+
+Génère une arborescence synthétique puis mesure:
+- construction: durée et mémoire (tracemalloc) de l'index
+- requêtes: nom exact, glob, sous-arbre, recherche de répertoire
+  comparées à glob.glob / os.walk
+- mise à jour: délai entre la création d'un fichier et sa présence dans l'index
+
+Usage:
+    python scripts/bench_path_index.py [--files 100000] [--fanout 20] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "1")
+
+from app.core.config import settings  # noqa: E402
+from app.services.react_engine.path_index import (PathIndex,  # noqa: E402
+                                                  PathIndexRegistry)
+
+
+def make_tree(root: str, files: int, fanout: int) -> None:
+    """``files`` fichiers répartis sur 3 niveaux de ``fanout`` répertoires"""
+    for i in range(files):
+        a, b, c = i % fanout, (i // fanout) % fanout, (i // fanout**2) % fanout
+        directory = os.path.join(root, f"pkg_{a}", f"mod_{b}", f"sub_{c}")
+        os.makedirs(directory, exist_ok=True)
+        ext = (".py", ".md", ".json", ".txt")[i % 4]
+        open(os.path.join(directory, f"file_{i}{ext}"), "w").close()
+
+
+def timed(fn, runs: int) -> float:
+    """Médiane en ms"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def walk_dirs(root: str, fragment: str):
+    return [d for _, dirs, _ in os.walk(root) for d in dirs if fragment in d.lower()]
+
+
+async def watch_latency(root: str, samples: int) -> float:
+    """Délai médian (ms) création fichier → visible dans l'index"""
+    registry = PathIndexRegistry()
+    await registry.start([root])
+    index = next(iter(registry._indexes.values()))
+    while not index.ready:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.2)
+
+    delays = []
+    for i in range(samples):
+        name = f"watched_{i}.py"
+        start = time.perf_counter()
+        open(os.path.join(root, "pkg_0", name), "w").close()
+        while not index.by_name(name):
+            await asyncio.sleep(0.005)
+        delays.append((time.perf_counter() - start) * 1000)
+    await registry.stop()
+    return statistics.median(delays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root, args.files, args.fanout)
+
+        tracemalloc.start()
+        index = PathIndex(root)
+        index.build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        index.ready = True
+        print(
+            f"entries={len(index)} build={index.build_seconds:.2f}s "
+            f"peak_mem={peak / 1e6:.1f}MB\n"
+        )
+
+        target = f"file_{args.files // 2}.py"
+        queries = {
+            "basename": (
+                lambda: index.glob(target),
+                lambda: glob.glob(os.path.join(root, "**", target), recursive=True),
+            ),
+            "glob *.json": (
+                lambda: index.glob("*.json", under="pkg_3"),
+                lambda: glob.glob(os.path.join(root, "pkg_3", "**", "*.json"), recursive=True),
+            ),
+            "subtree": (
+                lambda: index.under("pkg_1/mod_2"),
+                lambda: [e for e in os.walk(os.path.join(root, "pkg_1", "mod_2"))],
+            ),
+            "find_dirs": (
+                lambda: index.find_dirs("sub_1"),
+                lambda: walk_dirs(root, "sub_1"),
+            ),
+        }
+        print(f"{'query':<12} {'index(ms)':>10} {'disk(ms)':>10} {'speedup':>8}")
+        for name, (indexed, disk) in queries.items():
+            t_index, t_disk = timed(indexed, args.runs), timed(disk, args.runs)
+            print(f"{name:<12} {t_index:>10.2f} {t_disk:>10.2f} {t_disk / t_index:>7.0f}x")
+
+        latency = asyncio.run(watch_latency(root, samples=10))
+        print(
+            f"\nwatch update: {latency:.0f}ms median "
+            f"(debounce={settings.PATH_INDEX_DEBOUNCE_MS}ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la récupération de chemins (AUTO_RECOVERY): path_matcher vs search_directory
+
+Génère une arborescence synthétique (répertoires jusqu'à 6 niveaux) puis,
+pour des chemins introuvables (faute de frappe dans le dernier segment),
+mesure la latence et la justesse (chemin attendu en première suggestion):
+- search_directory: parcours disque limité à 3 niveaux (ancienne récupération)
+- path_matcher: index trigrammes construit depuis l'index des chemins
+
+Usage:
+    python scripts/bench_path_match.py [--files 100000] [--fanout 20] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "1")
+
+from app.services.react_engine import tools  # noqa: E402
+from app.services.react_engine.path_index import (PathIndex,  # noqa: E402
+                                                  PathIndexRegistry)
+from app.services.react_engine.path_matcher import PathMatcher  # noqa: E402
+
+
+def make_tree(root: str, files: int, fanout: int) -> list:
+    """Fichiers sur 3 niveaux, plus une branche profonde par paquet; renvoie les répertoires"""
+    dirs = set()
+    for i in range(files):
+        a, b, c = i % fanout, (i // fanout) % fanout, (i // fanout**2) % fanout
+        parts = [f"pkg_{a}", f"mod_{b}", f"sub_{c}"]
+        if i % 7 == 0:
+            parts += ["deep", f"layer_{b}", f"component_{i % 97}"]
+        directory = os.path.join(root, *parts)
+        os.makedirs(directory, exist_ok=True)
+        dirs.add(os.path.relpath(directory, root))
+        open(os.path.join(directory, f"file_{i}.py"), "w").close()
+    return sorted(dirs)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    """Supprime un caractère (hors premier) du nom"""
+    i = rng.randrange(1, len(name))
+    return name[:i] + name[i + 1 :]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as root:
+        dirs = make_tree(root, args.files, args.fanout)
+        index = PathIndex(root)
+        index.build()
+
+        start = time.perf_counter()
+        matcher = PathMatcher(*index.entries())
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"entries={len(index)} names={len(matcher.names)} matcher_build={build_ms:.0f}ms\n")
+
+        targets = rng.sample(dirs, args.queries)
+        missing = [
+            os.path.join(os.path.dirname(d), typo(os.path.basename(d), rng)) for d in targets
+        ]
+
+        def old(query: str) -> str:
+            result = tools.search_directory(os.path.basename(query), base=root)
+            return result["data"]["suggestion"] if result["success"] else None
+
+        def new(query: str) -> str:
+            matches = matcher.match(query, kind="dir", limit=5)
+            return os.path.join(root, matches[0][0]) if matches else None
+
+        print(f"{'method':<18} {'median(ms)':>10} {'p95(ms)':>9} {'top1':>6}")
+        with patch.object(tools, "path_indexes", PathIndexRegistry()), patch.object(
+            tools, "SEARCH_ALLOWED_BASES", [root]
+        ):
+            for name, fn in (("search_directory", old), ("path_matcher", new)):
+                samples, hits = [], 0
+                for query, expected in zip(missing, targets, strict=True):
+                    start = time.perf_counter()
+                    found = fn(query)
+                    samples.append((time.perf_counter() - start) * 1000)
+                    hits += found == os.path.join(root, expected)
+                samples.sort()
+                p95 = samples[int(len(samples) * 0.95) - 1]
+                print(
+                    f"{name:<18} {statistics.median(samples):>10.3f} {p95:>9.3f} "
+                    f"{hits / len(samples):>6.0%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark du cycle REPAIR: réparation "à froid" vs contexte préservé
+
+Rejoue un run en échec (EXECUTE → VERIFY FAIL → REPAIR → VERIFY PASS) avec un
+LLM et des outils scriptés à latence fixe, et compare:
+- fresh:   ancien comportement (prompt neuf, sans historique ni observations)
+- context: observations d'EXECUTE + memo des lectures + diff des échecs
+
+Usage:
+    python scripts/bench_repair.py [--files 5] [--llm-ms 80] [--tool-ms 30] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "1")
+
+from app.models.workflow import (CheckResult, JudgeVerdict,  # noqa: E402
+                                 VerificationReport, WorkflowState)
+from app.services.react_engine.engine import ReactEngine  # noqa: E402
+from app.services.react_engine.tools import ToolRegistry, ok  # noqa: E402
+from app.services.react_engine.workflow_engine import \
+    WorkflowEngine  # noqa: E402
+
+
+class ScriptedLLM:
+    """
+    LLM déterministe: lit chaque fichier nécessaire qu'il ne "connaît" pas
+    encore (absent du prompt courant et des observations), puis corrige.
+    """
+
+    def __init__(self, files, latency_s):
+        self.files = files
+        self.latency_s = latency_s
+        self.calls = 0
+        self.known = set()
+        self.repairing = False
+
+    async def generate(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+
+        if "La vérification a ÉCHOUÉ" in prompt:
+            # Nouveau run ReAct de réparation: seul le prompt fait foi
+            self.known = {f for f in self.files if f'"path": "{f}"' in prompt}
+            self.repairing = True
+        elif not prompt.startswith("Résultat de"):
+            self.known = set()
+            self.repairing = False
+
+        for f in self.files:
+            if f not in self.known:
+                self.known.add(f)
+                return self._tool("read_file", path=f)
+
+        if self.repairing and "Résultat de run_format" not in prompt:
+            return self._tool("run_format", target="backend")
+        return {"response": "```response\nfait\n```"}
+
+    @staticmethod
+    def _tool(name, **params):
+        return {"response": f"```tool\n{json.dumps({'tool': name, 'params': params})}\n```"}
+
+
+def build_registry(tool_latency_s, counters):
+    registry = ToolRegistry()
+
+    async def read_file(path: str):
+        counters["tool_calls"] += 1
+        await asyncio.sleep(tool_latency_s)
+        return ok({"path": path, "content": f"# {path}\n"})
+
+    async def run_format(target: str = "backend"):
+        counters["tool_calls"] += 1
+        await asyncio.sleep(tool_latency_s)
+        return ok({"formatted": True})
+
+    registry.register("read_file", read_file, "Lire", category="filesystem")
+    registry.register("run_format", run_format, "Formater", category="qa")
+    return registry
+
+
+async def one_run(mode, files, llm_ms, tool_ms):
+    counters = {"tool_calls": 0}
+    llm = ScriptedLLM(files, llm_ms / 1000)
+    react = ReactEngine(tools=build_registry(tool_ms / 1000, counters))
+    workflow = WorkflowEngine()
+    verify_latency = tool_ms / 1000
+
+    failing = VerificationReport(
+        passed=False,
+        results=[CheckResult(name="run_tests:backend", passed=False, error="1 failed")],
+    )
+    verdict = JudgeVerdict(status="FAIL", issues=["tests en échec"], suggested_fixes=["corriger"])
+
+    with (
+        patch("app.services.react_engine.engine.ollama_client.generate", llm.generate),
+        patch("app.services.react_engine.workflow_engine.react_engine", react),
+    ):
+        start = time.perf_counter()
+        execution = await workflow._execute("analyse et corrige", "bench", None, None, "bench")
+        await asyncio.sleep(verify_latency)  # VERIFY → FAIL
+        state = WorkflowState(
+            id="bench", original_request="analyse et corrige", execution=execution
+        )
+        state.verification = failing
+        state.repair_cycles = 1
+
+        llm_before, tools_before = llm.calls, counters["tool_calls"]
+        repair_start = time.perf_counter()
+        if mode == "fresh":
+            prompt = workflow.REPAIR_PROMPT.format(
+                issues="- tests en échec",
+                fixes="- corriger",
+                failure_digest="",
+                previous_response=execution.response[:500],
+                last_tool=execution.tools_used[-1].tool,
+            )
+            result = await react.run(user_message=prompt, model="bench")
+            iterations = result["iterations"]
+        else:
+            attempt = await workflow._repair(state, verdict, "bench", None, run_id="bench")
+            iterations = attempt.iterations
+        repair_s = time.perf_counter() - repair_start
+        await asyncio.sleep(verify_latency)  # VERIFY → PASS
+        time_to_verdict = time.perf_counter() - start
+
+    return {
+        "iterations": iterations,
+        "llm_calls": llm.calls - llm_before,
+        "tool_calls": counters["tool_calls"] - tools_before,
+        "repair_s": repair_s,
+        "time_to_verdict_s": time_to_verdict,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=5, help="Fichiers lus pendant EXECUTE")
+    parser.add_argument("--llm-ms", type=float, default=80, help="Latence par appel LLM")
+    parser.add_argument("--tool-ms", type=float, default=30, help="Latence par appel outil")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    files = [f"app/module_{i}.py" for i in range(args.files)]
+    print(f"files={args.files} llm={args.llm_ms}ms tool={args.tool_ms}ms runs={args.runs}\n")
+    print(f"{'mode':<8} {'iter':>5} {'llm':>5} {'tools':>6} {'repair(s)':>10} {'verdict(s)':>11}")
+
+    for mode in ("fresh", "context"):
+        samples = [await one_run(mode, files, args.llm_ms, args.tool_ms) for _ in range(args.runs)]
+        med = {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+        print(
+            f"{mode:<8} {med['iterations']:>5.0f} {med['llm_calls']:>5.0f} {med['tool_calls']:>6.0f} "
+            f"{med['repair_s']:>10.3f} {med['time_to_verdict_s']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark du coût de dispatch de ToolRegistry.execute (outil qui ne fait rien)
+
+Mesure, par appel, le surcoût du registry seul: étapes de contrôle
+(isolation agent, détection d'injection, gouvernance), limites et
+métriques. L'audit (log_action, écriture en base) est neutralisé pour ne
+mesurer que le pipeline.
+
+Cas:
+- noop: outil utilitaire sans paramètre
+- system: outil de catégorie "system" (gouverné)
+- system_read: même outil déclaré en lecture seule (gouvernance sautée)
+- ints: paramètre entier, détection d'injection active
+- text: paramètre texte, détection d'injection active
+
+Usage:
+    python scripts/bench_tool_dispatch.py [--calls 5000] [--runs 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TESTING", "1")
+
+from app.core.config import settings  # noqa: E402
+from app.services.react_engine import tools  # noqa: E402
+from app.services.react_engine.tool_traits import ToolTraits  # noqa: E402
+from app.services.react_engine.tools import ToolRegistry, ok  # noqa: E402
+
+# (outil, catégorie, paramètres déclarés, traits, arguments, détection d'injection)
+CASES = [
+    ("noop", "utility", {}, None, {}, False),
+    ("system", "system", {}, None, {}, False),
+    ("system_read", "system", {}, ToolTraits(read_only=True), {}, False),
+    ("ints", "utility", {"n": "int"}, None, {"n": 3}, True),
+    ("text", "utility", {"q": "string"}, None, {"q": "hello world " * 20}, True),
+]
+
+
+def noop(**kwargs) -> dict:
+    return ok({})
+
+
+async def timed(registry: ToolRegistry, name: str, kwargs: dict, calls: int, runs: int):
+    """Médiane en µs par appel"""
+    for _ in range(calls // 10):
+        await registry.execute(name, **kwargs)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await registry.execute(name, **kwargs)
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(samples)
+
+
+async def run(calls: int, runs: int):
+    registry = ToolRegistry()
+    for name, category, parameters, traits, _, _ in CASES:
+        registry.register(name, noop, "", category, parameters, blocking=False, traits=traits)
+
+    print(f"{'tool':<12} {'injection':>9} {'stages':>7} {'µs/call':>9}")
+    for name, _, _, _, kwargs, injection in CASES:
+        settings.ENFORCE_PROMPT_INJECTION_DETECTION = injection
+        per_call = await timed(registry, name, kwargs, calls, runs)
+        stages = len(registry.get(name)["stages"])
+        print(f"{name:<12} {str(injection):>9} {stages:>7} {per_call:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    tools.log_action = lambda **kwargs: True
+    asyncio.run(run(args.calls, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -40,6 +40,34 @@ def test_file(workspace_dir, tmp_path):
         test_path.unlink()
 
 
+@pytest.fixture
+def fake_dns(monkeypatch):
+    """
+    Résolutions DNS simulées pour url_guard (pas de réseau dans les tests).
+
+    ``records[host]`` fixe les adresses (ou une exception) d'un hôte; les
+    autres hôtes se résolvent vers une IP publique. ``calls`` liste les
+    résolutions effectuées (hors cache).
+    """
+    from types import SimpleNamespace
+
+    from app.services.react_engine.url_guard import dns_cache
+
+    dns = SimpleNamespace(records={}, calls=[])
+
+    async def lookup(host):
+        dns.calls.append(host)
+        value = dns.records.get(host, ("93.184.215.14",))
+        if isinstance(value, Exception):
+            raise value
+        return tuple(value)
+
+    dns_cache.clear()
+    monkeypatch.setattr(dns_cache, "_lookup", lookup)
+    yield dns
+    dns_cache.clear()
+
+
 # Fixtures pour tests API
 @pytest.fixture(scope="function")
 def db_session():
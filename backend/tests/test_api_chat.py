@@ -106,6 +106,67 @@ class TestToolsAPI:
             assert data.get("success") == False
             assert "error" in data
 
+    def test_batch_requires_auth(self, client: TestClient):
+        """Test lot d'outils nécessite auth"""
+        response = client.post(
+            "/api/v1/tools/batch", json={"calls": [{"tool": "get_datetime"}]}
+        )
+        assert response.status_code == 401
+
+    def test_batch_results_in_order(self, client: TestClient, auth_headers: dict):
+        """Test lot: un résultat par appel, dépendance en échec non exécutée"""
+        response = client.post(
+            "/api/v1/tools/batch",
+            json={
+                "calls": [
+                    {"id": "now", "tool": "get_datetime"},
+                    {"id": "bad", "tool": "fake_tool_xyz"},
+                    {"id": "after", "tool": "get_datetime", "depends_on": ["bad"]},
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] == False
+        assert [r["id"] for r in data["results"]] == ["now", "bad", "after"]
+        assert data["results"][0]["success"]
+        assert data["results"][1]["error"]["code"] == "E_TOOL_NOT_FOUND"
+        assert data["results"][2]["skipped"]
+
+    def test_batch_failed_tool_skips_dependent(self, client: TestClient, auth_headers: dict):
+        """Test lot: un outil qui renvoie fail(...) échoue, son dépendant n'est pas exécuté"""
+        response = client.post(
+            "/api/v1/tools/batch",
+            json={
+                "calls": [
+                    {"id": "read", "tool": "read_file", "params": {"path": "/etc/shadow"}},
+                    {"id": "after", "tool": "get_datetime", "depends_on": ["read"]},
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] == False
+        assert not data["results"][0]["success"]
+        assert data["results"][0]["error"]["code"] == "E_PATH_FORBIDDEN"
+        assert data["results"][1]["skipped"]
+
+    def test_batch_cycle_rejected(self, client: TestClient, auth_headers: dict):
+        """Test lot avec dépendances cycliques refusé"""
+        response = client.post(
+            "/api/v1/tools/batch",
+            json={
+                "calls": [
+                    {"id": "a", "tool": "get_datetime", "depends_on": ["b"]},
+                    {"id": "b", "tool": "get_datetime", "depends_on": ["a"]},
+                ]
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+
 
 class TestRateLimiting:
     """Test rate limiting middleware"""
@@ -0,0 +1,159 @@
+"""
+Tests de l'audit des commandes: tampon borné (SecureExecutor) et écriture par lots (AuditWriter)
+"""
+
+import asyncio
+import gc
+import logging
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from app.services.audit_service import AuditWriter
+from app.services.react_engine.secure_executor import ExecutionRole, SecureExecutor
+
+
+class _Writes(list):
+    """Faux write_audit_rows: garde les lots écrits"""
+
+    def __call__(self, rows):
+        self.append(list(rows))
+
+
+@pytest.fixture
+def writes():
+    return _Writes()
+
+
+async def _settle(writer: AuditWriter, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if not writer.pending:
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.02)
+
+
+class TestAuditBuffer:
+    """Entrées récentes seulement en mémoire, toutes mises en file d'écriture"""
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_keeps_latest(self, tmp_path, writes):
+        executor = SecureExecutor(workspace_dir=str(tmp_path), audit_buffer_size=5)
+        writer = AuditWriter(write=writes, batch_size=100, interval=60)
+
+        with patch("app.services.react_engine.secure_executor.audit_writer", writer):
+            for i in range(8):
+                await executor.execute(f"ls {i};", role=ExecutionRole.VIEWER)
+
+        assert len(executor.audit_log) == 5
+        assert [e["command"] for e in executor.get_audit_log(last_n=2)] == [["ls 6;"], ["ls 7;"]]
+        assert writer.pending == 8
+
+    @pytest.mark.asyncio
+    async def test_row_columns(self, tmp_path, writes):
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+        writer = AuditWriter(write=writes, batch_size=1, interval=60)
+
+        with patch("app.services.react_engine.secure_executor.audit_writer", writer):
+            writer.start()
+            await executor.execute("pwd", role=ExecutionRole.VIEWER)
+            await _settle(writer)
+            await writer.stop()
+
+        row = writes[0][0]
+        assert row["action"] == "command_execute" and row["resource"] == "pwd"
+        assert row["allowed"] is True and row["role"] == "viewer"
+        assert row["details"]["command"] == "pwd"
+        assert row["details"]["result"]["returncode"] == 0
+
+    @pytest.mark.asyncio
+    async def test_memory_flat_under_soak(self, tmp_path, monkeypatch):
+        """Des dizaines de milliers d'exécutions: mémoire stable une fois le tampon plein"""
+        logger = logging.getLogger("app.services.react_engine.secure_executor")
+        monkeypatch.setattr(logger, "disabled", True)
+        executor = SecureExecutor(workspace_dir=str(tmp_path), audit_buffer_size=200)
+        writer = AuditWriter(write=lambda rows: None, batch_size=100, interval=60, max_pending=500)
+
+        async def run(count: int) -> int:
+            for i in range(count):
+                await executor.execute(f"cat {i};", role=ExecutionRole.VIEWER)
+            gc.collect()
+            return tracemalloc.get_traced_memory()[0]
+
+        with patch("app.services.react_engine.secure_executor.audit_writer", writer):
+            tracemalloc.start()
+            try:
+                warm = await run(2000)
+                soaked = await run(20000)
+            finally:
+                tracemalloc.stop()
+
+        assert len(executor.audit_log) == 200 and writer.pending == 500
+        assert soaked - warm < 64 * 1024
+
+
+class TestAuditWriter:
+    """Lots écrits sur seuil de taille ou de délai, file bornée"""
+
+    @pytest.mark.asyncio
+    async def test_flush_on_batch_size(self, writes):
+        writer = AuditWriter(write=writes, batch_size=3, interval=60)
+        writer.start()
+        for i in range(7):
+            writer.submit({"n": i})
+        await _settle(writer, timeout=0.5)
+
+        # Lots pleins seulement: le reste attend le délai
+        assert [[r["n"] for r in batch] for batch in writes] == [[0, 1, 2], [3, 4, 5]]
+        assert writer.pending == 1
+        await writer.stop()
+        assert writes[-1] == [{"n": 6}]
+
+    @pytest.mark.asyncio
+    async def test_flush_on_interval(self, writes):
+        writer = AuditWriter(write=writes, batch_size=100, interval=0.05)
+        writer.start()
+        writer.submit({"n": 1})
+        await asyncio.sleep(0.2)
+        await writer.stop()
+
+        assert writes == [[{"n": 1}]] and writer.written == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending(self, writes):
+        writer = AuditWriter(write=writes, batch_size=10, interval=60)
+        writer.start()
+        for i in range(5):
+            writer.submit({"n": i})
+
+        await writer.stop()
+
+        assert [len(batch) for batch in writes] == [5] and writer.pending == 0
+
+    def test_overflow_drops_oldest(self, writes):
+        writer = AuditWriter(write=writes, batch_size=100, interval=60, max_pending=3)
+
+        for i in range(5):
+            writer.submit({"n": i})
+
+        assert [r["n"] for r in writer._pending] == [2, 3, 4]
+        assert writer.dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_write_error_drops_batch(self):
+        calls = []
+
+        def failing(rows):
+            calls.append(len(rows))
+            if len(calls) == 1:
+                raise RuntimeError("database down")
+
+        writer = AuditWriter(write=failing, batch_size=2, interval=60)
+        writer.start()
+        for i in range(4):
+            writer.submit({"n": i})
+        await _settle(writer)
+        await writer.stop()
+
+        assert calls == [2, 2]
+        assert writer.dropped == 2 and writer.written == 2
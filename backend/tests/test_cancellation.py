@@ -0,0 +1,211 @@
+"""
+Tests pour l'annulation de bout en bout (CancellationToken + deadline)
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import psutil
+import pytest
+from app.core.cancellation import CancellationToken, RunCancelled
+from app.services.react_engine.secure_executor import ExecutionRole, SecureExecutor
+from app.services.react_engine.tools import ToolRegistry
+from app.services.react_engine.workflow_engine import WorkflowEngine
+
+
+class TestCancellationToken:
+    """Tests du jeton"""
+
+    def test_check_raises_after_cancel(self):
+        token = CancellationToken()
+        token.check()
+
+        assert token.cancel("client") is True
+        assert token.cancel("client") is False  # idempotent
+
+        with pytest.raises(RunCancelled) as exc:
+            token.check()
+        assert exc.value.reason == "client"
+        assert exc.value.code == "RUN_CANCELLED"
+
+    def test_deadline_expired(self):
+        token = CancellationToken(deadline_s=0.01)
+        time.sleep(0.02)
+
+        assert token.cancelled
+        assert token.remaining() == 0.0
+        with pytest.raises(RunCancelled) as exc:
+            token.check()
+        assert exc.value.code == "RUN_DEADLINE_EXCEEDED"
+
+    def test_timeout_bounded_by_deadline(self):
+        assert CancellationToken().timeout(30) == 30
+        assert CancellationToken(deadline_s=5).timeout(30) <= 5
+
+    @pytest.mark.asyncio
+    async def test_scope_interrupts_await(self):
+        token = CancellationToken()
+
+        async def waiter():
+            async with token.scope():
+                await asyncio.sleep(60)
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        token.cancel("client")
+
+        with pytest.raises(RunCancelled):
+            await asyncio.wait_for(task, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_scope_enforces_deadline(self):
+        token = CancellationToken(deadline_s=0.05)
+        start = time.monotonic()
+
+        with pytest.raises(RunCancelled) as exc:
+            async with token.scope():
+                await asyncio.sleep(60)
+
+        assert exc.value.reason == "deadline"
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_seen_by_check_cancels_scoped_tasks(self):
+        """Deadline constatée par check() avant le rappel de scope(): même annulation"""
+        token = CancellationToken(deadline_s=60)
+
+        async def waiter():
+            async with token.scope():
+                await asyncio.sleep(60)
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        token.deadline = time.monotonic() - 1  # Rappel call_later encore à ~60 s
+
+        with pytest.raises(RunCancelled):
+            token.check()
+        done, _ = await asyncio.wait({task}, timeout=1)
+        assert task in done
+        assert isinstance(task.exception(), RunCancelled)
+        assert task.exception().reason == "deadline"
+        assert token.cancel("deadline") is False
+
+    @pytest.mark.asyncio
+    async def test_external_cancel_is_not_converted(self):
+        """Une annulation étrangère au jeton (shutdown) reste un CancelledError"""
+        token = CancellationToken()
+
+        async def waiter():
+            async with token.scope():
+                await asyncio.sleep(60)
+
+        task = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+class TestToolRegistryCancellation:
+    """ToolRegistry.execute interrompt l'outil async en cours"""
+
+    @pytest.mark.asyncio
+    async def test_running_tool_is_cancelled(self):
+        registry = ToolRegistry()
+
+        async def slow_tool():
+            await asyncio.sleep(60)
+
+        registry.register("slow", slow_tool, "Outil lent", category="utility")
+        token = CancellationToken()
+
+        task = asyncio.create_task(registry.execute("slow", cancel_token=token))
+        await asyncio.sleep(0.01)
+        token.cancel("client")
+
+        result = await asyncio.wait_for(task, timeout=1)
+        assert result["success"] is False
+        assert result["error"]["code"] == "E_CANCELLED"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_token_skips_tool(self):
+        registry = ToolRegistry()
+        tool = MagicMock(return_value={"success": True, "data": {}, "error": None, "meta": {}})
+        registry.register("noop", tool, "No-op", category="utility")
+        token = CancellationToken()
+        token.cancel("client")
+
+        result = await registry.execute("noop", cancel_token=token)
+
+        assert result["error"]["code"] == "E_CANCELLED"
+        tool.assert_not_called()
+
+
+class TestSecureExecutorCancellation:
+    """Le processus enfant est tué à l'annulation"""
+
+    @pytest.mark.asyncio
+    async def test_child_killed_on_cancel(self, tmp_path):
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+        me = psutil.Process()
+
+        task = asyncio.create_task(
+            executor.execute("tail -f /dev/null", role=ExecutionRole.VIEWER, timeout=60)
+        )
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if me.children():
+                break
+        assert me.children(), "subprocess did not start"
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not [p for p in me.children() if p.status() != psutil.STATUS_ZOMBIE]
+        assert executor.audit_log[-1].result == {"error": "cancelled"}
+
+
+class TestWorkflowCancellation:
+    """WorkflowEngine.run émet un terminal RUN_CANCELLED"""
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_emits_terminal(self):
+        engine = WorkflowEngine()
+        token = CancellationToken()
+        token.cancel("client")
+        ws = MagicMock()
+
+        with patch(
+            "app.services.react_engine.workflow_engine.event_emitter.emit_terminal",
+            new_callable=AsyncMock,
+        ) as emit_terminal:
+            result = await engine.run("bonjour", websocket=ws, run_id="r1", cancel_token=token)
+
+        assert result.workflow_phase == "failed"
+        args = emit_terminal.await_args.args
+        assert args[1] == "error"
+        assert args[3]["code"] == "RUN_CANCELLED"
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_execute_stops_react_loop(self):
+        engine = WorkflowEngine()
+        token = CancellationToken()
+
+        async def slow_run(**kwargs):
+            async with kwargs["cancel_token"].scope():
+                await asyncio.sleep(60)
+
+        with patch(
+            "app.services.react_engine.workflow_engine.react_engine.run", side_effect=slow_run
+        ):
+            task = asyncio.create_task(
+                engine.run("bonjour", run_id="r2", cancel_token=token, skip_spec=True)
+            )
+            await asyncio.sleep(0.01)
+            token.cancel("disconnect")
+            result = await asyncio.wait_for(task, timeout=1)
+
+        assert "disconnect" in result.response
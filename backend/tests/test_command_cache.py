@@ -0,0 +1,203 @@
+"""
+Tests des résultats partagés des commandes en lecture seule (command_cache, SecureExecutor)
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.services.react_engine.command_cache import CommandCache
+from app.services.react_engine.secure_executor import ExecutionRole, SecureExecutor
+
+
+class _Runs:
+    """Fonction d'exécution comptée, bloquée jusqu'à ``release``"""
+
+    def __init__(self, value="out"):
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return f"{self.value}-{self.calls}"
+
+
+class TestCommandCache:
+    """TTL, coalescence, annulation"""
+
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl(self):
+        cache, run = CommandCache(ttl=60, max_entries=10), _Runs()
+
+        first = await cache.get_or_run("k", run)
+        second = await cache.get_or_run("k", run)
+
+        assert first == ("out-1", "miss") and second == ("out-1", "hit")
+        assert run.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_expired(self):
+        cache, run = CommandCache(ttl=0.05, max_entries=10), _Runs()
+
+        await cache.get_or_run("k", run)
+        await asyncio.sleep(0.06)
+
+        assert await cache.get_or_run("k", run) == ("out-2", "miss")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_coalesced(self):
+        cache, run = CommandCache(ttl=0, max_entries=10), _Runs()
+        run.release.clear()
+
+        tasks = [asyncio.create_task(cache.get_or_run("k", run)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        run.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert run.calls == 1
+        assert sorted(source for _, source in results) == ["coalesced"] * 4 + ["miss"]
+        # TTL 0: coalescence seule, rien n'est gardé
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_cancelled_follower_runs(self):
+        cache, run = CommandCache(ttl=60, max_entries=10), _Runs()
+        run.release.clear()
+
+        leader = asyncio.create_task(cache.get_or_run("k", run))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(cache.get_or_run("k", run))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        await asyncio.sleep(0.01)
+        run.release.set()
+
+        assert await follower == ("out-2", "miss")
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.asyncio
+    async def test_not_cacheable_not_stored(self):
+        cache, run = CommandCache(ttl=60, max_entries=10), _Runs()
+
+        await cache.get_or_run("k", run, cacheable=lambda value: False)
+
+        assert await cache.get_or_run("k", run) == ("out-2", "miss")
+
+    @pytest.mark.asyncio
+    async def test_bounded(self):
+        cache = CommandCache(ttl=60, max_entries=2)
+
+        for key in "abc":
+            await cache.get_or_run(key, _Runs(key))
+
+        assert len(cache) == 2
+        assert (await cache.get_or_run("a", _Runs("again")))[1] == "miss"
+
+
+class TestExecutorCache:
+    """SecureExecutor: commandes en lecture seule seulement, clé argv/cwd/rôle"""
+
+    @pytest.fixture
+    def executor(self, tmp_path):
+        return SecureExecutor(workspace_dir=str(tmp_path))
+
+    @pytest.fixture
+    def spawns(self):
+        spawn = asyncio.create_subprocess_exec
+        with patch(
+            "app.services.react_engine.secure_executor.asyncio.create_subprocess_exec",
+            side_effect=spawn,
+        ) as spy:
+            yield spy
+
+    @pytest.mark.parametrize(
+        "command,cacheable",
+        [
+            ("df -h", True),
+            ("docker ps -a", True),
+            ("docker restart api", False),
+            ("systemctl status nginx", True),
+            ("systemctl --no-pager status nginx", True),
+            ("systemctl restart nginx", False),
+            ("ollama list", True),
+            ("ollama pull qwen", False),
+            ("date", False),
+            ("ip addr", True),
+            ("ip -4 addr show dev eth0", True),
+            ("ip route show table main", True),
+            ("ip link list", True),
+            ("ip route del default", False),
+            ("ip link set eth0 down", False),
+            ("ip addr add 10.0.0.2/24 dev eth0", False),
+            ("ip neigh flush all", False),
+            ("ifconfig", True),
+            ("ifconfig eth0 down", False),
+            ("hostname", True),
+            ("hostname newname", False),
+            ("ss -tlnp", True),
+            ("ss -K dst 10.0.0.1", False),
+            ("cat /etc/hostname", False),
+        ],
+    )
+    def test_cacheable_commands(self, executor, command, cacheable):
+        assert executor._is_cacheable(command.split()) is cacheable
+
+    @pytest.mark.asyncio
+    async def test_repeated_command_served_from_cache(self, executor, spawns):
+        first = await executor.execute("uptime", role=ExecutionRole.VIEWER)
+        second = await executor.execute("uptime", role=ExecutionRole.VIEWER)
+
+        assert spawns.call_count == 1
+        assert second.stdout == first.stdout and second.success
+        assert executor.audit_log[-1].result["cached"] == "hit"
+        assert executor.audit_log[-1].reason == "Résultat partagé"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_commands_run_once(self, executor, spawns):
+        results = await asyncio.gather(
+            *(executor.execute("df -h", role=ExecutionRole.VIEWER) for _ in range(5))
+        )
+
+        assert spawns.call_count == 1
+        assert len({r.stdout for r in results}) == 1
+        assert sorted(e.result.get("cached", "miss") for e in executor.audit_log) == [
+            "coalesced"
+        ] * 4 + ["miss"]
+
+    @pytest.mark.asyncio
+    async def test_key_includes_role_and_cwd(self, executor, spawns, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+
+        await executor.execute("uptime", role=ExecutionRole.VIEWER)
+        await executor.execute("uptime", role=ExecutionRole.OPERATOR)
+        await executor.execute("uptime", role=ExecutionRole.VIEWER, cwd=str(other))
+
+        assert spawns.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_mutating_forms_bypass_cache(self, executor, spawns):
+        """Les formes qui modifient l'état s'exécutent à chaque appel, même simultanées"""
+        spawn = spawns.side_effect
+        # Ne jamais modifier l'hôte de test: chaque exécution lance ``true``
+        spawns.side_effect = lambda *argv, **kwargs: spawn("true", **kwargs)
+        for command in ("hostname newname", "ifconfig eth0 down", "ip link set eth0 down"):
+            spawns.reset_mock()
+            await asyncio.gather(
+                *(executor.execute(command, role=ExecutionRole.VIEWER) for _ in range(3))
+            )
+            await executor.execute(command, role=ExecutionRole.VIEWER)
+
+            assert spawns.call_count == 4, command
+            assert all("cached" not in (e.result or {}) for e in list(executor.audit_log)[-4:])
+
+    @pytest.mark.asyncio
+    async def test_other_commands_not_cached(self, executor, spawns):
+        await executor.execute("date", role=ExecutionRole.VIEWER)
+        await executor.execute("date", role=ExecutionRole.VIEWER)
+
+        assert spawns.call_count == 2
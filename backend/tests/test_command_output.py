@@ -0,0 +1,158 @@
+"""
+Tests de la sortie des commandes lue au fil de l'eau (command_output, SecureExecutor)
+"""
+
+import asyncio
+
+import pytest
+from app.core.config import settings
+from app.services.react_engine.command_output import (BoundedOutput,
+                                                      LiveOutput,
+                                                      output_sink,
+                                                      stream_tool_output)
+from app.services.react_engine.secure_executor import (ExecutionRole,
+                                                       SecureExecutor)
+
+
+class _Emitted(list):
+    async def __call__(self, data):
+        self.append(data)
+
+
+class TestBoundedOutput:
+    """Début et fin conservés, milieu omis"""
+
+    def test_short_output_kept_whole(self):
+        output = BoundedOutput(head_bytes=10, tail_bytes=10)
+        for chunk in (b"hello ", b"world", b"!"):
+            output.feed(chunk)
+
+        assert output.text() == "hello world!"
+        assert output.omitted == 0 and output.total == 12
+
+    def test_long_output_keeps_head_and_tail(self):
+        output = BoundedOutput(head_bytes=5, tail_bytes=5)
+        for i in range(1000):
+            output.feed(f"{i:04d}\n".encode())
+
+        assert output.total == 5000 and output.omitted == 4990
+        assert output.text() == "0000\n\n[... 4990 octets omis ...]\n0999\n"
+        # Mémoire bornée: seuls les morceaux utiles à la fin sont gardés
+        assert sum(len(c) for c in output.tail) < 5 + 5
+
+
+class TestLiveOutput:
+    """Relais limité en débit"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_and_complete(self):
+        emitted = _Emitted()
+        live = LiveOutput(emitted, interval_ms=50, max_chars=100000)
+
+        for i in range(200):
+            live.feed("stdout", f"line {i}\n".encode())
+            await asyncio.sleep(0.001)
+        await live.aclose()
+
+        assert 2 <= len(emitted) <= 10
+        assert "".join(e["chunk"] for e in emitted) == "".join(f"line {i}\n" for i in range(200))
+        assert [e["seq"] for e in emitted] == list(range(1, len(emitted) + 1))
+
+    @pytest.mark.asyncio
+    async def test_oldest_dropped_over_cap(self):
+        emitted = _Emitted()
+        live = LiveOutput(emitted, interval_ms=1000, max_chars=10)
+
+        live.feed("stdout", b"0123456789abcdef")
+        live.feed("stderr", b"err")
+        await live.aclose()
+
+        chunks = {e["stream"]: e["chunk"] for e in emitted}
+        assert chunks == {"stdout": "6789abcdef", "stderr": "err"}
+        assert emitted[-1]["dropped"] == 6
+
+    @pytest.mark.asyncio
+    async def test_utf8_split_across_reads(self):
+        emitted = _Emitted()
+        live = LiveOutput(emitted, interval_ms=0)
+        data = "héllo ✓".encode()
+
+        for i in range(len(data)):
+            live.feed("stdout", data[i : i + 1])
+        await live.aclose()
+
+        assert "".join(e["chunk"] for e in emitted) == "héllo ✓"
+
+
+class TestExecutorStreaming:
+    """SecureExecutor lit les pipes au fil de l'eau"""
+
+    @pytest.fixture
+    def big_file(self, tmp_path):
+        path = tmp_path / "big.log"
+        path.write_bytes(b"".join(f"{i:07d}\n".encode() for i in range(100000)))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_output_bounded(self, tmp_path, big_file, monkeypatch):
+        monkeypatch.setattr(settings, "COMMAND_OUTPUT_HEAD_BYTES", 16)
+        monkeypatch.setattr(settings, "COMMAND_OUTPUT_TAIL_BYTES", 16)
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+
+        result = await executor.execute(f"cat {big_file}", role=ExecutionRole.VIEWER)
+
+        assert result.success
+        assert result.stdout.startswith("0000000\n0000001\n")
+        assert result.stdout.endswith("0099998\n0099999\n")
+        assert result.omitted_bytes == 800000 - 32
+        assert executor.audit_log[-1].result["stdout_len"] == 800000
+
+    @pytest.mark.asyncio
+    async def test_raw_output_not_bounded(self, tmp_path, big_file, monkeypatch):
+        monkeypatch.setattr(settings, "COMMAND_OUTPUT_HEAD_BYTES", 16)
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+
+        result = await executor.execute(
+            f"cat {big_file}", role=ExecutionRole.VIEWER, raw_output=True
+        )
+
+        assert len(result.stdout) == 800000 and result.omitted_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_chunks_forwarded_to_sink(self, tmp_path, big_file):
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+        received = []
+        token = output_sink.set(lambda stream, chunk: received.append((stream, chunk)))
+        try:
+            await executor.execute(f"cat {big_file}", role=ExecutionRole.VIEWER)
+        finally:
+            output_sink.reset(token)
+
+        assert len(received) > 1
+        assert b"".join(chunk for _, chunk in received) == big_file.read_bytes()
+
+    @pytest.mark.asyncio
+    async def test_tool_output_events(self, tmp_path, monkeypatch):
+        """Les morceaux deviennent des événements tool_output valides"""
+        monkeypatch.setattr(settings, "WS_MODE", "v8")
+        monkeypatch.setattr(settings, "WS_STRICT_VALIDATION", True)
+        (tmp_path / "out.txt").write_text("one\ntwo\n")
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+        sent = []
+
+        class _WebSocket:
+            async def send_json(self, event):
+                sent.append(event)
+
+        async with stream_tool_output(_WebSocket(), "run-1", "execute_command"):
+            await executor.execute(f"cat {tmp_path / 'out.txt'}", role=ExecutionRole.VIEWER)
+
+        assert [e["type"] for e in sent] == ["tool_output"]
+        assert sent[0]["run_id"] == "run-1"
+        assert sent[0]["data"]["tool"] == "execute_command"
+        assert sent[0]["data"]["chunk"] == "one\ntwo\n"
+
+    @pytest.mark.asyncio
+    async def test_no_websocket_no_sink(self):
+        async with stream_tool_output(None, "run-1", "execute_command") as live:
+            assert live is None and output_sink.get() is None
@@ -0,0 +1,146 @@
+"""
+Tests des places d'exécution des commandes (command_pool, SecureExecutor)
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+from app.core.config import settings
+from app.services.react_engine.command_pool import CommandPool, PoolBusy
+from app.services.react_engine.secure_executor import ExecutionRole, SecureExecutor
+
+
+async def _hold(pool: CommandPool, role: str, user, order: list, release: asyncio.Event):
+    async with pool.slot(role, user):
+        order.append(user)
+        await release.wait()
+
+
+async def _tick():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestCommandPool:
+    """Limites globales et par rôle, tour de rôle entre utilisateurs"""
+
+    @pytest.mark.asyncio
+    async def test_global_limit(self):
+        pool = CommandPool(max_concurrent=2, role_limits={})
+        order, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(pool, "viewer", u, order, release)) for u in "abc"]
+        await _tick()
+        assert order == ["a", "b"] and pool.queued == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"] and pool.active == 0
+
+    @pytest.mark.asyncio
+    async def test_role_limit_does_not_block_other_roles(self):
+        pool = CommandPool(max_concurrent=4, role_limits={"operator": 1})
+        order, release = [], asyncio.Event()
+
+        build = asyncio.create_task(_hold(pool, "operator", "a", order, release))
+        await _tick()
+        blocked = asyncio.create_task(_hold(pool, "operator", "b", order, release))
+        await _tick()
+        viewer = asyncio.create_task(_hold(pool, "viewer", "c", order, release))
+        await _tick()
+
+        assert order == ["a", "c"] and pool.queued == 1
+        release.set()
+        await asyncio.gather(build, blocked, viewer)
+        assert order == ["a", "c", "b"]
+
+    @pytest.mark.asyncio
+    async def test_fair_across_users(self):
+        pool = CommandPool(max_concurrent=1, role_limits={})
+        order = []
+
+        async def run(user):
+            async with pool.slot("viewer", user):
+                order.append(user)
+                await asyncio.sleep(0.01)
+
+        busy = asyncio.create_task(run("first"))
+        await _tick()
+        # "a" lance quatre commandes avant la seule de "b"
+        tasks = [asyncio.create_task(run(u)) for u in ["a", "a", "a", "a", "b"]]
+        await asyncio.gather(busy, *tasks)
+
+        assert order == ["first", "a", "b", "a", "a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self, monkeypatch):
+        monkeypatch.setattr(settings, "COMMAND_POOL_QUEUE_TIMEOUT_SECONDS", 0.05)
+        pool = CommandPool(max_concurrent=1, role_limits={})
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(pool, "viewer", "a", [], release))
+        await _tick()
+
+        with pytest.raises(PoolBusy):
+            async with pool.slot("viewer", "b"):
+                pass
+
+        assert pool.queued == 0
+        release.set()
+        await holder
+        assert pool.active == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_queued(self):
+        pool = CommandPool(max_concurrent=1, role_limits={})
+        order, release = [], asyncio.Event()
+        holder = asyncio.create_task(_hold(pool, "viewer", "a", order, release))
+        await _tick()
+        waiting = asyncio.create_task(_hold(pool, "viewer", "b", order, release))
+        await _tick()
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        release.set()
+        await holder
+
+        assert order == ["a"] and pool.queued == 0 and pool.active == 0
+
+
+class TestExecutorPool:
+    """SecureExecutor attend une place avant de lancer la commande"""
+
+    @pytest.mark.asyncio
+    async def test_busy_when_no_slot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "COMMAND_POOL_QUEUE_TIMEOUT_SECONDS", 0.05)
+        pool = CommandPool(max_concurrent=1, role_limits={})
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+
+        with patch("app.services.react_engine.secure_executor.command_pool", pool):
+            async with pool.slot("viewer", "someone"):
+                result = await executor.execute("pwd", role=ExecutionRole.VIEWER)
+            after = await executor.execute("pwd", role=ExecutionRole.VIEWER)
+
+        assert result.error_code == "E_TOOL_BUSY"
+        assert executor.audit_log[-2].result == {"error": "busy"}
+        assert after.success
+
+    @pytest.mark.asyncio
+    async def test_nice_and_affinity_per_role(self, tmp_path, monkeypatch):
+        cpu = min(os.sched_getaffinity(0))
+        monkeypatch.setattr(settings, "COMMAND_NICE", {"operator": 5})
+        monkeypatch.setattr(settings, "COMMAND_CPU_AFFINITY", {"operator": [cpu]})
+        script = tmp_path / "prio.py"
+        script.write_text("import os\nprint(os.nice(0), sorted(os.sched_getaffinity(0)))\n")
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+        monkeypatch.setattr(executor, "_is_command_allowed", lambda argv, role: (True, ""))
+        base = os.nice(0)
+
+        operator = await executor.execute(f"{sys.executable} {script}", ExecutionRole.OPERATOR)
+        viewer = await executor.execute(f"{sys.executable} {script}", ExecutionRole.VIEWER)
+
+        assert operator.stdout.strip() == f"{min(base + 5, 19)} [{cpu}]"
+        assert viewer.stdout.split()[0] == str(base)
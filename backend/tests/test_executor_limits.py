@@ -0,0 +1,149 @@
+"""
+Tests de l'arrêt des commandes (groupe de processus) et des rlimits (SecureExecutor)
+"""
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+import psutil
+import pytest
+from app.core.config import settings
+from app.services.react_engine.secure_executor import ExecutionRole, SecureExecutor
+
+# Meneur et descendants ignorent SIGTERM; un petit-enfant orphelin reste dans le groupe
+FORKING_SCRIPT = """
+import os, signal, sys, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+for _ in range(3):
+    if os.fork() == 0:
+        if os.fork() != 0:
+            os._exit(0)
+        break
+with open(sys.argv[1], "a") as f:
+    f.write(f"{os.getpid()}\\n")
+while True:
+    time.sleep(1)
+"""
+
+RLIMIT_SCRIPT = """
+import resource
+for name in ("RLIMIT_CPU", "RLIMIT_AS", "RLIMIT_FSIZE", "RLIMIT_NOFILE"):
+    print(name, *resource.getrlimit(getattr(resource, name)))
+"""
+
+
+def _alive(pid: int) -> bool:
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+async def _wait_pids(path, count: int) -> list:
+    for _ in range(100):
+        if path.exists() and len(path.read_text().split()) >= count:
+            break
+        await asyncio.sleep(0.05)
+    return [int(pid) for pid in path.read_text().split()]
+
+
+@pytest.fixture
+def executor(tmp_path, monkeypatch):
+    """Exécuteur qui autorise l'interpréteur Python (scripts de test uniquement)"""
+    monkeypatch.setattr(settings, "COMMAND_KILL_GRACE_SECONDS", 0.2)
+    executor = SecureExecutor(workspace_dir=str(tmp_path))
+    monkeypatch.setattr(executor, "_is_command_allowed", lambda argv, role: (True, ""))
+    return executor
+
+
+@pytest.fixture
+def script(tmp_path):
+    def write(source: str) -> str:
+        path = tmp_path / "script.py"
+        path.write_text(source)
+        return f"{sys.executable} {path}"
+
+    return write
+
+
+class TestProcessGroupKill:
+    """Timeout et annulation arrêtent la commande et tous ses descendants"""
+
+    @pytest.mark.asyncio
+    async def test_timeout_escalates_to_sigkill(self, executor, script, tmp_path):
+        pids_file = tmp_path / "pids"
+
+        result = await executor.execute(
+            f"{script(FORKING_SCRIPT)} {pids_file}", role=ExecutionRole.ADMIN, timeout=1
+        )
+
+        assert result.error_code == "E_TIMEOUT"
+        assert executor.audit_log[-1].result == {"error": "timeout", "killed": "SIGKILL"}
+        pids = await _wait_pids(pids_file, 4)
+        assert len(pids) == 4
+        await asyncio.sleep(0.1)
+        assert [pid for pid in pids if _alive(pid)] == []
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_descendants(self, executor, script, tmp_path):
+        pids_file = tmp_path / "pids"
+        task = asyncio.create_task(
+            executor.execute(f"{script(FORKING_SCRIPT)} {pids_file}", role=ExecutionRole.ADMIN)
+        )
+        pids = await _wait_pids(pids_file, 4)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert executor.audit_log[-1].result == {"error": "cancelled"}
+        await asyncio.sleep(0.1)
+        assert [pid for pid in pids if _alive(pid)] == []
+
+    @pytest.mark.asyncio
+    async def test_sigterm_enough(self, tmp_path):
+        """Une commande qui respecte SIGTERM n'est pas tuée par SIGKILL"""
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+
+        result = await executor.execute("tail -f /dev/null", role=ExecutionRole.VIEWER, timeout=1)
+
+        assert result.error_code == "E_TIMEOUT"
+        assert executor.audit_log[-1].result["killed"] == "SIGTERM"
+        children = [c for c in psutil.Process().children(recursive=True) if _alive(c.pid)]
+        assert children == []
+
+
+class TestRlimits:
+    """COMMAND_RLIMIT_* appliquées dans l'enfant avant exec"""
+
+    @pytest.mark.asyncio
+    async def test_limits_applied(self, executor, script, monkeypatch):
+        monkeypatch.setattr(settings, "COMMAND_RLIMIT_CPU_SECONDS", 30)
+        monkeypatch.setattr(settings, "COMMAND_RLIMIT_AS_BYTES", 2 * 1024**3)
+        monkeypatch.setattr(settings, "COMMAND_RLIMIT_FSIZE_BYTES", 1024**2)
+        monkeypatch.setattr(settings, "COMMAND_RLIMIT_NOFILE", 64)
+
+        result = await executor.execute(script(RLIMIT_SCRIPT), role=ExecutionRole.ADMIN)
+
+        assert result.success, result.stderr
+        limits = {line.split()[0]: line.split()[1:] for line in result.stdout.splitlines()}
+        assert limits["RLIMIT_CPU"] == ["30", "30"]
+        assert limits["RLIMIT_AS"] == [str(2 * 1024**3)] * 2
+        assert limits["RLIMIT_FSIZE"] == [str(1024**2)] * 2
+        assert limits["RLIMIT_NOFILE"] == ["64", "64"]
+
+    @pytest.mark.asyncio
+    async def test_no_preexec_without_limits(self, tmp_path):
+        executor = SecureExecutor(workspace_dir=str(tmp_path))
+        spawn = asyncio.create_subprocess_exec
+
+        with patch(
+            "app.services.react_engine.secure_executor.asyncio.create_subprocess_exec",
+            side_effect=spawn,
+        ) as spy:
+            result = await executor.execute("pwd", role=ExecutionRole.VIEWER)
+
+        assert result.success
+        assert spy.call_args.kwargs["preexec_fn"] is None
+        assert spy.call_args.kwargs["start_new_session"] is True
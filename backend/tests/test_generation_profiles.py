@@ -0,0 +1,167 @@
+"""
+Tests pour les profils de génération par phase (num_predict, stop, tokens par phase)
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from app.core.config import settings
+from app.core.metrics import LLM_PHASE_STOPS, LLM_PHASE_TOKENS
+from app.services.ollama.client import OllamaClient
+from app.services.ollama.profiles import (CLOSING_FENCE, get_profile,
+                                          resolve_options)
+from app.services.react_engine.verifier import VerifierService
+from app.services.react_engine.workflow_engine import WorkflowEngine
+
+
+def _mock_ollama(handler):
+    """Patch httpx.AsyncClient du client Ollama avec un transport local"""
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("app.services.ollama.client.httpx.AsyncClient", side_effect=factory)
+
+
+def _tokens(phase: str, kind: str) -> float:
+    return LLM_PHASE_TOKENS.labels(phase=phase, type=kind)._value.get()
+
+
+class TestProfiles:
+    """Définition et surcharge des profils"""
+
+    def test_default_matches_legacy_options(self):
+        assert get_profile(None).to_options() == {"temperature": 0.7, "num_ctx": 8192}
+
+    def test_unknown_profile_falls_back_to_default(self):
+        assert get_profile("nope").name == "default"
+
+    def test_json_phases_are_capped_with_closing_fence(self):
+        for phase in ("spec", "plan", "judge"):
+            options = get_profile(phase).to_options()
+            assert options["num_predict"] > 0
+            assert options["stop"] == [CLOSING_FENCE]
+
+    def test_react_phases_stop_after_tool_block(self):
+        profile = get_profile("execute")
+
+        assert "stop" not in profile.to_options()
+        assert profile.block_closed('```tool\n{"tool": "read_file"}\n```')
+        assert not profile.block_closed('```tool\n{"tool": "read_file"')
+        assert not profile.block_closed("```python\nprint(1)\n```")
+
+    def test_settings_overrides(self):
+        original = settings.LLM_PROFILE_OVERRIDES
+        settings.LLM_PROFILE_OVERRIDES = {"spec": {"num_predict": 256, "stop": ["FIN"]}}
+        try:
+            options = get_profile("spec").to_options()
+        finally:
+            settings.LLM_PROFILE_OVERRIDES = original
+
+        assert options["num_predict"] == 256
+        assert options["stop"] == ["FIN"]
+
+    def test_explicit_options_win(self):
+        options = resolve_options("judge", {"temperature": 0.0})
+
+        assert options["temperature"] == 0.0
+        assert options["num_predict"] == get_profile("judge").num_predict
+
+
+class TestOllamaClientProfiles:
+    """Les options du profil sont envoyées et les tokens comptés par phase"""
+
+    @pytest.mark.asyncio
+    async def test_generate_sends_profile_and_records_tokens(self):
+        sent = {}
+
+        def handler(request):
+            sent.update(json.loads(request.content))
+            return httpx.Response(
+                200,
+                json={
+                    "response": "ok",
+                    "prompt_eval_count": 40,
+                    "eval_count": 12,
+                    "done_reason": "length",
+                },
+            )
+
+        before = _tokens("spec", "completion")
+        stops_before = LLM_PHASE_STOPS.labels(phase="spec", reason="length")._value.get()
+
+        with _mock_ollama(handler):
+            await OllamaClient("http://ollama").generate("p", model="m", profile="spec")
+
+        assert sent["options"]["num_predict"] == get_profile("spec").num_predict
+        assert sent["options"]["stop"] == [CLOSING_FENCE]
+        assert _tokens("spec", "completion") == before + 12
+        assert LLM_PHASE_STOPS.labels(phase="spec", reason="length")._value.get() == stops_before + 1
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_after_tool_block(self):
+        chunks = ["```tool\n", '{"tool": "read_file"}', "\n```", "\nRésultat de read_file: ..."]
+
+        def handler(request):
+            body = "\n".join(json.dumps({"response": c, "done": False}) for c in chunks)
+            return httpx.Response(200, content=body.encode())
+
+        before = LLM_PHASE_STOPS.labels(phase="execute", reason="stop_block")._value.get()
+
+        with _mock_ollama(handler):
+            received = [
+                t
+                async for t in OllamaClient("http://ollama").generate_stream(
+                    "p", model="m", profile="execute"
+                )
+            ]
+
+        assert "".join(received) == "".join(chunks[:3])
+        assert LLM_PHASE_STOPS.labels(phase="execute", reason="stop_block")._value.get() == before + 1
+
+    @pytest.mark.asyncio
+    async def test_stream_records_final_counts(self):
+        def handler(request):
+            lines = [
+                {"response": "bon", "done": False},
+                {"response": "jour", "done": True, "prompt_eval_count": 5, "eval_count": 2},
+            ]
+            return httpx.Response(200, content="\n".join(map(json.dumps, lines)).encode())
+
+        before = _tokens("default", "prompt")
+
+        with _mock_ollama(handler):
+            received = [t async for t in OllamaClient("http://ollama").generate_stream("p")]
+
+        assert received == ["bon", "jour"]
+        assert _tokens("default", "prompt") == before + 5
+
+
+class TestTruncatedOutputs:
+    """La séquence d'arrêt retire la fence fermante: les parseurs l'acceptent"""
+
+    def test_verdict_without_closing_fence(self):
+        content = '```json\n{"status": "PASS", "confidence": 0.9}'
+
+        verdict = VerifierService()._parse_verdict(content)
+
+        assert verdict.status == "PASS"
+        assert verdict.confidence == 0.9
+
+    @pytest.mark.asyncio
+    async def test_spec_without_closing_fence(self):
+        content = '```json\n{"objective": "créer x", "acceptance": {"checks": ["pytest passes"]}}'
+
+        with patch(
+            "app.services.react_engine.workflow_engine.ollama_client.generate",
+            new_callable=AsyncMock,
+            return_value={"response": content},
+        ) as generate:
+            spec = await WorkflowEngine()._generate_spec("créer x", "m")
+
+        assert generate.await_args.kwargs["profile"] == "spec"
+        assert spec.objective == "créer x"
+        assert spec.acceptance.checks == ["pytest passes"]
@@ -0,0 +1,298 @@
+"""
+Tests de l'état git mis en cache (git_state): statut, diff paginé, historique paginé
+"""
+
+import subprocess
+
+import pytest
+from app.core.config import settings
+from app.services.react_engine import git_state as git_state_module
+from app.services.react_engine.git_state import (GitError, GitState,
+                                                 match_patch, parse_numstat,
+                                                 parse_status, patch_header,
+                                                 split_patch)
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, capture_output=True, check=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    try:
+        subprocess.run(["git", "--version"], capture_output=True, check=True, timeout=2)
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        pytest.skip("git not available")
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "test@test.com")
+    _git(path, "config", "user.name", "Test User")
+    for i in range(5):
+        (path / f"file{i}.txt").write_text("".join(f"line {n}\n" for n in range(50)))
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "initial")
+    return path
+
+
+@pytest.fixture
+def git_calls(monkeypatch):
+    """Sous-commandes git lancées via SecureExecutor"""
+    calls = []
+    execute = git_state_module.secure_executor.execute
+
+    async def counting(command, **kwargs):
+        # Sous-commande: premier mot après les options globales de git
+        calls.append(next(word for word in command.split()[1:] if not word.startswith("-")))
+        return await execute(command, **kwargs)
+
+    monkeypatch.setattr(git_state_module.secure_executor, "execute", counting)
+    return calls
+
+
+@pytest.fixture
+def state(monkeypatch):
+    monkeypatch.setattr(settings, "GIT_STATE_TTL_SECONDS", 60)
+    return GitState()
+
+
+class TestStatus:
+    """Statut mis en cache et invalidé"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_status_served_from_cache(self, repo, state, git_calls):
+        (repo / "file0.txt").write_text("changed\n")
+
+        first = await state.status(str(repo))
+        second = await state.status(str(repo / "sub"))
+
+        assert git_calls == ["status"]
+        assert not first["cached"] and second["cached"]
+        assert first["branch"] == "main" and len(first["head"]) == 40
+        assert [f["path"] for f in second["files"]] == ["file0.txt"]
+        assert " M file0.txt" in second["stdout"]
+
+    @pytest.mark.asyncio
+    async def test_index_change_invalidates(self, repo, state, git_calls):
+        (repo / "file0.txt").write_text("changed\n")
+        await state.status(str(repo))
+
+        _git(repo, "add", "file0.txt")
+        status = await state.status(str(repo))
+
+        assert git_calls == ["status", "status"]
+        assert status["files"][0]["index"] == "M"
+
+    @pytest.mark.asyncio
+    async def test_commit_invalidates(self, repo, state):
+        (repo / "file0.txt").write_text("changed\n")
+        before = await state.status(str(repo))
+
+        _git(repo, "commit", "-q", "-am", "change")
+        after = await state.status(str(repo))
+
+        assert after["clean"] and not after["cached"]
+        assert after["head"] != before["head"]
+
+    @pytest.mark.asyncio
+    async def test_workspace_change_events_invalidate(self, repo, state, git_calls):
+        await state.status(str(repo))
+        (repo / "new.txt").write_text("new\n")
+
+        state.on_paths_changed([str(repo.parent / "elsewhere.txt")])
+        assert (await state.status(str(repo)))["cached"]
+
+        state.on_paths_changed([str(repo / "new.txt")])
+        status = await state.status(str(repo))
+
+        assert not status["cached"]
+        assert status["files"] == [{"index": "?", "worktree": "?", "path": "new.txt"}]
+
+    @pytest.mark.asyncio
+    async def test_ttl_when_not_watched(self, repo, state, monkeypatch):
+        monkeypatch.setattr(settings, "GIT_STATE_TTL_SECONDS", 0)
+        await state.status(str(repo))
+
+        assert not (await state.status(str(repo)))["cached"]
+
+    @pytest.mark.asyncio
+    async def test_no_repo(self, tmp_path, state):
+        with pytest.raises(GitError) as exc:
+            await state.status(str(tmp_path))
+
+        assert exc.value.code == "E_GIT_NO_REPO"
+
+
+class TestDiff:
+    """Diff paginé par fichier, plafonné en octets"""
+
+    @pytest.fixture
+    def modified(self, repo):
+        for i in range(5):
+            (repo / f"file{i}.txt").write_text("".join(f"LINE {n}\n" for n in range(50)))
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_pages(self, modified, state, git_calls):
+        first = await state.diff(str(modified), limit=2)
+        second = await state.diff(str(modified), offset=first["next_offset"], limit=2)
+        last = await state.diff(str(modified), offset=4, limit=2)
+
+        assert [f["path"] for f in first["files"]] == ["file0.txt", "file1.txt"]
+        assert [f["path"] for f in second["files"]] == ["file2.txt", "file3.txt"]
+        assert last["next_offset"] is None
+        assert first["stat"] == {"files": 5, "added": 250, "deleted": 250}
+        assert "diff --git a/file1.txt" in first["stdout"]
+        assert "file2.txt" not in first["stdout"]
+        # Statistiques calculées une fois pour toutes les pages
+        assert git_calls.count("diff") == 4
+
+    @pytest.mark.asyncio
+    async def test_stat_only(self, modified, state, git_calls):
+        result = await state.diff(str(modified), stat_only=True)
+
+        assert result["stdout"] == ""
+        assert result["total_files"] == 5
+        assert git_calls == ["diff"]
+
+    @pytest.mark.asyncio
+    async def test_file_cap(self, modified, state, monkeypatch):
+        monkeypatch.setattr(settings, "GIT_DIFF_MAX_FILE_BYTES", 200)
+
+        result = await state.diff(str(modified), limit=1)
+
+        assert result["truncated"] and result["files"][0]["truncated"]
+        assert "[tronqué:" in result["stdout"]
+        assert len(result["stdout"].encode()) < 300
+
+    @pytest.mark.asyncio
+    async def test_page_byte_budget_moves_next_offset(self, modified, state):
+        result = await state.diff(str(modified), limit=5, max_bytes=1500)
+
+        assert 1 <= len(result["files"]) < 5
+        assert result["next_offset"] == len(result["files"])
+        assert result["truncated"]
+
+    @pytest.mark.asyncio
+    async def test_staged_and_pathspec(self, modified, state):
+        _git(modified, "add", "file3.txt")
+
+        staged = await state.diff(str(modified), staged=True)
+        scoped = await state.diff(str(modified), pathspec="file1.txt")
+
+        assert [f["path"] for f in staged["files"]] == ["file3.txt"]
+        assert [f["path"] for f in scoped["files"]] == ["file1.txt"]
+
+
+    @pytest.mark.asyncio
+    async def test_patches_matched_to_files_by_header(self, repo, state):
+        """Noms avec *, [, : en tête ou non ASCII: chaque page porte le patch de son fichier"""
+        names = ["*.txt", "f[0].txt", "f0.txt", ":x.txt", "é t.txt", 'q"uote.txt']
+        for name in names:
+            (repo / name).write_text("a\n")
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-q", "-m", "noms")
+        for name in names:
+            (repo / name).write_text(f"a\n{name}\n")
+
+        for offset in range(len(names)):
+            page = await state.diff(str(repo), offset=offset, limit=1)
+            (entry,) = page["files"]
+            assert page["stdout"].startswith(patch_header(entry["path"], entry["path"]))
+            assert f"+{entry['path']}\n" in page["stdout"]
+            assert len(split_patch(page["stdout"])) == 1
+
+
+class TestLog:
+    """Historique paginé par curseur"""
+
+    @pytest.fixture
+    def history(self, repo):
+        for i in range(4):
+            (repo / "file0.txt").write_text(f"version {i}\n")
+            _git(repo, "commit", "-q", "-am", f"commit {i}")
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_history(self, history, state):
+        subjects, cursor = [], None
+        while True:
+            page = await state.log(str(history), cursor=cursor, limit=2)
+            subjects += [c["subject"] for c in page["commits"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert subjects == ["commit 3", "commit 2", "commit 1", "commit 0", "initial"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_stable_when_head_moves(self, history, state):
+        first = await state.log(str(history), limit=2)
+        _git(history, "commit", "-q", "--allow-empty", "-m", "later")
+
+        second = await state.log(str(history), cursor=first["next_cursor"], limit=2)
+
+        assert [c["subject"] for c in second["commits"]] == ["commit 1", "commit 0"]
+
+    @pytest.mark.asyncio
+    async def test_pages_cached(self, history, state, git_calls):
+        first = await state.log(str(history), limit=2)
+        again = await state.log(str(history), limit=2)
+
+        assert git_calls == ["log"]
+        assert again["cached"] and again["commits"] == first["commits"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, history, state):
+        with pytest.raises(GitError) as exc:
+            await state.log(str(history), cursor="HEAD;rm:0")
+
+        assert exc.value.code == "E_INVALID_CURSOR"
+
+    @pytest.mark.asyncio
+    async def test_empty_repo(self, tmp_path, state):
+        _git(tmp_path, "init", "-q")
+
+        page = await state.log(str(tmp_path))
+
+        assert page["commits"] == [] and page["next_cursor"] is None
+
+
+class TestParsing:
+    """Analyse des sorties git"""
+
+    def test_status_branch_header(self):
+        status = parse_status("## main...origin/main [ahead 2, behind 1]\nR  a.txt -> b.txt\n")
+
+        assert (status["branch"], status["upstream"]) == ("main", "origin/main")
+        assert (status["ahead"], status["behind"]) == (2, 1)
+        assert status["files"] == [
+            {"index": "R", "worktree": " ", "path": "b.txt", "old_path": "a.txt"}
+        ]
+        assert status["stdout"] == "R  a.txt -> b.txt\n"
+
+    def test_numstat_rename_and_binary(self):
+        files = parse_numstat("1\t2\ta.py\0-\t-\timg.png\x003\t0\t\0old.py\0new.py\0")
+
+        assert files == [
+            {"path": "a.py", "added": 1, "deleted": 2, "binary": False},
+            {"path": "img.png", "added": 0, "deleted": 0, "binary": True},
+            {"old_path": "old.py", "path": "new.py", "added": 3, "deleted": 0, "binary": False},
+        ]
+
+    def test_match_patch_by_header(self):
+        chunks = {
+            'diff --git "a/\\303\\251.txt" "b/\\303\\251.txt"': "é",
+            "diff --git a/old.py b/old.py": "-old\n",
+            "diff --git a/new.py b/new.py": "+new\n",
+        }
+
+        assert match_patch({"path": "é.txt"}, chunks) == "é"
+        # Renommage non détecté par le second diff: suppression + ajout
+        assert match_patch({"old_path": "old.py", "path": "new.py"}, chunks) == "-old\n+new\n"
+        assert match_patch({"path": "absent.py"}, chunks) == ""
+
+    def test_split_patch(self):
+        patch = "diff --git a/x b/x\n+1\ndiff --git a/y b/y\n+2\n"
+
+        assert split_patch(patch) == ["diff --git a/x b/x\n+1\n", "diff --git a/y b/y\n+2\n"]
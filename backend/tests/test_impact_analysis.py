@@ -0,0 +1,226 @@
+"""
+Tests de la sélection des tests par impact et du mode shardé (run_tests)
+"""
+
+import os
+
+import pytest
+from app.core.config import settings
+from app.services.react_engine import impact_analysis, tools
+from app.services.react_engine.impact_analysis import (ImpactAnalyzer,
+                                                       module_names,
+                                                       parse_imports,
+                                                       split_shards)
+from app.services.react_engine.secure_executor import ExecutionResult
+
+FILES = {
+    "pkg/__init__.py": "",
+    "pkg/core.py": "VALUE = 1\n",
+    "pkg/util.py": "from . import core\n",
+    "pkg/other.py": "import json\n",
+    "tests/conftest.py": "",
+    "tests/test_core.py": "from pkg.core import VALUE\n",
+    "tests/test_util.py": "from pkg.util import core\n",
+    "tests/test_other.py": "import pkg.other\n",
+    "tests/data/sample.json": "{}\n",
+}
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    for rel, content in FILES.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+@pytest.fixture
+def analyzer(workspace):
+    analyzer = ImpactAnalyzer(str(workspace))
+    analyzer.refresh()
+    return analyzer
+
+
+class TestImports:
+    """Analyse des imports (ast)"""
+
+    def test_module_names(self):
+        assert module_names("app/core/config.py") == ["app.core.config", "core.config", "config"]
+        assert module_names("app/core/__init__.py") == ["app.core", "core"]
+
+    def test_parse_imports(self):
+        source = "import os\nfrom app.core import config\nfrom ..x import y\nfrom . import *\n"
+        assert parse_imports(source, "app/services/mod.py") == [
+            "app.core",
+            "app.core.config",
+            "app.services",
+            "app.x",
+            "app.x.y",
+            "os",
+        ]
+
+    def test_syntax_error(self):
+        assert parse_imports("def (:\n", "broken.py") == []
+
+
+class TestSelection:
+    """Fichiers modifiés → tests sélectionnés"""
+
+    def test_import_closure(self, analyzer):
+        selection = analyzer.select(["pkg/core.py"])
+
+        assert selection.tests == ["tests/test_core.py", "tests/test_util.py"]
+        assert selection.total == 3 and selection.skipped == 1
+        assert selection.reasons["tests/test_util.py"] == "imports"
+
+    def test_changed_test_file(self, analyzer):
+        assert analyzer.select(["tests/test_other.py"]).reasons == {
+            "tests/test_other.py": "changed"
+        }
+
+    def test_package_init_touches_submodule_importers(self, analyzer):
+        assert len(analyzer.select(["pkg/__init__.py"]).tests) == 3
+
+    def test_conftest_and_test_data(self, analyzer):
+        assert analyzer.select(["tests/conftest.py"]).skipped == 0
+        assert analyzer.select(["tests/data/sample.json"]).skipped == 0
+        assert analyzer.select(["docs/notes.md"]).tests == []
+
+    def test_config_forces_full_run(self, analyzer):
+        selection = analyzer.select(["pyproject.toml"])
+
+        assert selection.full and selection.skipped == 0
+
+    def test_failed_tests_reselected(self, analyzer):
+        output = "FAILED tests/test_other.py::test_x - assert 1 == 2\n1 failed in 0.1s\n"
+        analyzer.record_failures([output], ["tests/test_other.py", "tests/test_core.py"])
+
+        assert analyzer.select([]).reasons == {"tests/test_other.py": "failed_last_run"}
+
+        analyzer.record_failures(["1 passed\n"], ["tests/test_other.py"])
+        assert analyzer.select([]).tests == []
+
+    def test_cache_persisted(self, analyzer, workspace):
+        analyzer.failed = {"tests/test_core.py"}
+        analyzer.save()
+
+        reloaded = ImpactAnalyzer(str(workspace))
+        reloaded.load()
+
+        assert reloaded.refresh() == 0
+        assert reloaded.failed == {"tests/test_core.py"}
+        (workspace / "pkg" / "other.py").write_text("from pkg import core\n")
+        assert reloaded.refresh() == 1
+        assert "tests/test_other.py" in reloaded.select(["pkg/core.py"]).tests
+
+
+class TestShards:
+    """Répartition des fichiers de test"""
+
+    def test_balanced_by_size(self, tmp_path):
+        for name, size in (("a.py", 900), ("b.py", 500), ("c.py", 400), ("d.py", 100)):
+            (tmp_path / name).write_text("x" * size)
+
+        groups = split_shards(["a.py", "b.py", "c.py", "d.py"], 2, str(tmp_path))
+
+        assert groups == [["a.py", "d.py"], ["b.py", "c.py"]]
+
+    def test_no_empty_shard(self, tmp_path):
+        assert split_shards(["a.py"], 4, str(tmp_path)) == [["a.py"]]
+
+
+class _Runs(list):
+    """Fichiers passés à chaque sous-processus pytest; ``failing``: tests en échec simulés"""
+
+    def __init__(self):
+        super().__init__()
+        self.failing = set()
+
+
+class TestRunTests:
+    """run_tests en mode impact / shardé (SecureExecutor simulé)"""
+
+    @pytest.fixture
+    def executed(self, workspace, monkeypatch):
+        monkeypatch.setattr(settings, "WORKSPACE_DIR", str(workspace))
+        monkeypatch.setattr(impact_analysis, "_analyzers", {})
+        calls = _Runs()
+        failing = calls.failing
+
+        async def execute(command, **kwargs):
+            files = command.split()[5:]
+            calls.append(files)
+            bad = [f for f in files if f in failing]
+            stdout = "".join(f"FAILED {f}::test_x - assert False\n" for f in bad)
+            stdout += f"{len(bad)} failed, {len(files) - len(bad)} passed in 0.1s\n"
+            code = 1 if bad else 0
+            return ExecutionResult(
+                success=not bad,
+                stdout=stdout,
+                returncode=code,
+                error_code="E_CMD_FAILED" if bad else None,
+            )
+
+        monkeypatch.setattr(tools.secure_executor, "execute", execute)
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_impact_report(self, executed):
+        result = await tools.run_tests(mode="impact", changed=["pkg/core.py"])
+
+        assert result["success"]
+        data = result["data"]
+        assert (data["selected"], data["skipped"], data["total_test_files"]) == (2, 1, 3)
+        assert executed == [["tests/test_core.py", "tests/test_util.py"]]
+        assert data["returncode"] == 0 and data["wall_ms"] >= 0
+        assert data["shards"][0]["summary"] == "0 failed, 2 passed in 0.1s"
+
+    @pytest.mark.asyncio
+    async def test_nothing_impacted(self, executed):
+        result = await tools.run_tests(mode="impact", changed="docs/notes.md")
+
+        assert result["success"] and result["data"]["selected"] == 0
+        assert executed == []
+
+    @pytest.mark.asyncio
+    async def test_sharded_failure_reselected_next_run(self, executed):
+        executed.failing.add("tests/test_other.py")
+
+        result = await tools.run_tests(shards=3)
+
+        assert not result["success"]
+        assert result["error"]["code"] == "E_CMD_FAILED"
+        assert "FAILED tests/test_other.py" in result["error"]["message"]
+        assert result["meta"]["selected"] == 3 and len(result["meta"]["shards"]) == 3
+        assert sorted(f for files in executed for f in files) == [
+            "tests/test_core.py",
+            "tests/test_other.py",
+            "tests/test_util.py",
+        ]
+
+        executed.clear()
+        executed.failing.clear()
+        result = await tools.run_tests(mode="impact", changed=[])
+        assert executed == [["tests/test_other.py"]]
+        assert result["data"]["reasons"] == {"tests/test_other.py": "failed_last_run"}
+        assert os.path.exists(impact_analysis.get_analyzer(settings.WORKSPACE_DIR).cache_file)
+
+    @pytest.mark.asyncio
+    async def test_shards_capped(self, executed, monkeypatch):
+        monkeypatch.setattr(settings, "RUN_TESTS_MAX_SHARDS", 2)
+
+        await tools.run_tests(shards=8)
+
+        assert len(executed) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"mode": "smart"}, {"target": "frontend", "mode": "impact"}, {"shards": "many"}],
+    )
+    async def test_invalid_params(self, executed, kwargs):
+        result = await tools.run_tests(**kwargs)
+
+        assert result["error"]["code"] == "E_INVALID_PARAMS"
+        assert executed == []
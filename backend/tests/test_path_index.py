@@ -0,0 +1,216 @@
+"""
+Tests pour l'index des chemins du workspace (construction, requêtes, watchfiles)
+"""
+
+import asyncio
+import glob
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from app.services.react_engine.path_index import PathIndex, PathIndexRegistry
+from app.services.react_engine.tools import search_directory, search_files
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("x")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in (
+        "app/main.py",
+        "app/core/config.py",
+        "app/core/metrics.py",
+        "tests/test_main.py",
+        ".hidden/secret.py",
+        "app/.cache/cached.py",
+        "node_modules/pkg/index.js",
+        "docs/README.md",
+    ):
+        _touch(str(tmp_path / rel))
+    return tmp_path
+
+
+@pytest.fixture
+def index(tree):
+    idx = PathIndex(str(tree), exclude_dirs=["node_modules"])
+    idx.build()
+    idx.ready = True
+    return idx
+
+
+class TestQueries:
+    """Les requêtes de l'index reproduisent glob / scandir"""
+
+    def test_build_skips_excluded_dirs(self, index):
+        assert "app/core/config.py" in index.under("app")
+        assert not [p for p in index.under("") if p.startswith("node_modules")]
+
+    def test_glob_matches_stdlib_glob(self, index, tree):
+        root = str(tree)
+        for pattern, under in (("*.py", ""), ("*.py", "app"), ("config.py", ""), (".*", "")):
+            base = os.path.join(root, under) if under else root
+            expected = sorted(
+                os.path.relpath(p, root)
+                for p in glob.glob(os.path.join(base, "**", pattern), recursive=True)
+                if "node_modules" not in p
+            )
+            assert index.glob(pattern, under=under) == expected, (pattern, under)
+
+    def test_glob_with_directory_component(self, index):
+        assert index.glob("core/*.py") == ["app/core/config.py", "app/core/metrics.py"]
+
+    def test_find_dirs_is_case_insensitive(self, index):
+        assert sorted(index.find_dirs("CORE")) == ["app/core"]
+        assert index.find_dirs("core", under="tests") == []
+
+    def test_remove_tree_drops_descendants_only(self, index):
+        index._snap.remove_tree("app/core")
+
+        assert index.under("app/core") == []
+        assert "app/main.py" in index.under("app")
+        assert index.by_name("config.py") == []
+        assert not index.is_dir("app/core")
+
+
+class TestUpdates:
+    """Application des événements watchfiles"""
+
+    @pytest.mark.asyncio
+    async def test_added_directory_is_walked(self, index, tree):
+        _touch(str(tree / "moved/deep/file.txt"))
+
+        await index._apply([("added", str(tree / "moved"))])
+
+        assert index.glob("file.txt") == ["moved/deep/file.txt"]
+        assert index.is_dir("moved/deep")
+
+    @pytest.mark.asyncio
+    async def test_stale_added_event_is_ignored(self, index, tree):
+        await index._apply([("added", str(tree / "gone.txt"))])
+
+        assert index.by_name("gone.txt") == []
+
+    @pytest.mark.asyncio
+    async def test_published_snapshot_never_mutated(self, index, tree):
+        """Un lecteur qui tient l'état courant ne le voit pas changer"""
+        snap = index._snap
+        before = (list(snap.paths), set(snap.dirs), {k: set(v) for k, v in snap.by_name.items()})
+        version = index.version
+        _touch(str(tree / "app/core/new.py"))
+        os.remove(str(tree / "app/core/config.py"))
+
+        await index._apply(
+            [
+                ("added", str(tree / "app/core/new.py")),
+                ("deleted", str(tree / "app/core/config.py")),
+            ]
+        )
+
+        assert index._snap is not snap and index.version == version + 1
+        assert (list(snap.paths), set(snap.dirs), dict(snap.by_name)) == before
+        assert index.by_name("new.py") == ["app/core/new.py"] and index.by_name("config.py") == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_during_updates(self, index, tree):
+        """Requêtes dans des threads pendant que la boucle applique des changements"""
+        for i in range(200):
+            _touch(str(tree / f"churn/d{i % 10}/f{i}.py"))
+        errors, stop = [], threading.Event()
+
+        def read():
+            while not stop.is_set():
+                try:
+                    index.glob("*.py")
+                    index.find_dirs("d")
+                    index.entries()
+                    index.under("churn")
+                except Exception as e:  # pragma: no cover - échec du test
+                    errors.append(e)
+                    return
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        try:
+            churn = str(tree / "churn")
+            for _ in range(30):
+                await index._apply([("added", churn)])
+                await index._apply([("deleted", churn)])
+                await asyncio.sleep(0)
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+
+        assert errors == []
+
+    @pytest.mark.asyncio
+    async def test_watcher_keeps_index_live(self, tree):
+        registry = PathIndexRegistry()
+        with patch("app.services.react_engine.path_index.settings.PATH_INDEX_DEBOUNCE_MS", 20):
+            await registry.start([str(tree)])
+            try:
+                index = next(iter(registry._indexes.values()))
+                for _ in range(100):
+                    if index.ready:
+                        break
+                    await asyncio.sleep(0.02)
+                await asyncio.sleep(0.1)
+
+                _touch(str(tree / "app/new_module.py"))
+                os.remove(str(tree / "docs/README.md"))
+                for _ in range(100):
+                    if index.by_name("new_module.py") and not index.by_name("README.md"):
+                        break
+                    await asyncio.sleep(0.05)
+            finally:
+                await registry.stop()
+
+        assert index.by_name("new_module.py") == ["app/new_module.py"]
+        assert index.by_name("README.md") == []
+
+
+class TestToolsUseIndex:
+    """search_files / search_directory interrogent l'index quand il couvre le chemin"""
+
+    @pytest.fixture
+    def registry(self, index):
+        registry = PathIndexRegistry()
+        registry._indexes[index.root] = index
+        with patch("app.services.react_engine.tools.path_indexes", registry):
+            yield registry
+
+    def test_search_files_from_index(self, registry, tree):
+        result = search_files("*.py", str(tree / "app"))
+
+        assert result["success"]
+        assert result["data"]["source"] == "index"
+        assert result["data"]["matches"] == [
+            str(tree / "app/core/config.py"),
+            str(tree / "app/core/metrics.py"),
+            str(tree / "app/main.py"),
+        ]
+
+    def test_search_files_falls_back_when_not_ready(self, registry, index, tree):
+        index.ready = False
+
+        result = search_files("*.py", str(tree / "app"))
+
+        assert result["data"]["source"] == "scan"
+        assert result["data"]["count"] == 3
+
+    def test_search_directory_from_index(self, registry, tree):
+        with patch(
+            "app.services.react_engine.tools.SEARCH_ALLOWED_BASES", [str(tree)]
+        ):
+            result = search_directory("core", base=str(tree))
+
+        assert result["success"]
+        assert result["data"]["source"] == "index"
+        assert result["data"]["suggestion"] == str(tree / "app/core")
+        assert result["data"]["matches"][0]["depth"] == 1
@@ -0,0 +1,171 @@
+"""
+Tests des chemins proches d'un chemin introuvable (path_matcher, AUTO_RECOVERY)
+"""
+
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.config import settings
+from app.services.react_engine.engine import ReactEngine
+from app.services.react_engine.path_index import PathIndex, PathIndexRegistry
+from app.services.react_engine.path_matcher import (PathMatcher,
+                                                    PathMatcherCache,
+                                                    suggest_paths)
+from app.services.react_engine.tools import ToolRegistry, fail
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("x")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in (
+        "backend/app/services/react_engine/tools.py",
+        "backend/app/services/react_engine/engine.py",
+        "backend/app/core/config.py",
+        "backend/tests/test_tools.py",
+        "frontend/src/tools.ts",
+        "legacy/app/services/tools.py",
+        "docs/README.md",
+    ):
+        _touch(str(tmp_path / rel))
+    return tmp_path
+
+
+@pytest.fixture
+def index(tree):
+    idx = PathIndex(str(tree))
+    idx.build()
+    idx.ready = True
+    return idx
+
+
+@pytest.fixture
+def matcher(index):
+    return PathMatcher(*index.entries())
+
+
+class TestMatch:
+    """Classement des chemins proches"""
+
+    def test_typo_in_directory_name(self, matcher):
+        matches = matcher.match("backend/app/servces", kind="dir")
+
+        assert matches[0][0] == "backend/app/services"
+
+    def test_parents_break_ties_on_exact_name(self, matcher):
+        matches = matcher.match("backend/app/services/tools.py", kind="file")
+
+        # Même nom à plusieurs endroits: les parents communs départagent
+        assert [p for p, _ in matches[:2]] == [
+            "backend/app/services/react_engine/tools.py",
+            "legacy/app/services/tools.py",
+        ]
+
+    def test_kind_filter(self, matcher):
+        assert all(p.endswith((".py", ".ts")) for p, _ in matcher.match("tool.py", kind="file"))
+        assert matcher.match("tools.py", kind="dir") == []
+
+    def test_deep_path(self, matcher):
+        matches = matcher.match("src/engines/react/engine.py")
+
+        assert matches[0][0] == "backend/app/services/react_engine/engine.py"
+
+    def test_unrelated_name(self, matcher):
+        assert matcher.match("zzzz") == []
+
+    def test_common_trigrams_do_not_flood(self):
+        paths = [f"pkg/module_{i}.py" for i in range(3000)] + ["pkg/sampler.py"]
+
+        matches = PathMatcher(paths, {"pkg"}).match("pkg/smapler.py", kind="file")
+
+        assert matches[0][0] == "pkg/sampler.py"
+
+
+class TestCache:
+    """Matcher reconstruit quand l'index change, index construit à la demande sinon"""
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_on_index_change(self, index, tree):
+        cache = PathMatcherCache()
+        first = cache.for_index(index)
+        assert cache.for_index(index) is first
+
+        _touch(str(tree / "backend/app/new_module.py"))
+        await index._apply([("added", str(tree / "backend/app/new_module.py"))])
+
+        second = cache.for_index(index)
+        assert second is not first
+        assert second.match("new_modle.py")[0][0] == "backend/app/new_module.py"
+
+    def test_scan_cached_for_ttl(self, tree, monkeypatch):
+        monkeypatch.setattr(settings, "PATH_MATCH_SCAN_TTL_SECONDS", 60)
+        cache = PathMatcherCache()
+
+        assert cache.for_scan(str(tree)) is cache.for_scan(str(tree))
+
+        monkeypatch.setattr(settings, "PATH_MATCH_SCAN_TTL_SECONDS", 0)
+        assert cache.for_scan(str(tree)) is not cache.for_scan(str(tree))
+
+
+class TestSuggestPaths:
+    """suggest_paths: racine indexée ou parcours à la demande"""
+
+    @pytest.fixture(autouse=True)
+    def workspace(self, tree, monkeypatch):
+        monkeypatch.setattr(settings, "WORKSPACE_DIR", str(tree))
+        with patch("app.services.react_engine.path_matcher.matchers", PathMatcherCache()):
+            yield
+
+    def test_from_index(self, index, tree):
+        registry = PathIndexRegistry()
+        registry._indexes[index.root] = index
+        with patch("app.services.react_engine.path_matcher.path_indexes", registry):
+            result = suggest_paths(str(tree / "backend/app/cor"), kind="dir")
+
+        assert result["source"] == "index"
+        assert result["suggestion"] == str(tree / "backend/app/core")
+        assert result["matches"][0]["is_dir"]
+
+    def test_scan_when_not_indexed(self, tree):
+        with patch("app.services.react_engine.path_matcher.path_indexes", PathIndexRegistry()):
+            result = suggest_paths("backend/tests/test_tool.py", kind="file")
+
+        assert result["source"] == "scan"
+        assert result["suggestion"] == str(tree / "backend/tests/test_tools.py")
+
+    def test_outside_root_uses_name(self, tree):
+        with patch("app.services.react_engine.path_matcher.path_indexes", PathIndexRegistry()):
+            result = suggest_paths("/elsewhere/docs/readme.md")
+
+        assert result["suggestion"] == str(tree / "docs/README.md")
+
+    @pytest.mark.asyncio
+    async def test_engine_recovery_hint(self, tree):
+        """Une erreur E_FILE_NOT_FOUND ajoute la suggestion au prompt suivant"""
+        registry = ToolRegistry()
+        missing = MagicMock(return_value=fail("E_FILE_NOT_FOUND", "Fichier non trouvé: x"))
+        registry.register("read_file", missing, "Lire", category="filesystem")
+        call = {"tool": "read_file", "params": {"path": "backend/app/confg.py"}}
+        generate = AsyncMock(
+            side_effect=[
+                {"response": f"```tool\n{json.dumps(call)}\n```"},
+                {"response": "```response\nfini\n```"},
+            ]
+        )
+
+        with patch("app.services.react_engine.path_matcher.path_indexes", PathIndexRegistry()):
+            with patch("app.services.react_engine.engine.ollama_client.generate", generate):
+                result = await ReactEngine(tools=registry).run("lire la config")
+
+        recovery = [t for t in result["tools_used"] if t.get("auto_recovery")]
+        expected = str(tree / "backend/app/core/config.py")
+        assert recovery[0]["tool"] == "suggest_paths"
+        assert recovery[0]["input"] == {"path": "backend/app/confg.py", "kind": "file"}
+        assert recovery[0]["output"]["data"]["suggestion"] == expected
+        assert expected in generate.call_args_list[1].kwargs["prompt"]
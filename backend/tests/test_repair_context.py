@@ -0,0 +1,231 @@
+"""
+Tests pour la réparation avec contexte préservé (observations + memo outils)
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.models.workflow import (CheckResult, ExecutionResult, JudgeVerdict,
+                                 RepairAttempt, ToolExecution,
+                                 VerificationReport, WorkflowState)
+from app.services.react_engine.engine import ReactEngine, format_observations
+from app.services.react_engine.tools import ToolRegistry, ok
+from app.services.react_engine.workflow_engine import WorkflowEngine
+
+
+def _tool_call(tool: str, **params) -> dict:
+    return {"response": f"```tool\n{json.dumps({'tool': tool, 'params': params})}\n```"}
+
+
+def _final(text: str = "fini") -> dict:
+    return {"response": f"```response\n{text}\n```"}
+
+
+def _registry():
+    registry = ToolRegistry()
+    reads = MagicMock(return_value=ok({"content": "x = 1"}))
+    writes = MagicMock(return_value=ok({"written": True}))
+    registry.register("read_file", reads, "Lire", category="filesystem")
+    registry.register("run_format", writes, "Formater", category="qa")
+    return registry, reads, writes
+
+
+class TestToolMemo:
+    """Le memo évite de ré-exécuter les lectures déjà faites"""
+
+    @pytest.mark.asyncio
+    async def test_memo_shared_across_runs(self):
+        registry, reads, _ = _registry()
+        engine = ReactEngine(tools=registry)
+        memo = {}
+
+        with patch(
+            "app.services.react_engine.engine.ollama_client.generate",
+            new_callable=AsyncMock,
+            side_effect=[_tool_call("read_file", path="a.py"), _final()] * 2,
+        ):
+            await engine.run("execute", tool_memo=memo)
+            result = await engine.run("repair", tool_memo=memo)
+
+        assert reads.call_count == 1
+        assert result["tools_used"][0]["memoized"] is True
+        assert result["tool_memo"] is memo
+
+    @pytest.mark.asyncio
+    async def test_mutating_tool_invalidates_memo(self):
+        registry, reads, writes = _registry()
+        engine = ReactEngine(tools=registry)
+
+        with patch(
+            "app.services.react_engine.engine.ollama_client.generate",
+            new_callable=AsyncMock,
+            side_effect=[
+                _tool_call("read_file", path="a.py"),
+                _tool_call("run_format", target="backend"),
+                _tool_call("read_file", path="a.py"),
+                _final(),
+            ],
+        ):
+            result = await engine.run("fix")
+
+        assert reads.call_count == 2
+        assert writes.call_count == 1
+        assert not any(t.get("memoized") for t in result["tools_used"])
+
+    @pytest.mark.asyncio
+    async def test_observations_injected_in_prompt(self):
+        engine = ReactEngine(tools=ToolRegistry())
+        observations = [
+            {"tool": "read_file", "input": {"path": "a.py"}, "output": ok({"content": "x = 1"})}
+        ]
+
+        with patch(
+            "app.services.react_engine.engine.ollama_client.generate",
+            new_callable=AsyncMock,
+            return_value=_final(),
+        ) as generate:
+            await engine.run("repair", observations=observations)
+
+        prompt = generate.await_args.kwargs["prompt"]
+        assert "Observations déjà collectées" in prompt
+        assert 'read_file({"path": "a.py"})' in prompt
+
+    def test_format_observations_reports_failures(self):
+        text = format_observations(
+            [
+                {
+                    "tool": "run_tests",
+                    "input": {},
+                    "output": {"success": False, "error": {"code": "E_TESTS", "message": "2 failed"}},
+                }
+            ]
+        )
+        assert "ÉCHEC E_TESTS: 2 failed" in text
+
+
+class TestFailureDigest:
+    """Résumé compact des checks en échec + diff entre cycles"""
+
+    def _report(self, **checks) -> VerificationReport:
+        results = [
+            CheckResult(name=name, passed=passed, output="" if passed else f"{name} tail", error=None)
+            for name, passed in checks.items()
+        ]
+        return VerificationReport(passed=all(checks.values()), results=results)
+
+    def test_first_cycle_lists_failures(self):
+        digest = WorkflowEngine._failure_digest(self._report(tests=False, lint=True))
+
+        assert "- tests: échec" in digest
+        assert "tests tail" in digest
+        assert "lint" not in digest
+
+    def test_diff_with_previous_cycle(self):
+        previous = self._report(tests=False, lint=False, types=True)
+        current = self._report(tests=False, lint=True, types=False)
+
+        digest = WorkflowEngine._failure_digest(current, previous)
+
+        assert "tests [persistant]" in digest
+        assert "types [nouveau]" in digest
+        assert "Corrigés depuis le cycle précédent: lint" in digest
+
+    def test_output_tail_is_bounded(self):
+        report = VerificationReport(
+            passed=False,
+            results=[CheckResult(name="tests", passed=False, output="a" * 5000 + "END")],
+        )
+        digest = WorkflowEngine._failure_digest(report, tail_chars=100)
+
+        assert digest.endswith("END")
+        assert len(digest) < 200
+
+
+class TestRepairContext:
+    """_repair réutilise le contexte de l'exécution"""
+
+    @pytest.mark.asyncio
+    async def test_repair_passes_run_context(self):
+        engine = WorkflowEngine()
+        memo = {"read_file:{}": ok({})}
+        state = WorkflowState(
+            id="w1",
+            original_request="corrige",
+            execution=ExecutionResult(
+                response="fait",
+                tools_used=[
+                    ToolExecution(tool="read_file", params={"path": "a.py"}, result=ok({}))
+                ],
+                tool_memo=memo,
+            ),
+            verification=VerificationReport(
+                passed=False, results=[CheckResult(name="tests", passed=False, error="1 failed")]
+            ),
+        )
+        state.repair_cycles = 1
+        verdict = JudgeVerdict(status="FAIL", issues=["tests"], suggested_fixes=["fix"])
+        history = [{"role": "user", "content": "bonjour"}]
+
+        with patch(
+            "app.services.react_engine.workflow_engine.react_engine.run",
+            new_callable=AsyncMock,
+            return_value={"response": "réparé", "tools_used": [], "iterations": 2},
+        ) as run:
+            attempt = await engine._repair(
+                state, verdict, "m", None, history=history, run_id="run-1"
+            )
+
+        kwargs = run.await_args.kwargs
+        assert kwargs["run_id"] == "run-1"
+        assert kwargs["history"] is history
+        assert kwargs["tool_memo"] is state.execution.tool_memo
+        assert kwargs["tool_memo"] == memo
+        assert kwargs["observations"][0]["tool"] == "read_file"
+        assert "- tests: 1 failed" in kwargs["user_message"]
+        assert isinstance(attempt, RepairAttempt)
+        assert attempt.iterations == 2
+
+    def test_tool_memo_not_serialized(self):
+        execution = ExecutionResult(response="ok", tool_memo={"k": {"success": True}})
+        assert "tool_memo" not in execution.model_dump()
+
+    @pytest.mark.asyncio
+    async def test_digest_across_repair_cycles(self):
+        """Deux cycles via run(): le second compare au rapport ciblé par le premier"""
+        engine = WorkflowEngine()
+        engine.verify_required, engine.max_repair_cycles = True, 3
+        report = TestFailureDigest()._report
+        reports = [
+            report(tests=False, lint=False, types=True),
+            report(tests=False, lint=True, types=False),
+            report(tests=True, lint=True, types=True),
+        ]
+        fail = JudgeVerdict(status="FAIL", issues=["checks"], suggested_fixes=["fix"])
+        verdicts = [fail, fail, JudgeVerdict(status="PASS")]
+
+        with patch.multiple(
+            engine,
+            _is_simple_request=MagicMock(return_value=False),
+            _generate_spec=AsyncMock(),
+            _generate_plan=AsyncMock(),
+            _enrich_with_plan=MagicMock(return_value="corrige"),
+            _execute=AsyncMock(return_value=ExecutionResult(response="fait")),
+            _run_verification=AsyncMock(side_effect=reports),
+        ), patch(
+            "app.services.react_engine.workflow_engine.verifier_service.judge",
+            new_callable=AsyncMock,
+            side_effect=verdicts,
+        ), patch(
+            "app.services.react_engine.workflow_engine.react_engine.run",
+            new_callable=AsyncMock,
+            return_value={"response": "réparé", "tools_used": [], "iterations": 1},
+        ) as run:
+            response = await engine.run("corrige le projet")
+
+        assert response.repair_cycles == 2
+        prompts = [call.kwargs["user_message"] for call in run.await_args_list]
+        assert "Corrigés depuis" not in prompts[0]
+        assert "tests [persistant]" in prompts[1]
+        assert "types [nouveau]" in prompts[1]
+        assert "Corrigés depuis le cycle précédent: lint" in prompts[1]
@@ -0,0 +1,294 @@
+"""
+Tests pour le RunManager (runs WebSocket en tâches de fond)
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.cancellation import RunCancelled
+from app.core.config import settings
+from app.core.metrics import RUNS_REJECTED
+from app.services.websocket.event_emitter import event_emitter
+from app.services.websocket.exceptions import RunRejected
+from app.services.websocket.run_manager import RunChannel, RunManager
+
+
+def _blocking_factory(started: list, release: asyncio.Event):
+    async def factory(channel):
+        started.append(channel)
+        await release.wait()
+
+    return factory
+
+
+class TestRunChannel:
+    """Tests pour RunChannel (cible d'envoi stable)"""
+
+    @pytest.mark.asyncio
+    async def test_send_forwards_to_attached_socket(self):
+        ws = MagicMock()
+        ws.send_json = AsyncMock()
+        channel = RunChannel(ws)
+
+        await channel.send_json({"type": "token"})
+
+        ws.send_json.assert_awaited_once_with({"type": "token"}, mode="text")
+
+    @pytest.mark.asyncio
+    async def test_send_when_detached_raises_not_connected(self):
+        """Détaché → même erreur qu'un socket fermé (buffering EventEmitter)"""
+        channel = RunChannel(MagicMock())
+        channel.detach()
+
+        with pytest.raises(RuntimeError, match="WebSocket is not connected"):
+            await channel.send_json({"type": "token"})
+
+
+class TestRunManager:
+    """Tests pour l'admission et le suivi des runs"""
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_block_caller(self):
+        manager = RunManager(max_concurrent=2, max_per_user=2, max_queue=4)
+        started, release = [], asyncio.Event()
+
+        run = manager.submit("r1", "alice", MagicMock(), _blocking_factory(started, release))
+        await asyncio.sleep(0)
+
+        assert run.status == "running"
+        assert manager.active_count == 1
+
+        release.set()
+        await run.task
+        assert manager.get("r1") is None
+        assert manager.active_count == 0
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit_rejects(self):
+        manager = RunManager(max_concurrent=4, max_per_user=1, max_queue=4)
+        started, release = [], asyncio.Event()
+        before = RUNS_REJECTED.labels(reason="user_limit")._value.get()
+
+        run = manager.submit("r1", "alice", MagicMock(), _blocking_factory(started, release))
+
+        with pytest.raises(RunRejected) as exc:
+            manager.submit("r2", "alice", MagicMock(), _blocking_factory(started, release))
+        assert exc.value.reason == "user_limit"
+        assert RUNS_REJECTED.labels(reason="user_limit")._value.get() == before + 1
+
+        # Un autre utilisateur n'est pas concerné
+        other = manager.submit("r3", "bob", MagicMock(), _blocking_factory(started, release))
+
+        release.set()
+        await asyncio.gather(run.task, other.task)
+
+    @pytest.mark.asyncio
+    async def test_burst_fills_slots_before_queue(self):
+        """Soumissions en rafale: max_concurrent + max_queue runs admis avant démarrage"""
+        manager = RunManager(max_concurrent=4, max_per_user=10, max_queue=1)
+        started, release = [], asyncio.Event()
+        factory = _blocking_factory(started, release)
+
+        runs = [manager.submit(f"r{i}", "alice", MagicMock(), factory) for i in range(5)]
+        with pytest.raises(RunRejected) as exc:
+            manager.submit("r5", "alice", MagicMock(), factory)
+        assert exc.value.reason == "queue_full"
+
+        await asyncio.sleep(0)
+        assert len(started) == 4
+        assert manager.active_count == 4 and manager.queued_count == 1
+
+        release.set()
+        await asyncio.gather(*(run.task for run in runs))
+        assert len(started) == 5
+
+    @pytest.mark.asyncio
+    async def test_global_limit_queues_then_rejects(self):
+        manager = RunManager(max_concurrent=1, max_per_user=5, max_queue=1)
+        started, release = [], asyncio.Event()
+        factory = _blocking_factory(started, release)
+
+        first = manager.submit("r1", "alice", MagicMock(), factory)
+        await asyncio.sleep(0)
+        second = manager.submit("r2", "bob", MagicMock(), factory)
+        await asyncio.sleep(0)
+
+        assert manager.active_count == 1
+        assert manager.queued_count == 1
+        assert second.status == "queued"
+
+        with pytest.raises(RunRejected) as exc:
+            manager.submit("r3", "carol", MagicMock(), factory)
+        assert exc.value.reason == "queue_full"
+
+        release.set()
+        await asyncio.gather(first.task, second.task)
+        assert len(started) == 2
+        assert manager.queued_count == 0
+
+    @pytest.mark.asyncio
+    async def test_run_survives_reconnect(self):
+        """Un run détaché continue et streame sur le nouveau socket après resume"""
+        manager = RunManager(max_concurrent=2, max_per_user=2, max_queue=2)
+        old_ws, new_ws = MagicMock(), MagicMock()
+        new_ws.send_json = AsyncMock()
+        release = asyncio.Event()
+
+        async def factory(channel):
+            await release.wait()
+            await channel.send_json({"type": "complete"})
+
+        run = manager.submit("r1", "alice", old_ws, factory)
+        await asyncio.sleep(0)
+
+        assert manager.detach(old_ws) == ["r1"]
+        assert not run.channel.connected
+
+        assert await manager.resume("alice", new_ws) == ["r1"]
+        release.set()
+        await run.task
+
+        new_ws.send_json.assert_awaited_with({"type": "complete"}, mode="text")
+
+    @pytest.mark.asyncio
+    async def test_resume_leaves_runs_on_other_open_socket(self):
+        """Deux onglets: une reconnexion ne reprend que les runs détachés"""
+        manager = RunManager(max_concurrent=2, max_per_user=2, max_queue=2)
+        tab_a, tab_b, tab_b2 = MagicMock(), MagicMock(), MagicMock()
+        release = asyncio.Event()
+        run_a = manager.submit("r-a", "alice", tab_a, _blocking_factory([], release))
+        run_b = manager.submit("r-b", "alice", tab_b, _blocking_factory([], release))
+        await asyncio.sleep(0)
+
+        # Nouveau socket pendant que les deux onglets sont ouverts: rien à reprendre
+        assert await manager.resume("alice", MagicMock()) == []
+        assert run_a.channel.websocket is tab_a and run_b.channel.websocket is tab_b
+
+        manager.detach(tab_b)
+        assert await manager.resume("alice", tab_b2) == ["r-b"]
+        assert run_a.channel.websocket is tab_a and run_b.channel.websocket is tab_b2
+        assert run_b.disconnect_handle is None
+
+        release.set()
+        await asyncio.gather(run_a.task, run_b.task)
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_buffered_events(self):
+        original = settings.ENABLE_EVENT_QUEUE
+        settings.ENABLE_EVENT_QUEUE = True
+        try:
+            manager = RunManager(max_concurrent=2, max_per_user=2, max_queue=2)
+            release = asyncio.Event()
+            run = manager.submit("r-replay", "alice", MagicMock(), _blocking_factory([], release))
+            manager.detach(run.channel.websocket)
+
+            buffered = {"type": "thinking", "run_id": "r-replay", "data": {"message": "x"}}
+            await event_emitter.event_queue.enqueue("r-replay", buffered)
+
+            new_ws = MagicMock()
+            new_ws.send_json = AsyncMock()
+            await manager.resume("alice", new_ws)
+
+            new_ws.send_json.assert_awaited_once_with(buffered)
+            assert not await event_emitter.has_queued_events("r-replay")
+
+            release.set()
+            await run.task
+        finally:
+            settings.ENABLE_EVENT_QUEUE = original
+
+    @pytest.mark.asyncio
+    async def test_crashing_run_is_released(self):
+        manager = RunManager(max_concurrent=1, max_per_user=1, max_queue=1)
+
+        async def factory(channel):
+            raise ValueError("boom")
+
+        run = manager.submit("r1", "alice", MagicMock(), factory)
+        await run.task
+
+        assert manager.get("r1") is None
+        # Le slot utilisateur est libéré
+        manager.submit("r2", "alice", MagicMock(), AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_runs(self):
+        manager = RunManager(max_concurrent=1, max_per_user=2, max_queue=2)
+        release = asyncio.Event()
+        run = manager.submit("r1", "alice", MagicMock(), _blocking_factory([], release))
+        queued = manager.submit("r2", "alice", MagicMock(), _blocking_factory([], release))
+        await asyncio.sleep(0)
+
+        await manager.shutdown(timeout=0.1)
+
+        # Le run actif ignore le jeton → annulation forcée de la tâche
+        assert run.task.cancelled()
+        assert queued.cancel_token.reason == "shutdown"
+        assert queued.task.done()
+        assert manager.active_count == 0
+        assert manager.queued_count == 0
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_run_triggers_token(self):
+        manager = RunManager(max_concurrent=1, max_per_user=2, max_queue=2)
+        observed = []
+
+        async def factory(channel):
+            token = manager.get("r1").cancel_token
+            try:
+                async with token.scope():
+                    await asyncio.sleep(60)
+            except RunCancelled as e:
+                observed.append(e.reason)
+
+        run = manager.submit("r1", "alice", MagicMock(), factory)
+        await asyncio.sleep(0)
+
+        assert manager.cancel("r1") is True
+        await asyncio.wait_for(run.task, timeout=1)
+        assert observed == ["client"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_run_emits_terminal(self):
+        manager = RunManager(max_concurrent=1, max_per_user=5, max_queue=2)
+        release = asyncio.Event()
+        first = manager.submit("r1", "alice", MagicMock(), _blocking_factory([], release))
+        ws = MagicMock()
+        ws.send_json = AsyncMock()
+        queued = manager.submit("r2", "alice", ws, _blocking_factory([], release))
+        await asyncio.sleep(0)
+
+        with patch(
+            "app.services.websocket.run_manager.event_emitter.emit_terminal",
+            new_callable=AsyncMock,
+        ) as emit_terminal:
+            assert manager.cancel("r2") is True
+            await queued.task
+
+        assert emit_terminal.await_args.args[3]["code"] == "RUN_CANCELLED"
+        assert manager.queued_count == 0
+
+        release.set()
+        await first.task
+
+    @pytest.mark.asyncio
+    async def test_disconnect_grace_cancels_run(self):
+        original = settings.RUN_DISCONNECT_GRACE_SECONDS
+        settings.RUN_DISCONNECT_GRACE_SECONDS = 0
+        try:
+            manager = RunManager(max_concurrent=1, max_per_user=1, max_queue=1)
+            ws = MagicMock()
+
+            async def factory(channel):
+                async with manager.get("r1").cancel_token.scope():
+                    await asyncio.sleep(60)
+
+            run = manager.submit("r1", "alice", ws, factory)
+            await asyncio.sleep(0)
+            manager.detach(ws)
+
+            await asyncio.wait_for(run.task, timeout=1)
+            assert run.cancel_token.reason == "disconnect"
+        finally:
+            settings.RUN_DISCONNECT_GRACE_SECONDS = original
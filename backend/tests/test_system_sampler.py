@@ -0,0 +1,150 @@
+"""
+Tests de l'échantillonneur système et des outils get_system_info / get_system_metrics
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import psutil
+import pytest
+from app.core.system_sampler import SystemSampler, _rate
+from app.services.react_engine import tools
+from prometheus_client import REGISTRY
+
+
+@pytest.fixture
+def sampler(monkeypatch):
+    """Échantillonneur neuf à la place du singleton utilisé par les outils"""
+    instance = SystemSampler(interval=60, window=5, top_processes=3)
+    monkeypatch.setattr(tools, "system_sampler", instance)
+    return instance
+
+
+class TestSampling:
+    """Relevés et fenêtre glissante"""
+
+    def test_sample_fields(self):
+        sample = SystemSampler(interval=60, window=5, top_processes=3).sample()
+
+        assert 0 <= sample.cpu_percent <= 100
+        assert sample.memory_total_gb > 0
+        assert 0 < sample.memory_used_percent <= 100
+        assert 0 <= sample.disk_usage_percent <= 100
+        assert len(sample.processes) <= 3
+        assert {"pid", "name", "cpu_percent", "memory_mb"} <= set(sample.processes[0])
+
+    def test_window_is_bounded(self):
+        sampler = SystemSampler(interval=60, window=3, top_processes=0)
+
+        samples = [sampler.sample() for _ in range(5)]
+
+        assert sampler.history() == samples[-3:]
+        assert sampler.history(2) == samples[-2:]
+        assert sampler.history(0) == []
+        assert sampler.latest() is samples[-1]
+
+    def test_stale_sample_ignored(self):
+        sampler = SystemSampler(interval=60, window=3, top_processes=0)
+        sample = sampler.sample()
+
+        assert sampler.latest(max_age=60) is sample
+        sample.timestamp -= 120
+        assert sampler.latest(max_age=60) is None
+
+    def test_busy_process_reported(self):
+        sampler = SystemSampler(interval=60, window=3, top_processes=1000)
+        sampler.sample()
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            pass
+
+        processes = {row["pid"]: row for row in sampler.sample().processes}
+
+        assert processes[os.getpid()]["cpu_percent"] > 10
+
+    def test_counter_reset_gives_zero_rate(self):
+        before = SimpleNamespace(bytes_sent=5000)
+        after = SimpleNamespace(bytes_sent=100)
+
+        assert _rate(after, before, "bytes_sent", 1.0) == 0
+        assert _rate(before, after, "bytes_sent", 2.0) == 2450.0
+        assert _rate(after, None, "bytes_sent", 1.0) is None
+
+    def test_gauges_updated(self):
+        sample = SystemSampler(interval=60, window=3, top_processes=0).sample()
+
+        assert REGISTRY.get_sample_value(
+            "ai_orchestrator_system_memory_percent"
+        ) == pytest.approx(sample.memory_used_percent)
+        assert REGISTRY.get_sample_value(
+            "ai_orchestrator_system_cpu_percent"
+        ) == pytest.approx(sample.cpu_percent)
+
+
+class TestBackgroundTask:
+    """Tâche de fond"""
+
+    @pytest.mark.asyncio
+    async def test_start_collects_until_stopped(self):
+        sampler = SystemSampler(interval=0.05, window=50, top_processes=0)
+
+        sampler.start()
+        await asyncio.sleep(0.3)
+        await sampler.stop()
+
+        count = len(sampler.history())
+        assert not sampler.running
+        assert count >= 2
+        await asyncio.sleep(0.1)
+        assert len(sampler.history()) == count
+
+
+class TestTools:
+    """Outils lisant les relevés"""
+
+    @pytest.mark.asyncio
+    async def test_system_info_reads_recent_sample(self, sampler, monkeypatch):
+        sample = sampler.sample()
+
+        def unexpected():
+            raise AssertionError("psutil appelé alors qu'un relevé récent existe")
+
+        monkeypatch.setattr(psutil, "virtual_memory", unexpected)
+        monkeypatch.setattr(psutil, "disk_usage", unexpected)
+
+        result = await tools.BUILTIN_TOOLS.execute("get_system_info")
+
+        assert result["success"]
+        assert result["data"]["memory_used_percent"] == sample.memory_used_percent
+        assert result["data"]["cpu_percent"] == sample.cpu_percent
+        assert "workspace" in result["data"]
+
+    @pytest.mark.asyncio
+    async def test_metrics_sample_on_demand_then_history(self, sampler):
+        first = await tools.get_system_metrics()
+        assert first["success"]
+        assert first["data"]["sampler_running"] is False
+        assert first["data"]["latest"]["processes"]
+        assert first["data"]["history"] == []
+
+        for _ in range(3):
+            sampler.sample()
+        result = await tools.get_system_metrics(history=10, processes="false")
+
+        data = result["data"]
+        assert "processes" not in data["latest"]
+        # Relevés précédents seulement, du plus ancien au plus récent
+        assert len(data["history"]) == 3
+        assert all("processes" not in row for row in data["history"])
+        timestamps = [row["timestamp"] for row in data["history"]] + [data["latest"]["timestamp"]]
+        assert timestamps == sorted(timestamps)
+
+    @pytest.mark.asyncio
+    async def test_metrics_invalid_history(self, sampler):
+        result = await tools.get_system_metrics(history="beaucoup")
+
+        assert not result["success"]
+        assert result["error"]["code"] == "E_INVALID_PARAMS"
+
@@ -0,0 +1,141 @@
+"""
+Tests de l'exécution de lots d'appels d'outils (tool_batch)
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.api.v1.tools import _run_tool
+from app.services.react_engine.tool_batch import (BatchCall, BatchError,
+                                                  run_batch, validate_batch)
+
+
+class _Executor:
+    """Exécution simulée: durée par outil, outils en échec, ordre et parallélisme observés"""
+
+    def __init__(self, duration: float = 0.05, failing=()):
+        self.duration = duration
+        self.failing = set(failing)
+        self.order = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, call: BatchCall) -> dict:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.active -= 1
+        self.order.append(call.id)
+        success = call.tool not in self.failing
+        return {"success": success, "tool": call.tool, "params": call.params, "result": None}
+
+
+def _calls(*specs) -> list:
+    return [BatchCall(id=call_id, tool=tool, depends_on=list(deps)) for call_id, tool, deps in specs]
+
+
+class TestValidate:
+    """Validation du lot avant exécution"""
+
+    def test_valid_dag(self):
+        validate_batch(_calls(("a", "t", ()), ("b", "t", ("a",)), ("c", "t", ("a", "b"))))
+
+    @pytest.mark.parametrize(
+        "specs, message",
+        [
+            ((("a", "t", ()), ("a", "t", ())), "dupliqué"),
+            ((("a", "t", ("z",)),), "inconnue"),
+            ((("a", "t", ("a",)),), "lui-même"),
+            ((("a", "t", ("c",)), ("b", "t", ("a",)), ("c", "t", ("b",))), "cycliques"),
+        ],
+    )
+    def test_invalid(self, specs, message):
+        with pytest.raises(BatchError, match=message):
+            validate_batch(_calls(*specs))
+
+
+class TestRun:
+    """Ordonnancement et résultats"""
+
+    @pytest.mark.asyncio
+    async def test_independent_calls_run_concurrently(self):
+        executor = _Executor(duration=0.1)
+
+        start = time.perf_counter()
+        results = await run_batch(_calls(*((str(i), "t", ()) for i in range(5))), executor)
+
+        assert time.perf_counter() - start < 0.3
+        assert executor.peak == 5
+        assert [r["id"] for r in results] == ["0", "1", "2", "3", "4"]
+        assert all(r["duration_ms"] >= 90 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency(self):
+        executor = _Executor()
+
+        await run_batch(_calls(*((str(i), "t", ()) for i in range(6))), executor, 2)
+
+        assert executor.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_dependencies_ordered(self):
+        executor = _Executor(duration=0.02)
+
+        results = await run_batch(
+            _calls(("c", "t", ("b",)), ("b", "t", ("a",)), ("a", "t", ())), executor
+        )
+
+        assert executor.order == ["a", "b", "c"]
+        # Résultats dans l'ordre du lot, pas dans l'ordre d'exécution
+        assert [r["id"] for r in results] == ["c", "b", "a"]
+        assert results[0]["started_ms"] >= results[1]["started_ms"] + results[1]["duration_ms"]
+
+    @pytest.mark.asyncio
+    async def test_failed_dependency_skips_dependents(self):
+        executor = _Executor(failing={"broken"})
+
+        results = await run_batch(
+            _calls(
+                ("a", "broken", ()),
+                ("b", "t", ("a",)),
+                ("c", "t", ("b",)),
+                ("d", "t", ()),
+            ),
+            executor,
+        )
+
+        assert executor.order.count("a") == 1 and "b" not in executor.order
+        assert [r["success"] for r in results] == [False, False, False, True]
+        assert results[1]["error"]["code"] == "E_DEPENDENCY_FAILED"
+        assert results[2]["skipped"]
+        assert "d" in executor.order
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch_runs_nothing(self):
+        executor = _Executor()
+
+        with pytest.raises(BatchError):
+            await run_batch(_calls(("a", "t", ("b",)), ("b", "t", ("a",))), executor)
+
+        assert executor.order == []
+
+    @pytest.mark.asyncio
+    async def test_real_tool_failure_skips_dependents(self):
+        """Un outil qui renvoie fail(...) fait échouer l'appel et saute ses dépendants"""
+        user = {"sub": "alice", "username": "alice"}
+        calls = [
+            BatchCall(id="read", tool="read_file", params={"path": "/etc/shadow"}),
+            BatchCall(id="after", tool="get_datetime", depends_on=["read"]),
+            BatchCall(id="now", tool="get_datetime"),
+        ]
+
+        results = await run_batch(
+            calls, lambda call: _run_tool(call.tool, call.params, user, lambda: False)
+        )
+
+        assert [r["success"] for r in results] == [False, False, True]
+        assert results[0]["error"]["code"] == "E_PATH_FORBIDDEN"
+        assert results[1]["skipped"]
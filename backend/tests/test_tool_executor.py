@@ -0,0 +1,101 @@
+"""
+Tests pour l'exécution des outils synchrones hors de la boucle asyncio
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from app.core.cancellation import CancellationToken
+from app.core.loop_monitor import LoopLagMonitor
+from app.core.metrics import TOOL_INLINE_DURATION
+from app.services.react_engine.tools import BUILTIN_TOOLS, ToolRegistry, ok
+
+
+def _slow_tool(seconds: float = 0.3):
+    time.sleep(seconds)
+    return ok({"thread": threading.current_thread().name})
+
+
+async def _async_tool():
+    return ok({})
+
+
+async def _max_lag_during(coro) -> float:
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    try:
+        await coro
+        await asyncio.sleep(0.03)  # Laisse le moniteur observer le dernier réveil
+    finally:
+        await monitor.stop()
+    return monitor.max_lag
+
+
+class TestRegistration:
+    """Marquage bloquant / non bloquant"""
+
+    def test_defaults(self):
+        registry = ToolRegistry()
+        registry.register("slow", _slow_tool, "sync")
+        registry.register("fast", _slow_tool, "sync", blocking=False)
+        registry.register("async", _async_tool, "async", blocking=True)
+
+        assert registry.get("slow")["blocking"] is True
+        assert registry.get("fast")["blocking"] is False
+        assert registry.get("async")["blocking"] is False
+
+    def test_builtin_sync_tools_are_offloaded(self):
+        for name in ("read_file", "list_directory", "get_system_info", "memory_recall"):
+            assert BUILTIN_TOOLS.get(name)["blocking"] is True, name
+        assert BUILTIN_TOOLS.get("get_datetime")["blocking"] is False
+
+
+class TestDispatch:
+    """Les outils bloquants ne gèlent pas la boucle"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_tool_runs_in_pool_without_stalling_loop(self):
+        registry = ToolRegistry()
+        registry.register("slow", _slow_tool, "utility")
+        results = []
+
+        async def call():
+            results.append(await registry.execute("slow", seconds=0.3))
+
+        max_lag = await _max_lag_during(call())
+
+        assert results[0]["success"]
+        assert results[0]["data"]["thread"].startswith("tool")
+        assert max_lag < 0.05
+
+    @pytest.mark.asyncio
+    async def test_inline_tool_is_measured_as_stall(self):
+        registry = ToolRegistry()
+        registry.register("slow_inline", _slow_tool, "utility", blocking=False)
+        before = TOOL_INLINE_DURATION.labels(tool="slow_inline")._sum.get()
+
+        max_lag = await _max_lag_during(registry.execute("slow_inline", seconds=0.2))
+
+        assert max_lag >= 0.15
+        assert TOOL_INLINE_DURATION.labels(tool="slow_inline")._sum.get() - before >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_cancellation_does_not_wait_for_thread(self):
+        registry = ToolRegistry()
+        registry.register("slow", _slow_tool, "utility")
+        token = CancellationToken()
+
+        async def cancel_soon():
+            await asyncio.sleep(0.05)
+            token.cancel("client")
+
+        start = time.perf_counter()
+        result, _ = await asyncio.gather(
+            registry.execute("slow", cancel_token=token, seconds=0.5), cancel_soon()
+        )
+
+        assert result["error"]["code"] == "E_CANCELLED"
+        assert time.perf_counter() - start < 0.4
@@ -0,0 +1,234 @@
+"""
+Tests des limites par outil appliquées par ToolRegistry.execute
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.core.cancellation import CancellationToken
+from app.core.config import settings
+from app.services.react_engine.tool_limits import ToolLimits, current_user, tool_gates
+from app.services.react_engine.tools import BUILTIN_TOOLS, ToolRegistry, ok
+from prometheus_client import REGISTRY
+
+
+def _limit_hits(tool: str, limit: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "ai_orchestrator_tool_limit_hits_total", {"tool": tool, "limit": limit}
+    )
+    return value or 0.0
+
+
+class _Probe:
+    """Outil async qui mesure ses exécutions simultanées"""
+
+    def __init__(self, duration: float = 0.05):
+        self.duration = duration
+        self.active = 0
+        self.peak = 0
+
+    async def run(self) -> dict:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.active -= 1
+        return ok({"done": True})
+
+
+@pytest.fixture
+def registry():
+    return ToolRegistry()
+
+
+class TestDeadline:
+    """Durée maximale d'exécution"""
+
+    @pytest.mark.asyncio
+    async def test_async_tool_cancelled_at_deadline(self, registry):
+        async def hang():
+            await asyncio.sleep(10)
+
+        registry.register("hang", hang, "", "utility", limits=ToolLimits(timeout_s=0.05))
+        before = _limit_hits("hang", "timeout")
+
+        start = time.perf_counter()
+        result = await registry.execute("hang")
+
+        assert time.perf_counter() - start < 1
+        assert result["error"]["code"] == "E_TOOL_TIMEOUT"
+        assert result["meta"]["limit"] == "timeout"
+        assert _limit_hits("hang", "timeout") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_blocking_tool_abandoned_at_deadline(self, registry):
+        def slow():
+            time.sleep(0.5)
+            return ok({})
+
+        registry.register("slow", slow, "", "utility", limits=ToolLimits(timeout_s=0.05))
+
+        start = time.perf_counter()
+        result = await registry.execute("slow")
+
+        assert time.perf_counter() - start < 0.4
+        assert result["error"]["code"] == "E_TOOL_TIMEOUT"
+
+    @pytest.mark.asyncio
+    async def test_default_deadline_from_settings(self, registry, monkeypatch):
+        async def hang():
+            await asyncio.sleep(10)
+
+        monkeypatch.setattr(settings, "TOOL_TIMEOUT_SECONDS", 0.05)
+        registry.register("hang", hang, "", "utility")
+
+        result = await registry.execute("hang")
+
+        assert result["error"]["code"] == "E_TOOL_TIMEOUT"
+
+    @pytest.mark.asyncio
+    async def test_tool_timeout_error_not_reported_as_limit(self, registry):
+        async def own_timeout():
+            raise TimeoutError("upstream")
+
+        registry.register("own", own_timeout, "", "utility", limits=ToolLimits(timeout_s=5))
+
+        result = await registry.execute("own")
+
+        assert result["error"]["code"] == "E_TOOL_EXEC"
+
+    @pytest.mark.asyncio
+    async def test_run_cancellation_still_wins(self, registry):
+        async def hang():
+            await asyncio.sleep(10)
+
+        registry.register("hang", hang, "", "utility", limits=ToolLimits(timeout_s=5))
+        token = CancellationToken()
+        asyncio.get_running_loop().call_later(0.05, token.cancel)
+
+        result = await registry.execute("hang", cancel_token=token)
+
+        assert result["error"]["code"] == "E_CANCELLED"
+
+
+class TestResultSize:
+    """Taille maximale du résultat"""
+
+    @pytest.mark.asyncio
+    async def test_oversized_result_refused(self, registry):
+        registry.register(
+            "big",
+            lambda: ok({"content": "x" * 5000}),
+            "",
+            "utility",
+            blocking=False,
+            limits=ToolLimits(max_result_bytes=1000),
+        )
+
+        result = await registry.execute("big")
+
+        assert not result["success"]
+        assert result["error"]["code"] == "E_RESULT_TOO_LARGE"
+        assert result["data"] is None
+        assert "octets > 1000" in result["error"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_legacy_result_checked(self, registry, monkeypatch):
+        monkeypatch.setattr(settings, "TOOL_MAX_RESULT_BYTES", 100)
+        registry.register("legacy", lambda: {"rows": list(range(100))}, "", "utility")
+
+        result = await registry.execute("legacy")
+
+        assert result["error"]["code"] == "E_RESULT_TOO_LARGE"
+
+    @pytest.mark.asyncio
+    async def test_result_under_cap_returned(self, registry):
+        registry.register(
+            "small",
+            lambda: ok({"content": "x" * 10}),
+            "",
+            "utility",
+            blocking=False,
+            limits=ToolLimits(max_result_bytes=1000),
+        )
+
+        result = await registry.execute("small")
+
+        assert result["success"]
+        assert result["data"]["content"] == "x" * 10
+
+
+class TestConcurrency:
+    """Exécutions simultanées, globales et par utilisateur"""
+
+    @pytest.mark.asyncio
+    async def test_global_limit_queues_calls(self, registry):
+        probe = _Probe()
+        registry.register("probe", probe.run, "", "utility", limits=ToolLimits(max_concurrent=2))
+
+        results = await asyncio.gather(*(registry.execute("probe") for _ in range(6)))
+
+        assert all(r["success"] for r in results)
+        assert probe.peak == 2
+        assert tool_gates.in_use("probe") == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_reports_busy(self, registry, monkeypatch):
+        monkeypatch.setattr(settings, "TOOL_QUEUE_TIMEOUT_SECONDS", 0.05)
+        probe = _Probe(duration=0.3)
+        registry.register("probe", probe.run, "", "utility", limits=ToolLimits(max_concurrent=1))
+        before = _limit_hits("probe", "concurrency")
+
+        results = await asyncio.gather(registry.execute("probe"), registry.execute("probe"))
+
+        codes = sorted(r["error"]["code"] if not r["success"] else "ok" for r in results)
+        assert codes == ["E_TOOL_BUSY", "ok"]
+        assert _limit_hits("probe", "concurrency") == before + 1
+        assert tool_gates.in_use("probe") == 0
+
+    @pytest.mark.asyncio
+    async def test_per_user_limit(self, registry):
+        probe = _Probe()
+        registry.register(
+            "probe", probe.run, "", "utility", limits=ToolLimits(max_concurrent_per_user=1)
+        )
+
+        async def as_user(user):
+            # Utilisateur du run courant, comme positionné par RunManager
+            current_user.set(user)
+            return await registry.execute("probe")
+
+        await asyncio.gather(*(as_user(user) for user in ("alice", "alice", "alice", "bob")))
+
+        # alice sérialisée, bob en parallèle
+        assert probe.peak == 2
+        assert tool_gates.in_use("probe", "alice") == 0
+
+    @pytest.mark.asyncio
+    async def test_explicit_user_id(self, registry, monkeypatch):
+        monkeypatch.setattr(settings, "TOOL_QUEUE_TIMEOUT_SECONDS", 0.05)
+        registry.register(
+            "probe",
+            _Probe(duration=0.3).run,
+            "",
+            "utility",
+            limits=ToolLimits(max_concurrent_per_user=1),
+        )
+
+        results = await asyncio.gather(
+            registry.execute("probe", user_id="carol"), registry.execute("probe", user_id="carol")
+        )
+
+        assert sorted(r["success"] for r in results) == [False, True]
+        assert _limit_hits("probe", "user_concurrency") >= 1
+
+
+def test_builtin_declared_limits():
+    run_tests = BUILTIN_TOOLS.get("run_tests")["limits"].resolve()
+
+    assert run_tests.max_concurrent_per_user == 1
+    assert run_tests.timeout_s > settings.TIMEOUT_TESTS
+    assert run_tests.max_result_bytes == settings.TOOL_MAX_RESULT_BYTES
+    assert BUILTIN_TOOLS.get("read_file")["limits"] == ToolLimits()
@@ -0,0 +1,174 @@
+"""
+Tests du pipeline de contrôle précompilé de ToolRegistry (étapes choisies selon les traits)
+"""
+
+import pytest
+from app.core.config import settings
+from app.services.react_engine import tools
+from app.services.react_engine.tool_traits import ToolTraits
+from app.services.react_engine.tools import BUILTIN_TOOLS, ToolRegistry, ok
+from prometheus_client import REGISTRY
+
+
+def _noop(**kwargs) -> dict:
+    return ok({"done": True})
+
+
+def _stages(registry: ToolRegistry, name: str) -> list:
+    return [stage.__name__ for stage in registry.get(name)["stages"]]
+
+
+@pytest.fixture
+def registry():
+    return ToolRegistry()
+
+
+@pytest.fixture
+def audited(monkeypatch):
+    """Ressources passées à log_action"""
+    calls = []
+
+    def log_action(**kwargs):
+        calls.append(kwargs["resource"])
+        return True
+
+    monkeypatch.setattr(tools, "log_action", log_action)
+    return calls
+
+
+@pytest.fixture
+def governance_calls(monkeypatch, audited):
+    """Appels à governance_manager.prepare_action (toujours approuvés)"""
+    calls = []
+
+    async def prepare_action(tool_name, params, justification=""):
+        calls.append(tool_name)
+        return True, None, "ok"
+
+    monkeypatch.setattr(tools.governance_manager, "prepare_action", prepare_action)
+    return calls
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Paramètres passés au détecteur d'injection"""
+    calls = []
+
+    def scan_parameters(params):
+        calls.append(params)
+        return {}
+
+    monkeypatch.setattr(tools.prompt_injection_detector, "scan_parameters", scan_parameters)
+    monkeypatch.setattr(settings, "ENFORCE_PROMPT_INJECTION_DETECTION", True)
+    return calls
+
+
+class TestTraits:
+    """Traits déduits de l'enregistrement"""
+
+    def test_inferred_from_category_and_parameters(self):
+        traits = ToolTraits().resolve("fetch", "network", {"url": "string", "n": "int"})
+
+        assert traits == ToolTraits(read_only=False, sensitive=True, network=True, free_text=True)
+        assert traits.governed
+
+    def test_declared_fields_kept(self):
+        traits = ToolTraits(read_only=True).resolve("info", "system", {})
+
+        assert traits.sensitive and traits.read_only
+        assert not traits.free_text
+        assert not traits.governed
+        assert traits.audited
+
+    def test_sensitive_by_name(self):
+        assert ToolTraits().resolve("git_push", "qa", {}).governed
+
+    def test_network_read_stays_governed(self):
+        assert ToolTraits(read_only=True).resolve("fetch", "network", {}).governed
+
+
+class TestStages:
+    """Étapes retenues à l'enregistrement"""
+
+    def test_plain_tool_only_checks_agent(self, registry):
+        registry.register("noop", _noop, "", "utility", {"n": "int"}, blocking=False)
+
+        assert _stages(registry, "noop") == ["_check_agent"]
+
+    def test_free_text_and_sensitive_tool(self, registry):
+        registry.register("cmd", _noop, "", "system", {"command": "string"}, blocking=False)
+
+        assert _stages(registry, "cmd") == ["_check_agent", "_scan_injection", "_govern"]
+
+    def test_builtin_tools(self):
+        assert "_govern" in _stages(BUILTIN_TOOLS, "execute_command")
+        assert "_govern" in _stages(BUILTIN_TOOLS, "web_read")
+        for name in ("get_system_info", "get_system_metrics", "get_audit_log", "list_llm_models"):
+            assert _stages(BUILTIN_TOOLS, name)[-1] == "_audit", name
+        assert "_scan_injection" not in _stages(BUILTIN_TOOLS, "get_datetime")
+
+
+class TestExecute:
+    """Seules les étapes retenues s'exécutent"""
+
+    @pytest.mark.asyncio
+    async def test_int_parameters_not_scanned(self, registry, scanned):
+        registry.register("ints", _noop, "", "utility", {"n": "int"}, blocking=False)
+        registry.register("text", _noop, "", "utility", {"q": "string"}, blocking=False)
+
+        await registry.execute("ints", n=3)
+        await registry.execute("text", q="bonjour")
+
+        assert scanned == [{"q": "bonjour"}]
+
+    @pytest.mark.asyncio
+    async def test_read_only_system_tool_skips_governance(
+        self, registry, governance_calls, audited
+    ):
+        registry.register(
+            "info", _noop, "", "system", {}, blocking=False, traits=ToolTraits(read_only=True)
+        )
+        registry.register("shell", _noop, "", "system", {}, blocking=False)
+        registry.register("noop", _noop, "", "utility", {}, blocking=False)
+
+        assert (await registry.execute("info"))["success"]
+        assert (await registry.execute("shell"))["success"]
+        assert (await registry.execute("noop"))["success"]
+
+        assert governance_calls == ["shell"]
+        # La lecture exemptée d'approbation reste tracée
+        assert audited == ["info", "shell"]
+
+    @pytest.mark.asyncio
+    async def test_flags_read_at_call_time(self, registry, monkeypatch):
+        registry.register("noop", _noop, "", "utility", blocking=False)
+        monkeypatch.setattr(settings, "ENFORCE_AGENT_ISOLATION", True)
+
+        result = await registry.execute("noop")
+
+        assert result["error"]["code"] == "E_AGENT_REQUIRED"
+
+    @pytest.mark.asyncio
+    async def test_framework_params_not_passed(self, registry):
+        received = {}
+
+        def tool(**kwargs):
+            received.update(kwargs)
+            return ok({})
+
+        registry.register("tool", tool, "", "utility", {"n": "int"}, blocking=False)
+
+        await registry.execute("tool", n=1, run_id="r1", justification="test")
+
+        assert received == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_metrics_recorded(self, registry):
+        registry.register("pipeline_probe", _noop, "", "utility", blocking=False)
+        labels = {"tool_name": "pipeline_probe", "success": "true"}
+        before = REGISTRY.get_sample_value("tool_execution_duration_seconds_count", labels) or 0
+
+        await registry.execute("pipeline_probe")
+
+        after = REGISTRY.get_sample_value("tool_execution_duration_seconds_count", labels)
+        assert after == before + 1
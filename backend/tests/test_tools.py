@@ -43,9 +43,9 @@ class TestToolsRegistry:
         assert set(categories) == expected
 
     def test_qa_tools_count(self):
-        """Doit avoir 7 outils QA"""
+        """Doit avoir 8 outils QA"""
         qa_tools = [t for t in BUILTIN_TOOLS.list_tools() if t["category"] == "qa"]
-        assert len(qa_tools) == 7
+        assert len(qa_tools) == 8
 
     def test_qa_tools_names(self):
         """Les outils QA ont les bons noms"""
@@ -53,6 +53,7 @@ class TestToolsRegistry:
         expected = {
             "git_status",
             "git_diff",
+            "git_log",
             "run_tests",
             "run_lint",
             "run_format",
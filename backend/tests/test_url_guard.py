@@ -0,0 +1,115 @@
+"""
+Tests de la validation anti-SSRF des URLs sortantes (résolution DNS asynchrone)
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+from app.core.config import settings
+from app.core.loop_monitor import LoopLagMonitor
+from app.services.react_engine.url_guard import (DNSCache, ResolutionError,
+                                                 check_url)
+
+
+class TestCheckUrl:
+    """Vérification des adresses"""
+
+    @pytest.mark.asyncio
+    async def test_public_host_returns_addresses_to_pin(self, fake_dns):
+        fake_dns.records["example.org"] = ("93.184.215.14", "2606:2800:21f:cb07::1")
+
+        verdict = await check_url("https://example.org/page")
+
+        assert verdict.allowed
+        assert verdict.host == "example.org"
+        assert verdict.addresses == ("93.184.215.14", "2606:2800:21f:cb07::1")
+
+    @pytest.mark.asyncio
+    async def test_every_address_is_checked(self, fake_dns):
+        fake_dns.records["rebind.example"] = ("93.184.215.14", "10.0.0.5")
+
+        verdict = await check_url("http://rebind.example/")
+
+        assert not verdict.allowed
+        assert "10.0.0.5" in verdict.reason
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://localhost/",
+            "http://127.0.0.1:8080/",
+            "http://[::ffff:127.0.0.1]/",
+            "http://169.254.169.254/latest/meta-data",
+            "http://0.0.0.0/",
+            "file:///etc/passwd",
+        ],
+    )
+    async def test_internal_targets_refused(self, url, fake_dns):
+        verdict = await check_url(url)
+
+        assert not verdict.allowed
+        assert fake_dns.calls == []
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_host_raises(self, fake_dns):
+        fake_dns.records["nowhere.example"] = socket.gaierror(-2, "Name or service not known")
+
+        with pytest.raises(ResolutionError):
+            await check_url("http://nowhere.example/")
+
+
+class TestDNSCache:
+    """Cache des résolutions"""
+
+    @pytest.mark.asyncio
+    async def test_results_cached_until_ttl(self, fake_dns, monkeypatch):
+        await check_url("http://cached.example/a")
+        await check_url("http://CACHED.example/b")
+        assert fake_dns.calls == ["cached.example"]
+
+        monkeypatch.setattr(settings, "WEB_DNS_CACHE_TTL_SECONDS", 0)
+        await check_url("http://other.example/")
+        await check_url("http://other.example/")
+        assert fake_dns.calls == ["cached.example", "other.example", "other.example"]
+
+    @pytest.mark.asyncio
+    async def test_failures_cached(self, fake_dns):
+        fake_dns.records["down.example"] = socket.gaierror(-3, "Temporary failure")
+
+        for _ in range(2):
+            with pytest.raises(ResolutionError):
+                await check_url("http://down.example/")
+
+        assert fake_dns.calls == ["down.example"]
+
+    @pytest.mark.asyncio
+    async def test_slow_resolver_does_not_block_loop(self, monkeypatch):
+        def slow_getaddrinfo(*args, **kwargs):
+            time.sleep(0.3)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.215.14", 0))]
+
+        monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        try:
+            addresses = await DNSCache().resolve("slow.example")
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+
+        assert addresses == ("93.184.215.14",)
+        assert monitor.max_lag < 0.05
+
+    @pytest.mark.asyncio
+    async def test_resolver_timeout(self, monkeypatch):
+        monkeypatch.setattr(socket, "getaddrinfo", lambda *a, **k: time.sleep(0.5) or [])
+        monkeypatch.setattr(settings, "WEB_DNS_TIMEOUT_SECONDS", 0.05)
+
+        start = time.perf_counter()
+        with pytest.raises(ResolutionError, match="délai"):
+            await DNSCache().resolve("hang.example")
+
+        assert time.perf_counter() - start < 0.3
@@ -0,0 +1,208 @@
+"""
+Tests pour le pré-jugement déterministe du VerifierService
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.core.config import settings
+from app.models.workflow import (AcceptanceCriteria, CheckResult,
+                                 ExecutionResult, TaskSpec, ToolExecution,
+                                 VerificationReport)
+from app.services.react_engine.verifier import VerifierService
+
+
+def _spec(*checks):
+    return TaskSpec(objective="objectif", acceptance=AcceptanceCriteria(checks=list(checks)))
+
+
+def _report(*results):
+    """results: tuples (name, passed, returncode)"""
+    checks = [CheckResult(name=n, passed=p, error=None if p else "boom") for n, p, _ in results]
+    evidence = {n: ({"returncode": rc, "stdout": ""} if p else {"error": "boom"}) for n, p, rc in results}
+    failures = [f"{n}: boom" for n, p, _ in results if not p]
+    return VerificationReport(
+        passed=not failures,
+        checks_run=[n for n, _, _ in results],
+        results=checks,
+        evidence=evidence,
+        failures=failures,
+    )
+
+
+def _execution(*tool_results):
+    return ExecutionResult(
+        response="ok",
+        tools_used=[ToolExecution(tool="write_file", result=r) for r in tool_results],
+    )
+
+
+@pytest.fixture
+def verifier():
+    return VerifierService()
+
+
+@pytest.fixture(autouse=True)
+def no_sampling(monkeypatch):
+    monkeypatch.setattr(settings, "VERIFIER_PREJUDGE_ENABLED", True)
+    monkeypatch.setattr(settings, "VERIFIER_PREJUDGE_SAMPLE_RATE", 0.0)
+
+
+class TestPrejudge:
+    def test_failed_check_is_fail(self, verifier):
+        verdict = verifier._prejudge(
+            _spec("pytest passes"),
+            _execution(),
+            _report(("run_tests:backend", False, 1), ("run_lint:backend", True, 0)),
+        )
+        assert verdict.status == "FAIL"
+        assert verdict.issues == ["run_tests:backend: boom"]
+
+    def test_all_covered_checks_pass(self, verifier):
+        verdict = verifier._prejudge(
+            _spec("pytest passes", "ruff clean"),
+            _execution({"success": True}),
+            _report(("run_tests:backend", True, 0), ("run_lint:backend", True, 0)),
+        )
+        assert verdict.status == "PASS"
+
+    def test_uncovered_criterion_is_uncertain(self, verifier):
+        verdict = verifier._prejudge(
+            _spec("pytest passes", "fichier créé"),
+            _execution(),
+            _report(("run_tests:backend", True, 0)),
+        )
+        assert verdict is None
+
+    @pytest.mark.parametrize(
+        "criterion,check",
+        [
+            ("latest version deployed", "run_tests"),
+            ("informations affichées", "run_format"),
+            ("prototype works", "run_typecheck"),
+            ("rebuild the cache index", "run_build"),
+            ("contest entries saved", "run_tests"),
+        ],
+    )
+    def test_keyword_inside_word_does_not_cover(self, verifier, criterion, check):
+        verdict = verifier._prejudge(
+            _spec(criterion), _execution(), _report((f"{check}:backend", True, 0))
+        )
+        assert verdict is None
+
+    @pytest.mark.parametrize(
+        "criterion,check",
+        [
+            ("Tests pass", "run_tests"),
+            ("les tests passent", "run_tests"),
+            ("code formatted with black", "run_format"),
+            ("build succeeds", "run_build"),
+            ("type-check clean", "run_typecheck"),
+            ("mypy: no errors", "run_typecheck"),
+            ("linter happy", "run_lint"),
+        ],
+    )
+    def test_keyword_word_covers(self, verifier, criterion, check):
+        verdict = verifier._prejudge(
+            _spec(criterion), _execution(), _report((f"{check}:backend", True, 0))
+        )
+        assert verdict.status == "PASS"
+
+    def test_only_weak_evidence_is_uncertain(self, verifier):
+        verdict = verifier._prejudge(
+            _spec("task completed"), _execution(), _report(("git_status", True, 0))
+        )
+        assert verdict is None
+
+    def test_failed_execution_tool_is_uncertain(self, verifier):
+        verdict = verifier._prejudge(
+            _spec("pytest passes"),
+            _execution({"success": False, "error": {"code": "E_WRITE"}}),
+            _report(("run_tests:backend", True, 0)),
+        )
+        assert verdict is None
+
+    def test_no_checks_is_uncertain(self, verifier):
+        assert verifier._prejudge(_spec("pytest passes"), _execution(), _report()) is None
+
+
+class TestJudge:
+    @pytest.mark.asyncio
+    async def test_unambiguous_verdict_skips_llm(self, verifier):
+        with patch(
+            "app.services.react_engine.verifier.ollama_client.chat", new_callable=AsyncMock
+        ) as chat:
+            verdict = await verifier.judge(
+                "req",
+                _spec("pytest passes"),
+                _execution(),
+                _report(("run_tests:backend", True, 0)),
+            )
+
+        assert verdict.status == "PASS"
+        chat.assert_not_awaited()
+        stats = verifier.get_stats()
+        assert stats["prejudge"] == 1
+        assert stats["avoided_llm_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_mixed_case_calls_llm(self, verifier):
+        llm = {"message": {"content": '{"status": "PASS", "confidence": 0.7}'}}
+        with patch(
+            "app.services.react_engine.verifier.ollama_client.chat",
+            new_callable=AsyncMock,
+            return_value=llm,
+        ) as chat:
+            verdict = await verifier.judge(
+                "req",
+                _spec("fichier créé"),
+                _execution(),
+                _report(("run_tests:backend", True, 0)),
+            )
+
+        assert verdict.status == "PASS"
+        chat.assert_awaited_once()
+        assert verifier.get_stats()["llm"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sampling_measures_disagreement(self, verifier, monkeypatch):
+        monkeypatch.setattr(settings, "VERIFIER_PREJUDGE_SAMPLE_RATE", 1.0)
+        llm = {"message": {"content": '{"status": "PASS", "confidence": 0.7}'}}
+        with patch(
+            "app.services.react_engine.verifier.ollama_client.chat",
+            new_callable=AsyncMock,
+            return_value=llm,
+        ):
+            verdict = await verifier.judge(
+                "req",
+                _spec("pytest passes"),
+                _execution(),
+                _report(("run_tests:backend", False, 1)),
+            )
+            await asyncio.gather(*verifier._sample_tasks)
+
+        # Le verdict déterministe reste autoritaire
+        assert verdict.status == "FAIL"
+        stats = verifier.get_stats()
+        assert stats["disagree"] == 1
+        assert stats["disagreement_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_prejudge_disabled_always_calls_llm(self, verifier, monkeypatch):
+        monkeypatch.setattr(settings, "VERIFIER_PREJUDGE_ENABLED", False)
+        with patch(
+            "app.services.react_engine.verifier.ollama_client.chat",
+            new_callable=AsyncMock,
+            return_value={"error": "down"},
+        ) as chat:
+            verdict = await verifier.judge(
+                "req",
+                _spec("pytest passes"),
+                _execution(),
+                _report(("run_tests:backend", True, 0)),
+            )
+
+        chat.assert_awaited_once()
+        assert verdict.status == "PASS"  # fallback QA
+        assert verifier.get_stats()["fallback"] == 1
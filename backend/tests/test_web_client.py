@@ -0,0 +1,271 @@
+"""
+Tests du client HTTP partagé des outils web, contre un serveur HTTP local
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpcore
+import pytest
+import pytest_asyncio
+from app.core.config import settings
+from app.services.react_engine import tools
+from app.services.react_engine.url_guard import UrlVerdict
+from app.services.react_engine.web_client import (URLForbidden, WebClient,
+                                                  _PinnedBackend)
+
+PAGE = b"<html><body><p>Hello cache</p></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b"", **headers):
+        self.send_response(status)
+        headers.setdefault("Content-Type", "text/html; charset=utf-8")
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        state["hits"][self.path] = state["hits"].get(self.path, 0) + 1
+        state["ports"].add(self.client_address[1])
+        state["hosts"].add(self.headers.get("Host"))
+
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, ETag='"v1"')
+            else:
+                self._send(200, PAGE, ETag='"v1"')
+        elif self.path == "/max-age":
+            self._send(200, PAGE, Cache_Control="max-age=60")
+        elif self.path == "/no-store":
+            self._send(200, PAGE, Cache_Control="no-store", ETag='"v1"')
+        elif self.path == "/stream":
+            # Flux sans fin (~10s): le client doit couper au plafond
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                for _ in range(200):
+                    self.wfile.write(b"x" * 65536)
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        elif self.path.startswith("/slow"):
+            with state["lock"]:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.1)
+            with state["lock"]:
+                state["active"] -= 1
+            self._send(200, b"ok")
+        else:
+            self._send(404, b"not found")
+
+
+async def _allow(url):
+    return UrlVerdict(True)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.state = {"hits": {}, "ports": set(), "hosts": set(), "lock": threading.Lock(), "active": 0, "peak": 0}
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest_asyncio.fixture
+async def client():
+    web = WebClient()
+    yield web
+    await web.aclose()
+
+
+class TestStreaming:
+    """Téléchargement plafonné et pool de connexions"""
+
+    @pytest.mark.asyncio
+    async def test_body_cap_aborts_download(self, server, client):
+        _, base = server
+        start = time.perf_counter()
+
+        result = await client.fetch(f"{base}/stream", max_bytes=100_000)
+
+        assert result.truncated
+        assert len(result.content) == 100_000
+        # Sans coupure, le flux durerait ~10s
+        assert time.perf_counter() - start < 2.0
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, server, client):
+        httpd, base = server
+
+        for _ in range(3):
+            result = await client.fetch(f"{base}/missing", max_bytes=1000)
+            assert result.status_code == 404
+
+        assert len(httpd.state["ports"]) == 1
+
+
+class TestPinning:
+    """Connexion vers les adresses validées par url_check"""
+
+    @pytest.mark.asyncio
+    async def test_connects_to_pinned_address_without_lookup(self, server, client):
+        httpd, base = server
+        port = httpd.server_address[1]
+
+        async def pin(url):
+            return UrlVerdict(True, host="pinned.invalid", addresses=("127.0.0.1",))
+
+        # pinned.invalid ne se résout pas: seule l'adresse épinglée est utilisée
+        result = await client.fetch(
+            f"http://pinned.invalid:{port}/missing", max_bytes=100, url_check=pin
+        )
+
+        assert result.status_code == 404
+        assert httpd.state["hosts"] == {f"pinned.invalid:{port}"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_keep_their_pins(self, server, client, monkeypatch):
+        """Des validations d'autres hôtes entre check et connexion n'enlèvent pas l'épingle"""
+        httpd, _ = server
+        port = httpd.server_address[1]
+        monkeypatch.setattr(settings, "WEB_DNS_CACHE_MAX_ENTRIES", 1)
+
+        async def pin(url):
+            await asyncio.sleep(0)
+            return UrlVerdict(True, host=url.split("/")[2].split(":")[0], addresses=("127.0.0.1",))
+
+        # Hôtes *.invalid: seule l'adresse épinglée permet de se connecter
+        results = await asyncio.gather(
+            *(
+                client.fetch(f"http://h{i}.invalid:{port}/slow/{i}", max_bytes=100, url_check=pin)
+                for i in range(6)
+            )
+        )
+
+        assert [r.status_code for r in results] == [200] * 6
+        # Épingles et places par hôte relâchées avec leurs requêtes
+        assert client._pins == {} and client._host_slots == {}
+
+    @pytest.mark.asyncio
+    async def test_unpinned_hostname_fails_closed(self):
+        backend = _PinnedBackend({})
+
+        with pytest.raises(httpcore.ConnectError, match="Aucune adresse validée"):
+            await backend.connect_tcp("pinned.invalid", 80)
+
+    @pytest.mark.asyncio
+    async def test_refused_url_is_not_fetched(self, server, client):
+        httpd, base = server
+
+        async def deny(url):
+            return UrlVerdict(False, "interdit")
+
+        with pytest.raises(URLForbidden):
+            await client.fetch(f"{base}/max-age", max_bytes=100, url_check=deny)
+        assert httpd.state["hits"] == {}
+
+
+class TestCache:
+    """Cache des réponses GET"""
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation(self, server, client):
+        httpd, base = server
+
+        first = await client.fetch(f"{base}/etag", max_bytes=10_000)
+        second = await client.fetch(f"{base}/etag", max_bytes=10_000)
+
+        assert (first.cache, second.cache) == ("miss", "revalidated")
+        assert second.content == PAGE
+        # Sans TTL, chaque appel revalide (304 sans corps)
+        assert httpd.state["hits"]["/etag"] == 2
+
+    @pytest.mark.asyncio
+    async def test_max_age_serves_from_cache(self, server, client):
+        httpd, base = server
+
+        results = [await client.fetch(f"{base}/max-age", max_bytes=10_000) for _ in range(3)]
+
+        assert [r.cache for r in results] == ["miss", "hit", "hit"]
+        assert httpd.state["hits"]["/max-age"] == 1
+
+    @pytest.mark.asyncio
+    async def test_default_ttl_and_no_store(self, server, client):
+        httpd, base = server
+
+        for _ in range(2):
+            await client.fetch(f"{base}/etag", max_bytes=10_000, default_ttl=60)
+            await client.fetch(f"{base}/no-store", max_bytes=10_000, default_ttl=60)
+
+        assert httpd.state["hits"]["/etag"] == 1
+        assert httpd.state["hits"]["/no-store"] == 2
+
+    @pytest.mark.asyncio
+    async def test_truncated_entry_not_reused_for_larger_cap(self, server, client):
+        httpd, base = server
+
+        small = await client.fetch(f"{base}/max-age", max_bytes=10)
+        full = await client.fetch(f"{base}/max-age", max_bytes=10_000)
+        again = await client.fetch(f"{base}/max-age", max_bytes=10)
+
+        assert small.truncated and not full.truncated
+        assert (full.cache, again.cache) == ("miss", "hit")
+        assert again.content == PAGE[:10] and again.truncated
+        assert httpd.state["hits"]["/max-age"] == 2
+
+
+class TestPerHostLimit:
+    """Requêtes simultanées bornées par hôte"""
+
+    @pytest.mark.asyncio
+    async def test_per_host_concurrency(self, server, monkeypatch):
+        httpd, base = server
+        monkeypatch.setattr(settings, "WEB_PER_HOST_LIMIT", 2)
+        web = WebClient()
+        try:
+            await asyncio.gather(
+                *(web.fetch(f"{base}/slow/{i}", max_bytes=100) for i in range(8))
+            )
+        finally:
+            await web.aclose()
+
+        assert httpd.state["peak"] == 2
+        # Sémaphores par hôte retirés une fois libres
+        assert web._host_slots == {}
+
+
+class TestWebReadTool:
+    """web_read de bout en bout (SSRF désactivé pour le serveur local)"""
+
+    @pytest.mark.asyncio
+    async def test_web_read_uses_shared_cache(self, server, monkeypatch):
+        httpd, base = server
+        monkeypatch.setattr(tools, "check_url", _allow)
+        monkeypatch.setattr(tools, "web_client", WebClient())
+
+        first = await tools.web_read(f"{base}/etag")
+        second = await tools.web_read(f"{base}/etag")
+
+        assert first["data"]["content"] == "Hello cache"
+        assert (first["data"]["cache"], second["data"]["cache"]) == ("miss", "hit")
+        assert httpd.state["hits"]["/etag"] == 1
+        await tools.web_client.aclose()
@@ -2,15 +2,43 @@
 Tests for web_search and web_read tools (v8)
 """
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
 import pytest
 
+from app.services.react_engine import tools
+from app.services.react_engine.html_text import extract_text, split_chunks
 from app.services.react_engine.tools import (
     web_search,
     web_read,
     _extract_text_from_html,
     BUILTIN_TOOLS,
 )
+from app.services.react_engine.web_client import WebClient
+
+
+@pytest.fixture
+def serve(monkeypatch, fake_dns):
+    """Fait répondre le client web partagé par ``handler(request)``"""
+
+    def install(handler):
+        client = WebClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(tools, "web_client", client)
+        return client
+
+    return install
+
+
+def _ddg_page(count: int) -> str:
+    items = "".join(
+        f'<a class="result__a" href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com%2F{i}">'
+        f'Result {i}</a><a class="result__snippet" href="#">Snippet {i}</a>'
+        for i in range(count)
+    )
+    return f"<html><body>{items}</body></html>"
+
+
+def _timeout(request):
+    raise httpx.ReadTimeout("timeout", request=request)
 
 
 class TestWebSearch:
@@ -22,58 +50,41 @@ class TestWebSearch:
         assert "web_search" in tools
 
     @pytest.mark.asyncio
-    async def test_web_search_valid_query(self):
+    async def test_web_search_valid_query(self, serve):
         """web_search retourne des résultats pour une requête valide"""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {
-                "Abstract": "Python is a programming language",
-                "Heading": "Python",
-                "AbstractURL": "https://python.org",
-                "AbstractSource": "Wikipedia",
-                "RelatedTopics": [
-                    {"Text": "Python programming language", "FirstURL": "https://example.com/1"},
-                    {"Text": "Python tutorial", "FirstURL": "https://example.com/2"},
-                ]
-            }
-            
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await web_search("python programming")
-            
-            assert result["success"] is True
-            assert "results" in result["data"]
-            assert result["data"]["query"] == "python programming"
+        serve(lambda request: httpx.Response(200, html=_ddg_page(2)))
+
+        result = await web_search("python programming")
+
+        assert result["success"] is True
+        assert "results" in result["data"]
+        assert result["data"]["query"] == "python programming"
+        assert result["data"]["results"][0] == {
+            "title": "Result 0",
+            "url": "https://example.com/0",
+            "snippet": "Snippet 0",
+        }
 
     @pytest.mark.asyncio
-    async def test_web_search_limits_results(self):
+    async def test_web_search_limits_results(self, serve):
         """web_search limite le nombre de résultats"""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {"RelatedTopics": []}
-            
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await web_search("test", num_results=100)
-            
-            # Should not exceed 10 results max
-            assert result["success"] is True
+        serve(lambda request: httpx.Response(200, html=_ddg_page(15)))
+
+        result = await web_search("test", num_results=100)
+
+        # Should not exceed 10 results max
+        assert result["success"] is True
+        assert result["data"]["count"] == 10
 
     @pytest.mark.asyncio
-    async def test_web_search_timeout(self):
+    async def test_web_search_timeout(self, serve):
         """web_search gère les timeouts"""
-        with patch("httpx.AsyncClient") as mock_client:
-            import httpx
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                side_effect=httpx.TimeoutException("timeout")
-            )
-            
-            result = await web_search("test")
-            
-            assert result["success"] is False
-            assert result["error"]["code"] == "E_WEB_TIMEOUT"
+        serve(_timeout)
+
+        result = await web_search("test")
+
+        assert result["success"] is False
+        assert result["error"]["code"] == "E_WEB_TIMEOUT"
 
 
 class TestWebRead:
@@ -102,50 +113,66 @@ class TestWebRead:
         assert result is not None
 
     @pytest.mark.asyncio
-    async def test_web_read_valid_url(self):
+    async def test_web_read_valid_url(self, serve):
         """web_read lit une page valide"""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.headers = {"content-type": "text/html"}
-            mock_response.text = "<html><body><p>Hello World</p></body></html>"
-            mock_response.url = "https://example.com"
-            
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await web_read("https://example.com")
-            
-            assert result["success"] is True
-            assert "content" in result["data"]
+        serve(
+            lambda request: httpx.Response(
+                200, html="<html><body><p>Hello World</p></body></html>"
+            )
+        )
+
+        result = await web_read("https://example.com")
+
+        assert result["success"] is True
+        assert result["data"]["content"] == "Hello World"
 
     @pytest.mark.asyncio
-    async def test_web_read_rejects_binary(self):
+    async def test_web_read_max_length(self, serve):
+        """max_length borne le texte extrait"""
+        page = "<html><body>" + "<p>lorem ipsum</p>" * 1000 + "</body></html>"
+        serve(lambda request: httpx.Response(200, html=page))
+
+        result = await web_read("https://example.com/long", max_length=50)
+
+        assert result["success"] is True
+        assert result["data"]["length"] <= 50
+        assert result["data"]["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_web_read_blocks_redirect_to_private_ip(self, serve):
+        """Une redirection vers le réseau interne est refusée"""
+        serve(
+            lambda request: httpx.Response(302, headers={"location": "http://169.254.169.254/"})
+        )
+
+        result = await web_read("https://example.com/redirect")
+
+        assert result["success"] is False
+        assert result["error"]["code"] == "E_URL_FORBIDDEN"
+
+    @pytest.mark.asyncio
+    async def test_web_read_rejects_binary(self, serve):
         """web_read rejette les contenus binaires"""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.headers = {"content-type": "application/octet-stream"}
-            
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await web_read("https://example.com/file.bin")
-            
-            assert result["success"] is False
-            assert result["error"]["code"] == "E_CONTENT_TYPE"
+        serve(
+            lambda request: httpx.Response(
+                200, content=b"\x00\x01", headers={"content-type": "application/octet-stream"}
+            )
+        )
+
+        result = await web_read("https://example.com/file.bin")
+
+        assert result["success"] is False
+        assert result["error"]["code"] == "E_CONTENT_TYPE"
 
     @pytest.mark.asyncio
-    async def test_web_read_timeout(self):
+    async def test_web_read_timeout(self, serve):
         """web_read gère les timeouts"""
-        with patch("httpx.AsyncClient") as mock_client:
-            import httpx
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                side_effect=httpx.TimeoutException("timeout")
-            )
-            
-            result = await web_read("https://slow-site.com")
-            
-            assert result["success"] is False
-            assert result["error"]["code"] == "E_WEB_TIMEOUT"
+        serve(_timeout)
+
+        result = await web_read("https://slow-site.com")
+
+        assert result["success"] is False
+        assert result["error"]["code"] == "E_WEB_TIMEOUT"
 
 
 class TestHtmlExtraction:
@@ -179,3 +206,34 @@ class TestHtmlExtraction:
         html = "5 &lt; 10 &amp; 10 &gt; 5"
         result = _extract_text_from_html(html)
         assert "5 < 10 & 10 > 5" in result
+
+    def test_extract_keeps_headings_and_links(self):
+        """Titres et liens conservés en Markdown"""
+        html = '<h2>Install</h2><p>See <a href="https://docs.example.com/x">the docs</a>.</p>'
+        result = _extract_text_from_html(html)
+        assert result == "## Install\n\nSee [the docs](https://docs.example.com/x)."
+
+    def test_extract_independent_of_chunking(self):
+        """Même texte quel que soit le découpage du flux"""
+        html = (
+            "<title>T&eacute;st</title><style>p{}</style><h1>A&amp;B</h1>"
+            "<ul><li>un</li><li>deux</li></ul><script>if (a<b) {}</script><p>fin</p>"
+        ).encode()
+        expected = extract_text([html])
+        for size in (1, 3, 7, 64):
+            assert extract_text(split_chunks(html, size)) == expected
+        assert expected[0] == "Tést\n\n# A&B\n\n- un\n- deux\n\nfin"
+
+    def test_extract_stops_at_budget(self):
+        """Le flux n'est plus lu une fois le budget atteint"""
+        consumed = []
+
+        def chunks():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"<p>paragraphe {i}</p>"
+
+        text, truncated = extract_text(chunks(), max_chars=100)
+
+        assert truncated and len(text) <= 100
+        assert len(consumed) < 20
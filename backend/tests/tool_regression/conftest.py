@@ -113,56 +113,45 @@ def mock_ollama_unavailable(monkeypatch):
     return mock_response
 
 
-@pytest.fixture
-def mock_http_success(monkeypatch):
-    """Mock requête HTTP réussie"""
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.text = '{"message": "success"}'
-    mock_response.headers = {"content-type": "application/json"}
+def _mock_web_client(monkeypatch, handler):
+    """Remplace le client HTTP partagé des outils par un transport simulé"""
+    import httpx
 
-    async def mock_get(*args, **kwargs):
-        return mock_response
+    from app.services.react_engine import tools
+    from app.services.react_engine.web_client import WebClient
 
-    async def mock_post(*args, **kwargs):
-        return mock_response
+    monkeypatch.setattr(tools, "web_client", WebClient(transport=httpx.MockTransport(handler)))
 
+
+@pytest.fixture
+def mock_http_success(monkeypatch, fake_dns):
+    """Mock requête HTTP réussie (status_code/text lus à chaque requête)"""
     import httpx
 
-    mock_client = AsyncMock()
-    mock_client.get = mock_get
-    mock_client.post = mock_post
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.text = '{"message": "success"}'
+    mock_response.headers = {"content-type": "application/json"}
 
-    def mock_async_client(*args, **kwargs):
-        return mock_client
+    def handler(request):
+        return httpx.Response(
+            mock_response.status_code, text=mock_response.text, headers=mock_response.headers
+        )
 
-    monkeypatch.setattr(httpx, "AsyncClient", mock_async_client)
+    _mock_web_client(monkeypatch, handler)
 
     return mock_response
 
 
 @pytest.fixture
-def mock_http_timeout(monkeypatch):
+def mock_http_timeout(monkeypatch, fake_dns):
     """Mock timeout HTTP"""
-
-    async def mock_request(*args, **kwargs):
-        import httpx
-
-        raise httpx.TimeoutException("Request timeout")
-
     import httpx
 
-    mock_client = AsyncMock()
-    mock_client.request = mock_request
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    def mock_async_client(*args, **kwargs):
-        return mock_client
+    def handler(request):
+        raise httpx.ReadTimeout("Request timeout", request=request)
 
-    monkeypatch.setattr(httpx, "AsyncClient", mock_async_client)
+    _mock_web_client(monkeypatch, handler)
 
 
 @pytest.fixture
@@ -29,6 +29,8 @@ FATAL_ERRORS = {
     "E_HTTP_ERROR",  # http_request general errors
     "E_IMPORT",  # Missing dependency
     "E_GOVERNANCE_DENIED",  # Governance blocked action (no justification)
+    "E_INVALID_PARAMS",  # Invalid or conflicting tool parameters
+    "E_BINARY_FILE",  # read_file on a binary file
 }
 
 NETWORK_ERRORS = {
@@ -3,9 +3,11 @@ Tests de régression pour les outils filesystem
 """
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from app.services.react_engine import file_reader
 from app.services.react_engine.tools import BUILTIN_TOOLS
 
 from .contracts import assert_tool_error, assert_tool_success
@@ -74,6 +76,111 @@ class TestReadFile:
         assert result["data"]["content"] == "Hello World"
 
 
+class TestReadFileRanges:
+    """Tests pour read_file - lectures bornées (octets, lignes, tail)"""
+
+    @pytest.fixture
+    def log_file(self, workspace_dir):
+        path = Path(workspace_dir) / "app.log"
+        path.write_text("".join(f"line {i}\n" for i in range(1, 1001)))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_byte_range_with_pagination_hints(self, log_file, mock_settings):
+        """✅ offset/length → plage d'octets + next_offset"""
+        result = await BUILTIN_TOOLS.execute("read_file", path=str(log_file), offset=7, length=14)
+
+        assert_tool_success(result, {"content", "size", "total_lines", "next_offset"})
+        data = result["data"]
+        assert data["content"] == "line 2\nline 3\n"
+        assert data["size"] == log_file.stat().st_size
+        assert data["total_lines"] == 1000
+        assert data["next_offset"] == 21
+        assert data["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_line_range(self, log_file, mock_settings):
+        """✅ start_line/end_line → lignes incluses + next_line"""
+        result = await BUILTIN_TOOLS.execute(
+            "read_file", path=str(log_file), start_line=10, end_line=12
+        )
+
+        assert_tool_success(result)
+        assert result["data"]["content"] == "line 10\nline 11\nline 12\n"
+        assert result["data"]["lines"] == 3
+        assert result["data"]["next_line"] == 13
+
+    @pytest.mark.asyncio
+    async def test_tail(self, log_file, mock_settings):
+        """✅ tail → N dernières lignes"""
+        result = await BUILTIN_TOOLS.execute("read_file", path=str(log_file), tail=2)
+
+        assert_tool_success(result)
+        assert result["data"]["content"] == "line 999\nline 1000\n"
+        assert result["data"]["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_line_count_reused_across_pages(self, log_file, mock_settings):
+        """✅ Pagination: total_lines compté une fois tant que le fichier ne change pas"""
+        with patch.object(file_reader, "_scan_lines", wraps=file_reader._scan_lines) as scans:
+            for offset in (0, 100, 200):
+                result = await BUILTIN_TOOLS.execute(
+                    "read_file", path=str(log_file), offset=offset, length=100
+                )
+                assert result["data"]["total_lines"] == 1000
+            assert scans.call_count == 1
+
+            with log_file.open("a") as f:
+                f.write("line 1001\n")
+            result = await BUILTIN_TOOLS.execute("read_file", path=str(log_file), tail=1)
+
+        assert result["data"]["total_lines"] == 1001
+        assert scans.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_byte_ceiling(self, log_file, mock_settings, monkeypatch):
+        """✅ Plafond dur READ_FILE_MAX_BYTES, même sans plage demandée"""
+        monkeypatch.setattr(mock_settings, "READ_FILE_MAX_BYTES", 64)
+
+        full = await BUILTIN_TOOLS.execute("read_file", path=str(log_file))
+        ranged = await BUILTIN_TOOLS.execute("read_file", path=str(log_file), length=10_000)
+        tail = await BUILTIN_TOOLS.execute("read_file", path=str(log_file), tail=500)
+
+        for result in (full, ranged, tail):
+            assert result["data"]["bytes_read"] <= 64
+            assert result["data"]["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_utf8_boundaries(self, workspace_dir, mock_settings):
+        """✅ Plage coupant un caractère multi-octets: pas de caractère corrompu"""
+        path = Path(workspace_dir) / "utf8.txt"
+        path.write_text("é" * 10, encoding="utf-8")
+
+        result = await BUILTIN_TOOLS.execute("read_file", path=str(path), offset=1, length=6)
+
+        assert_tool_success(result)
+        assert result["data"]["content"] == "éé"
+        assert result["data"]["offset"] == 2
+
+    @pytest.mark.asyncio
+    async def test_binary_file(self, workspace_dir, mock_settings):
+        """❌ Fichier binaire → E_BINARY_FILE"""
+        path = Path(workspace_dir) / "core"
+        path.write_bytes(b"\x7fELF\x00\x01" * 1000)
+
+        result = await BUILTIN_TOOLS.execute("read_file", path=str(path))
+
+        assert_tool_error(result, "E_BINARY_FILE")
+        assert "6000 octets" in result["error"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_conflicting_modes(self, log_file, mock_settings):
+        """❌ Modes exclusifs combinés → E_INVALID_PARAMS"""
+        result = await BUILTIN_TOOLS.execute("read_file", path=str(log_file), offset=0, tail=5)
+
+        assert_tool_error(result, "E_INVALID_PARAMS")
+
+
 class TestWriteFile:
     """Tests pour write_file - 6 scénarios"""
 
@@ -197,6 +304,87 @@ class TestListDirectory:
         assert result["error"]["code"] in ["E_PATH_FORBIDDEN", "E_PERMISSION"]
 
 
+class TestListDirectoryPaging:
+    """Tests pour list_directory - pagination, tri, stat paresseux, arbre"""
+
+    @pytest.fixture
+    def big_dir(self, workspace_dir):
+        root = Path(workspace_dir) / "logs"
+        root.mkdir()
+        for i in range(25):
+            (root / f"app-{i:02d}.log").write_text("x" * i)
+        (root / "archive").mkdir()
+        return root
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination_covers_all_entries(self, big_dir, mock_settings):
+        """✅ Pages successives via next_cursor, sans doublon ni oubli"""
+        names, cursor, pages = [], None, 0
+        while True:
+            result = await BUILTIN_TOOLS.execute(
+                "list_directory", path=str(big_dir), limit=10, cursor=cursor
+            )
+            assert_tool_success(result, {"entries", "count", "total", "next_cursor"})
+            names += [e["name"] for e in result["data"]["entries"]]
+            pages += 1
+            cursor = result["data"]["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert names == sorted(p.name for p in big_dir.iterdir())
+        assert result["data"]["total"] == 26
+
+    @pytest.mark.asyncio
+    async def test_lazy_stat_and_size_sort(self, big_dir, mock_settings):
+        """✅ Pas de size sans fields; tri par taille décroissante"""
+        plain = await BUILTIN_TOOLS.execute("list_directory", path=str(big_dir), limit=1)
+        assert set(plain["data"]["entries"][0]) == {"name", "is_dir"}
+
+        result = await BUILTIN_TOOLS.execute(
+            "list_directory", path=str(big_dir), sort="size", fields="size,mtime", limit=3
+        )
+
+        entries = result["data"]["entries"]
+        assert [e["name"] for e in entries] == ["app-24.log", "app-23.log", "app-22.log"]
+        assert entries[0]["size"] == 24
+        assert entries[0]["mtime"].endswith("+00:00")
+
+    @pytest.mark.asyncio
+    async def test_tree_mode_with_per_dir_cap(self, workspace_dir, big_dir, mock_settings):
+        """✅ Arbre borné: profondeur et plafond par répertoire (omitted)"""
+        (big_dir / "archive" / "old.log").write_text("old")
+
+        result = await BUILTIN_TOOLS.execute(
+            "list_directory", path=workspace_dir, depth=2, per_dir=5, sort="type"
+        )
+
+        assert_tool_success(result, {"entries", "count", "truncated"})
+        data = result["data"]
+        logs = next(e for e in data["entries"] if e["name"] == "logs")
+        assert logs["children"][0]["name"] == "archive"
+        assert "children" not in logs["children"][0]  # depth=2 atteint
+        assert len(logs["children"]) == 5
+        assert logs["omitted"] == 21
+        assert data["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_or_sort(self, big_dir, mock_settings):
+        """❌ Curseur d'un autre tri / tri inconnu → E_INVALID_PARAMS"""
+        first = await BUILTIN_TOOLS.execute("list_directory", path=str(big_dir), limit=5)
+
+        result = await BUILTIN_TOOLS.execute(
+            "list_directory",
+            path=str(big_dir),
+            sort="mtime",
+            cursor=first["data"]["next_cursor"],
+        )
+        assert_tool_error(result, "E_INVALID_PARAMS")
+
+        result = await BUILTIN_TOOLS.execute("list_directory", path=str(big_dir), sort="color")
+        assert_tool_error(result, "E_INVALID_PARAMS")
+
+
 class TestSearchFiles:
     """Tests pour search_files - 4 scénarios"""
 
@@ -240,3 +428,112 @@ class TestSearchFiles:
         # Dépend de l'implémentation
         if not result["success"]:
             assert result["error"]["code"] in ["E_SEARCH_ERROR", "E_EXECUTION"]
+
+
+class TestSearchContent:
+    """Tests pour search_content - 8 scénarios"""
+
+    @pytest.fixture
+    def repo(self, workspace_dir):
+        root = Path(workspace_dir)
+        (root / ".gitignore").write_text("*.log\nbuild/\n")
+        (root / "src" / "app.py").write_text(
+            "import os\n\ndef handler():\n    # TODO: retry\n    return os.getcwd()\n"
+        )
+        (root / "src" / "lib").mkdir()
+        (root / "src" / "lib" / ".gitignore").write_text("*.gen.py\n!keep.gen.py\n")
+        (root / "src" / "lib" / "util.gen.py").write_text("TODO generated\n")
+        (root / "src" / "lib" / "keep.gen.py").write_text("TODO kept\n")
+        (root / "debug.log").write_text("TODO in log\n")
+        (root / "build").mkdir()
+        (root / "build" / "out.py").write_text("TODO in build\n")
+        (root / "blob.bin").write_bytes(b"TODO\x00\x01\x02" * 10)
+        return root
+
+    @pytest.mark.asyncio
+    async def test_regex_with_context(self, repo, mock_settings):
+        """✅ Regex → chemin, numéro de ligne, contexte avant/après"""
+        result = await BUILTIN_TOOLS.execute(
+            "search_content", pattern=r"def \w+\(", path=str(repo), context=1
+        )
+
+        assert_tool_success(result, {"matches", "count", "files_scanned", "truncated"})
+        [match] = result["data"]["matches"]
+        assert match == {
+            "path": "src/app.py",
+            "line": 3,
+            "text": "def handler():",
+            "before": [""],
+            "after": ["    # TODO: retry"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_respects_gitignore(self, repo, mock_settings):
+        """✅ .gitignore racine et imbriqués (avec négation) respectés"""
+        result = await BUILTIN_TOOLS.execute("search_content", pattern="TODO", path=str(repo))
+
+        paths = [m["path"] for m in result["data"]["matches"]]
+        assert paths == ["src/app.py", "src/lib/keep.gen.py"]
+
+    @pytest.mark.asyncio
+    async def test_skips_binary_files(self, repo, mock_settings):
+        """✅ Fichiers binaires ignorés et comptés"""
+        result = await BUILTIN_TOOLS.execute("search_content", pattern="TODO", path=str(repo))
+
+        assert result["data"]["skipped"]["binary"] == 1
+
+    @pytest.mark.asyncio
+    async def test_literal_ignore_case(self, repo, mock_settings):
+        """✅ Motif littéral (métacaractères non interprétés), insensible à la casse"""
+        result = await BUILTIN_TOOLS.execute(
+            "search_content",
+            pattern="OS.GETCWD()",
+            path=str(repo),
+            literal=True,
+            ignore_case="true",
+        )
+
+        assert_tool_success(result)
+        assert [m["line"] for m in result["data"]["matches"]] == [5]
+
+    @pytest.mark.asyncio
+    async def test_glob_filter(self, repo, mock_settings):
+        """✅ Filtre de fichiers (glob)"""
+        result = await BUILTIN_TOOLS.execute(
+            "search_content", pattern="TODO", path=str(repo), glob="*.gen.py"
+        )
+
+        assert [m["path"] for m in result["data"]["matches"]] == ["src/lib/keep.gen.py"]
+
+    @pytest.mark.asyncio
+    async def test_max_matches_truncates_in_path_order(self, workspace_dir, mock_settings):
+        """✅ Plafond max_matches: résultats tronqués, ordre des chemins conservé"""
+        root = Path(workspace_dir) / "many"
+        root.mkdir()
+        for i in range(30):
+            (root / f"f{i:02d}.txt").write_text("needle\n" * 3)
+
+        result = await BUILTIN_TOOLS.execute(
+            "search_content", pattern="needle", path=str(root), max_matches=7
+        )
+
+        data = result["data"]
+        assert data["count"] == 7
+        assert data["truncated"] is True
+        assert [m["path"] for m in data["matches"]] == ["f00.txt"] * 3 + ["f01.txt"] * 3 + [
+            "f02.txt"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_regex(self, repo, mock_settings):
+        """❌ Regex invalide → E_INVALID_PARAMS"""
+        result = await BUILTIN_TOOLS.execute("search_content", pattern="([unclosed", path=str(repo))
+
+        assert_tool_error(result, "E_INVALID_PARAMS")
+
+    @pytest.mark.asyncio
+    async def test_path_outside_workspace(self, workspace_dir, mock_settings):
+        """❌ Chemin hors workspace → E_PATH_FORBIDDEN"""
+        result = await BUILTIN_TOOLS.execute("search_content", pattern="root", path="/etc")
+
+        assert_tool_error(result, "E_PATH_FORBIDDEN")